@@ -0,0 +1,451 @@
+#!/usr/bin/env python3
+"""Warm TRR-Backend interpreter for the ``--json`` helper scripts preflight runs.
+
+Workspace tooling (runtime reconcile, Instagram auth freshness) shells out to
+``TRR-Backend/.venv/bin/python scripts/...`` several times per preflight, and
+each run pays interpreter start-up plus backend import and settings load.
+
+``serve`` keeps one backend-venv interpreter alive on a Unix socket with the
+backend package preloaded. Backend settings are read from the environment once,
+at preload, so the socket is keyed by the backend root and a fingerprint of
+the settings environment (``PRELOAD_ENV_PREFIXES`` and ``PRELOAD_ENV_KEYS``);
+per-phase preflight bookkeeping is not part of it. Each request is handled by
+a forked copy of that warm process, which forks once more to run the script
+with ``runpy`` so a script's ``sys.exit``, globals, env changes and stray
+children never leak into the server. Callers get the same contract as ``subprocess.run``: return code,
+stdout and stderr, or ``subprocess.TimeoutExpired``.
+
+Clients use :func:`try_run_script`; it starts the server on demand, and returns
+``None`` (run the script directly instead) when the backend venv is missing,
+the worker is disabled with ``WORKSPACE_BACKEND_WORKER=0``, the server does
+not come up, or it was preloaded under a different environment. The server
+greets each connection before reading the request: a connection lost before
+the greeting is retried, but a reply lost after the request was sent is
+reported as a failed run and never retried, since helper scripts are not all
+idempotent. The server exits after ``WORKSPACE_BACKEND_WORKER_IDLE_SECONDS``
+(default 300) without requests, or as soon as a preloaded backend module
+changes on disk.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import fcntl
+import hashlib
+import json
+import os
+import runpy
+import signal
+import socket
+import socketserver
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+from pathlib import Path
+from typing import Any, Sequence
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_IDLE_SECONDS = 300
+DEFAULT_PRELOAD = ("trr_backend",)
+STARTUP_TIMEOUT_SECONDS = 15.0
+TIMEOUT_EXIT_CODE = 124
+# Reply sent instead of running the script when preloaded modules changed; the
+# client restarts the server once and retries.
+STALE_REPLY = {"stale": True}
+# Sent instead of running the script when the request environment differs from
+# the one the backend was preloaded under; the client runs the script directly.
+ENV_MISMATCH_REPLY = {"env_mismatch": True}
+READY_GREETING = {"ready": True}
+# Environment backend settings read at import time: the backend's own
+# namespaces plus the workspace keys that select its runtime lane. Workspace
+# bookkeeping such as WORKSPACE_PREFLIGHT_DIAGNOSTICS_* and
+# WORKSPACE_PHASE_TIMINGS_* changes per phase and must stay out of the key.
+PRELOAD_ENV_PREFIXES = ("TRR_", "SUPABASE_", "DATABASE_", "MODAL_")
+PRELOAD_ENV_KEYS = frozenset({"WORKSPACE_DEV_MODE", "WORKSPACE_TRR_DB_LANE"})
+
+
+def worker_enabled(env: dict[str, str] | None = None) -> bool:
+    env = dict(os.environ) if env is None else env
+    return (env.get("WORKSPACE_BACKEND_WORKER") or "1").strip() == "1"
+
+
+def backend_python(backend_root: Path) -> Path:
+    return backend_root / ".venv" / "bin" / "python"
+
+
+def env_fingerprint(env: dict[str, str] | None = None) -> str:
+    """Hash of the environment keys a preloaded backend may have baked in."""
+    env = dict(os.environ) if env is None else env
+    relevant = sorted(
+        (key, value)
+        for key, value in env.items()
+        if key.startswith(PRELOAD_ENV_PREFIXES) or key in PRELOAD_ENV_KEYS
+    )
+    return hashlib.sha256(json.dumps(relevant).encode("utf-8")).hexdigest()[:12]
+
+
+def socket_path(backend_root: Path, env: dict[str, str] | None = None) -> Path:
+    # Unix socket paths are capped near 104 bytes on macOS, so keep them in TMPDIR.
+    digest = hashlib.sha256(str(backend_root.resolve()).encode("utf-8")).hexdigest()[:12]
+    return Path(tempfile.gettempdir()) / f"trr-backend-worker-{os.getuid()}-{digest}-{env_fingerprint(env)}.sock"
+
+
+def _idle_seconds() -> int:
+    raw = (os.getenv("WORKSPACE_BACKEND_WORKER_IDLE_SECONDS") or "").strip()
+    try:
+        return max(1, int(raw)) if raw else DEFAULT_IDLE_SECONDS
+    except ValueError:
+        return DEFAULT_IDLE_SECONDS
+
+
+def _preload_modules() -> tuple[str, ...]:
+    raw = os.getenv("WORKSPACE_BACKEND_WORKER_PRELOAD")
+    if raw is None:
+        return DEFAULT_PRELOAD
+    return tuple(name.strip() for name in raw.split(",") if name.strip())
+
+
+# --------------------------------------------------------------------------- server
+
+
+def _run_script_in_child(request: dict[str, Any], stdout_fd: int, stderr_fd: int) -> None:
+    """Body of the grandchild: become the script and never return."""
+    code = 1
+    try:
+        os.setsid()
+        devnull = os.open(os.devnull, os.O_RDONLY)
+        os.dup2(devnull, 0)
+        os.dup2(stdout_fd, 1)
+        os.dup2(stderr_fd, 2)
+        os.environ.clear()
+        os.environ.update(request.get("env") or {})
+        os.chdir(request["cwd"])
+        script = os.path.join(request["cwd"], request["script"])
+        sys.argv = [script, *request.get("args", [])]
+        sys.path.insert(0, os.path.dirname(script))
+        signal.signal(signal.SIGTERM, signal.SIG_DFL)
+        signal.signal(signal.SIGINT, signal.SIG_DFL)
+        try:
+            runpy.run_path(script, run_name="__main__")
+            code = 0
+        except SystemExit as exc:
+            if exc.code is None:
+                code = 0
+            elif isinstance(exc.code, int):
+                code = exc.code
+            else:
+                print(exc.code, file=sys.stderr)
+                code = 1
+    except BaseException:
+        traceback.print_exc()
+        code = 1
+    finally:
+        with contextlib.suppress(Exception):
+            sys.stdout.flush()
+            sys.stderr.flush()
+        os._exit(code & 0xFF)
+
+
+def _wait_with_deadline(pid: int, timeout: float | None) -> tuple[int, bool]:
+    deadline = None if timeout is None else time.monotonic() + timeout
+    delay = 0.002
+    while True:
+        waited, status = os.waitpid(pid, os.WNOHANG)
+        if waited == pid:
+            return os.waitstatus_to_exitcode(status), False
+        if deadline is not None and time.monotonic() >= deadline:
+            with contextlib.suppress(ProcessLookupError):
+                os.killpg(pid, signal.SIGKILL)
+            os.waitpid(pid, 0)
+            return TIMEOUT_EXIT_CODE, True
+        time.sleep(delay)
+        delay = min(delay * 2, 0.05)
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    server: "WorkerServer"
+
+    def handle(self) -> None:
+        self._reply(READY_GREETING)
+        request = json.loads(self.rfile.readline())
+        if self.server.preload_is_stale():
+            self._reply(STALE_REPLY)
+            return
+        if env_fingerprint(request.get("env") or {}) != self.server.env_fingerprint:
+            self._reply(ENV_MISMATCH_REPLY)
+            return
+        with tempfile.TemporaryFile() as stdout, tempfile.TemporaryFile() as stderr:
+            pid = os.fork()
+            if pid == 0:
+                _run_script_in_child(request, stdout.fileno(), stderr.fileno())
+            returncode, timed_out = _wait_with_deadline(pid, request.get("timeout"))
+            stdout.seek(0)
+            stderr.seek(0)
+            self._reply(
+                {
+                    "returncode": returncode,
+                    "timed_out": timed_out,
+                    "stdout": stdout.read().decode("utf-8", "replace"),
+                    "stderr": stderr.read().decode("utf-8", "replace"),
+                }
+            )
+
+    def _reply(self, payload: dict[str, Any]) -> None:
+        self.wfile.write(json.dumps(payload).encode("utf-8") + b"\n")
+
+
+class WorkerServer(socketserver.ForkingMixIn, socketserver.UnixStreamServer):
+    timeout = 1.0
+    # Forked handlers must not hold up shutdown when a client walks away.
+    block_on_close = False
+
+    def __init__(self, path: Path, *, idle_seconds: int) -> None:
+        super().__init__(str(path), _RequestHandler)
+        self.path = path
+        self.idle_seconds = idle_seconds
+        self.last_activity = time.monotonic()
+        self.loaded_mtimes: dict[str, float] = {}
+        self.env_fingerprint = env_fingerprint()
+
+    def preload(self, modules: Sequence[str], backend_root: Path) -> list[str]:
+        errors: list[str] = []
+        if str(backend_root) not in sys.path:
+            sys.path.insert(0, str(backend_root))
+        for name in modules:
+            try:
+                __import__(name)
+            except Exception as exc:  # a broken backend import must not kill the worker
+                errors.append(f"{name}: {exc}")
+        self.loaded_mtimes = self._backend_module_mtimes(backend_root)
+        return errors
+
+    @staticmethod
+    def _backend_module_mtimes(backend_root: Path) -> dict[str, float]:
+        root = str(backend_root.resolve())
+        mtimes: dict[str, float] = {}
+        for module in list(sys.modules.values()):
+            filename = getattr(module, "__file__", None)
+            if not filename or not os.path.realpath(filename).startswith(root) or "/.venv/" in filename:
+                continue
+            with contextlib.suppress(OSError):
+                mtimes[filename] = os.stat(filename).st_mtime
+        return mtimes
+
+    def preload_is_stale(self) -> bool:
+        for filename, mtime in self.loaded_mtimes.items():
+            try:
+                if os.stat(filename).st_mtime != mtime:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def process_request(self, request: Any, client_address: Any) -> None:
+        self.last_activity = time.monotonic()
+        super().process_request(request, client_address)
+
+    def handle_timeout(self) -> None:
+        pass
+
+    def idle(self) -> bool:
+        return not self.active_children and time.monotonic() - self.last_activity > self.idle_seconds
+
+    def serve_until_idle(self) -> None:
+        while not self.idle():
+            self.handle_request()
+            self.collect_children()
+            if self.preload_is_stale() and not self.active_children:
+                break
+
+
+def serve(backend_root: Path, path: Path, *, idle_seconds: int, preload: Sequence[str]) -> int:
+    if _connect(path) is not None:
+        return 0  # another worker already owns the socket
+    with contextlib.suppress(FileNotFoundError):
+        path.unlink()
+    server = WorkerServer(path, idle_seconds=idle_seconds)
+    try:
+        os.chmod(path, 0o600)
+        for error in server.preload(preload, backend_root):
+            print(f"[backend-worker] preload failed: {error}", file=sys.stderr)
+        server.serve_until_idle()
+    finally:
+        server.server_close()
+        with contextlib.suppress(FileNotFoundError):
+            path.unlink()
+    return 0
+
+
+# --------------------------------------------------------------------------- client
+
+
+def _connect(path: Path) -> socket.socket | None:
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+    return sock
+
+
+def _start_server(backend_root: Path, path: Path, env: dict[str, str]) -> socket.socket | None:
+    lock_path = path.with_suffix(".lock")
+    with lock_path.open("a") as lock:
+        fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+        sock = _connect(path)
+        if sock is not None:
+            return sock
+        with path.with_suffix(".log").open("ab") as log:
+            subprocess.Popen(
+                [
+                    str(backend_python(backend_root)),
+                    str(Path(__file__).resolve()),
+                    "serve",
+                    "--backend-root",
+                    str(backend_root),
+                    "--socket",
+                    str(path),
+                    "--idle-seconds",
+                    str(_idle_seconds()),
+                    "--preload",
+                    ",".join(_preload_modules()),
+                ],
+                cwd=backend_root,
+                env=env,
+                stdin=subprocess.DEVNULL,
+                stdout=log,
+                stderr=log,
+                start_new_session=True,
+            )
+        deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+        while time.monotonic() < deadline:
+            sock = _connect(path)
+            if sock is not None:
+                return sock
+            time.sleep(0.05)
+    return None
+
+
+class RequestLostError(Exception):
+    """The request reached the worker but no reply came back."""
+
+
+def _exchange(sock: socket.socket, request: dict[str, Any], timeout: float | None) -> dict[str, Any]:
+    # Failures before the greeting mean the server never saw the request (an
+    # idle exit with the connection still queued) and surface as ``OSError``.
+    # After the request is written they raise ``RequestLostError``.
+    with sock, sock.makefile("rwb") as stream:
+        sock.settimeout(STARTUP_TIMEOUT_SECONDS)
+        try:
+            greeting = stream.readline()
+        except TimeoutError as exc:
+            raise ConnectionError("backend worker did not accept the request") from exc
+        if greeting.strip() != json.dumps(READY_GREETING).encode("utf-8"):
+            raise ConnectionError("backend worker closed the connection before accepting the request")
+        stream.write(json.dumps(request).encode("utf-8") + b"\n")
+        stream.flush()
+        # The server enforces ``timeout`` itself; allow it a little slack to reply.
+        sock.settimeout(None if timeout is None else timeout + 10)
+        try:
+            line = stream.readline()
+        except TimeoutError:
+            raise
+        except OSError as exc:
+            raise RequestLostError(f"connection failed after the request was sent: {exc}") from exc
+    if not line:
+        raise RequestLostError("connection closed after the request was sent")
+    try:
+        return json.loads(line)
+    except ValueError as exc:
+        raise RequestLostError(f"unreadable reply: {exc}") from exc
+
+
+def try_run_script(
+    backend_root: Path,
+    script_relpath: str,
+    args: Sequence[str] = (),
+    *,
+    timeout: float | None = None,
+    env: dict[str, str] | None = None,
+) -> subprocess.CompletedProcess[str] | None:
+    """Run ``script_relpath`` in the warm backend worker.
+
+    Returns ``None`` when the worker cannot be used; callers then run the
+    script themselves exactly as before.
+    """
+    if not worker_enabled() or not backend_python(backend_root).is_file():
+        return None
+    command = [str(backend_python(backend_root)), script_relpath, *args]
+    env = dict(os.environ) if env is None else env
+    request = {
+        "script": script_relpath,
+        "args": list(args),
+        "cwd": str(backend_root),
+        "env": env,
+        "timeout": timeout,
+    }
+    path = socket_path(backend_root, env)
+    for _attempt in range(2):
+        try:
+            sock = _connect(path) or _start_server(backend_root, path, env)
+            if sock is None:
+                return None
+            reply = _exchange(sock, request, timeout)
+        except TimeoutError as exc:
+            raise subprocess.TimeoutExpired(command, timeout or 0) from exc
+        except RequestLostError as exc:
+            # The script may already have run; report a failed run rather than
+            # running it a second time.
+            return subprocess.CompletedProcess(command, 1, "", f"[backend-worker] {exc}; not retried.\n")
+        except OSError:
+            # The server exited before accepting the request (idle exit race);
+            # retry once with a fresh one.
+            continue
+        if reply.get("env_mismatch"):
+            return None
+        if reply.get("stale"):
+            # The server is exiting; wait for the socket to go so the retry starts a fresh one.
+            deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+            while path.exists() and time.monotonic() < deadline:
+                time.sleep(0.05)
+            continue
+        if reply.get("timed_out"):
+            raise subprocess.TimeoutExpired(command, timeout or 0, output=reply.get("stdout"), stderr=reply.get("stderr"))
+        return subprocess.CompletedProcess(command, int(reply["returncode"]), reply.get("stdout", ""), reply.get("stderr", ""))
+    return None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Warm TRR-Backend interpreter for workspace helper scripts.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    serve_parser = sub.add_parser("serve", help="Serve helper-script requests on a Unix socket until idle.")
+    serve_parser.add_argument("--backend-root", type=Path, required=True)
+    serve_parser.add_argument("--socket", type=Path, required=True)
+    serve_parser.add_argument("--idle-seconds", type=int, default=DEFAULT_IDLE_SECONDS)
+    serve_parser.add_argument("--preload", default=",".join(DEFAULT_PRELOAD), help="Comma-separated modules to import up front.")
+    run_parser = sub.add_parser("run", help="Run one backend script through the worker (debugging aid).")
+    run_parser.add_argument("--backend-root", type=Path, default=ROOT / "TRR-Backend")
+    run_parser.add_argument("--timeout", type=float)
+    run_parser.add_argument("script")
+    run_parser.add_argument("args", nargs=argparse.REMAINDER)
+    args = parser.parse_args(argv)
+
+    if args.command == "serve":
+        preload = tuple(name.strip() for name in args.preload.split(",") if name.strip())
+        return serve(args.backend_root, args.socket, idle_seconds=args.idle_seconds, preload=preload)
+
+    completed = try_run_script(args.backend_root, args.script, args.args, timeout=args.timeout)
+    if completed is None:
+        print("[backend-worker] worker unavailable (missing backend venv or WORKSPACE_BACKEND_WORKER=0)", file=sys.stderr)
+        return 2
+    sys.stdout.write(completed.stdout)
+    sys.stderr.write(completed.stderr)
+    return completed.returncode
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,9 +5,9 @@ import argparse
 import importlib.util
 import json
 import os
+import re
 import sys
-import urllib.error
-import urllib.request
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
@@ -15,13 +15,23 @@ from typing import Any, Callable
 
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.lib import http_client  # noqa: E402
+
 DEFAULT_CONFIG = ROOT / ".codex" / "config.toml"
 DEFAULT_OUTPUT_DIR = ROOT / "docs" / "workspace" / "supabase-advisor-snapshots"
 ADVISOR_TYPES = ("performance", "security")
 USER_AGENT = "TRR supabase-advisor-snapshot/1.0"
+DELTA_SCHEMA = 1
+# Every Nth capture in a delta chain is stored in full so reconstruction never
+# walks more than this many files.
+CHECKPOINT_EVERY = 30
+SNAPSHOT_DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
 
 
-UrlOpener = Callable[[urllib.request.Request, float], Any]
+UrlOpener = Callable[..., Any]
 
 
 @dataclass(frozen=True)
@@ -31,6 +41,8 @@ class AdvisorFetchResult:
     status: int | None
     payload: dict[str, Any] | None = None
     message: str | None = None
+    elapsed_ms: int | None = None
+    attempts: int = 1
 
     @property
     def ok(self) -> bool:
@@ -44,6 +56,10 @@ class AdvisorFetchResult:
         return len(lints) if isinstance(lints, list) else None
 
 
+class SnapshotStoreError(RuntimeError):
+    pass
+
+
 @dataclass(frozen=True)
 class SnapshotResult:
     project_ref: str
@@ -54,6 +70,7 @@ class SnapshotResult:
     captured_at: str
     fetches: tuple[AdvisorFetchResult, ...]
     saved_files: dict[str, Path] = field(default_factory=dict)
+    storage: dict[str, dict[str, Any]] = field(default_factory=dict)
 
     @property
     def exit_code(self) -> int:
@@ -83,48 +100,46 @@ def _advisor_url(project_ref: str, advisor_type: str) -> str:
     return f"https://api.supabase.com/v1/projects/{project_ref}/advisors/{advisor_type}"
 
 
+def _http_client(opener: UrlOpener | None) -> http_client.HttpClient:
+    transport = http_client.UrlopenTransport(opener) if opener is not None else None
+    return http_client.HttpClient(transport=transport)
+
+
 def fetch_advisor(
     *,
     advisor_type: str,
     project_ref: str,
     token: str,
     timeout: float,
-    opener: UrlOpener = urllib.request.urlopen,
+    opener: UrlOpener | None = None,
+    client: http_client.HttpClient | None = None,
 ) -> AdvisorFetchResult:
     if advisor_type not in ADVISOR_TYPES:
         raise ValueError(f"unsupported advisor type: {advisor_type}")
 
     url = _advisor_url(project_ref, advisor_type)
-    request = urllib.request.Request(
-        url,
-        headers={
-            "Accept": "application/json",
-            "Authorization": f"Bearer {token}",
-            "User-Agent": USER_AGENT,
-        },
-    )
-
+    if client is None:
+        client = _http_client(opener)
     try:
-        with opener(request, timeout=timeout) as response:
-            status = int(getattr(response, "status", 200))
-            payload = _decode_json_body(response.read())
-    except urllib.error.HTTPError as exc:
-        payload = _decode_json_body(exc.read())
-        return AdvisorFetchResult(
-            advisor_type=advisor_type,
-            url=url,
-            status=exc.code,
-            payload=payload or None,
-            message=payload.get("message") if isinstance(payload.get("message"), str) else exc.reason,
+        response = client.get(
+            url,
+            headers={
+                "Accept": "application/json",
+                "Authorization": f"Bearer {token}",
+                "User-Agent": USER_AGENT,
+            },
+            timeout=timeout,
         )
-    except urllib.error.URLError as exc:
+    except http_client.TransportError as exc:
         return AdvisorFetchResult(
             advisor_type=advisor_type,
             url=url,
             status=None,
-            message=str(exc.reason),
+            message=exc.reason,
         )
 
+    status = response.status
+    payload = _decode_json_body(response.body)
     message = payload.get("message") if status != 200 and isinstance(payload.get("message"), str) else None
     return AdvisorFetchResult(
         advisor_type=advisor_type,
@@ -132,6 +147,8 @@ def fetch_advisor(
         status=status,
         payload=payload if status == 200 else payload or None,
         message=message,
+        elapsed_ms=response.elapsed_ms,
+        attempts=response.attempts,
     )
 
 
@@ -150,6 +167,232 @@ def _display_path(path: Path) -> str:
         return str(path)
 
 
+def _canonical(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"))
+
+
+def _lint_key(lint: Any) -> str:
+    if isinstance(lint, dict) and isinstance(lint.get("cache_key"), str) and lint["cache_key"]:
+        return lint["cache_key"]
+    return _canonical(lint)
+
+
+def _index_lints(payload: dict[str, Any]) -> dict[str, Any] | None:
+    """Map lint identity to lint, or ``None`` when identities are not unique."""
+    lints = payload.get("lints")
+    if not isinstance(lints, list):
+        return None
+    indexed = {_lint_key(lint): lint for lint in lints}
+    return indexed if len(indexed) == len(lints) else None
+
+
+def diff_lints(base: dict[str, Any], payload: dict[str, Any]) -> dict[str, Any] | None:
+    """Lints added, removed (by key) and changed between two advisor payloads.
+
+    ``order`` is only recorded when the captured lint order differs from
+    base order followed by the added lints.
+    """
+    base_index = _index_lints(base)
+    index = _index_lints(payload)
+    if base_index is None or index is None:
+        return None
+    delta: dict[str, Any] = {
+        "added": [lint for key, lint in index.items() if key not in base_index],
+        "removed": [key for key in base_index if key not in index],
+        "changed": [
+            lint for key, lint in index.items() if key in base_index and _canonical(lint) != _canonical(base_index[key])
+        ],
+        "extra": {key: value for key, value in payload.items() if key != "lints"},
+    }
+    rebuilt = [_lint_key(lint) for lint in apply_delta(base, delta)["lints"]]
+    if rebuilt != list(index):
+        position = {key: offset for offset, key in enumerate(rebuilt)}
+        delta["order"] = [position[key] for key in index]
+    return delta
+
+
+def apply_delta(base: dict[str, Any], delta: dict[str, Any]) -> dict[str, Any]:
+    """Rebuild a payload from its base: base order plus added lints, or the recorded ``order``."""
+    removed = set(delta.get("removed") or [])
+    changed = {_lint_key(lint): lint for lint in delta.get("changed") or []}
+    lints = [changed.get(_lint_key(lint), lint) for lint in base.get("lints") or [] if _lint_key(lint) not in removed]
+    lints.extend(delta.get("added") or [])
+    order = delta.get("order")
+    if order is not None:
+        if sorted(order) != list(range(len(lints))):
+            raise SnapshotStoreError("delta lint order does not match its base")
+        lints = [lints[offset] for offset in order]
+    return {**(delta.get("extra") or {}), "lints": lints}
+
+
+def _full_path(output_root: Path, snapshot_date: str, advisor_type: str) -> Path:
+    return output_root / snapshot_date / f"{advisor_type}.json"
+
+
+def _delta_path(output_root: Path, snapshot_date: str, advisor_type: str) -> Path:
+    return output_root / snapshot_date / f"{advisor_type}.delta.json"
+
+
+def _read_json(path: Path) -> dict[str, Any]:
+    try:
+        value = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError) as exc:
+        raise SnapshotStoreError(f"unreadable snapshot artifact {_display_path(path)}: {exc}") from exc
+    if not isinstance(value, dict):
+        raise SnapshotStoreError(f"snapshot artifact {_display_path(path)} is not a JSON object")
+    return value
+
+
+def _has_snapshot(output_root: Path, snapshot_date: str, advisor_type: str) -> bool:
+    return (
+        _full_path(output_root, snapshot_date, advisor_type).exists()
+        or _delta_path(output_root, snapshot_date, advisor_type).exists()
+    )
+
+
+def snapshot_dates(output_root: Path) -> list[str]:
+    if not output_root.is_dir():
+        return []
+    return sorted(
+        child.name for child in output_root.iterdir() if child.is_dir() and SNAPSHOT_DATE_PATTERN.fullmatch(child.name)
+    )
+
+
+def _previous_snapshot_date(output_root: Path, before: str, advisor_type: str) -> str | None:
+    earlier = [day for day in snapshot_dates(output_root) if day < before]
+    return next((day for day in reversed(earlier) if _has_snapshot(output_root, day, advisor_type)), None)
+
+
+def _resolve(output_root: Path, snapshot_date: str, advisor_type: str) -> tuple[dict[str, Any], int]:
+    """Return ``(payload, delta_depth)`` for one advisor on one date."""
+    depth = 0
+    deltas: list[dict[str, Any]] = []
+    day = snapshot_date
+    while not _full_path(output_root, day, advisor_type).exists():
+        delta_path = _delta_path(output_root, day, advisor_type)
+        if not delta_path.exists():
+            raise SnapshotStoreError(f"no {advisor_type} advisor snapshot stored for {day}")
+        delta = _read_json(delta_path)
+        base_day = str(delta.get("base") or "")
+        if delta.get("schema") != DELTA_SCHEMA or not base_day or base_day >= day:
+            raise SnapshotStoreError(f"invalid delta artifact {_display_path(delta_path)}")
+        deltas.append(delta)
+        depth += 1
+        day = base_day
+    payload = _read_json(_full_path(output_root, day, advisor_type))
+    for delta in reversed(deltas):
+        payload = apply_delta(payload, delta)
+    return payload, depth
+
+
+def _dependent_dates(output_root: Path, snapshot_date: str, advisor_type: str) -> list[str]:
+    """Later dates whose stored delta is based on ``snapshot_date``."""
+    return [
+        day
+        for day in snapshot_dates(output_root)
+        if day > snapshot_date
+        and _delta_path(output_root, day, advisor_type).exists()
+        and _read_json(_delta_path(output_root, day, advisor_type)).get("base") == snapshot_date
+    ]
+
+
+def check_rewrite_allowed(output_root: Path, snapshot_date: str, advisor_type: str, payload: dict[str, Any]) -> None:
+    """Refuse to change a stored snapshot that later deltas are based on."""
+    if not _has_snapshot(output_root, snapshot_date, advisor_type):
+        return
+    dependents = _dependent_dates(output_root, snapshot_date, advisor_type)
+    if dependents and _canonical(_resolve(output_root, snapshot_date, advisor_type)[0]) != _canonical(payload):
+        raise SnapshotStoreError(
+            f"refusing to overwrite the {advisor_type} snapshot for {snapshot_date}: "
+            f"later snapshots are stored as deltas against it ({', '.join(dependents)})"
+        )
+
+
+def load_advisor_payload(output_root: Path, snapshot_date: str, advisor_type: str) -> dict[str, Any]:
+    """Reconstruct the advisor payload captured on ``snapshot_date``."""
+    if advisor_type not in ADVISOR_TYPES:
+        raise SnapshotStoreError(f"unsupported advisor type: {advisor_type}")
+    return _resolve(output_root, snapshot_date, advisor_type)[0]
+
+
+def store_advisor_payload(
+    output_root: Path, snapshot_date: str, advisor_type: str, payload: dict[str, Any]
+) -> tuple[Path, dict[str, Any]]:
+    """Write ``payload`` as a delta against the previous snapshot, or in full.
+
+    Full copies are kept for the first capture, every ``CHECKPOINT_EVERY``th
+    capture in a chain, and payloads whose lints cannot be keyed uniquely.
+    Raises ``SnapshotStoreError`` instead of changing a snapshot that later
+    deltas depend on.
+    """
+    check_rewrite_allowed(output_root, snapshot_date, advisor_type, payload)
+    full_path = _full_path(output_root, snapshot_date, advisor_type)
+    delta_path = _delta_path(output_root, snapshot_date, advisor_type)
+    base_day = _previous_snapshot_date(output_root, snapshot_date, advisor_type)
+    delta = None
+    if base_day is not None:
+        base, depth = _resolve(output_root, base_day, advisor_type)
+        if depth + 1 < CHECKPOINT_EVERY:
+            delta = diff_lints(base, payload)
+
+    if delta is None:
+        delta_path.unlink(missing_ok=True)
+        _write_json(full_path, payload)
+        return full_path, {"storage": "full", "base_date": None}
+
+    full_path.unlink(missing_ok=True)
+    _write_json(
+        delta_path,
+        {
+            "schema": DELTA_SCHEMA,
+            "advisor_type": advisor_type,
+            "base": base_day,
+            "lint_count": len(payload.get("lints") or []),
+            **delta,
+        },
+    )
+    counts = {name: len(delta[name]) for name in ("added", "removed", "changed")}
+    return delta_path, {"storage": "delta", "base_date": base_day, **counts}
+
+
+def _repoint_artifact(
+    output_dir: Path, advisor_type: str, old_path: Path, new_path: Path, info: dict[str, Any]
+) -> None:
+    manifest_path = output_dir / "manifest.json"
+    if manifest_path.exists():
+        manifest = _read_json(manifest_path)
+        entry = (manifest.get("advisors") or {}).get(advisor_type)
+        if isinstance(entry, dict):
+            entry.update({"artifact": _display_path(new_path), **info})
+            _write_json(manifest_path, manifest)
+    summary_path = output_dir / "summary.md"
+    if summary_path.exists():
+        summary = summary_path.read_text(encoding="utf-8")
+        _write_text(summary_path, summary.replace(f"`{_display_path(old_path)}`", f"`{_display_path(new_path)}`"))
+
+
+def compact_snapshots(output_root: Path) -> list[Path]:
+    """Rewrite stored full copies as deltas where the reconstruction round-trips."""
+    rewritten: list[Path] = []
+    for advisor_type in ADVISOR_TYPES:
+        for day in snapshot_dates(output_root):
+            full_path = _full_path(output_root, day, advisor_type)
+            if not full_path.exists() or _previous_snapshot_date(output_root, day, advisor_type) is None:
+                continue
+            payload = _read_json(full_path)
+            path, info = store_advisor_payload(output_root, day, advisor_type, payload)
+            if info["storage"] != "delta":
+                continue
+            rebuilt = load_advisor_payload(output_root, day, advisor_type)
+            if _canonical(rebuilt) != _canonical(payload):
+                path.unlink()
+                _write_json(full_path, payload)
+                raise SnapshotStoreError(f"delta round-trip mismatch for {advisor_type} on {day}; kept full copy")
+            _repoint_artifact(output_root / day, advisor_type, full_path, path, info)
+            rewritten.append(path)
+    return rewritten
+
+
 def _render_summary_markdown(
     *,
     project_ref: str,
@@ -159,6 +402,7 @@ def _render_summary_markdown(
     manifest_path: Path,
     fetches: list[AdvisorFetchResult],
     saved_files: dict[str, Path],
+    storage: dict[str, dict[str, Any]] | None = None,
 ) -> str:
     lines = [
         f"# Supabase Advisor Snapshot - {output_dir.name}",
@@ -175,7 +419,8 @@ def _render_summary_markdown(
 
     for fetch in fetches:
         if fetch.advisor_type in saved_files:
-            lines.append(f"- {fetch.advisor_type.title()} JSON: `{_display_path(saved_files[fetch.advisor_type])}`")
+            kind = "delta JSON" if (storage or {}).get(fetch.advisor_type, {}).get("storage") == "delta" else "JSON"
+            lines.append(f"- {fetch.advisor_type.title()} {kind}: `{_display_path(saved_files[fetch.advisor_type])}`")
     lines.extend(
         [
             "",
@@ -191,6 +436,14 @@ def _render_summary_markdown(
         count = str(fetch.lint_count) if fetch.lint_count is not None else ""
         lines.append(f"| {fetch.advisor_type} | {status} | {count} | {artifact} |")
 
+    deltas = {name: info for name, info in (storage or {}).items() if info.get("storage") == "delta"}
+    if deltas:
+        lines.extend(["", "## Changes Since Previous Snapshot", ""])
+        for name, info in sorted(deltas.items()):
+            lines.append(
+                f"- `{name}` vs {info['base_date']}: {info['added']} added, {info['removed']} removed, {info['changed']} changed."
+            )
+
     failed = [fetch for fetch in fetches if not fetch.ok]
     if failed:
         lines.extend(["", "## Failures", ""])
@@ -206,6 +459,7 @@ def _render_summary_markdown(
             "",
             "```bash",
             "make supabase-advisor-snapshot",
+            "make supabase-advisor-snapshot-show DATE=" + output_dir.name,
             "```",
             "",
             "This workflow intentionally uses `TRR_SUPABASE_ACCESS_TOKEN`, not the generic `SUPABASE_ACCESS_TOKEN`.",
@@ -223,27 +477,42 @@ def capture_snapshot(
     output_root: Path,
     snapshot_date: str,
     timeout: float,
-    opener: UrlOpener = urllib.request.urlopen,
+    opener: UrlOpener | None = None,
+    client: http_client.HttpClient | None = None,
 ) -> SnapshotResult:
+    if client is None:
+        client = _http_client(opener)
     captured_at = datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
     output_dir = output_root / snapshot_date
     output_dir.mkdir(parents=True, exist_ok=True)
 
-    fetches: list[AdvisorFetchResult] = []
-    saved_files: dict[str, Path] = {}
-    for advisor_type in ADVISOR_TYPES:
-        fetch = fetch_advisor(
-            advisor_type=advisor_type,
-            project_ref=project_ref,
-            token=token,
-            timeout=timeout,
-            opener=opener,
+    with ThreadPoolExecutor(max_workers=len(ADVISOR_TYPES)) as pool:
+        fetches = list(
+            pool.map(
+                lambda advisor_type: fetch_advisor(
+                    advisor_type=advisor_type,
+                    project_ref=project_ref,
+                    token=token,
+                    timeout=timeout,
+                    client=client,
+                ),
+                ADVISOR_TYPES,
+            )
         )
-        fetches.append(fetch)
+
+    # Check every advisor before writing any, so a refused re-capture leaves
+    # the stored date untouched.
+    for fetch in fetches:
         if fetch.ok and fetch.payload is not None:
-            path = output_dir / f"{advisor_type}.json"
-            _write_json(path, fetch.payload)
-            saved_files[advisor_type] = path
+            check_rewrite_allowed(output_root, snapshot_date, fetch.advisor_type, fetch.payload)
+
+    saved_files: dict[str, Path] = {}
+    storage: dict[str, dict[str, Any]] = {}
+    for fetch in fetches:
+        if fetch.ok and fetch.payload is not None:
+            path, info = store_advisor_payload(output_root, snapshot_date, fetch.advisor_type, fetch.payload)
+            saved_files[fetch.advisor_type] = path
+            storage[fetch.advisor_type] = info
 
     manifest = {
         "captured_at": captured_at,
@@ -261,6 +530,7 @@ def capture_snapshot(
                 if fetch.advisor_type in saved_files
                 else None,
                 "message": fetch.message,
+                **storage.get(fetch.advisor_type, {}),
             }
             for fetch in fetches
         },
@@ -278,6 +548,7 @@ def capture_snapshot(
             manifest_path=manifest_path,
             fetches=fetches,
             saved_files=saved_files,
+            storage=storage,
         ),
     )
 
@@ -290,6 +561,7 @@ def capture_snapshot(
         captured_at=captured_at,
         fetches=tuple(fetches),
         saved_files=saved_files,
+        storage=storage,
     )
 
 
@@ -306,7 +578,12 @@ def render_snapshot_result(result: SnapshotResult) -> str:
         if fetch.ok:
             artifact = _display_path(result.saved_files[fetch.advisor_type])
             count = fetch.lint_count if fetch.lint_count is not None else "unknown"
-            lines.append(f"{prefix} {fetch.advisor_type}: {status}, lints={count}, artifact={artifact}")
+            info = result.storage.get(fetch.advisor_type, {})
+            if info.get("storage") == "delta":
+                artifact += f" (delta vs {info['base_date']}: +{info['added']} -{info['removed']} ~{info['changed']})"
+            timing = f", {fetch.elapsed_ms}ms" if fetch.elapsed_ms is not None else ""
+            retries = f", attempts={fetch.attempts}" if fetch.attempts > 1 else ""
+            lines.append(f"{prefix} {fetch.advisor_type}: {status}, lints={count}, artifact={artifact}{timing}{retries}")
             continue
 
         lines.append(f"{prefix} {fetch.advisor_type}: ERROR {status} at {fetch.url}")
@@ -334,23 +611,72 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
     parser.add_argument("--output-dir", type=Path, default=DEFAULT_OUTPUT_DIR)
     parser.add_argument("--date", default=datetime.now().date().isoformat())
     parser.add_argument("--timeout", type=float, default=20.0)
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument(
+        "--show",
+        action="store_true",
+        help="Print the stored advisor JSON for --date, rebuilt from deltas; no network access.",
+    )
+    mode.add_argument(
+        "--compact",
+        action="store_true",
+        help="Rewrite stored full advisor JSON copies as deltas against the previous snapshot.",
+    )
+    parser.add_argument("--advisor", choices=ADVISOR_TYPES, help="Limit --show to one advisor type.")
     return parser.parse_args(argv)
 
 
+def show_snapshot(output_root: Path, snapshot_date: str, advisor_type: str | None) -> int:
+    prefix = "[supabase-advisor-snapshot]"
+    try:
+        if advisor_type is not None:
+            payload: dict[str, Any] = load_advisor_payload(output_root, snapshot_date, advisor_type)
+        else:
+            payload = {
+                name: load_advisor_payload(output_root, snapshot_date, name)
+                for name in ADVISOR_TYPES
+                if _has_snapshot(output_root, snapshot_date, name)
+            }
+            if not payload:
+                raise SnapshotStoreError(f"no advisor snapshot stored for {snapshot_date}")
+    except SnapshotStoreError as exc:
+        print(f"{prefix} ERROR: {exc}", file=sys.stderr)
+        return 2
+    print(json.dumps(payload, indent=2, sort_keys=True))
+    return 0
+
+
 def main(argv: list[str]) -> int:
     args = parse_args(argv)
+    if args.show:
+        return show_snapshot(args.output_dir, args.date, args.advisor)
+    if args.compact:
+        try:
+            rewritten = compact_snapshots(args.output_dir)
+        except SnapshotStoreError as exc:
+            print(f"[supabase-advisor-snapshot] ERROR: {exc}", file=sys.stderr)
+            return 2
+        for path in rewritten:
+            print(f"[supabase-advisor-snapshot] Compacted: {_display_path(path)}")
+        print(f"[supabase-advisor-snapshot] OK: {len(rewritten)} full snapshot(s) rewritten as deltas.")
+        return 0
+
     mcp_access = _load_mcp_access_module()
     config = mcp_access.load_config(args.config)
     project_ref = args.project_ref or config.project_ref
     token_env = args.token_env or config.token_env
     token = os.environ.get(token_env, "").strip()
     legacy_generic_token_present = bool(os.environ.get("SUPABASE_ACCESS_TOKEN")) and token_env != "SUPABASE_ACCESS_TOKEN"
+    # One pooled client for the access probe and every advisor fetch, so the
+    # snapshot reuses a single TLS connection to api.supabase.com.
+    client = http_client.HttpClient()
 
     access_result = mcp_access.check_project_access(
         project_ref=project_ref,
         token_env=token_env,
         token=token,
         timeout=args.timeout,
+        client=client,
         legacy_generic_token_present=legacy_generic_token_present,
     )
     if access_result.exit_code != 0:
@@ -362,14 +688,21 @@ def main(argv: list[str]) -> int:
         )
         return access_result.exit_code
 
-    result = capture_snapshot(
-        project_ref=project_ref,
-        token_env=token_env,
-        token=token,
-        output_root=args.output_dir,
-        snapshot_date=args.date,
-        timeout=args.timeout,
-    )
+    try:
+        result = capture_snapshot(
+            project_ref=project_ref,
+            token_env=token_env,
+            token=token,
+            output_root=args.output_dir,
+            snapshot_date=args.date,
+            timeout=args.timeout,
+            client=client,
+        )
+    except SnapshotStoreError as exc:
+        print(f"[supabase-advisor-snapshot] ERROR: {exc}", file=sys.stderr)
+        return 2
+    finally:
+        client.close()
 
     stream = sys.stdout if result.exit_code == 0 else sys.stderr
     print(render_snapshot_result(result), file=stream)
@@ -5,9 +5,7 @@ import argparse
 import json
 import os
 import sys
-import urllib.error
 import urllib.parse
-import urllib.request
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Callable
@@ -19,9 +17,17 @@ except ModuleNotFoundError:  # pragma: no cover - exercised on older local pytho
 
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.lib import http_client  # noqa: E402
+
 DEFAULT_CONFIG = ROOT / ".codex" / "config.toml"
 DEFAULT_PROJECT_REF = "vwxfvzutyufrkhfgoeaa"
 DEFAULT_TOKEN_ENV = "TRR_SUPABASE_ACCESS_TOKEN"
+# The access probe runs inside preflight; one retry absorbs a transient 5xx
+# without stretching a real outage past two timeouts.
+PROBE_RETRY = http_client.RetryPolicy(attempts=2)
 
 
 @dataclass(frozen=True)
@@ -124,7 +130,17 @@ def _decode_json_body(body: bytes) -> dict[str, Any]:
     return value if isinstance(value, dict) else {}
 
 
-UrlOpener = Callable[[urllib.request.Request, float], Any]
+UrlOpener = Callable[..., Any]
+
+
+def management_api_client(
+    *,
+    opener: UrlOpener | None = None,
+    retry: http_client.RetryPolicy | None = None,
+) -> http_client.HttpClient:
+    """Pooled client for api.supabase.com; ``opener`` swaps in a urlopen-style hook."""
+    transport = http_client.UrlopenTransport(opener) if opener is not None else None
+    return http_client.HttpClient(transport=transport, retry=retry)
 
 
 def check_project_access(
@@ -133,7 +149,8 @@ def check_project_access(
     token_env: str,
     token: str,
     timeout: float,
-    opener: UrlOpener = urllib.request.urlopen,
+    opener: UrlOpener | None = None,
+    client: http_client.HttpClient | None = None,
     legacy_generic_token_present: bool = False,
 ) -> AccessResult:
     if not token:
@@ -145,32 +162,30 @@ def check_project_access(
             legacy_generic_token_present=legacy_generic_token_present,
         )
 
+    if client is None:
+        client = management_api_client(opener=opener, retry=PROBE_RETRY)
     url = f"https://api.supabase.com/v1/projects/{project_ref}"
-    request = urllib.request.Request(
-        url,
-        headers={
-            "Accept": "application/json",
-            "Authorization": f"Bearer {token}",
-            "User-Agent": "TRR supabase-mcp-access/1.0",
-        },
-    )
-
     try:
-        with opener(request, timeout=timeout) as response:
-            status = int(getattr(response, "status", 200))
-            payload = _decode_json_body(response.read())
-    except urllib.error.HTTPError as exc:
-        status = exc.code
-        payload = _decode_json_body(exc.read())
-    except urllib.error.URLError as exc:
+        response = client.get(
+            url,
+            headers={
+                "Accept": "application/json",
+                "Authorization": f"Bearer {token}",
+                "User-Agent": "TRR supabase-mcp-access/1.0",
+            },
+            timeout=timeout,
+        )
+    except http_client.TransportError as exc:
         return AccessResult(
             state="network_error",
             exit_code=4,
             project_ref=project_ref,
             token_env=token_env,
-            api_message=str(exc.reason),
+            api_message=exc.reason,
             legacy_generic_token_present=legacy_generic_token_present,
         )
+    status = response.status
+    payload = _decode_json_body(response.body)
 
     if status == 200:
         return AccessResult(
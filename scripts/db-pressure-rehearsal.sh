@@ -45,23 +45,27 @@ capture_url() {
 
 capture_log_signals() {
   local output="${ARTIFACT_DIR}/log-signals.txt"
-  local pattern='EMAXCONNSESSION|MaxClientsInSessionMode|UPSTREAM_TIMEOUT|DATABASE_SERVICE_UNAVAILABLE|postgres_pool_queue_depth|pool_capacity|connection pool exhausted'
+  local signal_args=(
+    --signal EMAXCONNSESSION
+    --signal MaxClientsInSessionMode
+    --signal UPSTREAM_TIMEOUT
+    --signal DATABASE_SERVICE_UNAVAILABLE
+    --signal postgres_pool_queue_depth
+    --signal pool_capacity
+    --signal connection_pool_exhausted
+  )
+  local source
 
+  python3 scripts/workspace/log_index.py ingest >/dev/null 2>&1 || true
   {
     echo "# DB Pressure Log Signals"
     echo
-    for log_file in \
-      "$ROOT/.logs/workspace/trr-app.log" \
-      "$ROOT/.logs/workspace/trr-backend.log" \
-      "$ROOT/.logs/workspace/trr-social-worker.log" \
-      "$ROOT/.logs/workspace/trr-remote-workers.log"
-    do
-      echo "## ${log_file#$ROOT/}"
-      if [[ -f "$log_file" ]]; then
-        tail -n 1000 "$log_file" | rg -n "$pattern" || true
-      else
-        echo "not present"
-      fi
+    echo "## signal events per minute (last 2h)"
+    python3 scripts/workspace/log_index.py counts --no-ingest --since 2h "${signal_args[@]}" || true
+    echo
+    for source in app backend social-worker remote-workers; do
+      echo "## ${source}"
+      python3 scripts/workspace/log_index.py query --no-ingest --source "$source" --limit 200 "${signal_args[@]}" || true
       echo
     done
   } | redact_stream >"$output"
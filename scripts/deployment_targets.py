@@ -2,7 +2,6 @@
 from __future__ import annotations
 
 import argparse
-import ast
 import json
 import re
 import stat
@@ -12,6 +11,11 @@ from typing import Any
 
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.lib import source_literals  # noqa: E402
+
 DEFAULT_MANIFEST = ROOT / "docs" / "workspace" / "deployment-targets.json"
 
 EXPECTED = {
@@ -62,29 +66,13 @@ def load_manifest(path: Path = DEFAULT_MANIFEST) -> dict[str, Any]:
     return payload
 
 
-def _literal_assignments(path: Path) -> dict[str, Any]:
-    tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
-    values: dict[str, Any] = {}
-    for node in tree.body:
-        if (
-            isinstance(node, ast.Assign)
-            and len(node.targets) == 1
-            and isinstance(node.targets[0], ast.Name)
-        ):
-            try:
-                values[node.targets[0].id] = ast.literal_eval(node.value)
-            except (ValueError, TypeError):
-                continue
-        if (
-            isinstance(node, ast.AnnAssign)
-            and isinstance(node.target, ast.Name)
-            and node.value is not None
-        ):
-            try:
-                values[node.target.id] = ast.literal_eval(node.value)
-            except (ValueError, TypeError):
-                continue
-    return values
+def _literal_assignments(path: Path, names: tuple[str, ...], cache_path: Path) -> dict[str, Any]:
+    try:
+        return source_literals.literal_constants(path, names, cache_path=cache_path)
+    except (OSError, UnicodeError, SyntaxError, ValueError) as exc:
+        raise DeploymentTargetError(
+            f"unable to read guard constants from {path}: {exc}"
+        ) from exc
 
 
 def validate_manifest(payload: dict[str, Any]) -> None:
@@ -153,8 +141,16 @@ def validate_snapshot_permissions(payload: dict[str, Any], root: Path = ROOT) ->
         )
 
 
-def validate_projections(payload: dict[str, Any], root: Path = ROOT) -> None:
-    supabase = _literal_assignments(root / "scripts" / "check-supabase-mcp-access.py")
+def validate_projections(
+    payload: dict[str, Any], root: Path = ROOT, *, cache_path: Path | None = None
+) -> None:
+    if cache_path is None:
+        cache_path = source_literals.default_cache_path(root)
+    supabase = _literal_assignments(
+        root / "scripts" / "check-supabase-mcp-access.py",
+        ("DEFAULT_PROJECT_REF", "DEFAULT_TOKEN_ENV"),
+        cache_path,
+    )
     if supabase.get("DEFAULT_PROJECT_REF") != payload["supabase"]["project_ref"]:
         raise DeploymentTargetError(
             "Supabase access guard project ref differs from deployment target"
@@ -164,22 +160,21 @@ def validate_projections(payload: dict[str, Any], root: Path = ROOT) -> None:
             "Supabase access guard token env differs from deployment target"
         )
 
-    vercel = _literal_assignments(root / "scripts" / "vercel-project-guard.py")
     vercel_expected = {
         "DEFAULT_EXPECTED_NAME": payload["vercel"]["project_name"],
         "DEFAULT_EXPECTED_ID": payload["vercel"]["project_id"],
         "DEFAULT_TEAM_SLUG": payload["vercel"]["team_slug"],
         "DEFAULT_TEAM_ID": payload["vercel"]["team_id"],
     }
+    vercel = _literal_assignments(
+        root / "scripts" / "vercel-project-guard.py", tuple(vercel_expected), cache_path
+    )
     for key, expected in vercel_expected.items():
         if vercel.get(key) != expected:
             raise DeploymentTargetError(
                 f"Vercel guard {key} differs from deployment target"
             )
 
-    modal = _literal_assignments(
-        root / "TRR-Backend" / "scripts" / "modal" / "deploy_backend.py"
-    )
     modal_expected = {
         "DEFAULT_APP_REF": payload["modal"]["app_ref"],
         "DEFAULT_APP_NAME": payload["modal"]["app_name"],
@@ -187,6 +182,11 @@ def validate_projections(payload: dict[str, Any], root: Path = ROOT) -> None:
         "REQUIRED_MODAL_WORKSPACE": payload["modal"]["workspace"],
         "REQUIRED_MODAL_ENVIRONMENT": payload["modal"]["environment"],
     }
+    modal = _literal_assignments(
+        root / "TRR-Backend" / "scripts" / "modal" / "deploy_backend.py",
+        tuple(modal_expected),
+        cache_path,
+    )
     for key, expected in modal_expected.items():
         if modal.get(key) != expected:
             raise DeploymentTargetError(
@@ -230,6 +230,11 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     )
     parser.add_argument("command", choices=("check",))
     parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST)
+    parser.add_argument(
+        "--cache-path",
+        type=Path,
+        help="Source-literal cache file (default: .logs/workspace/source-literals-cache.json).",
+    )
     return parser.parse_args(argv)
 
 
@@ -239,7 +244,7 @@ def main(argv: list[str] | None = None) -> int:
         payload = load_manifest(args.manifest)
         validate_manifest(payload)
         validate_snapshot_permissions(payload)
-        validate_projections(payload)
+        validate_projections(payload, cache_path=args.cache_path)
     except DeploymentTargetError as exc:
         print(f"deployment-targets: ERROR: {exc}", file=sys.stderr)
         return 1
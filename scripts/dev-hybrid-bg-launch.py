@@ -1,31 +1,282 @@
 #!/usr/bin/env python3
-"""Launch make dev-hybrid as a detached workspace process."""
+"""Launch make dev-hybrid as a detached workspace process.
+
+Output from make and everything it starts goes through a pipe to a log pump in
+the detached session. The pump writes it to --log-file and rotates it by size
+and age. Closed segments are compressed (zstd when the ``zstandard`` module is
+installed, gzip otherwise) into ``<log stem>-segments/``. The oldest segments
+are dropped once their total size goes past --max-total-mb.
+
+The pump also supervises the process tree under make (see
+``scripts/lib/process_supervisor.py``). It samples per-process CPU and RSS into
+``<log stem>-processes.jsonl`` every --sample-interval-seconds. When make exits,
+anything it left running gets SIGTERM, then SIGKILL after
+--stop-grace-seconds, so crashed sessions do not leak dev servers.
+"""
 
 from __future__ import annotations
 
 import argparse
+import gzip
+import json
 import os
+import shutil
 import signal
 import sys
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from typing import Callable
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.lib import process_supervisor  # noqa: E402
+
+try:
+    import zstandard
+except ImportError:  # optional; gzip is always available
+    zstandard = None
+
+
+DEFAULT_MAX_SEGMENT_MB = 64
+DEFAULT_MAX_SEGMENT_AGE_HOURS = 24.0
+DEFAULT_MAX_TOTAL_MB = 512
+COMPRESSION_CHOICES = ("auto", "zstd", "gzip", "none")
+COMPRESSION_SUFFIXES = {"zstd": ".zst", "gzip": ".gz", "none": ""}
+DEFAULT_STOP_GRACE_SECONDS = 10.0
+DEFAULT_SAMPLE_INTERVAL_SECONDS = 30.0
+PUMP_READ_BYTES = 64 * 1024
+MB = 1024 * 1024
+SAMPLE_LOG_SEGMENT_BYTES = 8 * MB
+SAMPLE_LOG_TOTAL_BYTES = 32 * MB
 
 
 def parse_args() -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description=__doc__)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
     parser.add_argument("--log-file", required=True, type=Path)
     parser.add_argument("--pid-file", required=True, type=Path)
     parser.add_argument("--cwd", required=True, type=Path)
+    parser.add_argument("--max-segment-mb", type=float, default=DEFAULT_MAX_SEGMENT_MB)
+    parser.add_argument("--max-segment-age-hours", type=float, default=DEFAULT_MAX_SEGMENT_AGE_HOURS)
+    parser.add_argument("--max-total-mb", type=float, default=DEFAULT_MAX_TOTAL_MB)
+    parser.add_argument("--compression", choices=COMPRESSION_CHOICES, default="auto")
+    parser.add_argument("--stop-grace-seconds", type=float, default=DEFAULT_STOP_GRACE_SECONDS)
+    parser.add_argument("--sample-interval-seconds", type=float, default=DEFAULT_SAMPLE_INTERVAL_SECONDS)
     return parser.parse_args()
 
 
+def resolve_compression(requested: str) -> str:
+    if requested == "auto":
+        return "zstd" if zstandard is not None else "gzip"
+    if requested == "zstd" and zstandard is None:
+        raise RuntimeError("--compression zstd needs the zstandard module; use gzip or auto")
+    return requested
+
+
+def _compress(source: Path, target: Path, compression: str) -> None:
+    partial = target.with_name(target.name + ".partial")
+    with source.open("rb") as reader, partial.open("wb") as raw_writer:
+        if compression == "zstd":
+            with zstandard.ZstdCompressor(level=3).stream_writer(raw_writer, closefd=False) as writer:
+                shutil.copyfileobj(reader, writer, MB)
+        elif compression == "gzip":
+            with gzip.GzipFile(fileobj=raw_writer, mode="wb", compresslevel=6) as writer:
+                shutil.copyfileobj(reader, writer, MB)
+        else:
+            shutil.copyfileobj(reader, raw_writer, MB)
+    partial.replace(target)
+    source.unlink()
+
+
+class RotatingLogWriter:
+    """Size- and age-rotated log file with a bounded set of compressed segments.
+
+    Segments are tracked in memory in creation order, so enforcing the total
+    size bound touches only the segments being dropped. Compression runs on one
+    background thread, in rotation order, so the pump keeps draining the pipe.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        *,
+        max_segment_bytes: int,
+        max_segment_age_seconds: float,
+        max_total_bytes: int,
+        compression: str = "gzip",
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.path = path
+        self.segment_dir = path.with_name(f"{path.stem}-segments")
+        self.max_segment_bytes = max_segment_bytes
+        self.max_segment_age_seconds = max_segment_age_seconds
+        self.max_total_bytes = max_total_bytes
+        self.compression = compression
+        self.clock = clock
+        self.segments: deque[tuple[Path, int]] = deque()
+        self.segment_bytes = 0
+        self._lock = threading.Lock()
+        self._compressor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="log-segment-compress")
+        self._sequence = 0
+
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        for entry in sorted(self.segment_dir.iterdir(), key=lambda entry: entry.name):
+            if entry.name.endswith(".partial"):
+                entry.unlink()
+            elif entry.name.endswith(".closed"):
+                # Left behind by a pump that exited mid-compression.
+                self._compressor.submit(self._finish_segment, entry, entry.with_name(entry.name.removesuffix(".closed")))
+            elif entry.is_file():
+                self._add_segment(entry, entry.stat().st_size)
+        if path.exists() and path.stat().st_size > 0:
+            # Keep the previous session's output instead of truncating it.
+            self._retire()
+        self._open()
+
+    def _open(self) -> None:
+        self.fd = os.open(self.path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        self.size = os.fstat(self.fd).st_size
+        self.opened_at = self.clock()
+
+    def _add_segment(self, path: Path, size: int) -> None:
+        with self._lock:
+            self.segments.append((path, size))
+            self.segment_bytes += size
+            while self.segment_bytes > self.max_total_bytes and len(self.segments) > 1:
+                oldest, oldest_size = self.segments.popleft()
+                self.segment_bytes -= oldest_size
+                try:
+                    oldest.unlink()
+                except FileNotFoundError:
+                    pass
+
+    def _segment_name(self) -> str:
+        self._sequence += 1
+        stamp = time.strftime("%Y%m%dT%H%M%SZ", time.gmtime(self.clock()))
+        return f"{self.path.stem}-{stamp}-{os.getpid()}-{self._sequence:04d}.log{COMPRESSION_SUFFIXES[self.compression]}"
+
+    def _retire(self) -> None:
+        target = self.segment_dir / self._segment_name()
+        closed = target.with_name(target.name + ".closed")
+        os.replace(self.path, closed)
+        self._compressor.submit(self._finish_segment, closed, target)
+
+    def rotate(self) -> None:
+        os.close(self.fd)
+        self._retire()
+        self._open()
+
+    def _finish_segment(self, closed: Path, target: Path) -> None:
+        try:
+            _compress(closed, target, self.compression)
+        except OSError as exc:
+            sys.stderr.write(f"[workspace] log segment compression failed: {exc}\n")
+            return
+        self._add_segment(target, target.stat().st_size)
+
+    def write(self, data: bytes) -> None:
+        if self.size and (
+            self.size + len(data) > self.max_segment_bytes
+            or self.clock() - self.opened_at >= self.max_segment_age_seconds
+        ):
+            self.rotate()
+        view = memoryview(data)
+        while view:
+            written = os.write(self.fd, view)
+            view = view[written:]
+            self.size += written
+
+    def close(self) -> None:
+        os.close(self.fd)
+        self._compressor.shutdown(wait=True)
+
+
+def pump(read_fd: int, writer: RotatingLogWriter) -> None:
+    """Copy the child's output into ``writer`` until every writer of the pipe exits."""
+    while True:
+        try:
+            chunk = os.read(read_fd, PUMP_READ_BYTES)
+        except InterruptedError:
+            continue
+        if not chunk:
+            break
+        try:
+            writer.write(chunk)
+        except OSError as exc:
+            # Keep draining so the workspace never blocks on a full pipe.
+            sys.stderr.write(f"[workspace] dropping log output: {exc}\n")
+    os.close(read_fd)
+
+
+class TreeWatcher:
+    """Reaps the pump's children and stops whatever make leaves behind.
+
+    Runs on its own thread in the pump. The pump is a child subreaper where the
+    platform allows it, so orphaned workspace processes become its children and
+    are reaped here instead of lingering as zombies.
+    """
+
+    def __init__(self, supervisor: process_supervisor.ProcessTreeSupervisor, make_pid: int, grace_seconds: float) -> None:
+        self.supervisor = supervisor
+        self.make_pid = make_pid
+        self.grace_seconds = grace_seconds
+        self.make_status: int | None = None
+        self.result: process_supervisor.TerminationResult | None = None
+        self.thread = threading.Thread(target=self._run, name="make-tree-watcher", daemon=True)
+
+    def _run(self) -> None:
+        while self.make_status is None:
+            try:
+                pid, status = os.waitpid(-1, 0)
+            except InterruptedError:
+                continue
+            except ChildProcessError:
+                break
+            if pid == self.make_pid:
+                self.make_status = os.waitstatus_to_exitcode(status)
+        self.result = self.supervisor.terminate(self.grace_seconds)
+
+    def summary(self) -> str:
+        result = self.result
+        leftover = "" if result is None or not result.signalled else (
+            f"; stopped {result.signalled} leftover process(es), {len(result.killed)} with SIGKILL"
+        )
+        return f"[workspace] make dev-hybrid exited with status {self.make_status}{leftover}\n"
+
+
+def _sample_sink(writer: RotatingLogWriter) -> Callable[[list[dict[str, object]]], None]:
+    def sink(rows: list[dict[str, object]]) -> None:
+        writer.write("".join(json.dumps(row, separators=(",", ":")) + "\n" for row in rows).encode("utf-8"))
+
+    return sink
+
+
 def _write_pipe_message(fd: int, message: str) -> None:
     os.write(fd, message.encode("utf-8", errors="replace"))
     os.close(fd)
 
 
-def launch_detached(*, log_file: Path, pid_file: Path, cwd: Path) -> int:
+def launch_detached(
+    *,
+    log_file: Path,
+    pid_file: Path,
+    cwd: Path,
+    max_segment_bytes: int = DEFAULT_MAX_SEGMENT_MB * MB,
+    max_segment_age_seconds: float = DEFAULT_MAX_SEGMENT_AGE_HOURS * 3600,
+    max_total_bytes: int = DEFAULT_MAX_TOTAL_MB * MB,
+    compression: str = "auto",
+    stop_grace_seconds: float = DEFAULT_STOP_GRACE_SECONDS,
+    sample_interval_seconds: float = DEFAULT_SAMPLE_INTERVAL_SECONDS,
+    command: list[str] | None = None,
+) -> int:
     log_file.parent.mkdir(parents=True, exist_ok=True)
     pid_file.parent.mkdir(parents=True, exist_ok=True)
+    command = command or ["make", "--no-print-directory", "dev-hybrid"]
+    compression = resolve_compression(compression)
 
     read_fd, write_fd = os.pipe()
     supervisor_pid = os.fork()
@@ -48,34 +299,90 @@ def launch_detached(*, log_file: Path, pid_file: Path, cwd: Path) -> int:
     try:
         signal.signal(signal.SIGHUP, signal.SIG_IGN)
         os.setsid()
-        daemon_pid = os.fork()
-        if daemon_pid:
-            pid_file.write_text(f"{daemon_pid}\n", encoding="utf-8")
-            _write_pipe_message(write_fd, f"pid={daemon_pid}\n")
+        if os.fork():
+            os.close(write_fd)
             os._exit(0)
 
-        try:
-            signal.signal(signal.SIGHUP, signal.SIG_IGN)
-            os.chdir(cwd)
-            stdin_fd = os.open(os.devnull, os.O_RDONLY)
-            log_fd = os.open(log_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
-            os.dup2(stdin_fd, 0)
-            os.dup2(log_fd, 1)
-            os.dup2(log_fd, 2)
-            os.close(stdin_fd)
-            os.close(log_fd)
-            os.execvp("make", ["make", "--no-print-directory", "dev-hybrid"])
-        except BaseException as exc:  # noqa: BLE001
-            print(f"[workspace] failed to exec make dev-hybrid: {type(exc).__name__}: {exc}", file=sys.stderr)
-            os._exit(127)
+        # Log pump: owns the rotating writer and outlives make so late output
+        # from the workspace's children is still captured.
+        writer = RotatingLogWriter(
+            log_file,
+            max_segment_bytes=max_segment_bytes,
+            max_segment_age_seconds=max_segment_age_seconds,
+            max_total_bytes=max_total_bytes,
+            compression=compression,
+        )
+        process_supervisor.become_subreaper()
+        output_read_fd, output_write_fd = os.pipe()
+        make_pid = os.fork()
+        if not make_pid:
+            try:
+                signal.signal(signal.SIGHUP, signal.SIG_IGN)
+                os.close(output_read_fd)
+                os.close(write_fd)
+                os.chdir(cwd)
+                stdin_fd = os.open(os.devnull, os.O_RDONLY)
+                os.dup2(stdin_fd, 0)
+                os.dup2(output_write_fd, 1)
+                os.dup2(output_write_fd, 2)
+                os.close(stdin_fd)
+                os.close(output_write_fd)
+                os.execvp(command[0], command)
+            except BaseException as exc:  # noqa: BLE001
+                print(f"[workspace] failed to exec {' '.join(command)}: {type(exc).__name__}: {exc}", file=sys.stderr)
+                os._exit(127)
+
+        os.close(output_write_fd)
+        pid_file.write_text(f"{make_pid}\n", encoding="utf-8")
+        _write_pipe_message(write_fd, f"pid={make_pid}\n")
+        # `make stop` signals the workspace processes; the pump exits on EOF
+        # once they are gone rather than leaving them writing to a dead pipe.
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            signal.signal(signum, signal.SIG_IGN)
+        devnull_fd = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull_fd, fd)
+        os.close(devnull_fd)
+
+        supervisor = process_supervisor.ProcessTreeSupervisor()
+        sample_writer = RotatingLogWriter(
+            log_file.with_name(f"{log_file.stem}-processes.jsonl"),
+            max_segment_bytes=SAMPLE_LOG_SEGMENT_BYTES,
+            max_segment_age_seconds=max_segment_age_seconds,
+            max_total_bytes=SAMPLE_LOG_TOTAL_BYTES,
+            compression=compression,
+        )
+        supervisor.start_sampling(sample_interval_seconds, _sample_sink(sample_writer))
+        watcher = TreeWatcher(supervisor, make_pid, stop_grace_seconds)
+        watcher.thread.start()
+        pump(output_read_fd, writer)
+        watcher.thread.join()
+        supervisor.stop_sampling()
+        sample_writer.close()
+        writer.write(watcher.summary().encode("utf-8"))
+        writer.close()
+        os._exit(0)
     except BaseException as exc:  # noqa: BLE001
-        _write_pipe_message(write_fd, f"error={type(exc).__name__}: {exc}\n")
+        try:
+            _write_pipe_message(write_fd, f"error={type(exc).__name__}: {exc}\n")
+        except OSError:
+            pass
         os._exit(1)
 
 
 def main() -> int:
     args = parse_args()
-    pid = launch_detached(log_file=args.log_file, pid_file=args.pid_file, cwd=args.cwd)
+    pid = launch_detached(
+        log_file=args.log_file,
+        pid_file=args.pid_file,
+        cwd=args.cwd,
+        max_segment_bytes=int(args.max_segment_mb * MB),
+        max_segment_age_seconds=args.max_segment_age_hours * 3600,
+        max_total_bytes=int(args.max_total_mb * MB),
+        compression=args.compression,
+        stop_grace_seconds=args.stop_grace_seconds,
+        sample_interval_seconds=args.sample_interval_seconds,
+    )
     print(pid)
     return 0
 
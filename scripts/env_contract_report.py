@@ -10,6 +10,11 @@ from pathlib import Path
 from typing import Iterable
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.lib import env_files  # noqa: E402
+
 INVENTORY_PATH = ROOT / "docs/workspace/env-contract-inventory.md"
 DEPRECATIONS_PATH = ROOT / "docs/workspace/env-deprecations.md"
 VERCEL_REVIEW_PATH = ROOT / "docs/workspace/vercel-env-review.md"
@@ -298,15 +303,7 @@ def _load_shared_env_manifest() -> dict:
 
 
 def _env_keys(path: Path) -> set[str]:
-    keys: set[str] = set()
-    for raw_line in _read_text(path).splitlines():
-        line = raw_line.strip()
-        if not line or line.startswith("#") or "=" not in line:
-            continue
-        key, _, _ = line.partition("=")
-        if key and key.replace("_", "").isalnum():
-            keys.add(key)
-    return keys
+    return set(env_files.env_keys(path))
 
 
 def _run_rg(pattern: str) -> list[str]:
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import os
 import subprocess
@@ -10,6 +11,11 @@ from pathlib import Path
 from typing import Any
 
 ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts import backend_helper_worker  # noqa: E402
+
 BACKEND_ROOT = ROOT / "TRR-Backend"
 DEFAULT_COOKIE_FILES = (
     BACKEND_ROOT / "data" / "instagram_cookies.json",
@@ -17,6 +23,10 @@ DEFAULT_COOKIE_FILES = (
 )
 ENV_COOKIE_FILE_KEYS = ("SOCIAL_INSTAGRAM_COOKIES_FILE", "INSTAGRAM_COOKIES_FILE")
 DEFAULT_MAX_AGE_DAYS = 14
+VALIDATION_SCRIPT = "scripts/modal/repair_instagram_auth.py"
+VALIDATION_CACHE_PATH = ROOT / ".logs" / "workspace" / "instagram-auth-validation.json"
+VALIDATION_CACHE_SCHEMA = 1
+DEFAULT_VALIDATION_CACHE_SECONDS = 6 * 60 * 60
 
 
 def _python_command() -> str:
@@ -114,6 +124,79 @@ def _cookie_file_status(now: float | None = None) -> list[dict[str, Any]]:
     return statuses
 
 
+def _sha256_file(path: Path) -> str | None:
+    digest = hashlib.sha256()
+    try:
+        with path.open("rb") as handle:
+            for chunk in iter(lambda: handle.read(1 << 16), b""):
+                digest.update(chunk)
+    except OSError:
+        return None
+    return digest.hexdigest()
+
+
+def validation_fingerprint() -> dict[str, Any]:
+    """Everything a successful local-only validation result depends on."""
+    cookie_files: list[dict[str, Any]] = []
+    for path in _cookie_file_candidates():
+        try:
+            stat = path.stat()
+        except OSError:
+            cookie_files.append({"path": str(path), "present": False})
+            continue
+        cookie_files.append(
+            {
+                "path": str(path),
+                "present": True,
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "sha256": _sha256_file(path),
+            }
+        )
+    return {
+        "schema": VALIDATION_CACHE_SCHEMA,
+        "cookie_files": cookie_files,
+        "validation_script_sha256": _sha256_file(BACKEND_ROOT / VALIDATION_SCRIPT),
+    }
+
+
+def _validation_cache_seconds() -> int:
+    raw = str(os.getenv("WORKSPACE_INSTAGRAM_AUTH_VALIDATION_CACHE_SECONDS") or "").strip()
+    try:
+        return max(0, int(raw)) if raw else DEFAULT_VALIDATION_CACHE_SECONDS
+    except ValueError:
+        return DEFAULT_VALIDATION_CACHE_SECONDS
+
+
+def _load_cached_validation(fingerprint: dict[str, Any], now: float | None = None) -> dict[str, Any] | None:
+    max_age = _validation_cache_seconds()
+    if max_age <= 0:
+        return None
+    try:
+        cached = json.loads(VALIDATION_CACHE_PATH.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    if not isinstance(cached, dict) or cached.get("fingerprint") != fingerprint:
+        return None
+    validated_at = cached.get("validated_at")
+    current_time = time.time() if now is None else now
+    if not isinstance(validated_at, (int, float)) or not 0 <= current_time - validated_at <= max_age:
+        return None
+    payload = cached.get("validation")
+    return payload if isinstance(payload, dict) and payload.get("ok") else None
+
+
+def _store_cached_validation(fingerprint: dict[str, Any], payload: dict[str, Any]) -> None:
+    entry = {"fingerprint": fingerprint, "validated_at": time.time(), "validation": payload}
+    try:
+        VALIDATION_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        tmp = VALIDATION_CACHE_PATH.with_name(f".{VALIDATION_CACHE_PATH.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(entry, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        os.replace(tmp, VALIDATION_CACHE_PATH)
+    except OSError:
+        pass
+
+
 def _render_age(seconds: int | None) -> str:
     if seconds is None:
         return "unknown"
@@ -128,19 +211,15 @@ def _render_age(seconds: int | None) -> str:
     return f"{hours // 24}d"
 
 
-def check_instagram_auth_freshness() -> dict[str, Any]:
-    cookie_files = _cookie_file_status()
-    present_ages = [int(item["age_seconds"]) for item in cookie_files if item.get("present") and item["age_seconds"] is not None]
-    newest_cookie_age_seconds = min(present_ages) if present_ages else None
-    missing_cookie_files = [item["path"] for item in cookie_files if not item.get("present")]
-
+def _run_validation() -> tuple[int, dict[str, Any]]:
     command = [
         _python_command(),
-        "scripts/modal/repair_instagram_auth.py",
+        VALIDATION_SCRIPT,
         "--validate-local-only",
         "--json",
     ]
-    try:
+    completed = backend_helper_worker.try_run_script(BACKEND_ROOT, command[1], command[2:], timeout=_timeout_seconds())
+    if completed is None:
         completed = subprocess.run(
             command,
             cwd=BACKEND_ROOT,
@@ -149,6 +228,24 @@ def check_instagram_auth_freshness() -> dict[str, Any]:
             check=False,
             timeout=_timeout_seconds(),
         )
+    return completed.returncode, _parse_json_output(completed.stdout)
+
+
+def check_instagram_auth_freshness(*, use_cache: bool = True) -> dict[str, Any]:
+    cookie_files = _cookie_file_status()
+    present_ages = [int(item["age_seconds"]) for item in cookie_files if item.get("present") and item["age_seconds"] is not None]
+    newest_cookie_age_seconds = min(present_ages) if present_ages else None
+    missing_cookie_files = [item["path"] for item in cookie_files if not item.get("present")]
+
+    # Validation only depends on the cookie files and the validator, so a recent
+    # success for identical inputs is reused; cookie age is still checked live.
+    fingerprint = validation_fingerprint()
+    payload = _load_cached_validation(fingerprint) if use_cache else None
+    validation_cached = payload is not None
+    returncode = 0
+    try:
+        if payload is None:
+            returncode, payload = _run_validation()
     except subprocess.TimeoutExpired:
         return {
             "state": "advisory",
@@ -165,8 +262,9 @@ def check_instagram_auth_freshness() -> dict[str, Any]:
             },
         }
 
-    payload = _parse_json_output(completed.stdout)
-    validation_ok = bool(payload.get("ok")) and completed.returncode == 0
+    validation_ok = bool(payload.get("ok")) and returncode == 0
+    if validation_ok and use_cache and not validation_cached:
+        _store_cached_validation(fingerprint, payload)
     failure_reason = str(payload.get("failure_reason") or "").strip() or None
     side_effects = {
         "cookie_refresh": False,
@@ -188,6 +286,7 @@ def check_instagram_auth_freshness() -> dict[str, Any]:
             "newest_cookie_age_seconds": newest_cookie_age_seconds,
             "max_age_seconds": max_age,
             "validation": payload,
+            "validation_cached": validation_cached,
             "side_effects": side_effects,
         }
     if stale:
@@ -206,6 +305,7 @@ def check_instagram_auth_freshness() -> dict[str, Any]:
             "newest_cookie_age_seconds": newest_cookie_age_seconds,
             "max_age_seconds": max_age,
             "validation": payload,
+            "validation_cached": validation_cached,
             "side_effects": side_effects,
         }
     return {
@@ -217,6 +317,7 @@ def check_instagram_auth_freshness() -> dict[str, Any]:
         "newest_cookie_age_seconds": newest_cookie_age_seconds,
         "max_age_seconds": max_age,
         "validation": payload,
+        "validation_cached": validation_cached,
         "side_effects": side_effects,
     }
 
@@ -225,7 +326,8 @@ def render_summary(payload: dict[str, Any]) -> str:
     state = str(payload.get("state") or "advisory").strip()
     age = _render_age(payload.get("newest_cookie_age_seconds"))
     if state == "ok":
-        return f"[preflight] Instagram auth freshness OK (validated; newest cookie age {age})"
+        validated = "validated, cached" if payload.get("validation_cached") else "validated"
+        return f"[preflight] Instagram auth freshness OK ({validated}; newest cookie age {age})"
     reason = str(payload.get("reason") or "instagram_auth_freshness_advisory").strip()
     return f"[preflight] Instagram auth freshness ADVISORY ({reason}; no refresh attempted)"
 
@@ -233,9 +335,10 @@ def render_summary(payload: dict[str, Any]) -> str:
 def main(argv: list[str] | None = None) -> int:
     parser = argparse.ArgumentParser(description="Safely validate local Instagram auth freshness for preflight.")
     parser.add_argument("--json", action="store_true", help="Emit structured JSON instead of a preflight summary line.")
+    parser.add_argument("--no-cache", action="store_true", help="Re-run validation even if a cached success matches the cookie files.")
     args = parser.parse_args(argv)
 
-    payload = check_instagram_auth_freshness()
+    payload = check_instagram_auth_freshness(use_cache=False) if args.no_cache else check_instagram_auth_freshness()
     if args.json:
         print(json.dumps(payload, indent=2, sort_keys=True))
     else:
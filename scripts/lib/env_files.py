@@ -0,0 +1,135 @@
+"""Shared ``KEY=value`` env-file parser for the workspace env tooling.
+
+Stdlib only. The contract report, env hygiene check, redacted inventory, and
+runtime-capacity check all read the same ``profiles/*.env`` and ``.env*``
+surfaces. Parsing goes through ``load_env_file``, which memoizes each file per
+process keyed by (resolved path, mtime_ns, size, decode errors mode), so one interpreter running
+several of those tools parses each surface once. An edited file gets a new
+key and is parsed again.
+
+Rules:
+- blank lines and lines starting with ``#`` are skipped;
+- an ``export `` prefix on the key is dropped;
+- a value wrapped in matching single or double quotes is unquoted as is;
+- an unquoted value ends at the first ``#`` preceded by whitespace (an inline
+  comment);
+- a non-comment line without ``=``, or with a key that is not
+  ``[A-Za-z0-9_]+``, is kept in ``invalid_lines`` for callers that reject
+  malformed files.
+"""
+
+from __future__ import annotations
+
+import os
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+
+
+_KEY_PATTERN = re.compile(r"[A-Za-z0-9_]+")
+_INLINE_COMMENT = re.compile(r"\s+#")
+
+
+@dataclass(frozen=True)
+class EnvEntry:
+    key: str
+    value: str
+    line_number: int
+
+
+@dataclass(frozen=True)
+class EnvFile:
+    path: Path
+    exists: bool
+    entries: tuple[EnvEntry, ...] = ()
+    invalid_lines: tuple[tuple[int, str], ...] = ()
+
+    @property
+    def keys(self) -> frozenset[str]:
+        return frozenset(entry.key for entry in self.entries)
+
+    @property
+    def values(self) -> dict[str, str]:
+        """Key -> value; a key assigned twice keeps its last value, as a shell would."""
+        return {entry.key: entry.value for entry in self.entries}
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+
+_cache: dict[tuple[str, int, int, str], EnvFile] = {}
+_cache_lock = threading.Lock()
+stats = CacheStats()
+
+
+def _parse_value(raw: str) -> str:
+    value = raw.strip()
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in "\"'":
+        return value[1:-1]
+    match = _INLINE_COMMENT.search(value)
+    return value[: match.start()] if match else value
+
+
+def parse_env_text(text: str, path: Path = Path("<text>")) -> EnvFile:
+    entries: list[EnvEntry] = []
+    invalid: list[tuple[int, str]] = []
+    for line_number, raw_line in enumerate(text.splitlines(), start=1):
+        line = raw_line.strip()
+        if not line or line.startswith("#"):
+            continue
+        key, separator, raw_value = line.partition("=")
+        key = key.strip()
+        if key.startswith("export "):
+            key = key.removeprefix("export ").strip()
+        if not separator or not _KEY_PATTERN.fullmatch(key):
+            invalid.append((line_number, raw_line))
+            continue
+        entries.append(EnvEntry(key, _parse_value(raw_value), line_number))
+    return EnvFile(path=path, exists=True, entries=tuple(entries), invalid_lines=tuple(invalid))
+
+
+def load_env_file(path: Path, *, errors: str = "strict") -> EnvFile:
+    """Parse ``path`` once per (path, mtime_ns, size); a missing file parses as empty.
+
+    Read errors other than a missing file propagate as ``OSError`` or
+    ``UnicodeDecodeError`` so callers can decide how strict to be; pass
+    ``errors="ignore"`` (any ``str.decode`` errors handler) to read a file
+    with stray non-UTF-8 bytes leniently instead.
+    """
+    resolved = path.resolve()
+    try:
+        stat = os.stat(resolved)
+    except FileNotFoundError:
+        return EnvFile(path=path, exists=False)
+    key = (str(resolved), stat.st_mtime_ns, stat.st_size, errors)
+    with _cache_lock:
+        cached = _cache.get(key)
+        if cached is not None:
+            stats.hits += 1
+            return cached
+    parsed = parse_env_text(resolved.read_text(encoding="utf-8", errors=errors), path)
+    with _cache_lock:
+        # Drop entries for older versions of the same file.
+        for stale in [item for item in _cache if item[0] == key[0] and item[1:3] != key[1:3]]:
+            del _cache[stale]
+        _cache[key] = parsed
+        stats.misses += 1
+    return parsed
+
+
+def env_keys(path: Path, *, errors: str = "strict") -> frozenset[str]:
+    return load_env_file(path, errors=errors).keys
+
+
+def env_values(path: Path) -> dict[str, str]:
+    return load_env_file(path).values
+
+
+def clear_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+        stats.hits = stats.misses = 0
@@ -0,0 +1,383 @@
+"""Shared HTTP client for workspace provider tooling (Render, Supabase, Vercel).
+
+Stdlib only. One ``HttpClient`` keeps a small pool of keep-alive connections
+per host, retries 429/5xx answers with jittered exponential backoff, and
+records per-host response times. The wire layer is a pluggable ``Transport``
+so tests can point a client at a local stand-in server or wrap the
+``urlopen``-style hooks older callers already accept.
+
+Retries are conservative: 429 is retried for every method (the provider did
+not act on the request), 5xx and network errors only for idempotent methods,
+so a deploy or rollback POST is never sent twice.
+"""
+
+from __future__ import annotations
+
+import http.client
+import json
+import random
+import socket
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Mapping, Protocol
+
+
+DEFAULT_TIMEOUT_SECONDS = 30.0
+DEFAULT_MAX_CONNECTIONS_PER_HOST = 4
+DEFAULT_IDLE_SECONDS = 60.0
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+# A pooled connection the server already closed fails on first use with one of
+# these. If it fails while the request is still being written the server never
+# saw it; once the request is out, only idempotent methods are resent.
+_STALE_CONNECTION_ERRORS = (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError)
+
+
+class TransportError(RuntimeError):
+    """The request did not produce an HTTP response (DNS, connect, timeout, TLS)."""
+
+    def __init__(self, reason: str) -> None:
+        super().__init__(reason)
+        self.reason = reason
+
+
+@dataclass(frozen=True)
+class HttpRequest:
+    method: str
+    url: str
+    headers: Mapping[str, str] = field(default_factory=dict)
+    body: bytes | None = None
+
+
+@dataclass(frozen=True)
+class TransportResponse:
+    status: int
+    headers: Mapping[str, str]
+    body: bytes
+
+
+@dataclass(frozen=True)
+class HttpResponse:
+    method: str
+    url: str
+    status: int
+    headers: Mapping[str, str]
+    body: bytes
+    elapsed_ms: int
+    attempts: int
+
+    @property
+    def ok(self) -> bool:
+        return 200 <= self.status < 300
+
+    def json(self) -> Any:
+        return json.loads(self.body.decode("utf-8") or "{}")
+
+    def header(self, name: str) -> str | None:
+        wanted = name.lower()
+        for key, value in self.headers.items():
+            if key.lower() == wanted:
+                return value
+        return None
+
+
+class Transport(Protocol):
+    def send(self, request: HttpRequest, timeout: float) -> TransportResponse: ...
+
+
+def _host_key(url: str) -> tuple[str, str, int]:
+    parsed = urllib.parse.urlsplit(url)
+    scheme = parsed.scheme.lower()
+    if scheme not in {"http", "https"} or not parsed.hostname:
+        raise TransportError(f"unsupported URL: {url}")
+    port = parsed.port or (443 if scheme == "https" else 80)
+    return scheme, parsed.hostname, port
+
+
+def _request_target(url: str) -> str:
+    parsed = urllib.parse.urlsplit(url)
+    target = parsed.path or "/"
+    if parsed.query:
+        target += f"?{parsed.query}"
+    return target
+
+
+class PooledTransport:
+    """``http.client`` transport that keeps idle keep-alive connections per host."""
+
+    def __init__(
+        self,
+        *,
+        max_per_host: int = DEFAULT_MAX_CONNECTIONS_PER_HOST,
+        idle_seconds: float = DEFAULT_IDLE_SECONDS,
+    ) -> None:
+        self._max_per_host = max(1, max_per_host)
+        self._idle_seconds = idle_seconds
+        self._idle: dict[tuple[str, str, int], list[tuple[http.client.HTTPConnection, float]]] = {}
+        self._lock = threading.Lock()
+        self.connections_opened = 0
+
+    def _checkout(self, key: tuple[str, str, int], timeout: float) -> tuple[http.client.HTTPConnection, bool]:
+        now = time.monotonic()
+        with self._lock:
+            idle = self._idle.get(key, [])
+            while idle:
+                conn, last_used = idle.pop()
+                if now - last_used <= self._idle_seconds:
+                    conn.timeout = timeout
+                    if conn.sock is not None:
+                        conn.sock.settimeout(timeout)
+                    return conn, True
+                conn.close()
+            self.connections_opened += 1
+        scheme, host, port = key
+        if scheme == "https":
+            return http.client.HTTPSConnection(host, port, timeout=timeout), False
+        return http.client.HTTPConnection(host, port, timeout=timeout), False
+
+    def _checkin(self, key: tuple[str, str, int], conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if len(idle) < self._max_per_host:
+                idle.append((conn, time.monotonic()))
+                return
+        conn.close()
+
+    def send(self, request: HttpRequest, timeout: float) -> TransportResponse:
+        key = _host_key(request.url)
+        target = _request_target(request.url)
+        while True:
+            conn, reused = self._checkout(key, timeout)
+            sent = False
+            try:
+                conn.request(request.method, target, body=request.body, headers=dict(request.headers))
+                sent = True
+                response = conn.getresponse()
+                body = response.read()
+            except _STALE_CONNECTION_ERRORS as exc:
+                conn.close()
+                if reused and (not sent or request.method.upper() in IDEMPOTENT_METHODS):
+                    continue
+                raise TransportError(str(exc) or type(exc).__name__) from exc
+            except (OSError, http.client.HTTPException) as exc:
+                conn.close()
+                if isinstance(exc, socket.timeout):
+                    raise TransportError("timed out") from exc
+                raise TransportError(str(exc) or type(exc).__name__) from exc
+            if response.will_close:
+                conn.close()
+            else:
+                self._checkin(key, conn)
+            return TransportResponse(status=response.status, headers=dict(response.getheaders()), body=body)
+
+    def close(self) -> None:
+        with self._lock:
+            pools, self._idle = self._idle, {}
+        for idle in pools.values():
+            for conn, _ in idle:
+                conn.close()
+
+
+UrlOpener = Callable[..., Any]
+
+
+class UrlopenTransport:
+    """Adapter for ``urllib.request.urlopen``-compatible callables (existing test hooks)."""
+
+    def __init__(self, opener: UrlOpener = urllib.request.urlopen) -> None:
+        self._opener = opener
+
+    def send(self, request: HttpRequest, timeout: float) -> TransportResponse:
+        urllib_request = urllib.request.Request(
+            request.url,
+            data=request.body,
+            method=request.method,
+            headers=dict(request.headers),
+        )
+        try:
+            with self._opener(urllib_request, timeout=timeout) as response:
+                status = int(getattr(response, "status", 200))
+                headers = dict(getattr(response, "headers", None) or {})
+                body = response.read()
+        except urllib.error.HTTPError as exc:
+            return TransportResponse(status=exc.code, headers=dict(exc.headers or {}), body=exc.read() or b"")
+        except urllib.error.URLError as exc:
+            raise TransportError(str(exc.reason)) from exc
+        return TransportResponse(status=status, headers=headers, body=body)
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    attempts: int = 3
+    base_delay: float = 0.25
+    max_delay: float = 8.0
+    statuses: frozenset[int] = RETRY_STATUSES
+
+    def should_retry_status(self, method: str, status: int) -> bool:
+        if status not in self.statuses:
+            return False
+        return status == 429 or method.upper() in IDEMPOTENT_METHODS
+
+    def should_retry_error(self, method: str) -> bool:
+        return method.upper() in IDEMPOTENT_METHODS
+
+    def delay(self, attempt: int, retry_after: str | None = None, *, rng: Callable[[float, float], float] = random.uniform) -> float:
+        """Full-jitter backoff for ``attempt`` (1-based), or the server's ``Retry-After``."""
+        hinted = _parse_retry_after(retry_after)
+        if hinted is not None:
+            return min(self.max_delay, hinted)
+        return rng(0.0, min(self.max_delay, self.base_delay * (2 ** (attempt - 1))))
+
+
+NO_RETRY = RetryPolicy(attempts=1)
+
+
+def _parse_retry_after(value: str | None) -> float | None:
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, when.timestamp() - time.time())
+
+
+def _percentile(values: list[int], pct: float) -> int:
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return round(ordered[low] + (ordered[high] - ordered[low]) * (rank - low))
+
+
+class HttpMetrics:
+    """Per-host request counts and response times (every attempt is one sample)."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._hosts: dict[str, dict[str, Any]] = {}
+
+    def record(self, host: str, *, status: int | None, elapsed_ms: int, retried: bool) -> None:
+        with self._lock:
+            entry = self._hosts.setdefault(host, {"requests": 0, "retries": 0, "errors": 0, "elapsed_ms": []})
+            entry["requests"] += 1
+            entry["elapsed_ms"].append(elapsed_ms)
+            if retried:
+                entry["retries"] += 1
+            if status is None or status >= 400:
+                entry["errors"] += 1
+
+    def summary(self) -> dict[str, dict[str, int]]:
+        with self._lock:
+            hosts = {host: dict(entry, elapsed_ms=list(entry["elapsed_ms"])) for host, entry in self._hosts.items()}
+        return {
+            host: {
+                "requests": entry["requests"],
+                "retries": entry["retries"],
+                "errors": entry["errors"],
+                "p50_ms": _percentile(entry["elapsed_ms"], 50),
+                "p95_ms": _percentile(entry["elapsed_ms"], 95),
+                "max_ms": max(entry["elapsed_ms"]),
+            }
+            for host, entry in sorted(hosts.items())
+        }
+
+    def render(self) -> str:
+        return "\n".join(
+            f"{host}: requests={row['requests']} retries={row['retries']} errors={row['errors']} "
+            f"p50={row['p50_ms']}ms p95={row['p95_ms']}ms max={row['max_ms']}ms"
+            for host, row in self.summary().items()
+        )
+
+
+class HttpClient:
+    def __init__(
+        self,
+        *,
+        transport: Transport | None = None,
+        retry: RetryPolicy | None = None,
+        metrics: HttpMetrics | None = None,
+        default_headers: Mapping[str, str] | None = None,
+        timeout: float = DEFAULT_TIMEOUT_SECONDS,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.transport = transport if transport is not None else PooledTransport()
+        self.retry = retry if retry is not None else RetryPolicy()
+        self.metrics = metrics if metrics is not None else HttpMetrics()
+        self._default_headers = dict(default_headers or {})
+        self._timeout = timeout
+        self._sleep = sleep
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        *,
+        headers: Mapping[str, str] | None = None,
+        body: bytes | None = None,
+        json_body: Any = None,
+        timeout: float | None = None,
+    ) -> HttpResponse:
+        """Send one request, retrying per the policy; raise ``TransportError`` if no response arrived."""
+        method = method.upper()
+        merged = {**self._default_headers, **(headers or {})}
+        if json_body is not None:
+            body = json.dumps(json_body).encode("utf-8")
+            merged.setdefault("Content-Type", "application/json")
+        request = HttpRequest(method=method, url=url, headers=merged, body=body)
+        host = urllib.parse.urlsplit(url).netloc
+        timeout = self._timeout if timeout is None else timeout
+        started = time.monotonic()
+
+        attempt = 0
+        while True:
+            attempt += 1
+            attempt_started = time.monotonic()
+            try:
+                response = self.transport.send(request, timeout)
+            except TransportError:
+                self.metrics.record(host, status=None, elapsed_ms=_ms_since(attempt_started), retried=attempt > 1)
+                if attempt >= self.retry.attempts or not self.retry.should_retry_error(method):
+                    raise
+                self._sleep(self.retry.delay(attempt))
+                continue
+            self.metrics.record(host, status=response.status, elapsed_ms=_ms_since(attempt_started), retried=attempt > 1)
+            if attempt < self.retry.attempts and self.retry.should_retry_status(method, response.status):
+                retry_after = next((v for k, v in response.headers.items() if k.lower() == "retry-after"), None)
+                self._sleep(self.retry.delay(attempt, retry_after))
+                continue
+            return HttpResponse(
+                method=method,
+                url=url,
+                status=response.status,
+                headers=response.headers,
+                body=response.body,
+                elapsed_ms=_ms_since(started),
+                attempts=attempt,
+            )
+
+    def get(self, url: str, **kwargs: Any) -> HttpResponse:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> HttpResponse:
+        return self.request("POST", url, **kwargs)
+
+    def close(self) -> None:
+        close = getattr(self.transport, "close", None)
+        if callable(close):
+            close()
+
+
+def _ms_since(started: float) -> int:
+    return int((time.monotonic() - started) * 1000)
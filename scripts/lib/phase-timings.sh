@@ -0,0 +1,58 @@
+#!/usr/bin/env bash
+
+# Append-only timing ledger shared by preflight.sh, status-workspace.sh and
+# scripts/preflight_scheduler.py. One JSON object per line; read it back with
+# scripts/preflight-timings.py. Set WORKSPACE_PHASE_TIMINGS=0 to disable.
+
+workspace_timings_is_enabled() {
+  [[ "${WORKSPACE_PHASE_TIMINGS:-1}" == "1" && -n "${WORKSPACE_PHASE_TIMINGS_FILE:-}" ]]
+}
+
+# Usage: workspace_timings_init ROOT SOURCE
+workspace_timings_init() {
+  local root="$1"
+  local source_name="$2"
+
+  [[ "${WORKSPACE_PHASE_TIMINGS:-1}" == "1" ]] || return 0
+  export WORKSPACE_PHASE_TIMINGS_FILE="${WORKSPACE_PHASE_TIMINGS_FILE:-${root}/.logs/workspace/phase-timings.jsonl}"
+  export WORKSPACE_PHASE_TIMINGS_SOURCE="$source_name"
+  export WORKSPACE_PHASE_TIMINGS_RUN_ID="${source_name}-$(date -u +"%Y%m%dT%H%M%SZ")-$$"
+  mkdir -p "$(dirname "$WORKSPACE_PHASE_TIMINGS_FILE")" 2>/dev/null || WORKSPACE_PHASE_TIMINGS_FILE=""
+}
+
+workspace_timings_now_ms() {
+  # bash 5 exposes a microsecond clock; macOS /bin/bash 3.2 falls back to perl.
+  if [[ -n "${EPOCHREALTIME:-}" ]]; then
+    local now="${EPOCHREALTIME/,/.}"
+    printf '%s\n' "$(( ${now%.*} * 1000 + 10#${now#*.} / 1000 ))"
+    return 0
+  fi
+  perl -MTime::HiRes=time -e 'printf "%.0f\n", time() * 1000'
+}
+
+workspace_timings_byte_count() {
+  local LC_ALL=C
+  printf '%s\n' "${#1}"
+}
+
+# Usage: workspace_timings_record PHASE START_MS END_MS RC OUTPUT_BYTES
+# OUTPUT_BYTES is "null" when the phase wrote straight to the terminal.
+workspace_timings_record() {
+  local phase="$1"
+  local start_ms="$2"
+  local end_ms="$3"
+  local rc="$4"
+  local output_bytes="$5"
+
+  workspace_timings_is_enabled || return 0
+  printf '{"ts":"%s","run_id":"%s","source":"%s","phase":"%s","start_ms":%s,"end_ms":%s,"elapsed_ms":%s,"rc":%s,"output_bytes":%s,"prefetched":false}\n' \
+    "$(date -u +"%Y-%m-%dT%H:%M:%SZ")" \
+    "$WORKSPACE_PHASE_TIMINGS_RUN_ID" \
+    "$WORKSPACE_PHASE_TIMINGS_SOURCE" \
+    "$phase" \
+    "$start_ms" \
+    "$end_ms" \
+    "$((end_ms - start_ms))" \
+    "$rc" \
+    "$output_bytes" >>"$WORKSPACE_PHASE_TIMINGS_FILE" 2>/dev/null || true
+}
@@ -0,0 +1,99 @@
+#!/usr/bin/env bash
+
+# Bash side of scripts/preflight_scheduler.py. preflight.sh keeps its phase
+# order and output handling; read-only phases may already have been run by the
+# background scheduler, in which case their buffered result is replayed here.
+
+PREFLIGHT_PREFETCH_DIR=""
+PREFLIGHT_PREFETCH_PID=""
+
+# Usage: preflight_load_phase_commands ROOT
+# Defines PREFLIGHT_PHASE_CMD_<phase> arrays (dashes become underscores) from
+# the phase declarations, so inline and prefetched runs share one argv.
+preflight_load_phase_commands() {
+  local root="$1"
+  local definitions=""
+
+  definitions="$(python3 "$root/scripts/preflight_scheduler.py" shell --root "$root")" || return 1
+  eval "$definitions"
+}
+
+preflight_prefetch_is_active() {
+  [[ -n "${PREFLIGHT_PREFETCH_DIR:-}" ]]
+}
+
+# Usage: preflight_prefetch_start ROOT [PHASE_ALREADY_RUN...]
+preflight_prefetch_start() {
+  local root="$1"
+  shift
+  local phase
+
+  if preflight_diag_is_enabled || [[ "${WORKSPACE_PREFLIGHT_PARALLEL:-1}" != "1" ]]; then
+    return 0
+  fi
+
+  PREFLIGHT_PREFETCH_DIR="$(mktemp -d "${TMPDIR:-/tmp}/trr-preflight-phases.XXXXXX")"
+  for phase in "$@"; do
+    preflight_prefetch_claim "$phase" || true
+    preflight_prefetch_mark_done "$phase" 0
+  done
+  python3 "$root/scripts/preflight_scheduler.py" prefetch \
+    --ledger "$PREFLIGHT_PREFETCH_DIR" \
+    --jobs "${WORKSPACE_PREFLIGHT_JOBS:-4}" \
+    --parent-pid "$$" &
+  PREFLIGHT_PREFETCH_PID="$!"
+}
+
+preflight_prefetch_stop() {
+  local signal_name="${1:-TERM}"
+
+  if [[ -n "${PREFLIGHT_PREFETCH_PID:-}" ]]; then
+    kill -s "$signal_name" "$PREFLIGHT_PREFETCH_PID" >/dev/null 2>&1 || true
+    wait "$PREFLIGHT_PREFETCH_PID" >/dev/null 2>&1 || true
+    PREFLIGHT_PREFETCH_PID=""
+  fi
+  if [[ -n "${PREFLIGHT_PREFETCH_DIR:-}" ]]; then
+    rm -rf "$PREFLIGHT_PREFETCH_DIR"
+    PREFLIGHT_PREFETCH_DIR=""
+  fi
+}
+
+# Succeeds when the caller should run the phase inline; fails when the
+# scheduler has already claimed it and the caller must wait for its result.
+preflight_prefetch_claim() {
+  local phase="$1"
+
+  preflight_prefetch_is_active || return 0
+  mkdir "$PREFLIGHT_PREFETCH_DIR/${phase}.claim" 2>/dev/null
+}
+
+preflight_prefetch_mark_done() {
+  local phase="$1"
+  local rc="$2"
+
+  preflight_prefetch_is_active || return 0
+  printf '%s\n' "$rc" >"$PREFLIGHT_PREFETCH_DIR/.${phase}.rc.tmp"
+  mv -f "$PREFLIGHT_PREFETCH_DIR/.${phase}.rc.tmp" "$PREFLIGHT_PREFETCH_DIR/${phase}.rc"
+}
+
+# Wait for a scheduler-run phase, store its buffered output in the variable
+# named by $2 and return its exit code.
+preflight_prefetch_wait() {
+  local phase="$1"
+  local output_var="$2"
+  local rc_file="$PREFLIGHT_PREFETCH_DIR/${phase}.rc"
+  local buffered=""
+
+  while [[ ! -f "$rc_file" ]]; do
+    if [[ -n "${PREFLIGHT_PREFETCH_PID:-}" ]] && ! kill -0 "$PREFLIGHT_PREFETCH_PID" >/dev/null 2>&1; then
+      [[ -f "$rc_file" ]] && break
+      printf -v "$output_var" '%s' "[preflight] ERROR: phase scheduler exited before ${phase} finished."
+      return 1
+    fi
+    sleep 0.05
+  done
+
+  buffered="$(cat "$PREFLIGHT_PREFETCH_DIR/${phase}.out" 2>/dev/null || true)"
+  printf -v "$output_var" '%s' "$buffered"
+  return "$(<"$rc_file")"
+}
@@ -0,0 +1,359 @@
+"""Process-tree supervision for wrapped workspace commands.
+
+Stdlib only. A ``ProcessTreeSupervisor`` tracks every process below a root pid,
+escalates SIGTERM to SIGKILL after a grace period, reaps the children it ends up
+owning, and can sample per-process CPU and RSS on a background thread.
+
+The process table comes from ``/proc`` on Linux and ``ps`` elsewhere. A
+descendant whose parent exits is reparented and drops out of the parent/child
+chain, so the supervisor remembers every process it has seen in the tree and
+keeps tracking it while the same process (pid plus start time, where the
+platform exposes one) is alive. On Linux the supervising process can also
+become a child subreaper, so those orphans are reparented to it instead of
+init and can be reaped.
+"""
+
+from __future__ import annotations
+
+import ctypes
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Callable, Iterable, Mapping
+
+DEFAULT_GRACE_SECONDS = 5.0
+DEFAULT_KILL_WAIT_SECONDS = 2.0
+POLL_INTERVAL_SECONDS = 0.05
+PROC_ROOT = Path("/proc")
+PR_SET_CHILD_SUBREAPER = 36
+
+_CLOCK_TICKS = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+_PAGE_SIZE = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+
+
+@dataclass(frozen=True)
+class ProcessInfo:
+    pid: int
+    ppid: int
+    pgid: int
+    state: str
+    comm: str
+    cpu_seconds: float
+    rss_bytes: int
+    # Kernel start time in clock ticks; None when only ``ps`` is available.
+    start: int | None = None
+
+    @property
+    def key(self) -> tuple[int, int | None]:
+        return self.pid, self.start
+
+    @property
+    def alive(self) -> bool:
+        return self.state not in {"Z", "X"}
+
+
+@dataclass
+class ProcessUsage:
+    pid: int
+    comm: str
+    cpu_seconds: float
+    max_rss_bytes: int
+    first_seen: float
+    last_seen: float
+
+
+@dataclass(frozen=True)
+class TerminationResult:
+    terminated: tuple[int, ...]
+    killed: tuple[int, ...]
+    survivors: tuple[int, ...]
+
+    @property
+    def signalled(self) -> int:
+        return len(self.terminated) + len(self.killed)
+
+
+def parse_proc_stat(text: str) -> ProcessInfo:
+    """Parse one ``/proc/<pid>/stat`` line; the command name may contain spaces."""
+    head, _, tail = text.rpartition(")")
+    pid_text, _, comm = head.partition(" (")
+    fields = tail.split()
+    return ProcessInfo(
+        pid=int(pid_text),
+        ppid=int(fields[1]),
+        pgid=int(fields[2]),
+        state=fields[0],
+        comm=comm,
+        cpu_seconds=(int(fields[11]) + int(fields[12])) / _CLOCK_TICKS,
+        rss_bytes=int(fields[21]) * _PAGE_SIZE,
+        start=int(fields[19]),
+    )
+
+
+def proc_process_table(proc: Path = PROC_ROOT) -> dict[int, ProcessInfo]:
+    table: dict[int, ProcessInfo] = {}
+    for entry in proc.iterdir():
+        if not entry.name.isdigit():
+            continue
+        try:
+            info = parse_proc_stat((entry / "stat").read_text(encoding="utf-8", errors="replace"))
+        except (OSError, ValueError, IndexError):
+            continue  # exited while scanning
+        table[info.pid] = info
+    return table
+
+
+def _parse_cpu_time(value: str) -> float:
+    """Parse ``ps`` TIME values: ``[[DD-]HH:]MM:SS[.ss]``."""
+    days, _, clock = value.rpartition("-")
+    seconds = 0.0
+    for part in clock.split(":"):
+        seconds = seconds * 60 + float(part)
+    return seconds + (int(days) * 86400 if days else 0)
+
+
+def parse_ps_table(text: str) -> dict[int, ProcessInfo]:
+    table: dict[int, ProcessInfo] = {}
+    for line in text.splitlines():
+        fields = line.split(None, 6)
+        if len(fields) < 7:
+            continue
+        try:
+            pid, ppid, pgid, rss_kib = (int(value) for value in fields[:4])
+            cpu_seconds = _parse_cpu_time(fields[4])
+        except ValueError:
+            continue
+        table[pid] = ProcessInfo(
+            pid=pid,
+            ppid=ppid,
+            pgid=pgid,
+            state=fields[5][:1],
+            comm=fields[6].strip(),
+            cpu_seconds=cpu_seconds,
+            rss_bytes=rss_kib * 1024,
+        )
+    return table
+
+
+def ps_process_table() -> dict[int, ProcessInfo]:
+    process = subprocess.Popen(
+        ["ps", "-A", "-o", "pid=,ppid=,pgid=,rss=,time=,state=,comm="],
+        stdout=subprocess.PIPE,
+        stderr=subprocess.DEVNULL,
+        text=True,
+    )
+    stdout, _stderr = process.communicate()
+    table = parse_ps_table(stdout)
+    # ps lists itself as one of our children; it is not part of any tree.
+    table.pop(process.pid, None)
+    return table
+
+
+def process_table(proc: Path = PROC_ROOT) -> dict[int, ProcessInfo]:
+    if (proc / "self" / "stat").exists():
+        return proc_process_table(proc)
+    return ps_process_table()
+
+
+def become_subreaper() -> bool:
+    """Reparent orphaned descendants to this process (Linux only)."""
+    if not sys.platform.startswith("linux"):
+        return False
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+        return libc.prctl(PR_SET_CHILD_SUBREAPER, 1, 0, 0, 0) == 0
+    except (OSError, AttributeError):
+        return False
+
+
+class ProcessTreeSupervisor:
+    """Tracks, samples, and terminates the process tree below ``root_pid``.
+
+    With the default root (this process) the tree is everything this process
+    started. The root itself is only signalled when it is another process.
+    """
+
+    def __init__(
+        self,
+        root_pid: int | None = None,
+        *,
+        table: Callable[[], Mapping[int, ProcessInfo]] = process_table,
+        clock: Callable[[], float] = time.time,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self.root_pid = os.getpid() if root_pid is None else root_pid
+        self.include_root = self.root_pid != os.getpid()
+        self._table = table
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._seen: dict[tuple[int, int | None], ProcessInfo] = {}
+        self.usage: dict[tuple[int, int | None], ProcessUsage] = {}
+        self._sampler: threading.Thread | None = None
+        self._stop_sampling = threading.Event()
+
+    def tracked(self, table: Mapping[int, ProcessInfo] | None = None) -> dict[int, ProcessInfo]:
+        """Return live tracked processes and remember newly seen descendants."""
+        table = self._table() if table is None else table
+        children: dict[int, list[int]] = {}
+        for info in table.values():
+            children.setdefault(info.ppid, []).append(info.pid)
+        found: dict[int, ProcessInfo] = {}
+        pending = [self.root_pid]
+        if self.include_root and self.root_pid in table:
+            found[self.root_pid] = table[self.root_pid]
+        while pending:
+            for child in children.get(pending.pop(), ()):
+                if child not in found and child != os.getpid():
+                    found[child] = table[child]
+                    pending.append(child)
+        with self._lock:
+            for key, seen in list(self._seen.items()):
+                current = table.get(seen.pid)
+                if current is None or current.start != seen.start:
+                    del self._seen[key]  # exited, or the pid was reused
+                elif seen.pid not in found:
+                    found[seen.pid] = current
+            for info in found.values():
+                self._seen[info.key] = info
+        return {pid: info for pid, info in found.items() if info.alive}
+
+    def sample(self) -> list[dict[str, object]]:
+        """Record one CPU/RSS sample per tracked process."""
+        now = self._clock()
+        rows: list[dict[str, object]] = []
+        for info in sorted(self.tracked().values(), key=lambda item: item.pid):
+            with self._lock:
+                usage = self.usage.get(info.key)
+                if usage is None:
+                    usage = self.usage[info.key] = ProcessUsage(info.pid, info.comm, 0.0, 0, now, now)
+                usage.comm = info.comm
+                usage.cpu_seconds = max(usage.cpu_seconds, info.cpu_seconds)
+                usage.max_rss_bytes = max(usage.max_rss_bytes, info.rss_bytes)
+                usage.last_seen = now
+            rows.append(
+                {
+                    "ts": round(now, 3),
+                    "pid": info.pid,
+                    "ppid": info.ppid,
+                    "comm": info.comm,
+                    "cpu_seconds": round(info.cpu_seconds, 3),
+                    "rss_bytes": info.rss_bytes,
+                }
+            )
+        return rows
+
+    def usage_summary(self, limit: int = 10) -> list[dict[str, object]]:
+        """Sampled processes, busiest first."""
+        with self._lock:
+            usage = sorted(self.usage.values(), key=lambda item: (-item.cpu_seconds, -item.max_rss_bytes))
+        return [
+            {
+                "pid": item.pid,
+                "comm": item.comm,
+                "cpu_seconds": round(item.cpu_seconds, 3),
+                "max_rss_bytes": item.max_rss_bytes,
+                "seen_seconds": round(item.last_seen - item.first_seen, 3),
+            }
+            for item in usage[:limit]
+        ]
+
+    def start_sampling(
+        self,
+        interval_seconds: float,
+        sink: Callable[[list[dict[str, object]]], None] | None = None,
+    ) -> None:
+        if interval_seconds <= 0 or self._sampler is not None:
+            return
+
+        def run() -> None:
+            while True:
+                try:
+                    rows = self.sample()
+                    if sink is not None and rows:
+                        sink(rows)
+                except Exception as exc:  # noqa: BLE001 - sampling must never take the command down
+                    sys.stderr.write(f"[process-supervisor] sample failed: {exc}\n")
+                if self._stop_sampling.wait(interval_seconds):
+                    return
+
+        self._stop_sampling.clear()
+        self._sampler = threading.Thread(target=run, name="process-tree-sampler", daemon=True)
+        self._sampler.start()
+
+    def stop_sampling(self) -> None:
+        if self._sampler is None:
+            return
+        self._stop_sampling.set()
+        self._sampler.join()
+        self._sampler = None
+
+    def reap(self, exclude: Iterable[int] = ()) -> list[int]:
+        """Reap exited processes whose parent is this process, except ``exclude``."""
+        skip = set(exclude)
+        reaped: list[int] = []
+        for info in self._table().values():
+            if info.ppid != os.getpid() or info.pid in skip or info.alive:
+                continue
+            try:
+                pid, _status = os.waitpid(info.pid, os.WNOHANG)
+            except ChildProcessError:
+                continue
+            if pid:
+                reaped.append(pid)
+        return reaped
+
+    def _signal(self, pids: Iterable[int], signum: int) -> None:
+        for pid in pids:
+            try:
+                os.kill(pid, signum)
+            except (ProcessLookupError, PermissionError):
+                pass
+
+    def _wait_for_exit(self, timeout: float, exclude: Iterable[int], on_new: Callable[[int], None]) -> dict[int, ProcessInfo]:
+        deadline = time.monotonic() + timeout
+        while True:
+            self.reap(exclude)
+            alive = self.tracked()
+            for pid in alive:
+                on_new(pid)
+            if not alive or time.monotonic() >= deadline:
+                return alive
+            self._sleep(POLL_INTERVAL_SECONDS)
+
+    def terminate(
+        self,
+        grace_seconds: float = DEFAULT_GRACE_SECONDS,
+        *,
+        kill_wait_seconds: float = DEFAULT_KILL_WAIT_SECONDS,
+        exclude_reap: Iterable[int] = (),
+    ) -> TerminationResult:
+        """SIGTERM the tree, SIGKILL whatever is left after ``grace_seconds``.
+
+        Processes that appear in the tree during the grace period (a wrapper
+        respawning its child, say) are sent SIGTERM as they are found.
+        ``exclude_reap`` lists children the caller waits for itself.
+        """
+        exclude = tuple(exclude_reap)
+        termed: set[int] = set()
+
+        def send_term(pid: int) -> None:
+            if pid not in termed:
+                termed.add(pid)
+                self._signal([pid], signal.SIGTERM)
+
+        survivors = self._wait_for_exit(grace_seconds, exclude, send_term)
+        killed = tuple(sorted(survivors))
+        if killed:
+            self._signal(killed, signal.SIGKILL)
+            survivors = self._wait_for_exit(kill_wait_seconds, exclude, lambda pid: self._signal([pid], signal.SIGKILL))
+        return TerminationResult(
+            terminated=tuple(sorted(termed - set(killed))),
+            killed=killed,
+            survivors=tuple(sorted(survivors)),
+        )
@@ -0,0 +1,202 @@
+"""Cached extraction of module-level literal constants from Python sources.
+
+Stdlib only. The deployment-target and runtime-capacity checks pin workspace
+values against constants in guard scripts and backend modules. Reading them
+used to mean an ``ast.parse`` of each file on every check. ``literal_constants``
+extracts every top-level literal assignment in one pass and caches the result
+per file sha256, both in-process and on disk in
+``<root>/.logs/workspace/source-literals-cache.json`` of the tree being
+checked (``default_cache_path``). A warm check only hashes the files.
+
+Rules:
+- ``NAME = <literal>`` and ``NAME: T = <literal>`` at module level are kept;
+  a later assignment to the same name wins;
+- values that ``ast.literal_eval`` rejects are skipped, except dict displays,
+  which keep their literal entries and drop computed ones;
+- read errors propagate as ``OSError``, unparsable sources as ``SyntaxError``
+  or ``ValueError``, so callers decide how to report them.
+
+``cached_analysis`` exposes the same cache for other per-file AST checks whose
+result is a Python literal. Each analysis passes a ``version`` string that is
+part of its cache key; bump it whenever the analysis logic changes so results
+computed by the old code are not served for an unchanged file.
+"""
+
+from __future__ import annotations
+
+import ast
+import hashlib
+import json
+import os
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+
+ROOT = Path(__file__).resolve().parents[2]
+CACHE_SCHEMA = 2
+MAX_CACHED_FILES = 64
+LITERALS_ANALYSIS = "literals"
+LITERALS_VERSION = "1"  # bump when extract_literals changes what it returns
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+
+
+def default_cache_path(root: Path) -> Path:
+    return root / ".logs" / "workspace" / "source-literals-cache.json"
+
+
+DEFAULT_CACHE_PATH = default_cache_path(ROOT)
+
+_memory: dict[tuple[str, str, str], Any] = {}
+_lock = threading.Lock()
+stats = CacheStats()
+
+
+def _literal_value(node: ast.expr) -> Any:
+    try:
+        return ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        if not isinstance(node, ast.Dict):
+            raise ValueError("not a literal") from None
+    values: dict[Any, Any] = {}
+    for key_node, value_node in zip(node.keys, node.values, strict=True):
+        if key_node is None:
+            continue  # ``**mapping`` unpacking
+        try:
+            values[ast.literal_eval(key_node)] = ast.literal_eval(value_node)
+        except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+            continue
+    return values
+
+
+def extract_literals(source: bytes | str, filename: str = "<source>") -> dict[str, Any]:
+    """Return every module-level literal assignment in ``source``."""
+    tree = ast.parse(source, filename=filename)
+    values: dict[str, Any] = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name):
+            name, value_node = node.targets[0].id, node.value
+        elif isinstance(node, ast.AnnAssign) and isinstance(node.target, ast.Name) and node.value is not None:
+            name, value_node = node.target.id, node.value
+        else:
+            continue
+        try:
+            values[name] = _literal_value(value_node)
+        except ValueError:
+            continue
+    return values
+
+
+def _load_disk_cache(cache_path: Path) -> dict[str, Any]:
+    try:
+        cached = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, UnicodeError, json.JSONDecodeError):
+        return {}
+    if not isinstance(cached, dict) or cached.get("schema") != CACHE_SCHEMA:
+        return {}
+    entries = cached.get("entries")
+    return entries if isinstance(entries, dict) else {}
+
+
+def _store_disk_cache(cache_path: Path, entries: dict[str, Any]) -> None:
+    if len(entries) > MAX_CACHED_FILES:
+        # Entries are kept in insertion order; drop the oldest files first.
+        entries = dict(list(entries.items())[-MAX_CACHED_FILES:])
+    payload = {"schema": CACHE_SCHEMA, "entries": entries}
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
+        tmp.write_text(json.dumps(payload, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+        os.replace(tmp, cache_path)
+    except OSError:
+        pass
+
+
+def cached_analysis(
+    path: Path,
+    analysis: str,
+    compute: Callable[[bytes], Any],
+    *,
+    version: str,
+    cache_path: Path | None = None,
+) -> Any:
+    """Return ``compute(source)`` for ``path``, cached per (file sha256, ``analysis``, ``version``).
+
+    The result must be a Python literal; it is stored as its ``repr`` and read
+    back with ``ast.literal_eval``. Exceptions from ``compute`` propagate and
+    are not cached.
+    """
+    resolved = path.resolve()
+    source = resolved.read_bytes()
+    digest = hashlib.sha256(source).hexdigest()
+    result_key = f"{analysis}@{version}"
+    memory_key = (str(resolved), digest, result_key)
+    with _lock:
+        if memory_key in _memory:
+            stats.hits += 1
+            return _memory[memory_key]
+
+    cache_path = DEFAULT_CACHE_PATH if cache_path is None else cache_path
+    entries = _load_disk_cache(cache_path)
+    entry = entries.get(str(resolved))
+    if isinstance(entry, dict) and entry.get("sha256") == digest:
+        stored = entry.get("results", {}).get(result_key)
+        if isinstance(stored, str):
+            try:
+                result = ast.literal_eval(stored)
+            except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+                pass
+            else:
+                with _lock:
+                    _memory[memory_key] = result
+                    stats.hits += 1
+                return result
+
+    result = compute(source)
+    with _lock:
+        _memory[memory_key] = result
+        stats.misses += 1
+    results = entry.get("results", {}) if isinstance(entry, dict) and entry.get("sha256") == digest else {}
+    # Results from other versions of this analysis are stale for good.
+    results = {key: value for key, value in results.items() if not key.startswith(f"{analysis}@")}
+    encoded = repr(result)
+    try:
+        ast.literal_eval(encoded)
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
+        return result  # not round-trippable (e.g. a float infinity); keep it in memory only
+    entries.pop(str(resolved), None)
+    entries[str(resolved)] = {"sha256": digest, "results": {**results, result_key: encoded}}
+    _store_disk_cache(cache_path, entries)
+    return result
+
+
+def literal_constants(
+    path: Path,
+    names: Iterable[str] | None = None,
+    *,
+    cache_path: Path | None = None,
+) -> dict[str, Any]:
+    """Module-level literal constants of ``path``, limited to ``names`` when given."""
+    constants = cached_analysis(
+        path,
+        LITERALS_ANALYSIS,
+        lambda source: extract_literals(source, str(path)),
+        version=LITERALS_VERSION,
+        cache_path=cache_path,
+    )
+    if names is None:
+        return dict(constants)
+    return {name: constants[name] for name in names if name in constants}
+
+
+def clear_cache() -> None:
+    """Forget in-process results; the on-disk cache is left alone."""
+    with _lock:
+        _memory.clear()
+        stats.hits = stats.misses = 0
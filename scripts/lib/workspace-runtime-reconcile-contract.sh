@@ -5,3 +5,7 @@ WORKSPACE_RUNTIME_MODAL_AUTO_DEPLOY="${WORKSPACE_RUNTIME_MODAL_AUTO_DEPLOY:-1}"
 WORKSPACE_RUNTIME_EXTERNAL_VERIFY_ENABLED="${WORKSPACE_RUNTIME_EXTERNAL_VERIFY_ENABLED:-1}"
 WORKSPACE_RUNTIME_RENDER_VERIFY_ONLY="${WORKSPACE_RUNTIME_RENDER_VERIFY_ONLY:-1}"
 WORKSPACE_RUNTIME_DECODO_VERIFY_ONLY="${WORKSPACE_RUNTIME_DECODO_VERIFY_ONLY:-1}"
+WORKSPACE_RUNTIME_DB_TIMEOUT_SECONDS="${WORKSPACE_RUNTIME_DB_TIMEOUT_SECONDS:-120}"
+WORKSPACE_RUNTIME_MODAL_TIMEOUT_SECONDS="${WORKSPACE_RUNTIME_MODAL_TIMEOUT_SECONDS:-300}"
+WORKSPACE_RUNTIME_EXTERNAL_TIMEOUT_SECONDS="${WORKSPACE_RUNTIME_EXTERNAL_TIMEOUT_SECONDS:-60}"
+WORKSPACE_RUNTIME_RECONCILE_TTL_SECONDS="${WORKSPACE_RUNTIME_RECONCILE_TTL_SECONDS:-900}"
@@ -20,6 +20,7 @@ echo "  $TRR_BACKEND_LOG"
 echo "  $SOCIAL_WORKER_LOG"
 echo "  $REMOTE_WORKER_LOG"
 echo "  $BACKEND_WATCHDOG_EVENTS_LOG"
+echo "[workspace] Search indexed signals/levels with: make logs-query LOGS_ARGS='query --since 30m --level ERROR'"
 echo ""
 
 tail -n 200 -f "$TRR_APP_LOG" "$TRR_BACKEND_LOG" "$SOCIAL_WORKER_LOG" "$REMOTE_WORKER_LOG" "$BACKEND_WATCHDOG_EVENTS_LOG"
@@ -22,17 +22,53 @@ Examples:
   python3 scripts/nyt-interactive-scraper.py --recent --tag vis-design
   python3 scripts/nyt-interactive-scraper.py --archive --start 2025-01 --end 2026-04
   python3 scripts/nyt-interactive-scraper.py --archive --start 2026-03 --json
+  python3 scripts/nyt-interactive-scraper.py --archive --start 2019-01 --workers 16
+
+Archive mode fetches monthly sitemaps concurrently over keep-alive
+connections (--workers, --retries) and prints results in month order.
+Sitemaps are parsed incrementally from the gzip stream, so memory stays flat
+and output starts before the download finishes.
+
+Sitemap bodies are cached under --cache-dir with their ETag/Last-Modified and
+revalidated with conditional requests. Closed months also keep their parsed
+results, so a repeated archive query only downloads the current month.
+--offline answers entirely from the cache; --no-cache disables it.
+
+Every result is upserted into a SQLite store (--store, unique on URL).
+--since-last-run skips archive months already fetched after they closed
+(tracked per month, so an earlier --start still fetches the gap) and emits
+only news entries past the stored high-water stamp; --query answers --tag / --month straight from the
+store without touching the network:
+  python3 scripts/nyt-interactive-scraper.py --recent --since-last-run
+  python3 scripts/nyt-interactive-scraper.py --query --tag vis-design --json
+  python3 scripts/nyt-interactive-scraper.py --query --month 2026-03
 """
 
 import argparse
+import functools
 import gzip
+import hashlib
+import http.client
+import io
 import json
+import os
 import re
+import sqlite3
 import sys
-import urllib.request
+import threading
+import time
+import urllib.parse
 import xml.etree.ElementTree as ET
-from datetime import datetime
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import BinaryIO, Callable, Collection, Iterable, Iterator, Optional, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+ROOT = Path(__file__).resolve().parents[1]
 
 # ── Namespaces used in NYT sitemaps ──────────────────────────────────────────
 NS = {
@@ -55,15 +91,368 @@ NEWS_SITEMAP_URL = "https://www.nytimes.com/sitemaps/new/news.xml.gz"
 # The NYT graphics desk applies this keyword to data-visualization articles.
 VIS_DESIGN_TAG = "vis-design"
 
+# ── Fetch layer tuning ───────────────────────────────────────────────────────
+DEFAULT_WORKERS = 8
+DEFAULT_RETRIES = 3
+RETRY_BACKOFF_SECONDS = 0.5
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+MAX_REDIRECTS = 5
+FETCH_TIMEOUT_SECONDS = 30.0
+GZIP_MAGIC = b"\x1f\x8b"
+COPY_CHUNK_BYTES = 64 * 1024
+
+# ── Local sitemap cache ──────────────────────────────────────────────────────
+DEFAULT_CACHE_DIR = ROOT / ".cache" / "nyt-sitemaps"
+CACHE_SCHEMA_VERSION = 1
+
+# ── Persistent results store ─────────────────────────────────────────────────
+DEFAULT_STORE_PATH = ROOT / ".cache" / "nyt-interactives.sqlite3"
+
+
+# ── Fetch layer: keep-alive connections + bounded worker pool ───────────────
+
+class FetchError(Exception):
+    """Raised when a sitemap cannot be fetched after all retries."""
+
+
+def current_month() -> str:
+    return datetime.now(timezone.utc).strftime("%Y-%m")
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(data)
+    os.replace(tmp, path)
+
+
+class SitemapCache:
+    """On-disk cache of raw sitemap bodies and parsed closed-month results.
+
+    Layout under ``root``:
+      http/<key>.body       raw response body as received (usually gzip)
+      http/<key>.json       {url, etag, last_modified, stored_at}
+      months/<YYYY-MM>.json parsed archive results for a closed month
+    """
+
+    def __init__(self, root: Path, offline: bool = False):
+        self.root = root
+        self.offline = offline
+        (root / "http").mkdir(parents=True, exist_ok=True)
+        (root / "months").mkdir(parents=True, exist_ok=True)
+
+    def _key(self, url: str) -> str:
+        digest = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+        name = re.sub(r"[^A-Za-z0-9._-]", "_", url.rsplit("/", 1)[-1])[:64]
+        return f"{digest}-{name}"
+
+    def body_path(self, url: str) -> Path:
+        return self.root / "http" / f"{self._key(url)}.body"
+
+    def _meta_path(self, url: str) -> Path:
+        return self.root / "http" / f"{self._key(url)}.json"
+
+    def has_body(self, url: str) -> bool:
+        return self.body_path(url).exists()
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        """Validators for a conditional GET, or {} when nothing usable is cached."""
+        if not self.has_body(url):
+            return {}
+        try:
+            meta = json.loads(self._meta_path(url).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        headers = {}
+        if meta.get("etag"):
+            headers["If-None-Match"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["If-Modified-Since"] = meta["last_modified"]
+        return headers
+
+    def begin_body(self, url: str) -> tuple[Path, BinaryIO]:
+        tmp = self.body_path(url).with_suffix(f".{os.getpid()}.{threading.get_ident()}.tmp")
+        return tmp, tmp.open("wb")
+
+    def commit_body(self, url: str, tmp: Path, etag: Optional[str], last_modified: Optional[str]) -> None:
+        os.replace(tmp, self.body_path(url))
+        meta = {
+            "url": url,
+            "etag": etag,
+            "last_modified": last_modified,
+            "stored_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        }
+        _write_atomic(self._meta_path(url), json.dumps(meta, indent=2).encode("utf-8"))
+
+    def _month_path(self, ym: str) -> Path:
+        return self.root / "months" / f"{ym}.json"
+
+    def load_month(self, ym: str, include_all: bool) -> Optional[list[dict]]:
+        """Parsed results for a month cached after it closed, if any."""
+        try:
+            payload = json.loads(self._month_path(ym).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return None
+        if payload.get("schema_version") != CACHE_SCHEMA_VERSION:
+            return None
+        results = payload.get("results", {}).get("all" if include_all else "filtered")
+        return results if isinstance(results, list) else None
+
+    def store_month(self, ym: str, include_all: bool, results: list[dict]) -> None:
+        path = self._month_path(ym)
+        try:
+            payload = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            payload = {}
+        if payload.get("schema_version") != CACHE_SCHEMA_VERSION:
+            payload = {"schema_version": CACHE_SCHEMA_VERSION, "month": ym, "results": {}}
+        payload["results"]["all" if include_all else "filtered"] = results
+        _write_atomic(path, json.dumps(payload).encode("utf-8"))
+
+
+class _TeeReader(io.RawIOBase):
+    """Readable that copies everything read from ``source`` into ``sink``."""
+
+    def __init__(self, source: BinaryIO, sink: BinaryIO):
+        self._source = source
+        self._sink = sink
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        count = self._source.readinto(buffer)
+        if count:
+            self._sink.write(memoryview(buffer)[:count])
+        return count
+
 
-def fetch_xml(url: str) -> ET.Element:
-    """Fetch a URL (handles .gz transparently) and return parsed XML root."""
-    req = urllib.request.Request(url, headers={"Accept-Encoding": "gzip"})
-    with urllib.request.urlopen(req, timeout=30) as resp:
-        data = resp.read()
-    if url.endswith(".gz") or data[:2] == b"\x1f\x8b":
-        data = gzip.decompress(data)
-    return ET.fromstring(data)
+class SitemapFetcher:
+    """HTTP/1.1 fetcher with per-thread keep-alive connections and retries.
+
+    Each worker thread holds one persistent connection per (scheme, host), so
+    a multi-year archive run reuses a handful of TCP/TLS sessions instead of
+    opening one per month. ``map_ordered`` runs jobs on a bounded thread pool
+    and returns results in input order.
+    """
+
+    def __init__(
+        self,
+        workers: int = DEFAULT_WORKERS,
+        retries: int = DEFAULT_RETRIES,
+        backoff: float = RETRY_BACKOFF_SECONDS,
+        timeout: float = FETCH_TIMEOUT_SECONDS,
+        cache: Optional[SitemapCache] = None,
+    ):
+        self.cache = cache
+        self.workers = max(1, workers)
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self.timeout = timeout
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._connections: list[http.client.HTTPConnection] = []
+        self._pool: Optional[ThreadPoolExecutor] = None
+
+    def __enter__(self) -> "SitemapFetcher":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+        with self._lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+
+    def _connection(self, scheme: str, netloc: str) -> http.client.HTTPConnection:
+        conns = getattr(self._local, "conns", None)
+        if conns is None:
+            conns = self._local.conns = {}
+        conn = conns.get((scheme, netloc))
+        if conn is None:
+            cls = http.client.HTTPSConnection if scheme == "https" else http.client.HTTPConnection
+            conn = cls(netloc, timeout=self.timeout)
+            conns[(scheme, netloc)] = conn
+            with self._lock:
+                self._connections.append(conn)
+        return conn
+
+    def _drop_connection(self, scheme: str, netloc: str) -> None:
+        conns = getattr(self._local, "conns", {})
+        conn = conns.pop((scheme, netloc), None)
+        if conn is not None:
+            conn.close()
+            with self._lock:
+                if conn in self._connections:
+                    self._connections.remove(conn)
+
+    def _send(
+        self, url: str, headers: Optional[dict[str, str]] = None
+    ) -> tuple[http.client.HTTPResponse, tuple[str, str]]:
+        parts = urllib.parse.urlsplit(url)
+        target = parts.path or "/"
+        if parts.query:
+            target += "?" + parts.query
+        key = (parts.scheme, parts.netloc)
+        conn = self._connection(*key)
+        try:
+            conn.request("GET", target, headers={"Accept-Encoding": "gzip", **(headers or {})})
+            return conn.getresponse(), key
+        except (OSError, http.client.HTTPException):
+            self._drop_connection(*key)
+            raise
+
+    def _finish(self, resp: http.client.HTTPResponse, key: tuple[str, str]) -> None:
+        """Drain ``resp`` so its connection can carry the next request."""
+        try:
+            resp.read()
+        except (OSError, http.client.HTTPException):
+            self._drop_connection(*key)
+            return
+        if resp.will_close:
+            self._drop_connection(*key)
+
+    def _open_response(
+        self, url: str, headers: Optional[dict[str, str]] = None
+    ) -> tuple[http.client.HTTPResponse, tuple[str, str]]:
+        """Return an unread 200 (or 304 for conditional requests) response.
+
+        Retries 429/5xx and dropped connections with exponential backoff.
+        """
+        error: Exception = FetchError(f"no attempt made for {url}")
+        for attempt in range(self.retries + 1):
+            target = url
+            try:
+                for _ in range(MAX_REDIRECTS + 1):
+                    resp, key = self._send(target, headers)
+                    location = resp.getheader("Location")
+                    if resp.status not in REDIRECT_STATUSES or not location:
+                        break
+                    self._finish(resp, key)
+                    target = urllib.parse.urljoin(target, location)
+            except (OSError, http.client.HTTPException) as exc:
+                error = exc
+            else:
+                if resp.status == 200 or (resp.status == 304 and headers):
+                    return resp, key
+                self._finish(resp, key)
+                error = FetchError(f"HTTP {resp.status} for {target}")
+                if resp.status not in RETRY_STATUSES:
+                    raise error
+            if attempt < self.retries:
+                time.sleep(self.backoff * (2 ** attempt))
+        raise error
+
+    @contextmanager
+    def open(self, url: str) -> Iterator[BinaryIO]:
+        """Stream the body of ``url``; the connection is reused once the body is consumed.
+
+        With a cache attached, the request is conditional on the stored
+        validators, a 304 is served from the cached body, and a 200 is teed
+        into the cache while the caller reads it.
+        """
+        cache = self.cache
+        if cache is not None and cache.offline:
+            if not cache.has_body(url):
+                raise FetchError(f"offline and not cached: {url}")
+            with cache.body_path(url).open("rb") as cached:
+                yield cached
+            return
+
+        headers = cache.conditional_headers(url) if cache is not None else {}
+        resp, key = self._open_response(url, headers)
+        if resp.status == 304:
+            self._finish(resp, key)
+            with cache.body_path(url).open("rb") as cached:
+                yield cached
+            return
+
+        if cache is None:
+            try:
+                yield resp
+            except BaseException:
+                self._drop_connection(*key)
+                raise
+            self._finish(resp, key)
+            return
+
+        tmp, sink = cache.begin_body(url)
+        try:
+            with sink:
+                tee = _TeeReader(resp, sink)
+                yield tee
+                while tee.read(COPY_CHUNK_BYTES):
+                    pass
+        except BaseException:
+            self._drop_connection(*key)
+            tmp.unlink(missing_ok=True)
+            raise
+        cache.commit_body(url, tmp, resp.getheader("ETag"), resp.getheader("Last-Modified"))
+        self._finish(resp, key)
+
+    def fetch(self, url: str) -> bytes:
+        """GET ``url`` and return the raw body."""
+        with self.open(url) as body:
+            return body.read()
+
+    def map_ordered(self, fn: Callable[[T], R], items: Iterable[T]) -> Iterable[R]:
+        """Run ``fn`` over ``items`` with bounded parallelism, yielding in input order."""
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="nyt-sitemap")
+        return self._pool.map(fn, items)
+
+
+_default_fetcher: Optional[SitemapFetcher] = None
+
+
+def default_fetcher() -> SitemapFetcher:
+    global _default_fetcher
+    if _default_fetcher is None:
+        _default_fetcher = SitemapFetcher()
+    return _default_fetcher
+
+
+def _decompressed(stream: BinaryIO) -> BinaryIO:
+    """Wrap ``stream`` in a gzip reader when it starts with the gzip magic bytes."""
+    if not hasattr(stream, "peek"):
+        stream = io.BufferedReader(stream)
+    if stream.peek(2)[:2] == GZIP_MAGIC:
+        return gzip.GzipFile(fileobj=stream)
+    return stream
+
+
+def iter_sitemap_elements(stream: BinaryIO, tag: str) -> Iterator[ET.Element]:
+    """Yield each complete ``<tag>`` element from a (possibly gzipped) sitemap stream.
+
+    Elements are cleared from the tree once the caller moves on, so memory
+    stays flat no matter how many ``<url>`` entries the sitemap holds.
+    """
+    qualified = f"{{{NS['sm']}}}{tag}"
+    root = None
+    for event, el in ET.iterparse(_decompressed(stream), events=("start", "end")):
+        if root is None:
+            root = el
+            continue
+        if event == "end" and el.tag == qualified:
+            yield el
+            el.clear()
+            root.clear()
+
+
+@contextmanager
+def open_sitemap(
+    url: str,
+    tag: str,
+    fetcher: Optional[SitemapFetcher] = None,
+) -> Iterator[Iterator[ET.Element]]:
+    """Open ``url`` and stream its ``<tag>`` elements as they are downloaded."""
+    with (fetcher or default_fetcher()).open(url) as body:
+        yield iter_sitemap_elements(body, tag)
 
 
 def is_boilerplate(url: str) -> bool:
@@ -113,133 +502,429 @@ def parse_news_entry(url_el) -> dict:
 
 # ── Recent mode: news sitemap ────────────────────────────────────────────────
 
-def scrape_recent(
+def iter_recent(
     include_all: bool = False,
     tag_filter: Optional[str] = None,
-) -> list[dict]:
-    """Parse news.xml.gz for interactive articles and/or vis-design tagged articles.
+    fetcher: Optional[SitemapFetcher] = None,
+) -> Iterator[dict]:
+    """Stream news.xml.gz entries for interactive and/or vis-design tagged articles.
 
     Selection logic (OR):
       - URL contains /interactive/
       - keywords contain vis-design
     If tag_filter is set, only return articles matching that keyword.
     """
-    root = fetch_xml(NEWS_SITEMAP_URL)
-    results = []
+    with open_sitemap(NEWS_SITEMAP_URL, "url", fetcher) as url_els:
+        for url_el in url_els:
+            entry = parse_news_entry(url_el)
 
-    for url_el in root.findall("sm:url", NS):
-        entry = parse_news_entry(url_el)
+            # Apply tag filter if specified (strict keyword match)
+            if tag_filter:
+                if not any(
+                    k.strip().lower() == tag_filter.lower()
+                    for k in entry["keywords"].split(",")
+                ):
+                    continue
+            else:
+                # Default: match on /interactive/ URL OR vis-design keyword
+                if not entry["interactive_url"] and not entry["vis_design"]:
+                    continue
 
-        # Apply tag filter if specified (strict keyword match)
-        if tag_filter:
-            if not any(
-                k.strip().lower() == tag_filter.lower()
-                for k in entry["keywords"].split(",")
-            ):
-                continue
-        else:
-            # Default: match on /interactive/ URL OR vis-design keyword
-            if not entry["interactive_url"] and not entry["vis_design"]:
+            if not include_all and is_boilerplate(entry["url"]):
                 continue
 
-        if not include_all and is_boilerplate(entry["url"]):
-            continue
+            yield entry
 
-        results.append(entry)
 
-    return results
+def scrape_recent(
+    include_all: bool = False,
+    tag_filter: Optional[str] = None,
+    fetcher: Optional[SitemapFetcher] = None,
+) -> list[dict]:
+    """Parse news.xml.gz for interactive articles and/or vis-design tagged articles."""
+    return list(iter_recent(include_all, tag_filter, fetcher))
 
 
 # ── Vis-design mode: only vis-design tagged ──────────────────────────────────
 
-def scrape_vis_design() -> list[dict]:
+def iter_vis_design(fetcher: Optional[SitemapFetcher] = None) -> Iterator[dict]:
+    """Stream news.xml.gz entries tagged vis-design only."""
+    with open_sitemap(NEWS_SITEMAP_URL, "url", fetcher) as url_els:
+        for url_el in url_els:
+            entry = parse_news_entry(url_el)
+            if entry["vis_design"]:
+                yield entry
+
+
+def scrape_vis_design(fetcher: Optional[SitemapFetcher] = None) -> list[dict]:
     """Parse news.xml.gz for articles tagged vis-design only."""
-    root = fetch_xml(NEWS_SITEMAP_URL)
-    results = []
-    for url_el in root.findall("sm:url", NS):
-        entry = parse_news_entry(url_el)
-        if entry["vis_design"]:
-            results.append(entry)
-    return results
+    return list(iter_vis_design(fetcher))
 
 
 # ── Archive mode: monthly sitemaps ───────────────────────────────────────────
 
-def get_monthly_sitemap_urls() -> list[tuple[str, str]]:
+def get_monthly_sitemap_urls(fetcher: Optional[SitemapFetcher] = None) -> list[tuple[str, str]]:
     """Fetch the sitemap index and return [(url, YYYY-MM), ...]."""
-    root = fetch_xml(SITEMAP_INDEX_URL)
     entries = []
-    for sm in root.findall("sm:sitemap", NS):
-        loc = sm.findtext("sm:loc", "", NS)
-        m = re.search(r"sitemap-(\d{4}-\d{2})\.xml", loc)
-        if m:
-            entries.append((loc, m.group(1)))
+    with open_sitemap(SITEMAP_INDEX_URL, "sitemap", fetcher) as sitemap_els:
+        for sm in sitemap_els:
+            loc = sm.findtext("sm:loc", "", NS)
+            m = re.search(r"sitemap-(\d{4}-\d{2})\.xml", loc)
+            if m:
+                entries.append((loc, m.group(1)))
     return entries
 
 
-def scrape_archive(
-    start: str, end: str, include_all: bool = False
+def scrape_month(
+    sitemap_url: str,
+    ym: str,
+    include_all: bool = False,
+    fetcher: Optional[SitemapFetcher] = None,
 ) -> list[dict]:
-    """Fetch monthly sitemaps in [start, end] range and extract interactive URLs.
+    """Stream one monthly sitemap and return its interactive URLs."""
+    results = []
+    with open_sitemap(sitemap_url, "url", fetcher) as url_els:
+        for url_el in url_els:
+            loc = url_el.findtext("sm:loc", "", NS)
+            if not is_interactive(loc):
+                continue
+            if not include_all and is_boilerplate(loc):
+                continue
+            lastmod = url_el.findtext("sm:lastmod", "", NS)
+            results.append({
+                "url": loc,
+                "lastmod": lastmod,
+                "sitemap_month": ym,
+            })
+    return results
+
+
+def iter_archive(
+    start: str,
+    end: str,
+    include_all: bool = False,
+    fetcher: Optional[SitemapFetcher] = None,
+    on_month: Optional[Callable[[str, bool], None]] = None,
+    skip_months: Collection[str] = (),
+) -> Iterator[dict]:
+    """Stream interactive URLs from monthly sitemaps in the [start, end] range.
+
+    Months are fetched concurrently on the fetcher's worker pool; results and
+    progress lines are yielded in month order regardless of finish order, so
+    the first month can be printed while later ones are still downloading.
+    Closed months with cached parsed results skip the network entirely.
+    ``on_month(ym, ok)`` is called as each month is assembled. Months in
+    ``skip_months`` are left out of the range.
 
     Note: monthly sitemaps have no keyword metadata, so vis-design filtering
     is not possible here. Use --recent or --vis for keyword-based discovery.
     """
-    all_sitemaps = get_monthly_sitemap_urls()
+    fetcher = fetcher or default_fetcher()
+    all_sitemaps = get_monthly_sitemap_urls(fetcher)
 
     filtered = [
         (url, ym)
         for url, ym in all_sitemaps
         if start <= ym <= end
     ]
+    pending = [(url, ym) for url, ym in filtered if ym not in skip_months]
+
+    if filtered and not pending:
+        print(f"All {len(filtered)} month(s) in {start} to {end} were already fetched.", file=sys.stderr)
+        return
+    skipped = len(filtered) - len(pending)
+    filtered = pending
 
     if not filtered:
         print(f"No sitemaps found in range {start} to {end}.", file=sys.stderr)
         print(f"Available: {sorted(ym for _, ym in all_sitemaps)[:10]}...", file=sys.stderr)
-        return []
+        return
 
-    print(f"Fetching {len(filtered)} monthly sitemap(s)...", file=sys.stderr)
-    results = []
+    print(
+        f"Fetching {len(filtered)} monthly sitemap(s) with {fetcher.workers} worker(s)..."
+        + (f" ({skipped} already fetched)" if skipped else ""),
+        file=sys.stderr,
+    )
 
-    for sitemap_url, ym in sorted(filtered, key=lambda x: x[1]):
-        print(f"  {ym} ...", file=sys.stderr, end=" ", flush=True)
+    cache = fetcher.cache
+    this_month = current_month()
+
+    def job(item: tuple[str, str]) -> tuple[str, list[dict], Optional[Exception], bool]:
+        sitemap_url, ym = item
+        closed = ym < this_month
         try:
-            root = fetch_xml(sitemap_url)
-        except Exception as e:
-            print(f"FAILED ({e})", file=sys.stderr)
+            if cache is not None and closed:
+                cached = cache.load_month(ym, include_all)
+                if cached is not None:
+                    return ym, cached, None, True
+            month_results = scrape_month(sitemap_url, ym, include_all, fetcher)
+            if cache is not None and closed:
+                cache.store_month(ym, include_all, month_results)
+            return ym, month_results, None, False
+        except Exception as e:  # reported per month, like the sequential loop did
+            return ym, [], e, False
+
+    for ym, month_results, error, from_cache in fetcher.map_ordered(job, sorted(filtered, key=lambda x: x[1])):
+        if on_month is not None:
+            on_month(ym, error is None)
+        if error is not None:
+            print(f"  {ym} ... FAILED ({error})", file=sys.stderr)
             continue
+        suffix = " (cached)" if from_cache else ""
+        print(f"  {ym} ... {len(month_results)} interactive articles{suffix}", file=sys.stderr)
+        yield from month_results
 
-        count = 0
-        for url_el in root.findall("sm:url", NS):
-            loc = url_el.findtext("sm:loc", "", NS)
-            if not is_interactive(loc):
-                continue
-            if not include_all and is_boilerplate(loc):
+
+def scrape_archive(
+    start: str,
+    end: str,
+    include_all: bool = False,
+    fetcher: Optional[SitemapFetcher] = None,
+) -> list[dict]:
+    """Fetch monthly sitemaps in [start, end] range and extract interactive URLs."""
+    return list(iter_archive(start, end, include_all, fetcher))
+
+
+# ── Results store: SQLite index of everything seen ─────────────────────────
+
+def _utc_stamp(value: str) -> str:
+    """Normalize an ISO timestamp/date to a sortable UTC string ('' if unparseable)."""
+    if not value:
+        return ""
+    try:
+        parsed = datetime.fromisoformat(value.strip().replace("Z", "+00:00"))
+    except ValueError:
+        return ""
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.astimezone(timezone.utc).isoformat(timespec="seconds")
+
+
+def _split_keywords(keywords: str) -> list[str]:
+    return sorted({k.strip().lower() for k in keywords.split(",") if k.strip()})
+
+
+class ResultsStore:
+    """SQLite store of every article the scraper has emitted, unique on URL.
+
+    Also holds what --since-last-run needs: every archive month fetched
+    successfully (and whether it was already closed), and the newest
+    news-entry timestamp per mode.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS articles (
+            url TEXT NOT NULL,
+            title TEXT NOT NULL DEFAULT '',
+            keywords TEXT NOT NULL DEFAULT '',
+            published TEXT NOT NULL DEFAULT '',
+            lastmod TEXT NOT NULL DEFAULT '',
+            image TEXT NOT NULL DEFAULT '',
+            vis_design INTEGER NOT NULL DEFAULT 0,
+            interactive_url INTEGER NOT NULL DEFAULT 0,
+            month TEXT NOT NULL DEFAULT '',
+            stamp TEXT NOT NULL DEFAULT '',
+            first_seen_at TEXT NOT NULL,
+            last_seen_at TEXT NOT NULL
+        );
+        CREATE UNIQUE INDEX IF NOT EXISTS articles_url ON articles (url);
+        CREATE INDEX IF NOT EXISTS articles_month ON articles (month);
+        CREATE TABLE IF NOT EXISTS article_tags (
+            url TEXT NOT NULL,
+            tag TEXT NOT NULL,
+            PRIMARY KEY (url, tag)
+        );
+        CREATE INDEX IF NOT EXISTS article_tags_tag ON article_tags (tag);
+        CREATE TABLE IF NOT EXISTS marks (
+            name TEXT PRIMARY KEY,
+            value TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS archive_months (
+            month TEXT NOT NULL,
+            include_all INTEGER NOT NULL,
+            closed INTEGER NOT NULL,
+            fetched_at TEXT NOT NULL,
+            PRIMARY KEY (month, include_all)
+        );
+    """
+
+    UPSERT = """
+        INSERT INTO articles (
+            url, title, keywords, published, lastmod, image, vis_design,
+            interactive_url, month, stamp, first_seen_at, last_seen_at
+        ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT (url) DO UPDATE SET
+            title = CASE WHEN excluded.title != '' THEN excluded.title ELSE title END,
+            keywords = CASE WHEN excluded.keywords != '' THEN excluded.keywords ELSE keywords END,
+            published = CASE WHEN excluded.published != '' THEN excluded.published ELSE published END,
+            lastmod = CASE WHEN excluded.lastmod != '' THEN excluded.lastmod ELSE lastmod END,
+            image = CASE WHEN excluded.image != '' THEN excluded.image ELSE image END,
+            vis_design = MAX(vis_design, excluded.vis_design),
+            interactive_url = MAX(interactive_url, excluded.interactive_url),
+            month = CASE WHEN excluded.month != '' THEN excluded.month ELSE month END,
+            stamp = MAX(stamp, excluded.stamp),
+            last_seen_at = excluded.last_seen_at
+    """
+
+    def __init__(self, path: Path):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.path = path
+        self.conn = sqlite3.connect(path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.executescript(self.SCHEMA)
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.close()
+
+    def close(self) -> None:
+        self.conn.commit()
+        self.conn.close()
+
+    def upsert(self, entry: dict) -> None:
+        now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        stamp = _utc_stamp(entry.get("published") or entry.get("lastmod", ""))
+        month = entry.get("sitemap_month") or stamp[:7]
+        url = entry["url"]
+        self.conn.execute(
+            self.UPSERT,
+            (
+                url,
+                entry.get("title", ""),
+                entry.get("keywords", ""),
+                entry.get("published", ""),
+                entry.get("lastmod", ""),
+                entry.get("image", ""),
+                int(bool(entry.get("vis_design"))),
+                int(bool(entry.get("interactive_url", is_interactive(url)))),
+                month,
+                stamp,
+                now,
+                now,
+            ),
+        )
+        tags = _split_keywords(entry.get("keywords", ""))
+        if tags:
+            self.conn.execute("DELETE FROM article_tags WHERE url = ?", (url,))
+            self.conn.executemany(
+                "INSERT INTO article_tags (url, tag) VALUES (?, ?)",
+                [(url, tag) for tag in tags],
+            )
+
+    def get_mark(self, name: str) -> Optional[str]:
+        row = self.conn.execute("SELECT value FROM marks WHERE name = ?", (name,)).fetchone()
+        return row["value"] if row else None
+
+    def set_mark(self, name: str, value: str) -> None:
+        self.conn.execute(
+            "INSERT INTO marks (name, value) VALUES (?, ?) "
+            "ON CONFLICT (name) DO UPDATE SET value = excluded.value",
+            (name, value),
+        )
+        self.conn.commit()
+
+    def record_news(self, entries: Iterable[dict], mark: str, since_last_run: bool = False) -> Iterator[dict]:
+        """Upsert news entries as they stream past, advancing the ``mark`` high-water stamp.
+
+        With ``since_last_run``, entries at or before the stored mark are
+        dropped before they reach the caller.
+        """
+        floor = self.get_mark(mark) if since_last_run else None
+        newest = self.get_mark(mark) or ""
+        for entry in entries:
+            stamp = _utc_stamp(entry.get("published") or entry.get("lastmod", ""))
+            newest = max(newest, stamp)
+            if floor and stamp and stamp <= floor:
                 continue
-            lastmod = url_el.findtext("sm:lastmod", "", NS)
+            self.upsert(entry)
+            yield entry
+        self.conn.commit()
+        if newest:
+            self.set_mark(mark, newest)
+
+    def record_archive(self, entries: Iterable[dict]) -> Iterator[dict]:
+        """Upsert archive entries as they stream past."""
+        for entry in entries:
+            self.upsert(entry)
+            yield entry
+        self.conn.commit()
+
+    def archive_month_done(self, ym: str, ok: bool, include_all: bool = False) -> None:
+        """Record a successfully fetched archive month; failed months stay unfetched."""
+        if not ok:
+            return
+        self.conn.execute(
+            "INSERT INTO archive_months (month, include_all, closed, fetched_at) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (month, include_all) DO UPDATE SET "
+            "closed = MAX(closed, excluded.closed), fetched_at = excluded.fetched_at",
+            (
+                ym,
+                int(include_all),
+                int(ym < current_month()),
+                datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            ),
+        )
+        self.conn.commit()
+
+    def fetched_archive_months(self, include_all: bool = False) -> set[str]:
+        """Months fetched after they closed; open months are fetched again."""
+        rows = self.conn.execute(
+            "SELECT month FROM archive_months WHERE include_all = ? AND closed = 1",
+            (int(include_all),),
+        )
+        return {row["month"] for row in rows}
+
+    def query(self, tag: Optional[str] = None, month: Optional[str] = None) -> list[dict]:
+        sql = "SELECT * FROM articles"
+        clauses = []
+        params: list[str] = []
+        if tag:
+            clauses.append("url IN (SELECT url FROM article_tags WHERE tag = ?)")
+            params.append(tag.strip().lower())
+        if month:
+            clauses.append("month = ?")
+            params.append(month)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY month, stamp, url"
+        results = []
+        for row in self.conn.execute(sql, params):
             results.append({
-                "url": loc,
-                "lastmod": lastmod,
-                "sitemap_month": ym,
+                "url": row["url"],
+                "title": row["title"],
+                "keywords": row["keywords"],
+                "published": row["published"],
+                "lastmod": row["lastmod"],
+                "image": row["image"],
+                "vis_design": bool(row["vis_design"]),
+                "interactive_url": bool(row["interactive_url"]),
+                "sitemap_month": row["month"],
             })
-            count += 1
-        print(f"{count} interactive articles", file=sys.stderr)
-
-    return results
+        return results
 
 
 # ── Output formatting ────────────────────────────────────────────────────────
 
-def print_results(results: list[dict], as_json: bool = False):
-    if as_json:
-        print(json.dumps(results, indent=2))
-        return
+def print_json_stream(results: Iterable[dict]):
+    """Print results as a JSON array (same layout as json.dumps(indent=2)) as they arrive."""
+    count = 0
+    for r in results:
+        item = json.dumps(r, indent=2).replace("\n", "\n  ")
+        print(("[\n  " if count == 0 else ",\n  ") + item, end="", flush=True)
+        count += 1
+    print("\n]" if count else "[]")
 
-    if not results:
-        print("No articles found.")
+
+def print_results(results: Iterable[dict], as_json: bool = False):
+    if as_json:
+        print_json_stream(results)
         return
 
+    total = 0
     for r in results:
+        total += 1
         title = r.get("title", "")
         kw = r.get("keywords", "")
         date = r.get("published") or r.get("lastmod", "")
@@ -258,9 +943,13 @@ def print_results(results: list[dict], as_json: bool = False):
         if flags:
             print(f"  Matched: {', '.join(flags)}")
         if kw:
-            print(f"  Tags: {kw}")
+            print(f"  Tags: {kw}", flush=True)
 
-    print(f"\n── Total: {len(results)} articles ──")
+    if not total:
+        print("No articles found.")
+        return
+
+    print(f"\n── Total: {total} articles ──")
 
 
 # ── CLI ──────────────────────────────────────────────────────────────────────
@@ -285,12 +974,22 @@ def main():
         action="store_true",
         help="Monthly sitemaps for a date range (URL-path matching only).",
     )
+    mode.add_argument(
+        "--query",
+        action="store_true",
+        help="Answer --tag / --month from the results store without fetching.",
+    )
     parser.add_argument(
         "--tag",
         metavar="KEYWORD",
-        help="Filter --recent to only articles with this news:keywords value "
+        help="Filter --recent or --query to only articles with this news:keywords value "
              "(e.g. --tag vis-design, --tag 'Climate').",
     )
+    parser.add_argument(
+        "--month",
+        metavar="YYYY-MM",
+        help="Filter --query to articles from this month.",
+    )
     parser.add_argument(
         "--start",
         default="2024-01",
@@ -298,7 +997,7 @@ def main():
     )
     parser.add_argument(
         "--end",
-        default=datetime.now().strftime("%Y-%m"),
+        default=current_month(),
         help="End month YYYY-MM for archive mode (default: current month).",
     )
     parser.add_argument(
@@ -316,24 +1015,121 @@ def main():
         action="store_true",
         help="Print just the URLs, one per line.",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=DEFAULT_WORKERS,
+        help=f"Concurrent sitemap downloads for archive mode (default: {DEFAULT_WORKERS}).",
+    )
+    parser.add_argument(
+        "--retries",
+        type=int,
+        default=DEFAULT_RETRIES,
+        help=f"Retries per sitemap on 429/5xx or dropped connections (default: {DEFAULT_RETRIES}).",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        default=DEFAULT_CACHE_DIR,
+        help="Sitemap HTTP + parsed-results cache directory (default: .cache/nyt-sitemaps).",
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always download sitemaps; do not read or write the cache.",
+    )
+    parser.add_argument(
+        "--offline",
+        action="store_true",
+        help="Serve everything from the cache without network requests.",
+    )
+    parser.add_argument(
+        "--store",
+        type=Path,
+        default=DEFAULT_STORE_PATH,
+        help="SQLite results store (default: .cache/nyt-interactives.sqlite3).",
+    )
+    parser.add_argument(
+        "--no-store",
+        action="store_true",
+        help="Do not record results in the store.",
+    )
+    parser.add_argument(
+        "--since-last-run",
+        action="store_true",
+        help="Skip archive months already fetched after they closed; emit only news entries newer than the store's high-water mark.",
+    )
 
     args = parser.parse_args()
 
-    if args.vis:
-        results = scrape_vis_design()
-    elif args.recent:
-        results = scrape_recent(include_all=args.all, tag_filter=args.tag)
-    else:
-        if args.tag:
-            parser.error("--tag requires --recent (monthly sitemaps have no keywords)")
-        results = scrape_archive(args.start, args.end, include_all=args.all)
+    if args.archive and args.tag:
+        parser.error("--tag requires --recent (monthly sitemaps have no keywords)")
+    if args.month and not args.query:
+        parser.error("--month requires --query")
+    if args.offline and args.no_cache:
+        parser.error("--offline needs the cache; drop --no-cache")
+    if args.no_store and (args.query or args.since_last_run):
+        parser.error("--query and --since-last-run need the store; drop --no-store")
+    if args.query and args.since_last_run:
+        parser.error("--since-last-run applies to --recent, --vis and --archive")
+
+    store = None if args.no_store else ResultsStore(args.store)
+    try:
+        if args.query:
+            emit_results(store.query(tag=args.tag, month=args.month), args)
+        else:
+            run_scrape(args, store)
+    finally:
+        if store is not None:
+            store.close()
+
 
+def emit_results(results: Iterable[dict], args: argparse.Namespace):
     if args.urls_only:
         for r in results:
-            print(r["url"])
+            print(r["url"], flush=True)
     else:
         print_results(results, as_json=args.json)
 
 
+def run_scrape(args: argparse.Namespace, store: Optional[ResultsStore]):
+    cache = None if args.no_cache else SitemapCache(args.cache_dir, offline=args.offline)
+    with SitemapFetcher(workers=args.workers, retries=args.retries, cache=cache) as fetcher:
+        if args.vis:
+            results = iter_vis_design(fetcher)
+            mark = "news:vis"
+        elif args.recent:
+            results = iter_recent(include_all=args.all, tag_filter=args.tag, fetcher=fetcher)
+            mark = f"news:recent:tag={(args.tag or '').lower()}:all={int(args.all)}"
+        else:
+            on_month = None
+            skip_months: Collection[str] = ()
+            if store is not None:
+                if args.since_last_run:
+                    skip_months = store.fetched_archive_months(args.all)
+                on_month = functools.partial(store.archive_month_done, include_all=args.all)
+            results = iter_archive(
+                args.start,
+                args.end,
+                include_all=args.all,
+                fetcher=fetcher,
+                on_month=on_month,
+                skip_months=skip_months,
+            )
+
+        if store is not None:
+            if args.archive:
+                results = store.record_archive(results)
+            else:
+                results = store.record_news(results, mark, since_last_run=args.since_last_run)
+
+        # Results are generators: output starts while sitemaps are still streaming.
+        try:
+            emit_results(results, args)
+        except FetchError as e:
+            print(f"\nERROR: {e}", file=sys.stderr)
+            sys.exit(1)
+
+
 if __name__ == "__main__":
     main()
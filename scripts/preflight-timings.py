@@ -0,0 +1,235 @@
+#!/usr/bin/env python3
+"""Summarize the phase timing ledger written by preflight.sh and status-workspace.sh.
+
+Every preflight phase and status probe appends one JSON line to
+``.logs/workspace/phase-timings.jsonl`` (see scripts/lib/phase-timings.sh):
+
+  {"ts", "run_id", "source", "phase", "start_ms", "end_ms", "elapsed_ms",
+   "rc", "output_bytes", "prefetched"}
+
+``report`` prints p50/p95 per phase and a per-day p50 trend; ``check`` exits 1
+when a phase's recent runs are slower than its history by more than
+``--max-ratio``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Iterable
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_LEDGER = ROOT / ".logs" / "workspace" / "phase-timings.jsonl"
+DEFAULT_MAX_RATIO = 1.5
+DEFAULT_RECENT_RUNS = 3
+DEFAULT_MIN_DELTA_MS = 250
+DEFAULT_MIN_BASELINE_SAMPLES = 5
+
+PhaseKey = tuple[str, str]
+
+
+def load_events(path: Path, *, source: str | None = None, since: datetime | None = None) -> list[dict[str, Any]]:
+    """Read timing events, skipping torn or foreign lines."""
+    events: list[dict[str, Any]] = []
+    try:
+        handle = path.open(encoding="utf-8")
+    except FileNotFoundError:
+        return events
+    since_ms = int(since.timestamp() * 1000) if since is not None else None
+    with handle:
+        for line in handle:
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(event, dict) or not isinstance(event.get("phase"), str):
+                continue
+            if not isinstance(event.get("elapsed_ms"), int) or not isinstance(event.get("end_ms"), int):
+                continue
+            if source is not None and event.get("source") != source:
+                continue
+            if since_ms is not None and event["end_ms"] < since_ms:
+                continue
+            events.append(event)
+    events.sort(key=lambda event: event["end_ms"])
+    return events
+
+
+def percentile(values: Iterable[int], pct: float) -> float:
+    """Linear-interpolated percentile; ``values`` must not be empty."""
+    ordered = sorted(values)
+    if not ordered:
+        raise ValueError("percentile of empty sequence")
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def _by_phase(events: Iterable[dict[str, Any]]) -> dict[PhaseKey, list[dict[str, Any]]]:
+    grouped: dict[PhaseKey, list[dict[str, Any]]] = defaultdict(list)
+    for event in events:
+        grouped[(str(event.get("source") or "unknown"), event["phase"])].append(event)
+    return grouped
+
+
+def _day(event: dict[str, Any]) -> str:
+    return datetime.fromtimestamp(event["end_ms"] / 1000, tz=timezone.utc).strftime("%Y-%m-%d")
+
+
+def summarize(events: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    rows: list[dict[str, Any]] = []
+    for (source, phase), phase_events in _by_phase(events).items():
+        elapsed = [event["elapsed_ms"] for event in phase_events]
+        rows.append(
+            {
+                "source": source,
+                "phase": phase,
+                "count": len(phase_events),
+                "failures": sum(1 for event in phase_events if event.get("rc") not in (0, None)),
+                "p50_ms": round(percentile(elapsed, 50)),
+                "p95_ms": round(percentile(elapsed, 95)),
+                "max_ms": max(elapsed),
+                "last_ms": phase_events[-1]["elapsed_ms"],
+            }
+        )
+    rows.sort(key=lambda row: (row["source"], -row["p50_ms"], row["phase"]))
+    return rows
+
+
+def daily_trend(events: list[dict[str, Any]]) -> dict[str, dict[str, dict[str, int]]]:
+    """Return ``{"source/phase": {day: {"count", "p50_ms"}}}``."""
+    trend: dict[str, dict[str, dict[str, int]]] = {}
+    for (source, phase), phase_events in sorted(_by_phase(events).items()):
+        days: dict[str, list[int]] = defaultdict(list)
+        for event in phase_events:
+            days[_day(event)].append(event["elapsed_ms"])
+        trend[f"{source}/{phase}"] = {
+            day: {"count": len(values), "p50_ms": round(percentile(values, 50))}
+            for day, values in sorted(days.items())
+        }
+    return trend
+
+
+def find_regressions(
+    events: list[dict[str, Any]],
+    *,
+    max_ratio: float = DEFAULT_MAX_RATIO,
+    recent_runs: int = DEFAULT_RECENT_RUNS,
+    min_delta_ms: int = DEFAULT_MIN_DELTA_MS,
+    min_baseline_samples: int = DEFAULT_MIN_BASELINE_SAMPLES,
+) -> list[dict[str, Any]]:
+    """Compare each phase's last ``recent_runs`` runs against every earlier run.
+
+    A phase regresses when its recent p50 exceeds the baseline p50 by more than
+    ``max_ratio`` and by at least ``min_delta_ms`` (so 20ms -> 45ms is noise).
+    """
+    run_order: dict[str, list[str]] = defaultdict(list)
+    for event in events:
+        source = str(event.get("source") or "unknown")
+        run_id = str(event.get("run_id") or "")
+        if run_id and run_id not in run_order[source]:
+            run_order[source].append(run_id)
+    recent_ids = {source: set(ids[-recent_runs:]) for source, ids in run_order.items()}
+
+    regressions: list[dict[str, Any]] = []
+    for (source, phase), phase_events in sorted(_by_phase(events).items()):
+        recent = [event["elapsed_ms"] for event in phase_events if event.get("run_id") in recent_ids.get(source, ())]
+        baseline = [event["elapsed_ms"] for event in phase_events if event.get("run_id") not in recent_ids.get(source, ())]
+        if not recent or len(baseline) < min_baseline_samples:
+            continue
+        recent_p50 = percentile(recent, 50)
+        baseline_p50 = percentile(baseline, 50)
+        if recent_p50 - baseline_p50 < min_delta_ms:
+            continue
+        ratio = recent_p50 / baseline_p50 if baseline_p50 > 0 else float("inf")
+        if ratio > max_ratio:
+            regressions.append(
+                {
+                    "source": source,
+                    "phase": phase,
+                    "recent_p50_ms": round(recent_p50),
+                    "baseline_p50_ms": round(baseline_p50),
+                    "ratio": round(ratio, 2),
+                    "recent_samples": len(recent),
+                    "baseline_samples": len(baseline),
+                }
+            )
+    return regressions
+
+
+def _print_report(rows: list[dict[str, Any]], trend: dict[str, dict[str, dict[str, int]]], days: int) -> None:
+    if not rows:
+        print("[preflight-timings] No timing events recorded yet.")
+        return
+    print(f"{'source':<10} {'phase':<28} {'runs':>5} {'fail':>5} {'p50':>8} {'p95':>8} {'max':>8} {'last':>8}")
+    for row in rows:
+        print(
+            f"{row['source']:<10} {row['phase']:<28} {row['count']:>5} {row['failures']:>5} "
+            f"{row['p50_ms']:>6}ms {row['p95_ms']:>6}ms {row['max_ms']:>6}ms {row['last_ms']:>6}ms"
+        )
+    print()
+    print(f"Daily p50 trend (last {days} days):")
+    for name, per_day in trend.items():
+        points = ", ".join(f"{day[5:]}={point['p50_ms']}ms" for day, point in per_day.items())
+        print(f"  {name}: {points}")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Report and check preflight/status phase timings.")
+    parser.add_argument("--ledger", type=Path, default=DEFAULT_LEDGER, help="Timing ledger (JSONL).")
+    parser.add_argument("--source", choices=("preflight", "status"), help="Only consider one recorder.")
+    parser.add_argument("--days", type=int, default=14, help="Only consider events from the last N days.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    report = sub.add_parser("report", help="Print p50/p95 per phase and a per-day trend.")
+    report.add_argument("--json", action="store_true", help="Emit the report as JSON.")
+    check = sub.add_parser("check", help="Exit 1 when a phase regressed against its history.")
+    check.add_argument("--max-ratio", type=float, default=DEFAULT_MAX_RATIO, help="Allowed recent/baseline p50 ratio.")
+    check.add_argument("--recent-runs", type=int, default=DEFAULT_RECENT_RUNS, help="Runs compared against the baseline.")
+    check.add_argument("--min-delta-ms", type=int, default=DEFAULT_MIN_DELTA_MS, help="Ignore slowdowns smaller than this.")
+    check.add_argument(
+        "--min-baseline-samples",
+        type=int,
+        default=DEFAULT_MIN_BASELINE_SAMPLES,
+        help="Skip phases with fewer historical samples.",
+    )
+    args = parser.parse_args(argv)
+
+    since = datetime.now(timezone.utc) - timedelta(days=args.days)
+    events = load_events(args.ledger, source=args.source, since=since)
+
+    if args.command == "report":
+        rows = summarize(events)
+        trend = daily_trend(events)
+        if args.json:
+            print(json.dumps({"ledger": str(args.ledger), "phases": rows, "trend": trend}, indent=2))
+        else:
+            _print_report(rows, trend, args.days)
+        return 0
+
+    regressions = find_regressions(
+        events,
+        max_ratio=args.max_ratio,
+        recent_runs=max(1, args.recent_runs),
+        min_delta_ms=args.min_delta_ms,
+        min_baseline_samples=args.min_baseline_samples,
+    )
+    for item in regressions:
+        print(
+            f"[preflight-timings] REGRESSION: {item['source']}/{item['phase']} p50 {item['recent_p50_ms']}ms "
+            f"over the last {item['recent_samples']} sample(s) vs baseline {item['baseline_p50_ms']}ms "
+            f"({item['ratio']}x > {args.max_ratio}x)",
+            file=sys.stderr,
+        )
+    if regressions:
+        return 1
+    print(f"[preflight-timings] OK: no phase regressed beyond {args.max_ratio}x ({len(events)} events).")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -11,12 +11,15 @@ source "$ROOT/scripts/lib/preflight-browser-attention.sh"
 source "$ROOT/scripts/lib/preflight-env-contract.sh"
 source "$ROOT/scripts/lib/preflight-env-drift.sh"
 source "$ROOT/scripts/lib/preflight-handoff.sh"
+source "$ROOT/scripts/lib/phase-timings.sh"
+source "$ROOT/scripts/lib/preflight-scheduler.sh"
 source "$ROOT/scripts/lib/runtime-db-env.sh"
 source "$ROOT/scripts/lib/workspace-runtime-reconcile-contract.sh"
 source "$ROOT/scripts/lib/chrome-devtools-status.sh"
 source "$ROOT/scripts/lib/workspace-terminal.sh"
 
 preflight_diag_init "preflight.sh" "$ROOT" "preflight"
+workspace_timings_init "$ROOT" "preflight"
 
 ATTENTION_FILE="$(workspace_attention_file "$ROOT")"
 workspace_attention_reset "$ATTENTION_FILE"
@@ -97,11 +100,23 @@ run_preflight_phase() {
   command_display="$(preflight_diag_render_command "$@")"
   preflight_diag_set_phase "$phase"
 
+  if ! preflight_prefetch_claim "$phase"; then
+    rc=0
+    preflight_prefetch_wait "$phase" phase_output || rc="$?"
+    emit_preflight_phase_output "$phase" "$rc" "$phase_output"
+    preflight_diag_set_phase "idle"
+    return "$rc"
+  fi
+
   if ! preflight_diag_is_enabled; then
+    start_ms="$(workspace_timings_now_ms)"
     set +e
     phase_output="$("$@" 2>&1)"
     rc="$?"
     set -e
+    end_ms="$(workspace_timings_now_ms)"
+    preflight_prefetch_mark_done "$phase" "$rc"
+    workspace_timings_record "$phase" "$start_ms" "$end_ms" "$rc" "$(workspace_timings_byte_count "$phase_output")"
     emit_preflight_phase_output "$phase" "$rc" "$phase_output"
     preflight_diag_set_phase "idle"
     return "$rc"
@@ -131,6 +146,7 @@ run_preflight_phase() {
   end_ms="$(preflight_diag_now_ms)"
   elapsed_ms="$((end_ms - start_ms))"
   preflight_diag_log_event phase_end child_pid "$child_pid" exit_code "$rc" elapsed_ms "$elapsed_ms" command "$command_display"
+  workspace_timings_record "$phase" "$start_ms" "$end_ms" "$rc" null
   unset WORKSPACE_PREFLIGHT_DIAGNOSTICS_ACTIVE_CHILD_PID
   unset WORKSPACE_PREFLIGHT_DIAGNOSTICS_ACTIVE_CHILD_COMMAND
   unset WORKSPACE_PREFLIGHT_DIAGNOSTICS_ACTIVE_CHILD_SCRIPT
@@ -149,13 +165,26 @@ run_preflight_phase_capture() {
   echo "$message"
   command_display="$(preflight_diag_render_command "$@")"
   preflight_diag_set_phase "$phase"
+
+  if ! preflight_prefetch_claim "$phase"; then
+    rc=0
+    preflight_prefetch_wait "$phase" phase_output || rc="$?"
+    printf -v "$output_var" '%s' "$phase_output"
+    preflight_diag_set_phase "idle"
+    return "$rc"
+  fi
+
   output_file="$(mktemp)"
 
   if ! preflight_diag_is_enabled; then
+    start_ms="$(workspace_timings_now_ms)"
     set +e
     "$@" >"$output_file" 2>&1
     rc="$?"
     set -e
+    end_ms="$(workspace_timings_now_ms)"
+    preflight_prefetch_mark_done "$phase" "$rc"
+    workspace_timings_record "$phase" "$start_ms" "$end_ms" "$rc" "$(wc -c <"$output_file" | tr -d ' ')"
     phase_output="$(cat "$output_file")"
     rm -f "$output_file"
     printf -v "$output_var" '%s' "$phase_output"
@@ -189,6 +218,7 @@ run_preflight_phase_capture() {
   end_ms="$(preflight_diag_now_ms)"
   elapsed_ms="$((end_ms - start_ms))"
   preflight_diag_log_event phase_end child_pid "$child_pid" exit_code "$rc" elapsed_ms "$elapsed_ms" command "$command_display"
+  workspace_timings_record "$phase" "$start_ms" "$end_ms" "$rc" "$(wc -c <"$output_file" | tr -d ' ')"
   unset WORKSPACE_PREFLIGHT_DIAGNOSTICS_ACTIVE_CHILD_PID
   unset WORKSPACE_PREFLIGHT_DIAGNOSTICS_ACTIVE_CHILD_COMMAND
   unset WORKSPACE_PREFLIGHT_DIAGNOSTICS_ACTIVE_CHILD_SCRIPT
@@ -289,7 +319,15 @@ fi
 
 echo "[preflight] Mode: ${WORKSPACE_DEV_MODE}"
 
-run_preflight_phase "git-branch-report" "[preflight] Checking Git branch surface..." bash "$ROOT/scripts/git-branch-report.sh" --quiet-clean
+if ! WORKSPACE_DEV_MODE="$WORKSPACE_DEV_MODE" \
+  WORKSPACE_PREFLIGHT_STRICT="$WORKSPACE_PREFLIGHT_STRICT" \
+  WORKSPACE_PREFLIGHT_DOCTOR_TIMEOUT_SECONDS="$WORKSPACE_PREFLIGHT_DOCTOR_TIMEOUT_SECONDS" \
+  preflight_load_phase_commands "$ROOT"; then
+  echo "[preflight] ERROR: could not load phase commands from scripts/preflight_scheduler.py." >&2
+  exit 1
+fi
+
+run_preflight_phase "git-branch-report" "[preflight] Checking Git branch surface..." "${PREFLIGHT_PHASE_CMD_git_branch_report[@]}"
 
 if ! trr_runtime_db_require_local_app_url "$ROOT" "preflight" "$WORKSPACE_DEV_MODE"; then
   exit 1
@@ -301,15 +339,36 @@ if [[ "$WORKSPACE_DEV_MODE" == "cloud" || "$WORKSPACE_DEV_MODE" == "hybrid" ]];
   fi
 fi
 
-run_preflight_phase "modal-billing-guardrail" "[preflight] Checking Modal billing guardrails..." bash "$ROOT/scripts/modal-billing-guardrail.sh"
-run_preflight_phase "instagram-auth-freshness" "[preflight] Checking Instagram auth freshness..." python3 "$ROOT/scripts/instagram_auth_freshness.py"
+# Run independent read-only phases (see scripts/preflight_scheduler.py) ahead
+# of this script; each phase below still reports in order. Disabled in
+# diagnostics mode so signal tracking keeps one active child at a time.
+preflight_on_prefetch_signal() {
+  local signal_name="$1"
+  preflight_prefetch_stop "$signal_name"
+  trap - "$signal_name"
+  kill -s "$signal_name" "$$"
+}
+
+WORKSPACE_DEV_MODE="$WORKSPACE_DEV_MODE" \
+WORKSPACE_PREFLIGHT_STRICT="$WORKSPACE_PREFLIGHT_STRICT" \
+WORKSPACE_PREFLIGHT_DOCTOR_TIMEOUT_SECONDS="$WORKSPACE_PREFLIGHT_DOCTOR_TIMEOUT_SECONDS" \
+  preflight_prefetch_start "$ROOT" "git-branch-report"
+if preflight_prefetch_is_active; then
+  trap 'preflight_prefetch_stop' EXIT
+  trap 'preflight_on_prefetch_signal INT' INT
+  trap 'preflight_on_prefetch_signal TERM' TERM
+  trap 'preflight_on_prefetch_signal HUP' HUP
+fi
+
+run_preflight_phase "modal-billing-guardrail" "[preflight] Checking Modal billing guardrails..." "${PREFLIGHT_PHASE_CMD_modal_billing_guardrail[@]}"
+run_preflight_phase "instagram-auth-freshness" "[preflight] Checking Instagram auth freshness..." "${PREFLIGHT_PHASE_CMD_instagram_auth_freshness[@]}"
 
 # Reap helpers whose Codex/Claude session owner has exited before plugin health
 # checks run. The reaper preserves processes with a live session ancestor and
 # the shared Chrome keeper, so normal Chrome and active MCP sessions are not
 # touched.
 if [[ "${WORKSPACE_PREFLIGHT_MCP_REAP:-1}" == "1" ]]; then
-  run_preflight_phase "mcp-orphan-reap" "[preflight] Cleaning abandoned MCP helpers..." env MCP_REAPER_UNTRACKED_MIN_AGE_SEC="${WORKSPACE_PREFLIGHT_MCP_STALE_AGE_SEC:-3600}" bash "$ROOT/scripts/codex-mcp-session-reaper.sh" reap
+  run_preflight_phase "mcp-orphan-reap" "[preflight] Cleaning abandoned MCP helpers..." "${PREFLIGHT_PHASE_CMD_mcp_orphan_reap[@]}"
 fi
 
 # Codex can regenerate a stale Context7 app-resolver entry while the direct MCP
@@ -317,14 +376,14 @@ fi
 # terminating live Context7 connector processes.
 context7_repair_script="$HOME/.codex/plugins/context7/scripts/repair-context7-mcp.mjs"
 if [[ -f "$context7_repair_script" ]]; then
-  run_preflight_phase "context7-cache-repair" "[preflight] Reconciling Context7 cache/config..." node "$context7_repair_script"
+  run_preflight_phase "context7-cache-repair" "[preflight] Reconciling Context7 cache/config..." "${PREFLIGHT_PHASE_CMD_context7_cache_repair[@]}"
 fi
 
-run_preflight_phase "doctor" "[preflight] Running workspace doctor..." python3 "$ROOT/scripts/run-with-timeout.py" --timeout-seconds "$WORKSPACE_PREFLIGHT_DOCTOR_TIMEOUT_SECONDS" --label "workspace doctor" -- env WORKSPACE_DEV_MODE="$WORKSPACE_DEV_MODE" WORKSPACE_PREFLIGHT_STRICT="$WORKSPACE_PREFLIGHT_STRICT" bash "$ROOT/scripts/doctor.sh"
+run_preflight_phase "doctor" "[preflight] Running workspace doctor..." "${PREFLIGHT_PHASE_CMD_doctor[@]}"
 
 runtime_reconcile_output=""
 runtime_reconcile_rc=0
-run_preflight_phase_capture runtime_reconcile_output "runtime-reconcile" "[preflight] Reconciling runtime contracts (db, Modal, Render, Decodo; this can pause briefly while readiness probes run)..." env WORKSPACE_DEV_MODE="$WORKSPACE_DEV_MODE" python3 "$ROOT/scripts/workspace-runtime-reconcile.py" || runtime_reconcile_rc="$?"
+run_preflight_phase_capture runtime_reconcile_output "runtime-reconcile" "[preflight] Reconciling runtime contracts (db, Modal, Render, Decodo; this can pause briefly while readiness probes run)..." "${PREFLIGHT_PHASE_CMD_runtime_reconcile[@]}" || runtime_reconcile_rc="$?"
 if [[ "$runtime_reconcile_rc" != "0" ]]; then
   printf '%s\n' "$runtime_reconcile_output"
   exit "$runtime_reconcile_rc"
@@ -333,7 +392,7 @@ emit_preflight_phase_output "runtime-reconcile" 0 "$runtime_reconcile_output"
 
 env_contract_output=""
 env_contract_rc=0
-run_preflight_phase_capture env_contract_output "env-contract" "[preflight] Validating generated env contract..." bash "$ROOT/scripts/workspace-env-contract.sh" --check || env_contract_rc="$?"
+run_preflight_phase_capture env_contract_output "env-contract" "[preflight] Validating generated env contract..." "${PREFLIGHT_PHASE_CMD_env_contract[@]}" || env_contract_rc="$?"
 if [[ "$env_contract_rc" != "0" ]]; then
   env_contract_warning="$(preflight_handle_env_contract_result "$WORKSPACE_PREFLIGHT_STRICT" "$env_contract_rc" "$env_contract_output")" || {
     printf '%s\n' "$env_contract_output"
@@ -346,7 +405,7 @@ fi
 
 env_contract_report_output=""
 env_contract_report_rc=0
-run_preflight_phase_capture env_contract_report_output "env-contract-report" "[preflight] Validating env contract reports..." python3 "$ROOT/scripts/env_contract_report.py" validate || env_contract_report_rc="$?"
+run_preflight_phase_capture env_contract_report_output "env-contract-report" "[preflight] Validating env contract reports..." "${PREFLIGHT_PHASE_CMD_env_contract_report[@]}" || env_contract_report_rc="$?"
 if [[ "$env_contract_report_rc" != "0" ]]; then
   env_contract_report_warning="$(preflight_handle_env_contract_report_result "$WORKSPACE_PREFLIGHT_STRICT" "$env_contract_report_rc" "$env_contract_report_output")" || {
     printf '%s\n' "$env_contract_report_output"
@@ -368,7 +427,7 @@ fi
 
 handoff_sync_output=""
 handoff_sync_rc=0
-run_preflight_phase_capture handoff_sync_output "handoff-sync" "[preflight] Syncing generated handoffs..." python3 "$ROOT/scripts/sync-handoffs.py" --write || handoff_sync_rc="$?"
+run_preflight_phase_capture handoff_sync_output "handoff-sync" "[preflight] Syncing generated handoffs..." "${PREFLIGHT_PHASE_CMD_handoff_sync[@]}" || handoff_sync_rc="$?"
 if [[ "$handoff_sync_rc" == "0" ]]; then
   emit_preflight_phase_output "handoff-sync" 0 "$handoff_sync_output"
 else
@@ -380,11 +439,11 @@ else
   printf '%s\n' "$handoff_warning" >&2
 fi
 
-run_preflight_phase "codex-bootstrap" "[preflight] Reconciling Codex config..." bash "$ROOT/scripts/codex-config-sync.sh" bootstrap
+run_preflight_phase "codex-bootstrap" "[preflight] Reconciling Codex config..." "${PREFLIGHT_PHASE_CMD_codex_bootstrap[@]}"
 
-run_preflight_phase "check-policy" "[preflight] Checking policy drift rules..." bash "$ROOT/scripts/check-policy.sh"
+run_preflight_phase "check-policy" "[preflight] Checking policy drift rules..." "${PREFLIGHT_PHASE_CMD_check_policy[@]}"
 
-run_preflight_phase "chrome-devtools-mcp-status" "[preflight] Checking browser automation..." env CHROME_DEVTOOLS_MCP_STATUS_MODE=structured bash "$ROOT/scripts/chrome-devtools-mcp-status.sh"
+run_preflight_phase "chrome-devtools-mcp-status" "[preflight] Checking browser automation..." "${PREFLIGHT_PHASE_CMD_chrome_devtools_mcp_status[@]}"
 
 if [[ -d "$ROOT/.playwright-mcp" && "${WORKSPACE_PREFLIGHT_DIAGNOSTICS:-0}" == "1" ]]; then
   echo "[preflight] NOTE: '$ROOT/.playwright-mcp' exists and is treated as legacy/local-only." >&2
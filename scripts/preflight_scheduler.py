@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""Dependency-aware phase scheduler for scripts/preflight.sh.
+
+Every preflight phase is declared here with its command, the phases it must
+follow, and the shared state it mutates. ``preflight.sh`` loads each phase's
+argv from here (``shell`` subcommand), still walks the phases in their
+historical order and owns all output handling; this
+scheduler runs ahead of it, launching read-only phases whose dependencies are
+done with bounded parallelism and buffering each phase's combined output in a
+ledger directory.
+
+Ledger protocol (one directory per preflight run):
+  <phase>.claim/  atomic mkdir by whichever side runs the phase first
+  <phase>.out     combined stdout/stderr of a scheduler-run phase
+  <phase>.rc      exit code, written last (bash writes it for inline phases too)
+
+Scheduler-run phases are also appended to the phase timing ledger
+(``WORKSPACE_PHASE_TIMINGS_FILE``) with ``"prefetched": true``, so their real
+start and end times are recorded rather than the time preflight.sh waited.
+"""
+
+from __future__ import annotations
+
+import argparse
+import dataclasses
+import json
+import os
+import shlex
+import signal
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Mapping
+
+ROOT = Path(__file__).resolve().parent.parent
+DEFAULT_JOBS = 4
+POLL_INTERVAL_SECONDS = 0.05
+FORWARDED_SIGNALS = (signal.SIGINT, signal.SIGTERM, signal.SIGHUP)
+
+
+@dataclasses.dataclass(frozen=True)
+class Phase:
+    name: str
+    command: tuple[str, ...]
+    deps: tuple[str, ...] = ()
+    # Shared workspace state the phase mutates; any entry makes it inline-only.
+    side_effects: tuple[str, ...] = ()
+    # Files only this phase writes and no other phase reads.
+    artifacts: tuple[str, ...] = ()
+    enabled: bool = True
+
+    @property
+    def read_only(self) -> bool:
+        return not self.side_effects
+
+
+def build_phases(root: Path = ROOT, env: Mapping[str, str] | None = None) -> list[Phase]:
+    """Return preflight phases in the order preflight.sh emits them."""
+    env = os.environ if env is None else env
+    scripts = root / "scripts"
+    mode = env.get("WORKSPACE_DEV_MODE") or "local"
+    strict = env.get("WORKSPACE_PREFLIGHT_STRICT") or "0"
+    doctor_timeout = env.get("WORKSPACE_PREFLIGHT_DOCTOR_TIMEOUT_SECONDS") or "60"
+    context7_repair = Path(env.get("HOME", "~")).expanduser() / ".codex/plugins/context7/scripts/repair-context7-mcp.mjs"
+    return [
+        Phase(
+            "git-branch-report",
+            ("bash", str(scripts / "git-branch-report.sh"), "--quiet-clean"),
+        ),
+        Phase(
+            "modal-billing-guardrail",
+            ("bash", str(scripts / "modal-billing-guardrail.sh")),
+        ),
+        Phase(
+            "instagram-auth-freshness",
+            ("python3", str(scripts / "instagram_auth_freshness.py")),
+        ),
+        Phase(
+            "mcp-orphan-reap",
+            (
+                "env",
+                f"MCP_REAPER_UNTRACKED_MIN_AGE_SEC={env.get('WORKSPACE_PREFLIGHT_MCP_STALE_AGE_SEC') or '3600'}",
+                "bash",
+                str(scripts / "codex-mcp-session-reaper.sh"),
+                "reap",
+            ),
+            side_effects=("mcp-helper-processes",),
+            enabled=(env.get("WORKSPACE_PREFLIGHT_MCP_REAP") or "1") == "1",
+        ),
+        Phase(
+            "context7-cache-repair",
+            ("node", str(context7_repair)),
+            side_effects=("codex-config",),
+            enabled=context7_repair.is_file(),
+        ),
+        Phase(
+            "doctor",
+            (
+                "python3",
+                str(scripts / "run-with-timeout.py"),
+                "--timeout-seconds",
+                doctor_timeout,
+                "--label",
+                "workspace doctor",
+                "--report-json",
+                str(root / ".logs/workspace/doctor-run-report.json"),
+                "--sample-interval-seconds",
+                "1",
+                "--",
+                "env",
+                f"WORKSPACE_DEV_MODE={mode}",
+                f"WORKSPACE_PREFLIGHT_STRICT={strict}",
+                "bash",
+                str(scripts / "doctor.sh"),
+            ),
+            deps=("mcp-orphan-reap", "context7-cache-repair"),
+            side_effects=("plugin-repairs",),
+            artifacts=(".logs/workspace/doctor-run-report.json",),
+        ),
+        Phase(
+            "runtime-reconcile",
+            ("env", f"WORKSPACE_DEV_MODE={mode}", "python3", str(scripts / "workspace-runtime-reconcile.py")),
+            # Can apply runtime DB migrations and redeploy Modal, so it only
+            # runs inline once the billing guardrail and doctor have passed.
+            deps=("modal-billing-guardrail", "mcp-orphan-reap", "doctor"),
+            side_effects=("runtime-db", "modal-deploy"),
+            artifacts=(".logs/workspace/runtime-reconcile.json",),
+        ),
+        Phase(
+            "env-contract",
+            ("bash", str(scripts / "workspace-env-contract.sh"), "--check"),
+        ),
+        Phase(
+            "env-contract-report",
+            ("python3", str(scripts / "env_contract_report.py"), "validate"),
+        ),
+        Phase(
+            "handoff-sync",
+            ("python3", str(scripts / "sync-handoffs.py"), "--write", "--optimistic"),
+            side_effects=("handoffs",),
+        ),
+        Phase(
+            "codex-bootstrap",
+            ("bash", str(scripts / "codex-config-sync.sh"), "bootstrap"),
+            side_effects=("codex-config",),
+        ),
+        Phase(
+            "check-policy",
+            ("bash", str(scripts / "check-policy.sh")),
+            deps=("handoff-sync", "codex-bootstrap"),
+        ),
+        Phase(
+            "chrome-devtools-mcp-status",
+            ("env", "CHROME_DEVTOOLS_MCP_STATUS_MODE=structured", "bash", str(scripts / "chrome-devtools-mcp-status.sh")),
+            deps=("mcp-orphan-reap",),
+        ),
+    ]
+
+
+def validate_phases(phases: list[Phase]) -> list[str]:
+    errors: list[str] = []
+    seen: set[str] = set()
+    for phase in phases:
+        if phase.name in seen:
+            errors.append(f"duplicate phase {phase.name}")
+        for dep in phase.deps:
+            if dep not in seen:
+                errors.append(f"{phase.name} depends on {dep}, which is not declared before it")
+        seen.add(phase.name)
+    return errors
+
+
+class Ledger:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        path.mkdir(parents=True, exist_ok=True)
+
+    def claim(self, name: str) -> bool:
+        try:
+            (self.path / f"{name}.claim").mkdir()
+        except FileExistsError:
+            return False
+        return True
+
+    def output_path(self, name: str) -> Path:
+        return self.path / f"{name}.out"
+
+    def rc(self, name: str) -> int | None:
+        try:
+            return int((self.path / f"{name}.rc").read_text(encoding="utf-8").strip())
+        except (OSError, ValueError):
+            return None
+
+    def write_rc(self, name: str, rc: int) -> None:
+        tmp = self.path / f".{name}.rc.tmp"
+        tmp.write_text(f"{rc}\n", encoding="utf-8")
+        os.replace(tmp, self.path / f"{name}.rc")
+
+
+class TimingLog:
+    """Appends scheduler-run phases to the shared phase timing ledger."""
+
+    def __init__(self, path: Path, run_id: str, source: str = "preflight") -> None:
+        self.path = path
+        self.run_id = run_id
+        self.source = source
+
+    @classmethod
+    def from_env(cls, env: Mapping[str, str] | None = None) -> "TimingLog | None":
+        env = os.environ if env is None else env
+        path = env.get("WORKSPACE_PHASE_TIMINGS_FILE")
+        if (env.get("WORKSPACE_PHASE_TIMINGS") or "1") != "1" or not path:
+            return None
+        return cls(Path(path), env.get("WORKSPACE_PHASE_TIMINGS_RUN_ID") or "", env.get("WORKSPACE_PHASE_TIMINGS_SOURCE") or "preflight")
+
+    def record(self, phase: str, start_ms: int, end_ms: int, rc: int, output_bytes: int | None) -> None:
+        entry = {
+            "ts": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(end_ms / 1000)),
+            "run_id": self.run_id,
+            "source": self.source,
+            "phase": phase,
+            "start_ms": start_ms,
+            "end_ms": end_ms,
+            "elapsed_ms": end_ms - start_ms,
+            "rc": rc,
+            "output_bytes": output_bytes,
+            "prefetched": True,
+        }
+        # A single O_APPEND write keeps lines whole alongside bash appenders.
+        try:
+            with self.path.open("a", encoding="utf-8") as handle:
+                handle.write(json.dumps(entry, separators=(",", ":")) + "\n")
+        except OSError:
+            pass
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def _exit_status(returncode: int) -> int:
+    """Map Popen's negative signal codes to the shell's 128+N convention."""
+    return 128 - returncode if returncode < 0 else returncode
+
+
+class Scheduler:
+    def __init__(
+        self,
+        phases: list[Phase],
+        ledger: Ledger,
+        *,
+        jobs: int = DEFAULT_JOBS,
+        poll_interval: float = POLL_INTERVAL_SECONDS,
+        cwd: Path = ROOT,
+        parent_pid: int | None = None,
+        timings: TimingLog | None = None,
+    ) -> None:
+        self.phases = {phase.name: phase for phase in phases}
+        self.order = [phase.name for phase in phases]
+        self.ledger = ledger
+        self.jobs = max(1, jobs)
+        self.poll_interval = poll_interval
+        self.cwd = cwd
+        self.parent_pid = parent_pid
+        self.timings = timings
+        self.running: dict[str, subprocess.Popen[bytes]] = {}
+        self.started_ms: dict[str, int] = {}
+        self.received_signal: int | None = None
+
+    def _dep_state(self, phase: Phase) -> str:
+        """Return 'ready', 'waiting' or 'blocked' for ``phase``'s dependencies."""
+        for dep in phase.deps:
+            dep_phase = self.phases.get(dep)
+            if dep_phase is None or not dep_phase.enabled:
+                continue
+            rc = self.ledger.rc(dep)
+            if rc is None:
+                return "waiting"
+            if rc != 0:
+                return "blocked"
+        return "ready"
+
+    def _launch(self, phase: Phase) -> None:
+        self.started_ms[phase.name] = _now_ms()
+        with self.ledger.output_path(phase.name).open("wb") as output:
+            self.running[phase.name] = subprocess.Popen(
+                phase.command,
+                cwd=self.cwd,
+                stdin=subprocess.DEVNULL,
+                stdout=output,
+                stderr=subprocess.STDOUT,
+            )
+
+    def _reap(self) -> None:
+        for name, proc in list(self.running.items()):
+            returncode = proc.poll()
+            if returncode is None:
+                continue
+            rc = _exit_status(returncode)
+            if self.timings is not None:
+                try:
+                    output_bytes: int | None = self.ledger.output_path(name).stat().st_size
+                except OSError:
+                    output_bytes = None
+                self.timings.record(name, self.started_ms.pop(name), _now_ms(), rc, output_bytes)
+            self.ledger.write_rc(name, rc)
+            del self.running[name]
+
+    def _parent_gone(self) -> bool:
+        return self.parent_pid is not None and os.getppid() != self.parent_pid
+
+    def terminate(self, signum: int = signal.SIGTERM) -> None:
+        for proc in self.running.values():
+            if proc.poll() is None:
+                proc.send_signal(signum)
+        for proc in self.running.values():
+            try:
+                proc.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                proc.kill()
+                proc.wait()
+
+    def run(self) -> int:
+        pending = [
+            name
+            for name in self.order
+            if self.phases[name].enabled and self.phases[name].read_only
+        ]
+        while pending or self.running:
+            if self.received_signal is not None or self._parent_gone():
+                self.terminate(self.received_signal or signal.SIGTERM)
+                return 128 + (self.received_signal or signal.SIGTERM)
+            self._reap()
+            for name in list(pending):
+                if len(self.running) >= self.jobs:
+                    break
+                state = self._dep_state(self.phases[name])
+                if state == "waiting":
+                    continue
+                pending.remove(name)
+                # Blocked phases are left to preflight.sh, which stops before them anyway.
+                if state == "ready" and self.ledger.claim(name):
+                    self._launch(self.phases[name])
+            if pending or self.running:
+                time.sleep(self.poll_interval)
+        return 0
+
+
+def _install_signal_handlers(scheduler: Scheduler) -> None:
+    def handler(signum: int, _frame: object) -> None:
+        scheduler.received_signal = signum
+
+    # Installing handlers also resets inherited SIG_IGN, so children see
+    # default INT/TERM/HUP behavior exactly like inline preflight phases.
+    for signum in FORWARDED_SIGNALS:
+        signal.signal(signum, handler)
+
+
+def render_plan(phases: list[Phase]) -> list[dict[str, object]]:
+    return [
+        {
+            "name": phase.name,
+            "enabled": phase.enabled,
+            "read_only": phase.read_only,
+            "deps": list(phase.deps),
+            "side_effects": list(phase.side_effects),
+            "artifacts": list(phase.artifacts),
+        }
+        for phase in phases
+    ]
+
+
+def shell_variable(name: str) -> str:
+    return "PREFLIGHT_PHASE_CMD_" + name.replace("-", "_")
+
+
+def render_shell(phases: list[Phase]) -> str:
+    """Bash array assignments holding each phase's argv, for ``eval`` in preflight.sh."""
+    return "".join(
+        f"{shell_variable(phase.name)}=({' '.join(shlex.quote(part) for part in phase.command)})\n"
+        for phase in phases
+    )
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run read-only preflight phases ahead of preflight.sh.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    plan = sub.add_parser("plan", help="Print the declared phase graph.")
+    plan.add_argument("--json", action="store_true", help="Emit the phase graph as JSON.")
+    shell = sub.add_parser("shell", help="Print each phase's argv as bash array assignments.")
+    shell.add_argument("--root", type=Path, default=ROOT, help="Workspace root used in phase commands.")
+    prefetch = sub.add_parser("prefetch", help="Run read-only phases into a ledger directory.")
+    prefetch.add_argument("--ledger", type=Path, required=True, help="Ledger directory shared with preflight.sh.")
+    prefetch.add_argument("--jobs", type=int, default=DEFAULT_JOBS, help="Maximum concurrent phases.")
+    prefetch.add_argument("--parent-pid", type=int, help="Stop when this process is no longer our parent.")
+    args = parser.parse_args(argv)
+
+    phases = build_phases(args.root if args.command == "shell" else ROOT)
+    errors = validate_phases(phases)
+    if errors:
+        for error in errors:
+            print(f"[preflight-scheduler] ERROR: {error}", file=sys.stderr)
+        return 2
+
+    if args.command == "plan":
+        if args.json:
+            print(json.dumps(render_plan(phases), indent=2))
+        else:
+            for phase in phases:
+                kind = "read-only" if phase.read_only else f"side effects: {', '.join(phase.side_effects)}"
+                deps = f" after {', '.join(phase.deps)}" if phase.deps else ""
+                state = "" if phase.enabled else " (disabled)"
+                print(f"{phase.name}: {kind}{deps}{state}")
+        return 0
+
+    if args.command == "shell":
+        sys.stdout.write(render_shell(phases))
+        return 0
+
+    scheduler = Scheduler(
+        phases,
+        Ledger(args.ledger),
+        jobs=args.jobs,
+        parent_pid=args.parent_pid,
+        timings=TimingLog.from_env(),
+    )
+    _install_signal_handlers(scheduler)
+    return scheduler.run()
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
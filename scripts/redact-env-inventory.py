@@ -11,6 +11,11 @@ from urllib.parse import urlparse
 
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.lib import env_files  # noqa: E402
+
 DEFAULT_KEYS = (
     "TRR_DB_DIRECT_URL",
     "TRR_DB_SESSION_URL",
@@ -40,18 +45,7 @@ class EnvSurface:
 
 
 def _parse_env_file(path: Path) -> dict[str, str]:
-    values: dict[str, str] = {}
-    if not path.is_file():
-        return values
-    for raw_line in path.read_text(encoding="utf-8").splitlines():
-        line = raw_line.strip()
-        if not line or line.startswith("#") or "=" not in line:
-            continue
-        key, value = line.split("=", 1)
-        key = key.strip()
-        value = value.strip().strip('"').strip("'")
-        values[key] = value
-    return values
+    return env_files.env_values(path)
 
 
 def _classify_connection(value: str) -> str:
@@ -9,18 +9,20 @@ Usage:
   ./scripts/render-trr.sh preflight --service-id ID --commit SHA
   ./scripts/render-trr.sh deploy --service-id ID --commit SHA --previous-deploy-id DEPLOY_ID
   ./scripts/render-trr.sh status --service-id ID --deploy-id DEPLOY_ID --commit SHA
+  ./scripts/render-trr.sh wait --service-id ID --deploy-id DEPLOY_ID --commit SHA [--timeout-seconds N]
   ./scripts/render-trr.sh rollback --service-id ID --deploy-id DEPLOY_ID --commit SHA
 
 Deploy requires TRR_RENDER_ALLOW_MUTATION=1 after current-chat approval.
 Rollback additionally requires TRR_RENDER_ALLOW_ROLLBACK=1.
+Wait streams deploy status transitions as JSON lines; exit 0 live, 1 failed, 124 timeout.
 USAGE
   exit 0
 fi
 
 case "$1" in
-  preflight|deploy|status|rollback) ;;
+  preflight|deploy|status|wait|rollback) ;;
   *)
-    echo "render-trr: ERROR: expected preflight, deploy, status, or rollback." >&2
+    echo "render-trr: ERROR: expected preflight, deploy, status, wait, or rollback." >&2
     exit 2
     ;;
 esac
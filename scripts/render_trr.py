@@ -1,5 +1,5 @@
 #!/usr/bin/env python3
-"""Fail-closed Render preflight, deploy, status, and rollback guard for TRR."""
+"""Fail-closed Render preflight, deploy, status, wait, and rollback guard for TRR."""
 
 from __future__ import annotations
 
@@ -9,13 +9,17 @@ import os
 import re
 import subprocess
 import sys
-import urllib.error
-import urllib.request
+import time
 from pathlib import Path
 from typing import Any, Callable, Mapping, Protocol
 
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.lib import http_client  # noqa: E402
+
 BACKEND_ROOT = ROOT / "TRR-Backend"
 DEFAULT_MANIFEST = ROOT / "docs" / "workspace" / "deployment-targets.json"
 API_BASE_URL = "https://api.render.com"
@@ -32,6 +36,28 @@ EXPECTED_CREDENTIAL_ENV = "TRR_RENDER_API_KEY"
 COMMIT_PATTERN = re.compile(r"^[0-9a-f]{40}$")
 DEPLOY_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]+$")
 
+DEPLOY_SUCCESS_STATUSES = frozenset({"live"})
+# A deploy that ends "deactivated" while we wait for it was superseded.
+DEPLOY_FAILURE_STATUSES = frozenset(
+    {"build_failed", "update_failed", "pre_deploy_failed", "canceled", "deactivated"}
+)
+# status -> (first poll interval, ceiling) in seconds; intervals grow 1.5x per
+# poll without a transition. Builds take minutes, so they back off furthest.
+POLL_SCHEDULE = {
+    "created": (2.0, 5.0),
+    "queued": (2.0, 10.0),
+    "build_in_progress": (5.0, 30.0),
+    "pre_deploy_in_progress": (5.0, 20.0),
+    "update_in_progress": (3.0, 10.0),
+}
+DEFAULT_POLL_SCHEDULE = (5.0, 15.0)
+POLL_BACKOFF = 1.5
+FAST_POLL_WINDOW_SECONDS = 30.0
+FAST_POLL_SECONDS = 2.0
+DEFAULT_WAIT_TIMEOUT_SECONDS = 1800.0
+MAX_CONSECUTIVE_POLL_ERRORS = 3
+WAIT_TIMEOUT_EXIT_CODE = 124
+
 
 class RenderGuardError(RuntimeError):
     pass
@@ -44,42 +70,52 @@ class RenderClient(Protocol):
 
 
 class RenderApiClient:
-    def __init__(self, api_key: str) -> None:
+    def __init__(
+        self,
+        api_key: str,
+        *,
+        http: http_client.HttpClient | None = None,
+        base_url: str = API_BASE_URL,
+    ) -> None:
         if not api_key:
             raise RenderGuardError(
                 f"{EXPECTED_CREDENTIAL_ENV} is required for Render API access"
             )
         self._api_key = api_key
+        self._base_url = base_url.rstrip("/")
+        self._http = http if http is not None else http_client.HttpClient()
+
+    @property
+    def metrics(self) -> http_client.HttpMetrics:
+        return self._http.metrics
 
     def _request(
         self, method: str, path: str, payload: dict[str, str] | None = None
     ) -> Any:
-        body = json.dumps(payload).encode("utf-8") if payload is not None else None
-        request = urllib.request.Request(
-            f"{API_BASE_URL}{path}",
-            data=body,
-            method=method,
-            headers={
-                "Accept": "application/json",
-                "Authorization": f"Bearer {self._api_key}",
-                "Content-Type": "application/json",
-                "User-Agent": "TRR render deployment guard/1.0",
-            },
-        )
         try:
-            with urllib.request.urlopen(request, timeout=30) as response:
-                raw = response.read()
-        except urllib.error.HTTPError as exc:
-            raise RenderGuardError(
-                f"Render API {method} {path} failed with HTTP {exc.code}"
-            ) from exc
-        except urllib.error.URLError as exc:
+            response = self._http.request(
+                method,
+                f"{self._base_url}{path}",
+                headers={
+                    "Accept": "application/json",
+                    "Authorization": f"Bearer {self._api_key}",
+                    "Content-Type": "application/json",
+                    "User-Agent": "TRR render deployment guard/1.0",
+                },
+                json_body=payload,
+                timeout=30,
+            )
+        except http_client.TransportError as exc:
             raise RenderGuardError(
                 f"Render API {method} {path} failed: {exc.reason}"
             ) from exc
+        if not response.ok:
+            raise RenderGuardError(
+                f"Render API {method} {path} failed with HTTP {response.status}"
+            )
         try:
-            return json.loads(raw.decode("utf-8") or "{}")
-        except json.JSONDecodeError as exc:
+            return response.json()
+        except (UnicodeDecodeError, json.JSONDecodeError) as exc:
             raise RenderGuardError(
                 f"Render API {method} {path} returned invalid JSON"
             ) from exc
@@ -297,6 +333,25 @@ def deploy(
     }
 
 
+def _check_deploy_record(
+    value: Any, deploy_id: str, expected_commit: str
+) -> dict[str, Any]:
+    deploy_record = _unwrap(value, "deploy")
+    observed_id = str(deploy_record.get("id") or "").strip()
+    observed_commit = _validate_commit(
+        _deploy_commit(deploy_record), "observed deploy commit"
+    )
+    if observed_id != deploy_id:
+        raise RenderGuardError(
+            f"Render deploy ID mismatch: got {observed_id or '<empty>'}; expected {deploy_id}"
+        )
+    if observed_commit != expected_commit:
+        raise RenderGuardError(
+            f"Render deploy commit mismatch: got {observed_commit}; expected {expected_commit}"
+        )
+    return deploy_record
+
+
 def status(
     *,
     client: RenderClient,
@@ -311,21 +366,12 @@ def status(
     expected_commit = _validate_commit(commit, "deploy commit")
     git_verify(expected_commit)
     _verify_service(client, target, service_id)
-    deploy_record = _unwrap(
-        client.get(f"/v1/services/{service_id}/deploys/{deploy_id}"), "deploy"
-    )
-    observed_id = str(deploy_record.get("id") or "").strip()
-    observed_commit = _validate_commit(
-        _deploy_commit(deploy_record), "observed deploy commit"
+    deploy_record = _check_deploy_record(
+        client.get(f"/v1/services/{service_id}/deploys/{deploy_id}"),
+        deploy_id,
+        expected_commit,
     )
-    if observed_id != deploy_id:
-        raise RenderGuardError(
-            f"Render deploy ID mismatch: got {observed_id or '<empty>'}; expected {deploy_id}"
-        )
-    if observed_commit != expected_commit:
-        raise RenderGuardError(
-            f"Render deploy commit mismatch: got {observed_commit}; expected {expected_commit}"
-        )
+    observed_commit = _deploy_commit(deploy_record)
     return {
         "ok": True,
         "service_id": service_id,
@@ -336,6 +382,107 @@ def status(
     }
 
 
+def poll_interval(status: str, polls_in_status: int, elapsed: float) -> float:
+    """Seconds until the next poll: fast right after trigger, backing off in long states."""
+    first, ceiling = POLL_SCHEDULE.get(status, DEFAULT_POLL_SCHEDULE)
+    interval = min(ceiling, first * POLL_BACKOFF**polls_in_status)
+    if elapsed < FAST_POLL_WINDOW_SECONDS:
+        interval = min(interval, FAST_POLL_SECONDS)
+    return interval
+
+
+EventSink = Callable[[dict[str, Any]], None]
+
+
+def wait(
+    *,
+    client: RenderClient,
+    target: Mapping[str, str],
+    service_id: str,
+    deploy_id: str,
+    commit: str,
+    timeout_seconds: float = DEFAULT_WAIT_TIMEOUT_SECONDS,
+    emit: EventSink = lambda event: None,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep,
+    git_verify: GitVerifier = verify_local_commit,
+) -> dict[str, Any]:
+    """Poll one deploy until it reaches a terminal state or ``timeout_seconds``.
+
+    Every status change is passed to ``emit`` as it is observed; the returned
+    result (also emitted) has ``ok`` set only when the deploy went live.
+    """
+    _guard_service_id(target, service_id)
+    deploy_id = _validate_deploy_id(deploy_id, "deploy ID")
+    expected_commit = _validate_commit(commit, "deploy commit")
+    git_verify(expected_commit)
+    _verify_service(client, target, service_id)
+
+    started = clock()
+    current = ""
+    polls = 0
+    polls_in_status = 0
+    poll_errors = 0
+    while True:
+        elapsed = clock() - started
+        try:
+            response = client.get(f"/v1/services/{service_id}/deploys/{deploy_id}")
+        except RenderGuardError as exc:
+            poll_errors += 1
+            emit(
+                {
+                    "event": "poll_error",
+                    "deploy_id": deploy_id,
+                    "elapsed_seconds": round(elapsed, 1),
+                    "error": str(exc),
+                }
+            )
+            if poll_errors >= MAX_CONSECUTIVE_POLL_ERRORS:
+                raise
+        else:
+            poll_errors = 0
+            polls += 1
+            deploy_record = _check_deploy_record(response, deploy_id, expected_commit)
+            observed = str(deploy_record.get("status") or "unknown").lower()
+            if observed != current:
+                emit(
+                    {
+                        "event": "transition",
+                        "deploy_id": deploy_id,
+                        "from": current or None,
+                        "status": observed,
+                        "elapsed_seconds": round(elapsed, 1),
+                    }
+                )
+                current = observed
+                polls_in_status = 0
+            else:
+                polls_in_status += 1
+            if current in DEPLOY_SUCCESS_STATUSES or current in DEPLOY_FAILURE_STATUSES:
+                break
+
+        remaining = timeout_seconds - (clock() - started)
+        if remaining <= 0:
+            break
+        sleep(min(remaining, poll_interval(current, polls_in_status, elapsed)))
+
+    terminal = current in DEPLOY_SUCCESS_STATUSES or current in DEPLOY_FAILURE_STATUSES
+    result = {
+        "event": "result",
+        "ok": current in DEPLOY_SUCCESS_STATUSES,
+        "service_id": service_id,
+        "deploy_id": deploy_id,
+        "commit": expected_commit,
+        "status": current or "unknown",
+        "timed_out": not terminal,
+        "polls": polls,
+        "elapsed_seconds": round(clock() - started, 1),
+        "direct_url": target["direct_url"],
+    }
+    emit(result)
+    return result
+
+
 def rollback(
     *,
     client: RenderClient,
@@ -398,6 +545,14 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
     status_parser.add_argument("--deploy-id", required=True)
     status_parser.add_argument("--commit", required=True)
 
+    wait_parser = subparsers.add_parser("wait")
+    wait_parser.add_argument("--service-id", required=True)
+    wait_parser.add_argument("--deploy-id", required=True)
+    wait_parser.add_argument("--commit", required=True)
+    wait_parser.add_argument(
+        "--timeout-seconds", type=float, default=DEFAULT_WAIT_TIMEOUT_SECONDS
+    )
+
     rollback_parser = subparsers.add_parser("rollback")
     rollback_parser.add_argument("--service-id", required=True)
     rollback_parser.add_argument("--deploy-id", required=True)
@@ -426,6 +581,19 @@ def main(argv: list[str] | None = None) -> int:
                 commit=args.commit,
                 previous_deploy_id=args.previous_deploy_id,
             )
+        elif args.command == "wait":
+            result = wait(
+                client=client,
+                target=target,
+                service_id=args.service_id,
+                deploy_id=args.deploy_id,
+                commit=args.commit,
+                timeout_seconds=args.timeout_seconds,
+                emit=lambda event: print(json.dumps(event, sort_keys=True), flush=True),
+            )
+            if result["ok"]:
+                return 0
+            return WAIT_TIMEOUT_EXIT_CODE if result["timed_out"] else 1
         elif args.command == "status":
             result = status(
                 client=client,
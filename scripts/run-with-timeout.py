@@ -1,14 +1,55 @@
 #!/usr/bin/env python3
-"""Run a command with a wall-clock timeout and preserve its combined output."""
+"""Run a command with a wall-clock timeout and preserve its combined output.
+
+Output is forwarded as it arrives instead of being held until the command
+exits. ``--stream`` prefixes each line with the time since the command started.
+Only the last ``--tail-lines`` lines are kept in memory for the timeout report.
+``--report-json`` writes wall time, CPU user/sys, peak RSS, and output volume
+for the command's whole process tree.
+
+On a timeout the tree gets SIGTERM, then SIGKILL after ``--grace-seconds``,
+through ``scripts/lib/process_supervisor.py``. On Linux this process is a child
+subreaper, so descendants orphaned along the way are still found and reaped.
+"""
 
 from __future__ import annotations
 
 import argparse
+import dataclasses
+import json
 import os
-import signal
+import resource
+import selectors
 import subprocess
 import sys
+import time
+from collections import deque
 from collections.abc import Sequence
+from pathlib import Path
+from typing import Any, BinaryIO
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.lib import process_supervisor  # noqa: E402
+
+DEFAULT_TAIL_LINES = 40
+READ_BYTES = 64 * 1024
+# A partial line longer than this is forwarded without waiting for its newline.
+MAX_PENDING_LINE_BYTES = 64 * 1024
+MAX_TAIL_LINE_BYTES = 2048
+EXIT_POLL_SECONDS = 0.05
+
+
+def _non_negative_float(value: str) -> float:
+    try:
+        parsed = float(value)
+    except ValueError as exc:
+        raise argparse.ArgumentTypeError("must be a non-negative number") from exc
+    if parsed < 0:
+        raise argparse.ArgumentTypeError("must be a non-negative number")
+    return parsed
 
 
 def _positive_int(value: str) -> int:
@@ -22,9 +63,29 @@ def _positive_int(value: str) -> int:
 
 
 def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description=__doc__)
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
     parser.add_argument("--timeout-seconds", type=_positive_int, required=True)
     parser.add_argument("--label", default="command")
+    parser.add_argument("--stream", action="store_true", help="prefix each output line with the elapsed time")
+    parser.add_argument("--tail-lines", type=_positive_int, default=DEFAULT_TAIL_LINES)
+    parser.add_argument("--report-json", type=Path, help="write a resource report for the command to this path")
+    parser.add_argument(
+        "--grace-seconds",
+        type=_non_negative_float,
+        default=process_supervisor.DEFAULT_GRACE_SECONDS,
+        help="time between SIGTERM and SIGKILL on a timeout",
+    )
+    parser.add_argument(
+        "--sample-interval-seconds",
+        type=_non_negative_float,
+        default=0.0,
+        help="sample per-process CPU/RSS for the report at this interval (0 disables)",
+    )
+    parser.add_argument(
+        "--kill-leaked",
+        action="store_true",
+        help="also stop descendants still running after the command exits",
+    )
     parser.add_argument("command", nargs=argparse.REMAINDER)
     args = parser.parse_args(argv)
     if args.command and args.command[0] == "--":
@@ -34,41 +95,235 @@ def parse_args(argv: Sequence[str] | None = None) -> argparse.Namespace:
     return args
 
 
-def main(argv: Sequence[str] | None = None) -> int:
-    args = parse_args(argv)
+@dataclasses.dataclass
+class RunResult:
+    returncode: int
+    timed_out: bool
+    wall_seconds: float
+    cpu_user_seconds: float
+    cpu_system_seconds: float
+    max_rss_bytes: int
+    output_bytes: int
+    output_lines: int
+    tail: list[str]
+    termination: dict[str, list[int]] | None = None
+    leaked: list[dict[str, Any]] = dataclasses.field(default_factory=list)
+    processes: list[dict[str, Any]] = dataclasses.field(default_factory=list)
+
+
+def _max_rss_bytes(usage: resource.struct_rusage) -> int:
+    # Linux reports ru_maxrss in KiB, macOS in bytes.
+    return usage.ru_maxrss if sys.platform == "darwin" else usage.ru_maxrss * 1024
+
+
+class OutputForwarder:
+    """Forwards child output and keeps a bounded tail of complete lines."""
+
+    def __init__(self, out: BinaryIO, *, stream: bool, tail_lines: int, started: float) -> None:
+        self.out = out
+        self.stream = stream
+        self.started = started
+        self.tail: deque[bytes] = deque(maxlen=tail_lines)
+        self.pending = b""
+        self.output_bytes = 0
+        self.output_lines = 0
+
+    def _prefix(self) -> bytes:
+        return f"[+{time.monotonic() - self.started:.3f}s] ".encode()
+
+    def _emit_line(self, line: bytes) -> None:
+        self.output_lines += 1
+        self.tail.append(line.rstrip(b"\n")[:MAX_TAIL_LINE_BYTES])
+        if self.stream:
+            self.out.write(self._prefix() + line)
+
+    def feed(self, chunk: bytes) -> None:
+        self.output_bytes += len(chunk)
+        if not self.stream:
+            self.out.write(chunk)
+        data = self.pending + chunk
+        lines = data.split(b"\n")
+        self.pending = lines.pop()
+        for line in lines:
+            self._emit_line(line + b"\n")
+        if len(self.pending) > MAX_PENDING_LINE_BYTES:
+            self._emit_line(self.pending + b"\n")
+            self.pending = b""
+        self.out.flush()
+
+    def finish(self, *, terminate_line: bool = False) -> None:
+        if self.pending:
+            self._emit_line(self.pending + b"\n" if self.stream else self.pending)
+            if terminate_line and not self.stream:
+                self.out.write(b"\n")
+            self.pending = b""
+        self.out.flush()
+
+    def tail_text(self) -> list[str]:
+        return [line.decode("utf-8", errors="replace") for line in self.tail]
+
+
+def run(
+    command: Sequence[str],
+    *,
+    timeout_seconds: float,
+    stream: bool = False,
+    tail_lines: int = DEFAULT_TAIL_LINES,
+    grace_seconds: float = process_supervisor.DEFAULT_GRACE_SECONDS,
+    sample_interval_seconds: float = 0.0,
+    kill_leaked: bool = False,
+    out: BinaryIO | None = None,
+) -> RunResult:
+    out = sys.stdout.buffer if out is None else out
+    process_supervisor.become_subreaper()
+    usage_before = resource.getrusage(resource.RUSAGE_CHILDREN)
+    started = time.monotonic()
+    deadline = started + timeout_seconds
+    forwarder = OutputForwarder(out, stream=stream, tail_lines=tail_lines, started=started)
     process = subprocess.Popen(
-        args.command,
+        list(command),
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
-        text=True,
         start_new_session=True,
     )
-    try:
-        stdout, _stderr = process.communicate(timeout=args.timeout_seconds)
-    except subprocess.TimeoutExpired as exc:
+    supervisor = process_supervisor.ProcessTreeSupervisor()
+    supervisor.start_sampling(sample_interval_seconds)
+    assert process.stdout is not None
+    read_fd = process.stdout.fileno()
+    timed_out = False
+    with selectors.DefaultSelector() as selector:
+        selector.register(read_fd, selectors.EVENT_READ)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                timed_out = True
+                break
+            if not selector.select(remaining):
+                continue
+            chunk = os.read(read_fd, READ_BYTES)
+            if not chunk:
+                break
+            forwarder.feed(chunk)
+
+    # The command can close its output and keep running; the deadline still
+    # applies until it exits.
+    status: int | None = None
+    while not timed_out:
+        pid, wait_status = os.waitpid(process.pid, os.WNOHANG)
+        if pid:
+            status = wait_status
+            break
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            timed_out = True
+            break
+        time.sleep(min(EXIT_POLL_SECONDS, remaining))
+
+    termination: process_supervisor.TerminationResult | None = None
+    if timed_out:
+        termination = supervisor.terminate(grace_seconds, exclude_reap=[process.pid])
+    if status is None:
+        _pid, status = os.waitpid(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    leaked: list[dict[str, Any]] = []
+    if not timed_out:
+        leaked = [{"pid": info.pid, "comm": info.comm} for info in supervisor.tracked().values()]
+        if leaked and kill_leaked:
+            termination = supervisor.terminate(grace_seconds)
+    supervisor.stop_sampling()
+    supervisor.reap()
+    # Every process in the tree is ours to reap (directly or as subreaper), so
+    # RUSAGE_CHILDREN covers the whole tree; ru_maxrss is its largest process.
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    if timed_out:
+        # Whatever was already written to the pipe is still worth showing.
+        os.set_blocking(read_fd, False)
         try:
-            os.killpg(process.pid, signal.SIGKILL)
-        except Exception:
-            process.kill()
-        stdout, _stderr = process.communicate()
-        output = stdout or exc.output or ""
-        if isinstance(output, bytes):
-            output = output.decode()
-        sys.stdout.write(output)
-        if output and not output.endswith("\n"):
-            sys.stdout.write("\n")
-        print(
-            f"[run-with-timeout] ERROR: {args.label} timed out after {args.timeout_seconds}s.",
-            file=sys.stderr,
-        )
+            while chunk := os.read(read_fd, READ_BYTES):
+                forwarder.feed(chunk)
+        except (BlockingIOError, OSError):
+            pass
+    process.stdout.close()
+    forwarder.finish(terminate_line=timed_out)
+    return RunResult(
+        returncode=int(process.returncode),
+        timed_out=timed_out,
+        wall_seconds=round(time.monotonic() - started, 3),
+        cpu_user_seconds=round(usage.ru_utime - usage_before.ru_utime, 3),
+        cpu_system_seconds=round(usage.ru_stime - usage_before.ru_stime, 3),
+        max_rss_bytes=_max_rss_bytes(usage),
+        output_bytes=forwarder.output_bytes,
+        output_lines=forwarder.output_lines,
+        tail=forwarder.tail_text(),
+        termination=None if termination is None else dataclasses.asdict(termination),
+        leaked=leaked,
+        processes=supervisor.usage_summary(),
+    )
+
+
+def write_report(path: Path, *, label: str, command: Sequence[str], timeout_seconds: int, result: RunResult) -> None:
+    report = {
+        "label": label,
+        "command": subprocess.list2cmdline(list(command)),
+        "timeout_seconds": timeout_seconds,
+        "finished_at": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        **dataclasses.asdict(result),
+    }
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(report, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    args = parse_args(argv)
+    result = run(
+        args.command,
+        timeout_seconds=args.timeout_seconds,
+        stream=args.stream,
+        tail_lines=args.tail_lines,
+        grace_seconds=args.grace_seconds,
+        sample_interval_seconds=args.sample_interval_seconds,
+        kill_leaked=args.kill_leaked,
+    )
+    if args.report_json is not None:
+        try:
+            write_report(
+                args.report_json,
+                label=args.label,
+                command=args.command,
+                timeout_seconds=args.timeout_seconds,
+                result=result,
+            )
+        except OSError as exc:
+            print(f"[run-with-timeout] WARNING: could not write {args.report_json}: {exc}", file=sys.stderr)
+
+    if result.leaked:
+        action = "stopped" if args.kill_leaked else "left running"
+        summary = ", ".join(f"{item['comm']}:{item['pid']}" for item in result.leaked)
+        print(f"[run-with-timeout] WARNING: {args.label} {action} leaked process(es): {summary}", file=sys.stderr)
+    if not result.timed_out:
+        return result.returncode
+
+    print(
+        f"[run-with-timeout] ERROR: {args.label} timed out after {args.timeout_seconds}s.",
+        file=sys.stderr,
+    )
+    print(
+        "[run-with-timeout] Command: " + subprocess.list2cmdline(args.command),
+        file=sys.stderr,
+    )
+    if result.termination is not None:
         print(
-            "[run-with-timeout] Command: " + subprocess.list2cmdline(args.command),
+            f"[run-with-timeout] Stopped {len(result.termination['terminated'])} process(es) with SIGTERM, "
+            f"{len(result.termination['killed'])} with SIGKILL after {args.grace_seconds:g}s.",
             file=sys.stderr,
         )
-        return 124
-
-    sys.stdout.write(stdout or "")
-    return int(process.returncode)
+    if args.stream and result.tail:
+        print(f"[run-with-timeout] Last {len(result.tail)} line(s) before the timeout:", file=sys.stderr)
+        for line in result.tail:
+            print(f"  {line}", file=sys.stderr)
+    return 124
 
 
 if __name__ == "__main__":
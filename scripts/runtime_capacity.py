@@ -1,4 +1,15 @@
 #!/usr/bin/env python3
+"""Validate and project the TRR runtime-capacity authority.
+
+``ProjectionEngine`` loads ``docs/workspace/runtime-capacity.json`` once,
+materializes the shell projection of every context up front, and parses each
+``profiles/*.env`` file once for both the context and the override checks. The
+Modal runtime defaults in ``modal_jobs.py`` and the social dispatch fallback in
+``social_season_analytics_impl.py`` are read with ``ast`` through
+``scripts/lib/source_literals.py``, which caches them by file sha256, so
+unchanged backends are not reparsed on every architecture check.
+"""
+
 from __future__ import annotations
 
 import argparse
@@ -12,7 +23,24 @@ from typing import Any
 
 
 ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.lib import env_files, source_literals  # noqa: E402
+
 DEFAULT_MANIFEST = ROOT / "docs" / "workspace" / "runtime-capacity.json"
+MODAL_JOBS = Path("TRR-Backend") / "trr_backend" / "modal_jobs.py"
+SOCIAL_IMPLEMENTATION = (
+    Path("TRR-Backend") / "trr_backend" / "socials" / "social_season_analytics_impl.py"
+)
+# Bump when _inspect_social_dispatch_fallback changes so cached results are recomputed.
+SOCIAL_DISPATCH_FALLBACK_ANALYSIS_VERSION = "1"
+STAGE_ENV_KEYS = {
+    "posts": "WORKSPACE_TRR_REMOTE_SOCIAL_POSTS",
+    "comments": "WORKSPACE_TRR_REMOTE_SOCIAL_COMMENTS",
+    "media_mirror": "WORKSPACE_TRR_REMOTE_SOCIAL_MEDIA_MIRROR",
+    "comment_media_mirror": "WORKSPACE_TRR_REMOTE_SOCIAL_COMMENT_MEDIA_MIRROR",
+}
 
 
 class CapacityContractError(RuntimeError):
@@ -131,17 +159,19 @@ def shell_projection(payload: dict[str, Any], context_name: str) -> dict[str, st
     context = contexts.get(context_name)
     if not isinstance(context, dict):
         raise CapacityContractError(f"unknown runtime capacity context: {context_name}")
-    stage_caps = context["stage_caps"]
-    general = context["container_job_concurrency"]["general_social"]
+    try:
+        stage_caps = context["stage_caps"]
+        general = context["container_job_concurrency"]["general_social"]
+        dispatch_batch_size = context["dispatch_batch_size"]
+    except (KeyError, TypeError) as exc:
+        raise CapacityContractError(
+            f"runtime capacity context {context_name} is incomplete: missing {exc}"
+        ) from exc
     projection = {
         "WORKSPACE_RUNTIME_CAPACITY_CONTEXT": context_name,
-        "WORKSPACE_RUNTIME_CAPACITY_DISPATCH_BATCH_SIZE": str(
-            context["dispatch_batch_size"]
-        ),
+        "WORKSPACE_RUNTIME_CAPACITY_DISPATCH_BATCH_SIZE": str(dispatch_batch_size),
         "WORKSPACE_RUNTIME_CAPACITY_GENERAL_CONCURRENCY": str(general),
-        "WORKSPACE_TRR_REMOTE_SOCIAL_DISPATCH_LIMIT": str(
-            context["dispatch_batch_size"]
-        ),
+        "WORKSPACE_TRR_REMOTE_SOCIAL_DISPATCH_LIMIT": str(dispatch_batch_size),
         "WORKSPACE_TRR_MODAL_SOCIAL_JOB_CONCURRENCY_LIMIT": str(general),
         "WORKSPACE_TRR_REMOTE_SOCIAL_POSTS": str(stage_caps.get("posts", 1)),
         "WORKSPACE_TRR_REMOTE_SOCIAL_COMMENTS": str(stage_caps.get("comments", 1)),
@@ -159,56 +189,41 @@ def shell_projection(payload: dict[str, Any], context_name: str) -> dict[str, st
 
 
 def _parse_profile(path: Path) -> dict[str, str]:
-    values: dict[str, str] = {}
     try:
-        lines = path.read_text(encoding="utf-8").splitlines()
+        parsed = env_files.load_env_file(path)
     except (OSError, UnicodeError) as exc:
         raise CapacityContractError(f"unable to read profile {path}: {exc}") from exc
-    for raw_line in lines:
-        line = raw_line.split("#", 1)[0].strip()
-        if not line:
-            continue
-        if "=" not in line:
-            raise CapacityContractError(f"invalid profile line in {path}: {raw_line}")
-        key, value = line.split("=", 1)
-        values[key] = value
-    return values
+    if not parsed.exists:
+        raise CapacityContractError(f"unable to read profile {path}: file not found")
+    if parsed.invalid_lines:
+        raise CapacityContractError(f"invalid profile line in {path}: {parsed.invalid_lines[0][1]}")
+    return parsed.values
 
 
-def _modal_defaults() -> dict[str, str]:
-    path = ROOT / "TRR-Backend" / "trr_backend" / "modal_jobs.py"
+def _modal_defaults(root: Path = ROOT, *, cache_path: Path | None = None) -> dict[str, str]:
+    path = root / MODAL_JOBS
     try:
-        source = path.read_text(encoding="utf-8")
+        constants = source_literals.literal_constants(
+            path,
+            ("_CANONICAL_MODAL_RUNTIME_DEFAULTS",),
+            cache_path=source_literals.default_cache_path(root) if cache_path is None else cache_path,
+        )
     except (OSError, UnicodeError) as exc:
         raise CapacityContractError(
             f"unable to read Modal runtime defaults from {path}: {exc}"
         ) from exc
-    try:
-        tree = ast.parse(source, filename=str(path))
     except (SyntaxError, ValueError) as exc:
         raise CapacityContractError(
             f"unable to parse Modal runtime defaults from {path}: {exc}"
         ) from exc
-    for node in tree.body:
-        if not isinstance(node, ast.AnnAssign) or not isinstance(node.target, ast.Name):
-            continue
-        if node.target.id != "_CANONICAL_MODAL_RUNTIME_DEFAULTS" or node.value is None:
-            continue
-        if not isinstance(node.value, ast.Dict):
-            break
-        values: dict[str, str] = {}
-        for key_node, value_node in zip(
-            node.value.keys, node.value.values, strict=True
-        ):
-            try:
-                key = ast.literal_eval(key_node)
-                value = ast.literal_eval(value_node)
-            except (ValueError, TypeError):
-                continue
-            if isinstance(key, str) and isinstance(value, (str, int)):
-                values[key] = str(value)
-        return values
-    raise CapacityContractError("unable to locate _CANONICAL_MODAL_RUNTIME_DEFAULTS")
+    defaults = constants.get("_CANONICAL_MODAL_RUNTIME_DEFAULTS")
+    if not isinstance(defaults, dict):
+        raise CapacityContractError("unable to locate _CANONICAL_MODAL_RUNTIME_DEFAULTS")
+    return {
+        key: str(value)
+        for key, value in defaults.items()
+        if isinstance(key, str) and isinstance(value, (str, int))
+    }
 
 
 def _owned_return_nodes(node: ast.AST) -> Iterator[ast.Return]:
@@ -224,21 +239,10 @@ def _owned_return_nodes(node: ast.AST) -> Iterator[ast.Return]:
         yield from _owned_return_nodes(child)
 
 
-def validate_social_dispatch_fallback(
-    payload: dict[str, Any],
-    *,
-    implementation_path: Path | None = None,
-) -> None:
-    path = implementation_path or (
-        ROOT
-        / "TRR-Backend"
-        / "trr_backend"
-        / "socials"
-        / "social_season_analytics_impl.py"
-    )
+def _inspect_social_dispatch_fallback(path: Path, source: bytes) -> int:
     try:
-        tree = ast.parse(path.read_text(encoding="utf-8"), filename=str(path))
-    except (OSError, SyntaxError) as exc:
+        tree = ast.parse(source, filename=str(path))
+    except (SyntaxError, ValueError) as exc:
         raise CapacityContractError(
             f"unable to inspect social dispatch fallback in {path}: {exc}"
         ) from exc
@@ -296,6 +300,38 @@ def validate_social_dispatch_fallback(
             "_modal_dispatch_limit must pass SOCIAL_MODAL_DISPATCH_LIMIT_DEFAULT to its returned resolver"
         )
 
+    return fallback_value
+
+
+def social_dispatch_fallback(path: Path, *, cache_path: Path | None = None) -> int:
+    """Return the literal SOCIAL_MODAL_DISPATCH_LIMIT_DEFAULT wired into ``_modal_dispatch_limit``.
+
+    Only successful inspections are cached, keyed by the file's sha256 and
+    ``SOCIAL_DISPATCH_FALLBACK_ANALYSIS_VERSION``; a changed file, or one that
+    fails the structural checks, is parsed again.
+    """
+    try:
+        return source_literals.cached_analysis(
+            path,
+            "social_dispatch_fallback",
+            lambda source: _inspect_social_dispatch_fallback(path, source),
+            version=SOCIAL_DISPATCH_FALLBACK_ANALYSIS_VERSION,
+            cache_path=cache_path,
+        )
+    except OSError as exc:
+        raise CapacityContractError(
+            f"unable to inspect social dispatch fallback in {path}: {exc}"
+        ) from exc
+
+
+def validate_social_dispatch_fallback(
+    payload: dict[str, Any],
+    *,
+    implementation_path: Path | None = None,
+    cache_path: Path | None = None,
+) -> None:
+    path = implementation_path or ROOT / SOCIAL_IMPLEMENTATION
+    fallback_value = social_dispatch_fallback(path, cache_path=cache_path)
     expected = payload["contexts"]["local_workspace"]["dispatch_batch_size"]
     if fallback_value != expected:
         raise CapacityContractError(
@@ -303,232 +339,277 @@ def validate_social_dispatch_fallback(
         )
 
 
-def validate_projections(payload: dict[str, Any], root: Path = ROOT) -> None:
-    contexts = payload["contexts"]
-    profile_contexts = payload.get("profile_contexts")
-    if not isinstance(profile_contexts, dict):
-        raise CapacityContractError("profile_contexts must be an object")
-
-    for profile_name, context_name in profile_contexts.items():
-        profile_path = root / "profiles" / f"{profile_name}.env"
-        if not profile_path.is_file():
-            raise CapacityContractError(f"missing profile: {profile_path}")
-        values = _parse_profile(profile_path)
-        if values.get("WORKSPACE_RUNTIME_CAPACITY_PROFILE") != context_name:
-            raise CapacityContractError(
-                f"{profile_name} does not select capacity context {context_name}"
+class ProjectionEngine:
+    """A validated capacity manifest with every context projection materialized.
+
+    Profiles are parsed on first use and shared by the context and override
+    checks. Source literals are cached in ``cache_path``, by default under
+    ``root``'s ``.logs/workspace``.
+    """
+
+    def __init__(
+        self,
+        payload: dict[str, Any],
+        root: Path = ROOT,
+        *,
+        cache_path: Path | None = None,
+    ) -> None:
+        self.payload = payload
+        self.root = root
+        self.cache_path = source_literals.default_cache_path(root) if cache_path is None else cache_path
+        self._projections: dict[str, dict[str, str]] = {}
+        self._profiles: dict[str, dict[str, str]] = {}
+
+    @classmethod
+    def from_manifest(
+        cls, path: Path = DEFAULT_MANIFEST, root: Path = ROOT, *, cache_path: Path | None = None
+    ) -> ProjectionEngine:
+        payload = load_manifest(path)
+        validate_manifest(payload)
+        return cls(payload, root, cache_path=cache_path)
+
+    def projection(self, context_name: str) -> dict[str, str]:
+        projection = self._projections.get(context_name)
+        if projection is None:
+            projection = self._projections[context_name] = shell_projection(
+                self.payload, context_name
             )
-        expected = shell_projection(payload, str(context_name))
-        for key in (
-            "WORKSPACE_TRR_REMOTE_SOCIAL_DISPATCH_LIMIT",
-            "WORKSPACE_TRR_MODAL_SOCIAL_JOB_CONCURRENCY_LIMIT",
-        ):
-            if key in values and values[key] != expected[key]:
+        return projection
+
+    def profile_path(self, profile_name: str) -> Path:
+        return self.root / "profiles" / f"{profile_name}.env"
+
+    def profile(self, profile_name: str) -> dict[str, str]:
+        values = self._profiles.get(profile_name)
+        if values is None:
+            values = self._profiles[profile_name] = _parse_profile(
+                self.profile_path(profile_name)
+            )
+        return values
+
+    def validate(self) -> None:
+        payload = self.payload
+        root = self.root
+        contexts = payload["contexts"]
+        profile_contexts = payload.get("profile_contexts")
+        if not isinstance(profile_contexts, dict):
+            raise CapacityContractError("profile_contexts must be an object")
+
+        for profile_name, context_name in profile_contexts.items():
+            profile_path = self.profile_path(profile_name)
+            if not profile_path.is_file():
+                raise CapacityContractError(f"missing profile: {profile_path}")
+            values = self.profile(profile_name)
+            if values.get("WORKSPACE_RUNTIME_CAPACITY_PROFILE") != context_name:
                 raise CapacityContractError(
-                    f"{profile_name} {key}={values[key]} does not match {context_name}={expected[key]}"
+                    f"{profile_name} does not select capacity context {context_name}"
                 )
-        if values.get("WORKSPACE_TRR_REMOTE_SOCIAL_WORKERS") == "1":
+            expected = self.projection(str(context_name))
             for key in (
                 "WORKSPACE_TRR_REMOTE_SOCIAL_DISPATCH_LIMIT",
                 "WORKSPACE_TRR_MODAL_SOCIAL_JOB_CONCURRENCY_LIMIT",
             ):
-                if values.get(key) != expected[key]:
+                if key in values and values[key] != expected[key]:
                     raise CapacityContractError(
-                        f"enabled profile {profile_name} must explicitly preserve {key}={expected[key]}"
+                        f"{profile_name} {key}={values[key]} does not match {context_name}={expected[key]}"
+                    )
+            if values.get("WORKSPACE_TRR_REMOTE_SOCIAL_WORKERS") == "1":
+                for key in (
+                    "WORKSPACE_TRR_REMOTE_SOCIAL_DISPATCH_LIMIT",
+                    "WORKSPACE_TRR_MODAL_SOCIAL_JOB_CONCURRENCY_LIMIT",
+                ):
+                    if values.get(key) != expected[key]:
+                        raise CapacityContractError(
+                            f"enabled profile {profile_name} must explicitly preserve {key}={expected[key]}"
+                        )
+
+        profile_overrides = payload.get("profile_overrides")
+        if not isinstance(profile_overrides, dict):
+            raise CapacityContractError("profile_overrides must be an object")
+        for profile_name, override in profile_overrides.items():
+            if not isinstance(override, dict):
+                raise CapacityContractError(
+                    f"profile override {profile_name} must be an object"
+                )
+            values = self.profile(profile_name)
+            remote_social_enabled = override.get("remote_social_enabled")
+            if not isinstance(remote_social_enabled, bool):
+                raise CapacityContractError(
+                    f"profile override {profile_name}.remote_social_enabled must be boolean"
+                )
+            enabled = "1" if remote_social_enabled else "0"
+            if values.get("WORKSPACE_TRR_REMOTE_SOCIAL_WORKERS") != enabled:
+                raise CapacityContractError(
+                    f"profile override {profile_name} remote social state differs from profile"
+                )
+            stage_caps = override.get("stage_caps")
+            if not isinstance(stage_caps, dict):
+                raise CapacityContractError(
+                    f"profile override {profile_name}.stage_caps must be an object"
+                )
+            for stage_name, env_key in STAGE_ENV_KEYS.items():
+                expected_value = _positive_int(
+                    stage_caps.get(stage_name),
+                    f"profile_overrides.{profile_name}.stage_caps.{stage_name}",
+                    allow_zero=True,
+                )
+                if values.get(env_key) != str(expected_value):
+                    raise CapacityContractError(
+                        f"profile override {profile_name} {env_key} differs from matrix"
                     )
 
-    profile_overrides = payload.get("profile_overrides")
-    if not isinstance(profile_overrides, dict):
-        raise CapacityContractError("profile_overrides must be an object")
-    stage_env_keys = {
-        "posts": "WORKSPACE_TRR_REMOTE_SOCIAL_POSTS",
-        "comments": "WORKSPACE_TRR_REMOTE_SOCIAL_COMMENTS",
-        "media_mirror": "WORKSPACE_TRR_REMOTE_SOCIAL_MEDIA_MIRROR",
-        "comment_media_mirror": "WORKSPACE_TRR_REMOTE_SOCIAL_COMMENT_MEDIA_MIRROR",
-    }
-    for profile_name, override in profile_overrides.items():
-        if not isinstance(override, dict):
-            raise CapacityContractError(
-                f"profile override {profile_name} must be an object"
-            )
-        values = _parse_profile(root / "profiles" / f"{profile_name}.env")
-        remote_social_enabled = override.get("remote_social_enabled")
-        if not isinstance(remote_social_enabled, bool):
-            raise CapacityContractError(
-                f"profile override {profile_name}.remote_social_enabled must be boolean"
-            )
-        enabled = "1" if remote_social_enabled else "0"
-        if values.get("WORKSPACE_TRR_REMOTE_SOCIAL_WORKERS") != enabled:
-            raise CapacityContractError(
-                f"profile override {profile_name} remote social state differs from profile"
-            )
-        stage_caps = override.get("stage_caps")
-        if not isinstance(stage_caps, dict):
-            raise CapacityContractError(
-                f"profile override {profile_name}.stage_caps must be an object"
-            )
-        for stage_name, env_key in stage_env_keys.items():
-            expected_value = _positive_int(
-                stage_caps.get(stage_name),
-                f"profile_overrides.{profile_name}.stage_caps.{stage_name}",
-                allow_zero=True,
-            )
-            if values.get(env_key) != str(expected_value):
+        validate_social_dispatch_fallback(
+            payload,
+            implementation_path=root / SOCIAL_IMPLEMENTATION,
+            cache_path=self.cache_path,
+        )
+
+        modal_defaults = _modal_defaults(root, cache_path=self.cache_path)
+        hosted = contexts["hosted_modal"]
+        expected_modal = {
+            "TRR_RUNTIME_CAPACITY_CONTEXT": "hosted_modal",
+            "SOCIAL_MODAL_DISPATCH_LIMIT": hosted["dispatch_batch_size"],
+            "TRR_MODAL_SOCIAL_JOB_CONCURRENCY_LIMIT": hosted["container_job_concurrency"][
+                "general_social"
+            ],
+            "TRR_MODAL_SOCIAL_COMMENTS_JOB_CONCURRENCY_LIMIT": hosted[
+                "container_job_concurrency"
+            ]["comments"],
+            "TRR_MODAL_SOCIAL_COMMENTS_RECOVERY_JOB_CONCURRENCY_LIMIT": hosted[
+                "container_job_concurrency"
+            ]["comments_recovery"],
+            "TRR_MODAL_SOCIAL_MEDIA_JOB_CONCURRENCY_LIMIT": hosted[
+                "container_job_concurrency"
+            ]["media"],
+            "TRR_MODAL_SOCIAL_RECOVERY_CONCURRENCY_LIMIT": hosted[
+                "container_job_concurrency"
+            ]["recovery"],
+            "SOCIAL_WORKER_POOL_COMMENTS": hosted["stage_caps"]["comments"],
+            "SOCIAL_WORKER_POOL_MEDIA_MIRROR": hosted["stage_caps"]["media_mirror"],
+            "SOCIAL_WORKER_POOL_COMMENT_MEDIA_MIRROR": hosted["stage_caps"][
+                "comment_media_mirror"
+            ],
+            "SOCIAL_POSTS_COMMENTS_PLATFORM_CAP_INSTAGRAM": hosted["stage_caps"][
+                "instagram_posts_comments_platform"
+            ],
+        }
+        for key, expected_value in expected_modal.items():
+            if modal_defaults.get(key) != str(expected_value):
                 raise CapacityContractError(
-                    f"profile override {profile_name} {env_key} differs from matrix"
+                    f"Modal projection {key}={modal_defaults.get(key)!r} does not match hosted matrix {expected_value}"
                 )
 
-    validate_social_dispatch_fallback(
-        payload,
-        implementation_path=(
-            root
-            / "TRR-Backend"
-            / "trr_backend"
-            / "socials"
-            / "social_season_analytics_impl.py"
-        ),
-    )
+        try:
+            makefile = (root / "Makefile").read_text(encoding="utf-8")
+        except (OSError, UnicodeError) as exc:
+            raise CapacityContractError(f"unable to read Makefile: {exc}") from exc
+        hybrid = contexts["workspace_hybrid"]
+        for assignment in (
+            f"WORKSPACE_TRR_REMOTE_SOCIAL_DISPATCH_LIMIT={hybrid['dispatch_batch_size']}",
+            "WORKSPACE_TRR_MODAL_SOCIAL_JOB_CONCURRENCY_LIMIT="
+            f"{hybrid['container_job_concurrency']['general_social']}",
+        ):
+            if assignment not in makefile:
+                raise CapacityContractError(
+                    f"Makefile is missing hybrid projection: {assignment}"
+                )
 
-    modal_defaults = _modal_defaults()
-    hosted = contexts["hosted_modal"]
-    expected_modal = {
-        "TRR_RUNTIME_CAPACITY_CONTEXT": "hosted_modal",
-        "SOCIAL_MODAL_DISPATCH_LIMIT": hosted["dispatch_batch_size"],
-        "TRR_MODAL_SOCIAL_JOB_CONCURRENCY_LIMIT": hosted["container_job_concurrency"][
-            "general_social"
-        ],
-        "TRR_MODAL_SOCIAL_COMMENTS_JOB_CONCURRENCY_LIMIT": hosted[
-            "container_job_concurrency"
-        ]["comments"],
-        "TRR_MODAL_SOCIAL_COMMENTS_RECOVERY_JOB_CONCURRENCY_LIMIT": hosted[
-            "container_job_concurrency"
-        ]["comments_recovery"],
-        "TRR_MODAL_SOCIAL_MEDIA_JOB_CONCURRENCY_LIMIT": hosted[
-            "container_job_concurrency"
-        ]["media"],
-        "TRR_MODAL_SOCIAL_RECOVERY_CONCURRENCY_LIMIT": hosted[
-            "container_job_concurrency"
-        ]["recovery"],
-        "SOCIAL_WORKER_POOL_COMMENTS": hosted["stage_caps"]["comments"],
-        "SOCIAL_WORKER_POOL_MEDIA_MIRROR": hosted["stage_caps"]["media_mirror"],
-        "SOCIAL_WORKER_POOL_COMMENT_MEDIA_MIRROR": hosted["stage_caps"][
-            "comment_media_mirror"
-        ],
-        "SOCIAL_POSTS_COMMENTS_PLATFORM_CAP_INSTAGRAM": hosted["stage_caps"][
-            "instagram_posts_comments_platform"
-        ],
-    }
-    for key, expected_value in expected_modal.items():
-        if modal_defaults.get(key) != str(expected_value):
-            raise CapacityContractError(
-                f"Modal projection {key}={modal_defaults.get(key)!r} does not match hosted matrix {expected_value}"
+        try:
+            status_script = (root / "scripts" / "status-workspace.sh").read_text(
+                encoding="utf-8"
             )
-
-    try:
-        makefile = (root / "Makefile").read_text(encoding="utf-8")
-    except (OSError, UnicodeError) as exc:
-        raise CapacityContractError(f"unable to read Makefile: {exc}") from exc
-    hybrid = contexts["workspace_hybrid"]
-    for assignment in (
-        f"WORKSPACE_TRR_REMOTE_SOCIAL_DISPATCH_LIMIT={hybrid['dispatch_batch_size']}",
-        "WORKSPACE_TRR_MODAL_SOCIAL_JOB_CONCURRENCY_LIMIT="
-        f"{hybrid['container_job_concurrency']['general_social']}",
-    ):
-        if assignment not in makefile:
+        except (OSError, UnicodeError) as exc:
             raise CapacityContractError(
-                f"Makefile is missing hybrid projection: {assignment}"
-            )
+                f"unable to read status-workspace.sh: {exc}"
+            ) from exc
+        local = contexts["local_workspace"]
+        for assignment in (
+            'WORKSPACE_RUNTIME_CAPACITY_PROFILE="${WORKSPACE_RUNTIME_CAPACITY_PROFILE:-local_workspace}"',
+            'WORKSPACE_RUNTIME_CAPACITY_CONTEXT="${WORKSPACE_RUNTIME_CAPACITY_CONTEXT:-$WORKSPACE_RUNTIME_CAPACITY_PROFILE}"',
+            f'WORKSPACE_TRR_REMOTE_SOCIAL_DISPATCH_LIMIT="${{WORKSPACE_TRR_REMOTE_SOCIAL_DISPATCH_LIMIT:-{local["dispatch_batch_size"]}}}"',
+            f'WORKSPACE_TRR_MODAL_SOCIAL_JOB_CONCURRENCY_LIMIT="${{WORKSPACE_TRR_MODAL_SOCIAL_JOB_CONCURRENCY_LIMIT:-{local["container_job_concurrency"]["general_social"]}}}"',
+        ):
+            if assignment not in status_script:
+                raise CapacityContractError(
+                    f"status-workspace.sh is missing capacity projection: {assignment}"
+                )
 
-    try:
-        status_script = (root / "scripts" / "status-workspace.sh").read_text(
-            encoding="utf-8"
-        )
-    except (OSError, UnicodeError) as exc:
-        raise CapacityContractError(
-            f"unable to read status-workspace.sh: {exc}"
-        ) from exc
-    local = contexts["local_workspace"]
-    for assignment in (
-        'WORKSPACE_RUNTIME_CAPACITY_PROFILE="${WORKSPACE_RUNTIME_CAPACITY_PROFILE:-local_workspace}"',
-        'WORKSPACE_RUNTIME_CAPACITY_CONTEXT="${WORKSPACE_RUNTIME_CAPACITY_CONTEXT:-$WORKSPACE_RUNTIME_CAPACITY_PROFILE}"',
-        f'WORKSPACE_TRR_REMOTE_SOCIAL_DISPATCH_LIMIT="${{WORKSPACE_TRR_REMOTE_SOCIAL_DISPATCH_LIMIT:-{local["dispatch_batch_size"]}}}"',
-        f'WORKSPACE_TRR_MODAL_SOCIAL_JOB_CONCURRENCY_LIMIT="${{WORKSPACE_TRR_MODAL_SOCIAL_JOB_CONCURRENCY_LIMIT:-{local["container_job_concurrency"]["general_social"]}}}"',
-    ):
-        if assignment not in status_script:
-            raise CapacityContractError(
-                f"status-workspace.sh is missing capacity projection: {assignment}"
+        workspace_presets = payload.get("workspace_presets")
+        if not isinstance(workspace_presets, dict):
+            raise CapacityContractError("workspace_presets must be an object")
+        for target_name, preset in workspace_presets.items():
+            if not isinstance(preset, dict) or preset.get("context") != "workspace_hybrid":
+                raise CapacityContractError(
+                    f"workspace preset {target_name} must select workspace_hybrid"
+                )
+            target_match = re.search(
+                rf"(?ms)^{re.escape(target_name)}:\n(.*?)(?=^[A-Za-z0-9_.-]+:|\Z)",
+                makefile,
             )
+            if target_match is None:
+                raise CapacityContractError(
+                    f"Makefile is missing workspace preset {target_name}"
+                )
+            target_body = target_match.group(1)
+            preset_stage_caps = preset.get("stage_caps")
+            if not isinstance(preset_stage_caps, dict):
+                raise CapacityContractError(
+                    f"workspace preset {target_name}.stage_caps must be an object"
+                )
+            unknown_stage_caps = sorted(preset_stage_caps.keys() - STAGE_ENV_KEYS.keys())
+            if unknown_stage_caps:
+                raise CapacityContractError(
+                    f"workspace preset {target_name} has unknown stage caps: {', '.join(unknown_stage_caps)}"
+                )
+            for stage_name, value in preset_stage_caps.items():
+                _positive_int(
+                    value,
+                    f"workspace_presets.{target_name}.stage_caps.{stage_name}",
+                    allow_zero=True,
+                )
+            expected_assignments = {
+                "WORKSPACE_TRR_REMOTE_SOCIAL_WORKERS": 1,
+                "WORKSPACE_TRR_REMOTE_SOCIAL_DISPATCH_LIMIT": hybrid["dispatch_batch_size"],
+                "WORKSPACE_TRR_MODAL_SOCIAL_JOB_CONCURRENCY_LIMIT": hybrid[
+                    "container_job_concurrency"
+                ]["general_social"],
+                **{
+                    STAGE_ENV_KEYS[stage_name]: value
+                    for stage_name, value in preset_stage_caps.items()
+                },
+            }
+            for key, expected_value in expected_assignments.items():
+                if f"{key}={expected_value}" not in target_body:
+                    raise CapacityContractError(
+                        f"Makefile preset {target_name} is missing {key}={expected_value}"
+                    )
 
-    workspace_presets = payload.get("workspace_presets")
-    if not isinstance(workspace_presets, dict):
-        raise CapacityContractError("workspace_presets must be an object")
-    for target_name, preset in workspace_presets.items():
-        if not isinstance(preset, dict) or preset.get("context") != "workspace_hybrid":
+        try:
+            runtime_adapter = (
+                root / "TRR-Backend" / "scripts" / "_workspace_runtime_env.py"
+            ).read_text(encoding="utf-8")
+        except (OSError, UnicodeError) as exc:
             raise CapacityContractError(
-                f"workspace preset {target_name} must select workspace_hybrid"
-            )
-        target_match = re.search(
-            rf"(?ms)^{re.escape(target_name)}:\n(.*?)(?=^[A-Za-z0-9_.-]+:|\Z)",
-            makefile,
-        )
-        if target_match is None:
-            raise CapacityContractError(
-                f"Makefile is missing workspace preset {target_name}"
-            )
-        target_body = target_match.group(1)
-        preset_stage_caps = preset.get("stage_caps")
-        if not isinstance(preset_stage_caps, dict):
-            raise CapacityContractError(
-                f"workspace preset {target_name}.stage_caps must be an object"
-            )
-        unknown_stage_caps = sorted(preset_stage_caps.keys() - stage_env_keys.keys())
-        if unknown_stage_caps:
-            raise CapacityContractError(
-                f"workspace preset {target_name} has unknown stage caps: {', '.join(unknown_stage_caps)}"
-            )
-        for stage_name, value in preset_stage_caps.items():
-            _positive_int(
-                value,
-                f"workspace_presets.{target_name}.stage_caps.{stage_name}",
-                allow_zero=True,
-            )
-        expected_assignments = {
-            "WORKSPACE_TRR_REMOTE_SOCIAL_WORKERS": 1,
-            "WORKSPACE_TRR_REMOTE_SOCIAL_DISPATCH_LIMIT": hybrid["dispatch_batch_size"],
-            "WORKSPACE_TRR_MODAL_SOCIAL_JOB_CONCURRENCY_LIMIT": hybrid[
-                "container_job_concurrency"
-            ]["general_social"],
-            **{
-                stage_env_keys[stage_name]: value
-                for stage_name, value in preset_stage_caps.items()
-            },
-        }
-        for key, expected_value in expected_assignments.items():
-            if f"{key}={expected_value}" not in target_body:
+                f"unable to read backend runtime adapter: {exc}"
+            ) from exc
+        for workspace_key, runtime_key in (
+            ("WORKSPACE_TRR_REMOTE_SOCIAL_DISPATCH_LIMIT", "SOCIAL_MODAL_DISPATCH_LIMIT"),
+            (
+                "WORKSPACE_TRR_MODAL_SOCIAL_JOB_CONCURRENCY_LIMIT",
+                "TRR_MODAL_SOCIAL_JOB_CONCURRENCY_LIMIT",
+            ),
+        ):
+            pattern = re.compile(rf'"{workspace_key}"\s*:\s*"{runtime_key}"')
+            if not pattern.search(runtime_adapter):
                 raise CapacityContractError(
-                    f"Makefile preset {target_name} is missing {key}={expected_value}"
+                    f"backend runtime adapter is missing {workspace_key} -> {runtime_key}"
                 )
 
-    try:
-        runtime_adapter = (
-            root / "TRR-Backend" / "scripts" / "_workspace_runtime_env.py"
-        ).read_text(encoding="utf-8")
-    except (OSError, UnicodeError) as exc:
-        raise CapacityContractError(
-            f"unable to read backend runtime adapter: {exc}"
-        ) from exc
-    for workspace_key, runtime_key in (
-        ("WORKSPACE_TRR_REMOTE_SOCIAL_DISPATCH_LIMIT", "SOCIAL_MODAL_DISPATCH_LIMIT"),
-        (
-            "WORKSPACE_TRR_MODAL_SOCIAL_JOB_CONCURRENCY_LIMIT",
-            "TRR_MODAL_SOCIAL_JOB_CONCURRENCY_LIMIT",
-        ),
-    ):
-        pattern = re.compile(rf'"{workspace_key}"\s*:\s*"{runtime_key}"')
-        if not pattern.search(runtime_adapter):
-            raise CapacityContractError(
-                f"backend runtime adapter is missing {workspace_key} -> {runtime_key}"
-            )
+
+def validate_projections(
+    payload: dict[str, Any], root: Path = ROOT, *, cache_path: Path | None = None
+) -> None:
+    ProjectionEngine(payload, root, cache_path=cache_path).validate()
 
 
 def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
@@ -536,6 +617,11 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
         description="Validate and project the TRR runtime-capacity authority."
     )
     parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST)
+    parser.add_argument(
+        "--cache-path",
+        type=Path,
+        help="Source-literal cache file (default: .logs/workspace/source-literals-cache.json).",
+    )
     subparsers = parser.add_subparsers(dest="command", required=True)
     subparsers.add_parser("check")
     shell_parser = subparsers.add_parser("shell")
@@ -546,13 +632,12 @@ def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
 def main(argv: list[str] | None = None) -> int:
     args = parse_args(argv)
     try:
-        payload = load_manifest(args.manifest)
-        validate_manifest(payload)
+        engine = ProjectionEngine.from_manifest(args.manifest, cache_path=args.cache_path)
         if args.command == "check":
-            validate_projections(payload)
+            engine.validate()
             print("runtime-capacity: OK")
         else:
-            for key, value in shell_projection(payload, args.context).items():
+            for key, value in engine.projection(args.context).items():
                 if not re.fullmatch(r"[A-Za-z0-9_.:/-]+", value):
                     raise CapacityContractError(
                         f"unsafe shell projection value for {key}"
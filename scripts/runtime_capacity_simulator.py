@@ -0,0 +1,516 @@
+#!/usr/bin/env python3
+"""Simulate social dispatch against a runtime-capacity context.
+
+Discrete-event model of the remote social lane for one or more contexts in
+``docs/workspace/runtime-capacity.json``:
+
+- jobs (posts, comments, media mirror, comment media mirror) arrive from a
+  synthetic mix or a recorded JSONL file and wait in one FIFO queue;
+- every ``--dispatch-interval-seconds`` the dispatcher sweeps the queue and
+  starts at most ``dispatch_batch_size`` jobs, skipping jobs whose stage cap,
+  container family limit, or Instagram posts/comments platform cap is full;
+- each started job holds one Modal container and ``db_sessions`` Supabase
+  session-mode connections until it finishes.
+
+Container families follow the manifest: comments use ``comments`` and media
+stages use ``media`` when the context defines them, otherwise everything
+shares ``general_social``. A stage missing from ``stage_caps`` runs at 1, the
+same default the shell projection uses.
+
+The report covers throughput, queue depth over time, peak DB sessions against
+the session budget (Supavisor pool size minus headroom, see
+``docs/workspace/supabase-capacity-budget.md``) and peak Modal containers.
+``--set`` tries candidate values on a copy of the context; the manifest is
+never modified.
+"""
+
+from __future__ import annotations
+
+import argparse
+import copy
+import heapq
+import json
+import os
+import random
+import sys
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any
+
+
+ROOT = Path(__file__).resolve().parents[1]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.runtime_capacity import (  # noqa: E402
+    DEFAULT_MANIFEST,
+    CapacityContractError,
+    load_manifest,
+    validate_manifest,
+)
+
+STAGES = ("posts", "comments", "media_mirror", "comment_media_mirror")
+STAGE_FAMILIES = {
+    "posts": ("general_social",),
+    "comments": ("comments", "general_social"),
+    "media_mirror": ("media", "general_social"),
+    "comment_media_mirror": ("media", "general_social"),
+}
+PLATFORM_CAPPED_STAGES = frozenset({"posts", "comments"})
+DEFAULT_CONTEXTS = ("hosted_modal", "workspace_hybrid")
+DEFAULT_JOB_COUNTS = {"posts": 20, "comments": 80, "media_mirror": 40, "comment_media_mirror": 20}
+DEFAULT_DURATIONS = {"posts": 20.0, "comments": 45.0, "media_mirror": 30.0, "comment_media_mirror": 30.0}
+DEFAULT_SESSION_POOL_SIZE = 15
+DEFAULT_SESSION_HEADROOM = 5
+
+_COMPLETE, _ARRIVE, _SWEEP = 0, 1, 2
+
+
+@dataclass(frozen=True)
+class Job:
+    job_id: int
+    stage: str
+    arrival_seconds: float
+    duration_seconds: float
+    db_sessions: int = 1
+    platform: str = "instagram"
+
+
+@dataclass(frozen=True)
+class SimulationConfig:
+    context: str
+    dispatch_batch_size: int
+    family_limits: dict[str, int]
+    stage_caps: dict[str, int]
+    platform_cap: int | None
+    session_budget: int
+    baseline_sessions: int = 0
+    dispatch_interval_seconds: float = 10.0
+    cold_start_seconds: float = 0.0
+
+    def family(self, stage: str) -> str:
+        return next(name for name in STAGE_FAMILIES[stage] if name in self.family_limits)
+
+
+@dataclass
+class StageReport:
+    submitted: int = 0
+    completed: int = 0
+    blocked: int = 0
+    peak_in_flight: int = 0
+    mean_wait_seconds: float = 0.0
+    p95_wait_seconds: float = 0.0
+
+
+@dataclass
+class SimulationReport:
+    context: str
+    config: SimulationConfig
+    jobs: int
+    completed: int
+    blocked: int
+    makespan_seconds: float
+    throughput_per_minute: float
+    peak_queue_depth: int
+    peak_db_sessions: int
+    session_budget: int
+    seconds_over_session_budget: float
+    peak_containers: int
+    peak_containers_by_family: dict[str, int]
+    stages: dict[str, StageReport] = field(default_factory=dict)
+    samples: list[dict[str, float | int]] = field(default_factory=list)
+
+    @property
+    def over_budget(self) -> bool:
+        return self.peak_db_sessions > self.session_budget
+
+    def to_dict(self) -> dict[str, Any]:
+        payload = asdict(self)
+        payload["over_budget"] = self.over_budget
+        return payload
+
+
+def _non_negative_int(value: Any, label: str) -> int:
+    if not isinstance(value, int) or isinstance(value, bool) or value < 0:
+        raise CapacityContractError(f"{label} must be a non-negative integer")
+    return value
+
+
+def apply_overrides(context: dict[str, Any], assignments: list[str]) -> dict[str, Any]:
+    """Return a copy of ``context`` with ``dotted.key=int`` assignments applied."""
+    updated = copy.deepcopy(context)
+    for assignment in assignments:
+        path, separator, raw_value = assignment.partition("=")
+        if not separator or not path:
+            raise CapacityContractError(f"--set expects KEY=VALUE, got {assignment!r}")
+        try:
+            value = int(raw_value)
+        except ValueError as exc:
+            raise CapacityContractError(f"--set {path} must be an integer") from exc
+        target = updated
+        *parents, leaf = path.split(".")
+        for part in parents:
+            child = target.get(part)
+            if not isinstance(child, dict):
+                raise CapacityContractError(f"--set {path}: {part} is not an object in the context")
+            target = child
+        target[leaf] = _non_negative_int(value, path)
+    return updated
+
+
+def config_from_context(
+    name: str,
+    context: dict[str, Any],
+    *,
+    session_pool_size: int = DEFAULT_SESSION_POOL_SIZE,
+    session_headroom: int = DEFAULT_SESSION_HEADROOM,
+    baseline_sessions: int = 0,
+    dispatch_interval_seconds: float = 10.0,
+    cold_start_seconds: float = 0.0,
+) -> SimulationConfig:
+    stage_caps = context.get("stage_caps", {})
+    family_limits = dict(context.get("container_job_concurrency", {}))
+    if "general_social" not in family_limits:
+        raise CapacityContractError(f"{name}.container_job_concurrency.general_social is required")
+    return SimulationConfig(
+        context=name,
+        dispatch_batch_size=_non_negative_int(context.get("dispatch_batch_size"), f"{name}.dispatch_batch_size"),
+        family_limits=family_limits,
+        stage_caps={stage: int(stage_caps.get(stage, 1)) for stage in STAGES},
+        platform_cap=stage_caps.get("instagram_posts_comments_platform"),
+        session_budget=max(0, session_pool_size - session_headroom),
+        baseline_sessions=baseline_sessions,
+        dispatch_interval_seconds=dispatch_interval_seconds,
+        cold_start_seconds=cold_start_seconds,
+    )
+
+
+def parse_stage_values(raw: str, label: str, cast: type = int) -> dict[str, Any]:
+    """Parse ``stage=value[,stage=value...]``."""
+    values: dict[str, Any] = {}
+    for item in filter(None, (part.strip() for part in raw.split(","))):
+        stage, separator, value = item.partition("=")
+        if not separator or stage not in STAGES:
+            raise CapacityContractError(f"{label} expects stage=value with stage in {', '.join(STAGES)}; got {item!r}")
+        try:
+            values[stage] = cast(value)
+        except ValueError as exc:
+            raise CapacityContractError(f"{label} {stage} must be a number") from exc
+        if values[stage] < 0:
+            raise CapacityContractError(f"{label} {stage} must not be negative")
+    return values
+
+
+def synthetic_jobs(
+    counts: dict[str, int],
+    *,
+    arrival_window_seconds: float,
+    durations: dict[str, float] | None = None,
+    seed: int = 0,
+    sessions_per_job: int = 1,
+) -> list[Job]:
+    """Uniform arrivals over the window; durations jitter +/-25% around the stage mean."""
+    rng = random.Random(seed)
+    means = {**DEFAULT_DURATIONS, **(durations or {})}
+    drafts = [
+        (rng.uniform(0.0, arrival_window_seconds), stage, means[stage] * rng.uniform(0.75, 1.25))
+        for stage in STAGES
+        for _ in range(counts.get(stage, 0))
+    ]
+    drafts.sort(key=lambda item: item[0])
+    return [
+        Job(job_id, stage, round(arrival, 3), round(duration, 3), sessions_per_job)
+        for job_id, (arrival, stage, duration) in enumerate(drafts)
+    ]
+
+
+def load_jobs(path: Path, *, sessions_per_job: int = 1) -> list[Job]:
+    """Read a recorded job mix: one JSON object per line.
+
+    Required fields: ``stage``, ``arrival_seconds``, ``duration_seconds``.
+    Optional: ``db_sessions`` (defaults to ``sessions_per_job``) and
+    ``platform`` (defaults to ``instagram``).
+    """
+    try:
+        lines = path.read_text(encoding="utf-8").splitlines()
+    except (OSError, UnicodeError) as exc:
+        raise CapacityContractError(f"unable to read job mix {path}: {exc}") from exc
+    jobs: list[Job] = []
+    for line_number, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            row = json.loads(line)
+            stage = row["stage"]
+            arrival = float(row["arrival_seconds"])
+            duration = float(row["duration_seconds"])
+            sessions = int(row.get("db_sessions", sessions_per_job))
+            platform = str(row.get("platform", "instagram"))
+        except (json.JSONDecodeError, KeyError, TypeError, ValueError, AttributeError) as exc:
+            raise CapacityContractError(f"{path}:{line_number}: invalid job record: {exc}") from exc
+        if stage not in STAGES or arrival < 0 or duration <= 0 or sessions < 0:
+            raise CapacityContractError(f"{path}:{line_number}: invalid job record")
+        jobs.append(Job(len(jobs), stage, arrival, duration, sessions, platform))
+    jobs.sort(key=lambda job: (job.arrival_seconds, job.job_id))
+    return jobs
+
+
+def _percentile(values: list[float], fraction: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def simulate(config: SimulationConfig, jobs: list[Job], *, max_seconds: float = 86400.0) -> SimulationReport:
+    events: list[tuple[float, int, int, int]] = []
+    order = 0
+
+    def push(at: float, kind: int, job_id: int = -1) -> None:
+        nonlocal order
+        heapq.heappush(events, (at, kind, order, job_id))
+        order += 1
+
+    by_id = {job.job_id: job for job in jobs}
+    for job in jobs:
+        push(job.arrival_seconds, _ARRIVE, job.job_id)
+    push(0.0, _SWEEP)
+
+    queue: deque[Job] = deque()
+    pending_arrivals = len(jobs)
+    stage_running = {stage: 0 for stage in STAGES}
+    family_running = {family: 0 for family in config.family_limits}
+    platform_running = 0
+    sessions = config.baseline_sessions
+    stages = {stage: StageReport() for stage in STAGES}
+    waits: dict[str, list[float]] = {stage: [] for stage in STAGES}
+    for job in jobs:
+        stages[job.stage].submitted += 1
+
+    peak_queue = peak_sessions = peak_containers = 0
+    peak_by_family = dict.fromkeys(config.family_limits, 0)
+    over_budget_seconds = 0.0
+    last_time = 0.0
+    makespan = 0.0
+    completed = 0
+    samples: list[dict[str, float | int]] = []
+
+    def platform_limited(job: Job) -> bool:
+        return config.platform_cap is not None and job.platform == "instagram" and job.stage in PLATFORM_CAPPED_STAGES
+
+    def can_start(job: Job) -> bool:
+        family = config.family(job.stage)
+        if stage_running[job.stage] >= config.stage_caps[job.stage]:
+            return False
+        if family_running[family] >= config.family_limits[family]:
+            return False
+        return not (platform_limited(job) and platform_running >= config.platform_cap)
+
+    while events:
+        now, kind, _order, job_id = heapq.heappop(events)
+        if now > max_seconds:
+            break
+        if sessions > config.session_budget:
+            over_budget_seconds += now - last_time
+        last_time = now
+
+        if kind == _ARRIVE:
+            queue.append(by_id[job_id])
+            pending_arrivals -= 1
+            peak_queue = max(peak_queue, len(queue))
+        elif kind == _COMPLETE:
+            job = by_id[job_id]
+            stage_running[job.stage] -= 1
+            family_running[config.family(job.stage)] -= 1
+            platform_running -= platform_limited(job)
+            sessions -= job.db_sessions
+            stages[job.stage].completed += 1
+            completed += 1
+            makespan = now
+        else:
+            started = 0
+            kept: deque[Job] = deque()
+            while queue:
+                job = queue.popleft()
+                if started >= config.dispatch_batch_size or not can_start(job):
+                    kept.append(job)
+                    continue
+                started += 1
+                family = config.family(job.stage)
+                stage_running[job.stage] += 1
+                family_running[family] += 1
+                platform_running += platform_limited(job)
+                sessions += job.db_sessions
+                waits[job.stage].append(now - job.arrival_seconds)
+                stages[job.stage].peak_in_flight = max(stages[job.stage].peak_in_flight, stage_running[job.stage])
+                peak_by_family[family] = max(peak_by_family[family], family_running[family])
+                push(now + config.cold_start_seconds + job.duration_seconds, _COMPLETE, job.job_id)
+            queue = kept
+            running = sum(stage_running.values())
+            peak_containers = max(peak_containers, running)
+            peak_sessions = max(peak_sessions, sessions)
+            samples.append(
+                {"t": round(now, 3), "queued": len(queue), "running": running, "db_sessions": sessions}
+            )
+            if running == 0 and pending_arrivals == 0 and (not queue or started == 0):
+                break  # drained, or every queued job is behind a zero cap
+            push(now + config.dispatch_interval_seconds, _SWEEP)
+
+    for job in queue:
+        stages[job.stage].blocked += 1
+    for stage, report in stages.items():
+        if waits[stage]:
+            report.mean_wait_seconds = round(sum(waits[stage]) / len(waits[stage]), 3)
+            report.p95_wait_seconds = round(_percentile(waits[stage], 0.95), 3)
+
+    return SimulationReport(
+        context=config.context,
+        config=config,
+        jobs=len(jobs),
+        completed=completed,
+        blocked=len(queue),
+        makespan_seconds=round(makespan, 3),
+        throughput_per_minute=round(completed * 60 / makespan, 3) if makespan else 0.0,
+        peak_queue_depth=peak_queue,
+        peak_db_sessions=peak_sessions,
+        session_budget=config.session_budget,
+        seconds_over_session_budget=round(over_budget_seconds, 3),
+        peak_containers=peak_containers,
+        peak_containers_by_family=peak_by_family,
+        stages=stages,
+        samples=samples,
+    )
+
+
+def render_text(report: SimulationReport) -> str:
+    budget_state = "OVER BUDGET" if report.over_budget else "within budget"
+    lines = [
+        f"[capacity-sim] {report.context}: {report.completed}/{report.jobs} jobs in {report.makespan_seconds:.0f}s "
+        f"({report.throughput_per_minute:.1f}/min), {report.blocked} blocked",
+        f"  dispatch batch {report.config.dispatch_batch_size} every {report.config.dispatch_interval_seconds:g}s; "
+        f"peak queue depth {report.peak_queue_depth}"
+        + (
+            f"; instagram posts+comments platform cap {report.config.platform_cap}"
+            if report.config.platform_cap is not None
+            else ""
+        ),
+        f"  peak DB sessions {report.peak_db_sessions} / budget {report.session_budget} ({budget_state}; "
+        f"{report.seconds_over_session_budget:.0f}s over)",
+        f"  peak Modal containers {report.peak_containers} ("
+        + ", ".join(
+            f"{family} {peak}/{report.config.family_limits[family]}"
+            for family, peak in report.peak_containers_by_family.items()
+        )
+        + ")",
+    ]
+    for stage, stage_report in report.stages.items():
+        if not stage_report.submitted:
+            continue
+        lines.append(
+            f"  {stage}: {stage_report.completed}/{stage_report.submitted} done, "
+            f"peak in flight {stage_report.peak_in_flight}/{report.config.stage_caps[stage]}, "
+            f"wait mean {stage_report.mean_wait_seconds:.0f}s p95 {stage_report.p95_wait_seconds:.0f}s"
+            + (f", {stage_report.blocked} blocked" if stage_report.blocked else "")
+        )
+    return "\n".join(lines)
+
+
+def _session_pool_size_default() -> int:
+    raw = str(os.getenv("WORKSPACE_SUPAVISOR_SESSION_POOL_SIZE") or "").strip()
+    try:
+        return int(raw) if raw else DEFAULT_SESSION_POOL_SIZE
+    except ValueError:
+        return DEFAULT_SESSION_POOL_SIZE
+
+
+def parse_args(argv: list[str] | None = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--manifest", type=Path, default=DEFAULT_MANIFEST)
+    parser.add_argument(
+        "--context",
+        action="append",
+        help=f"context to simulate; repeatable (default: {', '.join(DEFAULT_CONTEXTS)})",
+    )
+    parser.add_argument(
+        "--set",
+        action="append",
+        default=[],
+        metavar="KEY=VALUE",
+        help="override a context value for this run, e.g. stage_caps.comments=6 or container_job_concurrency.comments=6",
+    )
+    mix = parser.add_mutually_exclusive_group()
+    mix.add_argument(
+        "--jobs",
+        default=",".join(f"{stage}={count}" for stage, count in DEFAULT_JOB_COUNTS.items()),
+        help="synthetic job mix as stage=count pairs (default: %(default)s)",
+    )
+    mix.add_argument("--jobs-file", type=Path, help="recorded job mix (JSONL)")
+    parser.add_argument("--arrival-window-seconds", type=float, default=300.0)
+    parser.add_argument("--duration", default="", help="mean synthetic duration per stage, e.g. comments=60,posts=15")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--sessions-per-job", type=int, default=1)
+    parser.add_argument("--dispatch-interval-seconds", type=float, default=10.0)
+    parser.add_argument("--cold-start-seconds", type=float, default=0.0)
+    parser.add_argument(
+        "--session-pool-size",
+        type=int,
+        default=_session_pool_size_default(),
+        help="Supavisor session pool size (default: $WORKSPACE_SUPAVISOR_SESSION_POOL_SIZE or %(default)s)",
+    )
+    parser.add_argument("--session-headroom", type=int, default=DEFAULT_SESSION_HEADROOM)
+    parser.add_argument("--baseline-sessions", type=int, default=0, help="sessions held by other holders throughout")
+    parser.add_argument("--max-seconds", type=float, default=86400.0)
+    parser.add_argument("--json", action="store_true", help="print the full report, including queue samples, as JSON")
+    parser.add_argument("--fail-over-budget", action="store_true", help="exit 1 when any context exceeds the session budget")
+    args = parser.parse_args(argv)
+    if args.dispatch_interval_seconds <= 0:
+        parser.error("--dispatch-interval-seconds must be positive")
+    return args
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(argv)
+    try:
+        payload = load_manifest(args.manifest)
+        validate_manifest(payload)
+        if args.jobs_file is not None:
+            jobs = load_jobs(args.jobs_file, sessions_per_job=args.sessions_per_job)
+        else:
+            jobs = synthetic_jobs(
+                parse_stage_values(args.jobs, "--jobs"),
+                arrival_window_seconds=args.arrival_window_seconds,
+                durations=parse_stage_values(args.duration, "--duration", float),
+                seed=args.seed,
+                sessions_per_job=args.sessions_per_job,
+            )
+        reports: list[SimulationReport] = []
+        for name in args.context or DEFAULT_CONTEXTS:
+            context = payload["contexts"].get(name)
+            if not isinstance(context, dict):
+                raise CapacityContractError(f"unknown runtime capacity context: {name}")
+            config = config_from_context(
+                name,
+                apply_overrides(context, args.set),
+                session_pool_size=args.session_pool_size,
+                session_headroom=args.session_headroom,
+                baseline_sessions=args.baseline_sessions,
+                dispatch_interval_seconds=args.dispatch_interval_seconds,
+                cold_start_seconds=args.cold_start_seconds,
+            )
+            reports.append(simulate(config, jobs, max_seconds=args.max_seconds))
+    except CapacityContractError as exc:
+        print(f"capacity-sim: ERROR: {exc}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps([report.to_dict() for report in reports], indent=2, sort_keys=True))
+    else:
+        print("\n".join(render_text(report) for report in reports))
+    if args.fail_over_budget and any(report.over_budget for report in reports):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
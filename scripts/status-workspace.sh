@@ -6,16 +6,27 @@ LOG_DIR="${ROOT}/.logs/workspace"
 PIDFILE="${LOG_DIR}/pids.env"
 BACKEND_WATCHDOG_STATE_FILE="${LOG_DIR}/backend-watchdog.env"
 RUNTIME_RECONCILE_FILE="${LOG_DIR}/runtime-reconcile.json"
+
+# scripts/workspace/status.py collects the snapshot natively and calls back into
+# this script only for the Codex runtime section (--codex-runtime-json).
+# WORKSPACE_STATUS_ENGINE=bash keeps the sequential shell collector below.
+if [[ "${WORKSPACE_STATUS_ENGINE:-python}" != "bash" && "${1:-}" != "--codex-runtime-json" ]] && command -v python3 >/dev/null 2>&1; then
+  exec python3 "${ROOT}/scripts/workspace/status.py" "$@"
+fi
+
 source "${ROOT}/scripts/lib/mcp-runtime.sh"
 source "${ROOT}/scripts/lib/workspace-runtime-reconcile-contract.sh"
 source "${ROOT}/scripts/lib/workspace-health.sh"
 source "${ROOT}/scripts/lib/chrome-devtools-status.sh"
 source "${ROOT}/scripts/lib/context7-status.sh"
 source "${ROOT}/scripts/lib/doctor-plugin-registry.sh"
+source "${ROOT}/scripts/lib/phase-timings.sh"
 
 OUTPUT_FORMAT="text"
 if [[ "${1:-}" == "--json" ]]; then
   OUTPUT_FORMAT="json"
+elif [[ "${1:-}" == "--codex-runtime-json" ]]; then
+  OUTPUT_FORMAT="codex-runtime-json"
 elif [[ -n "${1:-}" ]]; then
   echo "Usage: $0 [--json]" >&2
   exit 1
@@ -524,24 +535,91 @@ build_codex_runtime_json() {
   printf ']'
 }
 
+# Lap timer for the probes below: each status_probe_lap call appends the time
+# since the previous lap to the phase timing ledger (scripts/preflight-timings.py).
+STATUS_PROBE_LAP_MS=""
+
+status_probe_lap_start() {
+  workspace_timings_is_enabled || return 0
+  STATUS_PROBE_LAP_MS="$(workspace_timings_now_ms)"
+}
+
+# Usage: status_probe_lap PROBE RC OUTPUT
+status_probe_lap() {
+  local now_ms
+
+  workspace_timings_is_enabled || return 0
+  now_ms="$(workspace_timings_now_ms)"
+  workspace_timings_record "$1" "$STATUS_PROBE_LAP_MS" "$now_ms" "$2" "$(workspace_timings_byte_count "$3")"
+  STATUS_PROBE_LAP_MS="$now_ms"
+}
+
+# status.py shares its timing run id with the --codex-runtime-json callback.
+if [[ "$OUTPUT_FORMAT" != "codex-runtime-json" || -z "${WORKSPACE_PHASE_TIMINGS_RUN_ID:-}" ]]; then
+  workspace_timings_init "$ROOT" "status"
+fi
+
+collect_codex_runtime() {
+  CONTEXT7_STATUS="$(context7_config_status)"
+  status_probe_lap context7-config "$?" "$CONTEXT7_STATUS"
+  CONTEXT7_CACHE_PARITY_STATUS="$(context7_cache_parity_status)"
+  status_probe_lap context7-cache-parity "$?" "$CONTEXT7_CACHE_PARITY_STATUS"
+  CONTEXT7_STALE_CACHE_COUNT="$(context7_stale_cache_count)"
+  status_probe_lap context7-stale-cache "$?" "$CONTEXT7_STALE_CACHE_COUNT"
+  PLUGIN_REGISTRY_JSON="$(doctor_plugin_registry_json 0)"
+  status_probe_lap plugin-registry "$?" "$PLUGIN_REGISTRY_JSON"
+  PLUGIN_REGISTRY_OVERALL="$(printf '%s' "$PLUGIN_REGISTRY_JSON" | "${MCP_RUNTIME_PYTHON_BIN:-python3}" -c 'import json,sys; print((json.load(sys.stdin) or {}).get("overall_status", "unknown"))' 2>/dev/null || echo "unknown")"
+  CODEX_APP_SERVER_ROWS="$(list_codex_app_servers)"
+  status_probe_lap codex-app-servers "$?" "$CODEX_APP_SERVER_ROWS"
+  CODEX_APP_SERVER_COUNT="$(printf '%s\n' "$CODEX_APP_SERVER_ROWS" | sed '/^$/d' | wc -l | tr -d ' ')"
+}
+
+status_codex_runtime_json() {
+  cat <<JSON
+{
+    "app_servers": $(build_codex_runtime_json),
+    "context7": {
+      "status": "$(json_escape "$CONTEXT7_STATUS")",
+      "label": "$(json_escape "$(context7_status_label "$CONTEXT7_STATUS")")",
+      "repair_command": "make context7-repair",
+      "plugin_root": "$(json_escape "$(context7_plugin_root)")",
+      "cache_root": "$(json_escape "$(context7_cache_root)")",
+      "cache_version": "$(json_escape "$(context7_cache_version)")",
+      "cache_plugin_root": "$(json_escape "$(context7_cache_plugin_root)")",
+      "cache_parity": "$(json_escape "$CONTEXT7_CACHE_PARITY_STATUS")",
+      "stale_cache_copies": "$(json_escape "$CONTEXT7_STALE_CACHE_COUNT")"
+    },
+    "plugin_registry": ${PLUGIN_REGISTRY_JSON}
+  }
+JSON
+}
+
+if [[ "$OUTPUT_FORMAT" == "codex-runtime-json" ]]; then
+  status_probe_lap_start
+  collect_codex_runtime
+  status_codex_runtime_json
+  exit 0
+fi
+
 BACKEND_READINESS_URL="$(workspace_backend_status_readiness_url "${TRR_BACKEND_PORT}")"
 BACKEND_LIVENESS_URL="$(workspace_backend_status_liveness_url "${TRR_BACKEND_PORT}")"
 APP_HEALTH_URL="http://${TRR_APP_HOST}:${TRR_APP_PORT}/"
+status_probe_lap_start
 BACKEND_READINESS_STATUS="$(backend_health_status "${BACKEND_READINESS_URL}" "${BACKEND_LIVENESS_URL}" "${TRR_BACKEND_PID:-}")"
+status_probe_lap backend-readiness "$?" "$BACKEND_READINESS_STATUS"
 BACKEND_LIVENESS_STATUS="$(health_status "${BACKEND_LIVENESS_URL}" "${TRR_BACKEND_PID:-}")"
+status_probe_lap backend-liveness "$?" "$BACKEND_LIVENESS_STATUS"
 APP_HEALTH_STATUS="$(health_status "${APP_HEALTH_URL}" "${TRR_APP_PID:-}")"
-CONTEXT7_STATUS="$(context7_config_status)"
-CONTEXT7_CACHE_PARITY_STATUS="$(context7_cache_parity_status)"
-CONTEXT7_STALE_CACHE_COUNT="$(context7_stale_cache_count)"
-PLUGIN_REGISTRY_JSON="$(doctor_plugin_registry_json 0)"
-PLUGIN_REGISTRY_OVERALL="$(printf '%s' "$PLUGIN_REGISTRY_JSON" | "${MCP_RUNTIME_PYTHON_BIN:-python3}" -c 'import json,sys; print((json.load(sys.stdin) or {}).get("overall_status", "unknown"))' 2>/dev/null || echo "unknown")"
+status_probe_lap app-health "$?" "$APP_HEALTH_STATUS"
+collect_codex_runtime
 
+status_probe_lap_start
 TRR_APP_LISTENERS="$(port_listeners "${TRR_APP_PORT}")"
+status_probe_lap app-listeners "$?" "$TRR_APP_LISTENERS"
 TRR_BACKEND_LISTENERS="$(port_listeners "${TRR_BACKEND_PORT}")"
+status_probe_lap backend-listeners "$?" "$TRR_BACKEND_LISTENERS"
 RUN_STATE="$([[ "$HAVE_PIDFILE" -eq 1 ]] && echo active || echo inactive)"
 BACKEND_WATCHDOG_STATE_LABEL="active"
-CODEX_APP_SERVER_ROWS="$(list_codex_app_servers)"
-CODEX_APP_SERVER_COUNT="$(printf '%s\n' "$CODEX_APP_SERVER_ROWS" | sed '/^$/d' | wc -l | tr -d ' ')"
 if [[ "$HAVE_PIDFILE" -ne 1 ]]; then
   if [[ "$HAVE_WATCHDOG_STATE" -eq 1 ]]; then
     BACKEND_WATCHDOG_STATE_LABEL="last_run_telemetry"
@@ -660,21 +738,7 @@ if [[ "$OUTPUT_FORMAT" == "json" ]]; then
     "modal_social_stage_caps": "$(json_escape "$(status_modal_social_stage_caps)")"
   },
   "runtime_reconcile": $(runtime_reconcile_json),
-  "codex_runtime": {
-    "app_servers": $(build_codex_runtime_json),
-    "context7": {
-      "status": "$(json_escape "$CONTEXT7_STATUS")",
-      "label": "$(json_escape "$(context7_status_label "$CONTEXT7_STATUS")")",
-      "repair_command": "make context7-repair",
-      "plugin_root": "$(json_escape "$(context7_plugin_root)")",
-      "cache_root": "$(json_escape "$(context7_cache_root)")",
-      "cache_version": "$(json_escape "$(context7_cache_version)")",
-      "cache_plugin_root": "$(json_escape "$(context7_cache_plugin_root)")",
-      "cache_parity": "$(json_escape "$CONTEXT7_CACHE_PARITY_STATUS")",
-      "stale_cache_copies": "$(json_escape "$CONTEXT7_STALE_CACHE_COUNT")"
-    },
-    "plugin_registry": ${PLUGIN_REGISTRY_JSON}
-  },
+  "codex_runtime": $(status_codex_runtime_json),
   "timestamp_utc": "$(date -u +%Y-%m-%dT%H:%M:%SZ)"
 }
 JSON
@@ -7,15 +7,23 @@ import os
 import subprocess
 import sys
 import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any
+from typing import Any, Callable
 
 
 DEFAULT_PROJECT_REF = "vwxfvzutyufrkhfgoeaa"
 DEFAULT_TOKEN_ENV = "TRR_SUPABASE_ACCESS_TOKEN"
 DEFAULT_OLDER_THAN_DAYS = 30
 PROTECTED_BRANCH_NAMES = {"main", "production", "prod", "staging", "stage"}
+DEFAULT_CONCURRENCY = 4
+# Deletions started per second across all workers; the Management API behind
+# the CLI rate-limits per token.
+DEFAULT_MAX_RATE = 1.0
+PREFIX = "[supabase-preview-branch-cleanup]"
 
 
 @dataclass(frozen=True)
@@ -28,6 +36,41 @@ class CleanupCandidate:
     reason: str
 
 
+@dataclass(frozen=True)
+class DeletionResult:
+    id: str
+    name: str
+    ok: bool
+    returncode: int | None
+    elapsed_seconds: float
+    error: str | None = None
+
+
+class RateLimiter:
+    """Space call starts at least ``1 / rate`` seconds apart across threads."""
+
+    def __init__(
+        self,
+        rate: float,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._interval = 1.0 / rate if rate > 0 else 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._next_start = 0.0
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = self._clock()
+            start = max(now, self._next_start)
+            self._next_start = start + self._interval
+        if start > now:
+            self._sleep(start - now)
+
+
 def _parse_timestamp(value: Any) -> datetime | None:
     if not isinstance(value, str) or not value:
         return None
@@ -100,28 +143,33 @@ def _run_supabase(
     project_ref: str,
     token: str,
     timeout: float,
+    workdir: str,
 ) -> subprocess.CompletedProcess[str]:
     env = os.environ.copy()
     # The CLI reads SUPABASE_ACCESS_TOKEN. Keep TRR's public contract on the
     # project-specific token and map it only into this child process.
     env["SUPABASE_ACCESS_TOKEN"] = token
-    with tempfile.TemporaryDirectory(prefix="trr-supabase-branch-cleanup-") as workdir:
-        return subprocess.run(
-            ["supabase", *args, "--project-ref", project_ref, "--output", "json", "--workdir", workdir],
-            env=env,
-            capture_output=True,
-            text=True,
-            timeout=timeout,
-            check=False,
-        )
+    # One scratch workdir serves the whole run: it only ever holds the CLI's
+    # cached project ref, which is identical for every call.
+    return subprocess.run(
+        ["supabase", *args, "--project-ref", project_ref, "--output", "json", "--workdir", workdir],
+        env=env,
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+        check=False,
+    )
 
 
-def list_branches(*, project_ref: str, token_env: str, token: str, timeout: float) -> list[dict[str, Any]]:
+def list_branches(
+    *, project_ref: str, token_env: str, token: str, timeout: float, workdir: str
+) -> list[dict[str, Any]]:
     result = _run_supabase(
         ["branches", "list"],
         project_ref=project_ref,
         token=token,
         timeout=timeout,
+        workdir=workdir,
     )
     if result.returncode != 0:
         raise SystemExit(
@@ -139,37 +187,120 @@ def list_branches(*, project_ref: str, token_env: str, token: str, timeout: floa
 
 def delete_branch(
     *,
-    branch_id: str,
+    candidate: CleanupCandidate,
     project_ref: str,
     token_env: str,
     token: str,
     timeout: float,
-) -> None:
-    result = _run_supabase(
-        ["branches", "delete", branch_id, "--yes"],
-        project_ref=project_ref,
-        token=token,
-        timeout=timeout,
-    )
-    if result.returncode != 0:
-        raise SystemExit(
-            f"[supabase-preview-branch-cleanup] ERROR: failed to delete branch {branch_id}\n"
-            + result.stderr.strip()
+    workdir: str,
+) -> DeletionResult:
+    started = time.monotonic()
+    try:
+        result = _run_supabase(
+            ["branches", "delete", candidate.id, "--yes"],
+            project_ref=project_ref,
+            token=token,
+            timeout=timeout,
+            workdir=workdir,
+        )
+    except subprocess.TimeoutExpired:
+        return DeletionResult(
+            id=candidate.id,
+            name=candidate.name,
+            ok=False,
+            returncode=None,
+            elapsed_seconds=round(time.monotonic() - started, 1),
+            error=f"supabase branches delete timed out after {timeout:g}s",
         )
+    except OSError as exc:
+        return DeletionResult(
+            id=candidate.id,
+            name=candidate.name,
+            ok=False,
+            returncode=None,
+            elapsed_seconds=round(time.monotonic() - started, 1),
+            error=str(exc),
+        )
+    return DeletionResult(
+        id=candidate.id,
+        name=candidate.name,
+        ok=result.returncode == 0,
+        returncode=result.returncode,
+        elapsed_seconds=round(time.monotonic() - started, 1),
+        error=None if result.returncode == 0 else (result.stderr.strip() or f"exit {result.returncode}"),
+    )
+
+
+def _first_line(text: str | None) -> str:
+    lines = (text or "").strip().splitlines()
+    return lines[0] if lines else "unknown error"
+
+
+Deleter = Callable[[CleanupCandidate], DeletionResult]
+
+
+def delete_candidates(
+    candidates: list[CleanupCandidate],
+    *,
+    deleter: Deleter,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    limiter: RateLimiter | None = None,
+    progress: Callable[[str], None] = lambda line: None,
+) -> list[DeletionResult]:
+    """Delete every candidate with bounded concurrency; failures never stop the run."""
+    limiter = limiter or RateLimiter(DEFAULT_MAX_RATE)
+
+    def run(candidate: CleanupCandidate) -> DeletionResult:
+        limiter.acquire()
+        return deleter(candidate)
+
+    results: dict[str, DeletionResult] = {}
+    with ThreadPoolExecutor(max_workers=max(1, concurrency)) as pool:
+        futures = {pool.submit(run, candidate): candidate for candidate in candidates}
+        for future in as_completed(futures):
+            candidate = futures[future]
+            try:
+                outcome = future.result()
+            except Exception as exc:  # noqa: BLE001 - one branch must not abort the rest.
+                outcome = DeletionResult(
+                    id=candidate.id, name=candidate.name, ok=False, returncode=None, elapsed_seconds=0.0, error=str(exc)
+                )
+            results[candidate.id] = outcome
+            verdict = "deleted" if outcome.ok else "FAILED"
+            detail = "" if outcome.ok else f": {_first_line(outcome.error)}"
+            progress(
+                f"{PREFIX} [{len(results)}/{len(candidates)}] {verdict} {candidate.name} "
+                f"id={candidate.id} in {outcome.elapsed_seconds:g}s{detail}"
+            )
+    return [results[candidate.id] for candidate in candidates]
 
 
-def _render_human(candidates: list[CleanupCandidate], *, delete: bool) -> str:
+def _render_human(
+    candidates: list[CleanupCandidate],
+    *,
+    delete: bool,
+    deletions: list[DeletionResult] | None = None,
+) -> str:
     if not candidates:
         return "[supabase-preview-branch-cleanup] OK: no cleanup candidates found."
 
-    action = "deleted" if delete else "dry-run"
+    outcomes = {result.id: result for result in deletions or []}
+    failed = [result for result in outcomes.values() if not result.ok]
+    if delete and failed:
+        action = f"deleted {len(outcomes) - len(failed)}, failed {len(failed)} of"
+    else:
+        action = "deleted" if delete else "dry-run"
     lines = [f"[supabase-preview-branch-cleanup] {action}: {len(candidates)} candidate(s)"]
     for candidate in candidates:
         age = "unknown-age" if candidate.age_days is None else f"{candidate.age_days}d"
+        outcome = outcomes.get(candidate.id)
+        result = ""
+        if outcome is not None:
+            result = " result=deleted" if outcome.ok else f" result=failed error={_first_line(outcome.error)}"
         lines.append(
             "- "
             + f"{candidate.name} id={candidate.id} status={candidate.status} "
-            + f"age={age} reason={candidate.reason}"
+            + f"age={age} reason={candidate.reason}{result}"
         )
     if not delete:
         lines.append(
@@ -187,6 +318,12 @@ def main(argv: list[str] | None = None) -> int:
     parser.add_argument("--delete", action="store_true", help="Delete selected cleanup candidates.")
     parser.add_argument("--json", action="store_true", help="Emit JSON summary.")
     parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument(
+        "--concurrency", type=int, default=DEFAULT_CONCURRENCY, help="Parallel branch deletions."
+    )
+    parser.add_argument(
+        "--max-rate", type=float, default=DEFAULT_MAX_RATE, help="Deletions started per second (0 disables)."
+    )
     args = parser.parse_args(argv)
 
     token = os.environ.get(args.token_env, "")
@@ -199,43 +336,53 @@ def main(argv: list[str] | None = None) -> int:
         )
 
     names = {str(name) for name in args.name if str(name)}
-    branches = list_branches(
-        project_ref=args.project_ref,
-        token_env=args.token_env,
-        token=token,
-        timeout=args.timeout,
-    )
-    candidates = select_cleanup_candidates(
-        branches,
-        now=datetime.now(timezone.utc),
-        older_than_days=args.older_than_days,
-        names=names,
-    )
+    with tempfile.TemporaryDirectory(prefix="trr-supabase-branch-cleanup-") as workdir:
+        branches = list_branches(
+            project_ref=args.project_ref,
+            token_env=args.token_env,
+            token=token,
+            timeout=args.timeout,
+            workdir=workdir,
+        )
+        candidates = select_cleanup_candidates(
+            branches,
+            now=datetime.now(timezone.utc),
+            older_than_days=args.older_than_days,
+            names=names,
+        )
 
-    deleted: list[str] = []
-    if args.delete:
-        for candidate in candidates:
-            delete_branch(
-                branch_id=candidate.id,
-                project_ref=args.project_ref,
-                token_env=args.token_env,
-                token=token,
-                timeout=args.timeout,
+        deletions: list[DeletionResult] = []
+        if args.delete and candidates:
+            deletions = delete_candidates(
+                candidates,
+                deleter=lambda candidate: delete_branch(
+                    candidate=candidate,
+                    project_ref=args.project_ref,
+                    token_env=args.token_env,
+                    token=token,
+                    timeout=args.timeout,
+                    workdir=workdir,
+                ),
+                concurrency=args.concurrency,
+                limiter=RateLimiter(args.max_rate),
+                progress=lambda line: print(line, file=sys.stderr, flush=True),
             )
-            deleted.append(candidate.id)
 
+    failed = [result for result in deletions if not result.ok]
     payload = {
         "project_ref": args.project_ref,
         "dry_run": not args.delete,
         "older_than_days": args.older_than_days,
         "candidates": [candidate.__dict__ for candidate in candidates],
-        "deleted_branch_ids": deleted,
+        "deletions": [result.__dict__ for result in deletions],
+        "deleted_branch_ids": [result.id for result in deletions if result.ok],
+        "failed_branch_ids": [result.id for result in failed],
     }
     if args.json:
         print(json.dumps(payload, indent=2, sort_keys=True))
     else:
-        print(_render_human(candidates, delete=args.delete))
-    return 0
+        print(_render_human(candidates, delete=args.delete, deletions=deletions))
+    return 1 if failed else 0
 
 
 if __name__ == "__main__":
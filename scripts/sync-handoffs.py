@@ -8,6 +8,7 @@ import dataclasses
 import datetime as dt
 import difflib
 import fcntl
+import hashlib
 import json
 import os
 import re
@@ -38,6 +39,7 @@ FRESHNESS_LIMITS = {
 }
 RECENT_COMPLETIONS_LIMIT = 5
 OLDER_PLANS_LIMIT = 10
+OPTIMISTIC_MAX_ATTEMPTS = 3
 VERCEL_PREVIEW_READY_RELATIVE_PATH = Path(".logs/workspace/vercel-preview-ready/latest.json")
 
 TASK_STATUS_RE = re.compile(r"^Status\s+[—-]\s+Task\s+(\d+)\s+\((.+)\)\s*$")
@@ -65,6 +67,10 @@ class LockTimeoutError(SyncHandoffsError):
     exit_code = EXIT_LOCK_TIMEOUT
 
 
+class ConcurrentWriteError(SyncHandoffsError):
+    exit_code = EXIT_LOCK_TIMEOUT
+
+
 @dataclasses.dataclass(frozen=True)
 class HandoffSnapshot:
     include: bool
@@ -159,7 +165,18 @@ def parse_args() -> argparse.Namespace:
         default=10.0,
         help="How long to wait for the shared handoff lock.",
     )
-    return parser.parse_args()
+    parser.add_argument(
+        "--optimistic",
+        action="store_true",
+        help=(
+            "With --write, render without holding the lock and take the exclusive lock only to "
+            "compare-and-swap each handoff."
+        ),
+    )
+    args = parser.parse_args()
+    if args.optimistic and not args.write:
+        parser.error("--optimistic requires --write")
+    return args
 
 
 def strip_quotes(value: str) -> str:
@@ -535,10 +552,81 @@ def run_check(rendered: dict[Path, str]) -> None:
         raise DriftError("Generated handoffs are out of sync.")
 
 
-def run_write(rendered: dict[Path, str]) -> None:
+def content_hash(text: str | None) -> str | None:
+    if text is None:
+        return None
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def read_handoff_hash(path: Path) -> str | None:
+    try:
+        return content_hash(path.read_text(encoding="utf-8"))
+    except FileNotFoundError:
+        return None
+
+
+def write_atomic(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with tmp_path.open("w", encoding="utf-8") as handle:
+            handle.write(text)
+            handle.flush()
+            os.fsync(handle.fileno())
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+def run_write(rendered: dict[Path, str]) -> list[Path]:
+    written: list[Path] = []
+    for path, expected in rendered.items():
+        if read_handoff_hash(path) == content_hash(expected):
+            continue
+        write_atomic(path, expected)
+        written.append(path)
+    return written
+
+
+def compare_and_swap(rendered: dict[Path, str], observed: dict[Path, str | None]) -> list[Path]:
+    """Swap in each rendered handoff whose on-disk hash still matches the pre-render observation.
+
+    Returns the paths that another writer changed in the meantime; those are left untouched.
+    """
+    conflicts: list[Path] = []
     for path, expected in rendered.items():
-        path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(expected, encoding="utf-8")
+        current = read_handoff_hash(path)
+        if current == content_hash(expected):
+            continue
+        if current != observed.get(path):
+            conflicts.append(path)
+            continue
+        write_atomic(path, expected)
+    return conflicts
+
+
+def run_optimistic_write(
+    scopes: list[ScopeConfig],
+    today: dt.date,
+    timeout_seconds: float,
+    *,
+    max_attempts: int = OPTIMISTIC_MAX_ATTEMPTS,
+) -> None:
+    pending = list(scopes)
+    for _attempt in range(max_attempts):
+        observed = {scope.handoff_path: read_handoff_hash(scope.handoff_path) for scope in pending}
+        rendered = render_selected_scopes(pending, today)
+        if all(observed[path] == content_hash(text) for path, text in rendered.items()):
+            return
+        with lock_workspace(exclusive=True, timeout_seconds=timeout_seconds):
+            conflicts = set(compare_and_swap(rendered, observed))
+        if not conflicts:
+            return
+        pending = [scope for scope in pending if scope.handoff_path in conflicts]
+    paths = ", ".join(str(scope.handoff_path) for scope in pending)
+    raise ConcurrentWriteError(
+        f"Handoffs kept changing underneath optimistic sync after {max_attempts} attempts: {paths}"
+    )
 
 
 def selected_scopes(args: argparse.Namespace) -> list[ScopeConfig]:
@@ -554,12 +642,15 @@ def main() -> int:
     scopes = selected_scopes(args)
 
     try:
-        with lock_workspace(exclusive=args.write, timeout_seconds=args.lock_timeout_seconds):
-            rendered = render_selected_scopes(scopes, today)
-            if args.write:
-                run_write(rendered)
-            else:
-                run_check(rendered)
+        if args.optimistic:
+            run_optimistic_write(scopes, today, args.lock_timeout_seconds)
+        else:
+            with lock_workspace(exclusive=args.write, timeout_seconds=args.lock_timeout_seconds):
+                rendered = render_selected_scopes(scopes, today)
+                if args.write:
+                    run_write(rendered)
+                else:
+                    run_check(rendered)
     except SyncHandoffsError as exc:
         print(f"[sync-handoffs] ERROR: {exc}", file=sys.stderr)
         return exc.exit_code
@@ -0,0 +1,186 @@
+from __future__ import annotations
+
+import json
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from scripts import backend_helper_worker as worker
+
+
+@pytest.fixture
+def backend(tmp_path: Path, monkeypatch):
+    root = tmp_path / "TRR-Backend"
+    (root / ".venv" / "bin").mkdir(parents=True)
+    (root / ".venv" / "bin" / "python").symlink_to(sys.executable)
+    (root / "trr_backend").mkdir()
+    (root / "trr_backend" / "__init__.py").write_text(
+        "import os\nLOADED_IN = os.getpid()\nSETTING = os.environ.get('TRR_SETTING')\n", encoding="utf-8"
+    )
+    (root / "scripts").mkdir()
+    (root / "scripts" / "probe.py").write_text(
+        "\n".join(
+            [
+                "import json, os, sys",
+                "warm = 'trr_backend' in sys.modules",
+                "print(json.dumps({'warm': warm, 'argv': sys.argv[1:], 'cwd': os.getcwd(), 'flag': os.environ.get('PROBE_FLAG')}))",
+                "print('to-stderr', file=sys.stderr)",
+                "os.environ['LEAK'] = '1'",
+                "sys.exit(int(os.environ.get('PROBE_EXIT', '0')))",
+            ]
+        )
+        + "\n",
+        encoding="utf-8",
+    )
+    (root / "scripts" / "loaded_in.py").write_text("import trr_backend\nprint(trr_backend.LOADED_IN)\n", encoding="utf-8")
+    (root / "scripts" / "setting.py").write_text("import trr_backend\nprint(trr_backend.SETTING)\n", encoding="utf-8")
+    (root / "scripts" / "slow.py").write_text("import time\ntime.sleep(30)\n", encoding="utf-8")
+    monkeypatch.setenv("WORKSPACE_BACKEND_WORKER_IDLE_SECONDS", "1")
+    monkeypatch.delenv("WORKSPACE_BACKEND_WORKER", raising=False)
+    monkeypatch.delenv("WORKSPACE_BACKEND_WORKER_PRELOAD", raising=False)
+    yield root
+    # Let the idle server notice it has nothing left to do.
+    path = worker.socket_path(root)
+    deadline = time.monotonic() + 10
+    while path.exists() and time.monotonic() < deadline:
+        time.sleep(0.1)
+
+
+def test_worker_matches_direct_run_contract(backend: Path, monkeypatch) -> None:
+    monkeypatch.setenv("PROBE_FLAG", "on")
+    monkeypatch.setenv("PROBE_EXIT", "3")
+
+    completed = worker.try_run_script(backend, "scripts/probe.py", ["--json"], timeout=30)
+    direct = subprocess.run(
+        [sys.executable, "scripts/probe.py", "--json"],
+        cwd=backend,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    assert completed is not None
+    assert completed.returncode == direct.returncode == 3
+    assert completed.stderr == direct.stderr == "to-stderr\n"
+    assert '"warm": true' in completed.stdout
+    assert completed.stdout.replace('"warm": true', '"warm": false') == direct.stdout
+    assert "LEAK" not in os.environ
+
+
+def test_worker_is_reused_and_restarts_when_backend_code_changes(backend: Path) -> None:
+    first = worker.try_run_script(backend, "scripts/probe.py", timeout=30)
+    started = time.monotonic()
+    second = worker.try_run_script(backend, "scripts/probe.py", timeout=30)
+    warm_elapsed = time.monotonic() - started
+
+    module = backend / "trr_backend" / "__init__.py"
+    stamp = module.stat().st_mtime + 5
+    os.utime(module, (stamp, stamp))
+    third = worker.try_run_script(backend, "scripts/probe.py", timeout=30)
+
+    assert first and second and third
+    assert first.returncode == second.returncode == third.returncode == 0
+    assert warm_elapsed < 1.0
+    assert '"warm": true' in third.stdout
+
+
+def test_worker_enforces_timeouts(backend: Path) -> None:
+    started = time.monotonic()
+    with pytest.raises(subprocess.TimeoutExpired):
+        worker.try_run_script(backend, "scripts/slow.py", timeout=1)
+
+    assert time.monotonic() - started < 8
+
+
+def test_worker_is_skipped_without_backend_venv_or_when_disabled(backend: Path, tmp_path: Path, monkeypatch) -> None:
+    assert worker.try_run_script(tmp_path, "scripts/probe.py") is None
+
+    monkeypatch.setenv("WORKSPACE_BACKEND_WORKER", "0")
+    assert worker.try_run_script(backend, "scripts/probe.py") is None
+
+
+def test_worker_is_keyed_by_the_preload_environment(backend: Path) -> None:
+    env_a = {**os.environ, "TRR_SETTING": "a"}
+    env_b = {**os.environ, "TRR_SETTING": "b"}
+
+    first = worker.try_run_script(backend, "scripts/setting.py", timeout=30, env=env_a)
+    second = worker.try_run_script(backend, "scripts/setting.py", timeout=30, env=env_b)
+    # A server preloaded under env A refuses a request carrying env B.
+    sock = worker._connect(worker.socket_path(backend, env_a))
+    assert sock is not None
+    refused = worker._exchange(sock, {"script": "scripts/setting.py", "cwd": str(backend), "env": env_b}, 30)
+
+    assert first and first.stdout == "a\n"
+    assert second and second.stdout == "b\n"
+    assert worker.socket_path(backend, env_a) != worker.socket_path(backend, env_b)
+    assert refused == worker.ENV_MISMATCH_REPLY
+    for env in (env_a, env_b):
+        deadline = time.monotonic() + 10
+        while worker.socket_path(backend, env).exists() and time.monotonic() < deadline:
+            time.sleep(0.1)
+
+
+def test_preflight_phases_share_one_worker(backend: Path) -> None:
+    def phase_env(phase: str, child_pid: str, script: str) -> dict[str, str]:
+        return {
+            **os.environ,
+            "WORKSPACE_DEV_MODE": "local",
+            "WORKSPACE_PREFLIGHT_DIAGNOSTICS_PHASE": phase,
+            "WORKSPACE_PREFLIGHT_DIAGNOSTICS_ACTIVE_CHILD_PID": child_pid,
+            "WORKSPACE_PREFLIGHT_DIAGNOSTICS_ACTIVE_CHILD_COMMAND": f"python3 {script}",
+            "WORKSPACE_PREFLIGHT_DIAGNOSTICS_ACTIVE_CHILD_SCRIPT": script,
+            "WORKSPACE_PHASE_TIMINGS_RUN_ID": f"run-{child_pid}",
+        }
+
+    freshness = phase_env("instagram-auth-freshness", "4101", "instagram_auth_freshness.py")
+    reconcile = phase_env("runtime-reconcile", "4187", "workspace-runtime-reconcile.py")
+
+    first = worker.try_run_script(backend, "scripts/loaded_in.py", timeout=30, env=freshness)
+    second = worker.try_run_script(backend, "scripts/loaded_in.py", timeout=30, env=reconcile)
+
+    assert worker.socket_path(backend, freshness) == worker.socket_path(backend, reconcile)
+    assert worker.socket_path(backend, {**reconcile, "TRR_DB_URL": "postgres://other"}) != worker.socket_path(
+        backend, reconcile
+    )
+    # Both phases were served by the backend preloaded in one worker process.
+    assert first and second
+    assert first.stdout == second.stdout
+    deadline = time.monotonic() + 10
+    while worker.socket_path(backend, reconcile).exists() and time.monotonic() < deadline:
+        time.sleep(0.1)
+
+
+def test_lost_reply_after_the_request_was_sent_is_not_retried(backend: Path) -> None:
+    path = worker.socket_path(backend)
+    listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    listener.bind(str(path))
+    listener.listen()
+    listener.settimeout(10)
+    requests: list[dict] = []
+
+    def accept_and_drop() -> None:
+        conn, _ = listener.accept()
+        with conn, conn.makefile("rwb") as stream:
+            stream.write(json.dumps(worker.READY_GREETING).encode("utf-8") + b"\n")
+            stream.flush()
+            requests.append(json.loads(stream.readline()))
+
+    thread = threading.Thread(target=accept_and_drop)
+    thread.start()
+    try:
+        completed = worker.try_run_script(backend, "scripts/probe.py", timeout=30)
+    finally:
+        listener.close()
+        path.unlink()
+        thread.join()
+
+    assert completed is not None, "must not fall back to running the script directly"
+    assert completed.returncode == 1
+    assert "not retried" in completed.stderr
+    assert len(requests) == 1
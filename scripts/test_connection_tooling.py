@@ -2,13 +2,17 @@ from __future__ import annotations
 
 import importlib.util
 import io
+import json
 import os
 import subprocess
 import sys
+import threading
 import tomllib
 import urllib.error
 from pathlib import Path
 
+import pytest
+
 
 ROOT = Path(__file__).resolve().parents[1]
 
@@ -424,7 +428,7 @@ def test_supabase_advisor_snapshot_writes_dated_json_artifacts(tmp_path: Path) -
     )
 
     assert result.exit_code == 0
-    assert requested_urls == [
+    assert sorted(requested_urls) == [
         "https://api.supabase.com/v1/projects/vwxfvzutyufrkhfgoeaa/advisors/performance",
         "https://api.supabase.com/v1/projects/vwxfvzutyufrkhfgoeaa/advisors/security",
     ]
@@ -466,6 +470,148 @@ def test_supabase_advisor_snapshot_reports_missing_trr_token_without_network(tmp
     assert not (tmp_path / "2026-04-28").exists()
 
 
+def _advisor_lint(key: str, level: str = "WARN") -> dict[str, object]:
+    return {"cache_key": key, "name": key.split("_", 1)[0], "level": level, "metadata": {"schema": "public"}}
+
+
+def _capture_advisor_fixture(module, output_root: Path, snapshot_date: str, lints: dict[str, list[dict]]):
+    in_flight: list[int] = []
+    lock = threading.Lock()
+    active = 0
+
+    class FakeResponse:
+        status = 200
+
+        def __init__(self, body: bytes) -> None:
+            self.body = body
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            return None
+
+        def read(self) -> bytes:
+            return self.body
+
+    def fake_opener(request, timeout):
+        nonlocal active
+        with lock:
+            active += 1
+            in_flight.append(active)
+        threading.Event().wait(0.05)
+        with lock:
+            active -= 1
+        advisor_type = request.full_url.rsplit("/", 1)[-1]
+        return FakeResponse(json.dumps({"lints": lints[advisor_type]}).encode("utf-8"))
+
+    result = module.capture_snapshot(
+        project_ref="vwxfvzutyufrkhfgoeaa",
+        token_env="TRR_SUPABASE_ACCESS_TOKEN",
+        token="secret-token-value",
+        output_root=output_root,
+        snapshot_date=snapshot_date,
+        timeout=1.0,
+        opener=fake_opener,
+    )
+    return result, max(in_flight)
+
+
+def test_supabase_advisor_snapshot_fetches_concurrently_and_stores_deltas(tmp_path: Path) -> None:
+    module = load_supabase_advisor_snapshot_module()
+    first = {
+        "performance": [_advisor_lint("perf_a"), _advisor_lint("perf_b"), _advisor_lint("perf_c")],
+        "security": [_advisor_lint("sec_a")],
+    }
+    second = {
+        "performance": [_advisor_lint("perf_a"), _advisor_lint("perf_c", "ERROR"), _advisor_lint("perf_d")],
+        "security": [_advisor_lint("sec_a")],
+    }
+
+    _, concurrency = _capture_advisor_fixture(module, tmp_path, "2026-05-01", first)
+    result, _ = _capture_advisor_fixture(module, tmp_path, "2026-05-08", second)
+
+    assert concurrency == 2
+    assert (tmp_path / "2026-05-01" / "performance.json").exists()
+    assert not (tmp_path / "2026-05-08" / "performance.json").exists()
+    delta = json.loads((tmp_path / "2026-05-08" / "performance.delta.json").read_text(encoding="utf-8"))
+    assert delta["base"] == "2026-05-01"
+    assert [lint["cache_key"] for lint in delta["added"]] == ["perf_d"]
+    assert delta["removed"] == ["perf_b"]
+    assert [lint["cache_key"] for lint in delta["changed"]] == ["perf_c"]
+    security_delta = json.loads((tmp_path / "2026-05-08" / "security.delta.json").read_text(encoding="utf-8"))
+    assert security_delta["added"] == security_delta["removed"] == security_delta["changed"] == []
+    manifest = json.loads(result.manifest_path.read_text(encoding="utf-8"))
+    assert manifest["advisors"]["performance"]["storage"] == "delta"
+    assert manifest["advisors"]["performance"]["lint_count"] == 3
+    assert "1 added, 1 removed, 1 changed" in result.summary_path.read_text(encoding="utf-8")
+
+    assert module.load_advisor_payload(tmp_path, "2026-05-08", "performance") == {"lints": second["performance"]}
+    assert module.load_advisor_payload(tmp_path, "2026-05-01", "performance") == {"lints": first["performance"]}
+
+
+def test_supabase_advisor_snapshot_keeps_lint_order_and_protects_delta_bases(tmp_path: Path) -> None:
+    module = load_supabase_advisor_snapshot_module()
+    first = {"performance": [_advisor_lint("perf_a"), _advisor_lint("perf_b")], "security": [_advisor_lint("sec_a")]}
+    reordered = {
+        "performance": [_advisor_lint("perf_c"), _advisor_lint("perf_b"), _advisor_lint("perf_a", "ERROR")],
+        "security": [_advisor_lint("sec_a")],
+    }
+
+    _capture_advisor_fixture(module, tmp_path, "2026-05-01", first)
+    _capture_advisor_fixture(module, tmp_path, "2026-05-08", reordered)
+
+    assert module.load_advisor_payload(tmp_path, "2026-05-08", "performance") == {"lints": reordered["performance"]}
+    assert "order" not in json.loads((tmp_path / "2026-05-08" / "security.delta.json").read_text(encoding="utf-8"))
+
+    # Re-capturing the base date with identical data is fine; different data
+    # would silently change what 2026-05-08 reconstructs to.
+    _capture_advisor_fixture(module, tmp_path, "2026-05-01", first)
+    stored = sorted((path.name, path.read_bytes()) for path in (tmp_path / "2026-05-01").glob("*.json"))
+    changed = {**first, "security": [_advisor_lint("sec_b")]}
+    with pytest.raises(module.SnapshotStoreError, match="2026-05-08"):
+        _capture_advisor_fixture(module, tmp_path, "2026-05-01", changed)
+
+    assert sorted((path.name, path.read_bytes()) for path in (tmp_path / "2026-05-01").glob("*.json")) == stored
+    assert module.load_advisor_payload(tmp_path, "2026-05-08", "security") == {"lints": first["security"]}
+
+
+def test_supabase_advisor_snapshot_show_and_compact_reconstruct_dates(tmp_path: Path) -> None:
+    module = load_supabase_advisor_snapshot_module()
+    for day, keys in (("2026-05-01", ["a", "b"]), ("2026-05-02", ["a", "b", "c"]), ("2026-05-03", ["c"])):
+        day_dir = tmp_path / day
+        day_dir.mkdir()
+        (day_dir / "security.json").write_text(
+            json.dumps({"lints": [_advisor_lint(f"sec_{key}") for key in keys]}), encoding="utf-8"
+        )
+
+    assert module.main(["--output-dir", str(tmp_path), "--compact"]) == 0
+    assert sorted(path.name for path in tmp_path.glob("*/security*.json")) == [
+        "security.delta.json",
+        "security.delta.json",
+        "security.json",
+    ]
+
+    result = run_script(
+        "scripts/capture-supabase-advisor-snapshot.py",
+        "--output-dir",
+        str(tmp_path),
+        "--show",
+        "--date",
+        "2026-05-02",
+        "--advisor",
+        "security",
+    )
+    assert result.returncode == 0, result.stderr
+    assert [lint["cache_key"] for lint in json.loads(result.stdout)["lints"]] == ["sec_a", "sec_b", "sec_c"]
+
+    missing = run_script(
+        "scripts/capture-supabase-advisor-snapshot.py", "--output-dir", str(tmp_path), "--show", "--date", "2026-04-01"
+    )
+    assert missing.returncode == 2
+    assert "no advisor snapshot stored for 2026-04-01" in missing.stderr
+
+
 def test_supabase_preview_branch_cleanup_selects_old_nonpersistent_branches() -> None:
     module = load_supabase_preview_branch_cleanup_module()
     now = module.datetime(2026, 6, 17, tzinfo=module.timezone.utc)
@@ -537,3 +683,81 @@ def test_supabase_preview_branch_cleanup_name_filter_allows_targeted_branch() ->
 
     assert [candidate.id for candidate in candidates] == ["fresh-id"]
     assert candidates[0].reason == "explicit-name"
+
+
+def test_supabase_preview_branch_cleanup_rate_limiter_spaces_starts() -> None:
+    module = load_supabase_preview_branch_cleanup_module()
+    now = [0.0]
+    sleeps: list[float] = []
+
+    def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+
+    limiter = module.RateLimiter(2.0, clock=lambda: now[0], sleep=sleep)
+    for _ in range(3):
+        limiter.acquire()
+
+    assert sleeps == [0.5, 1.0]
+
+
+def test_supabase_preview_branch_cleanup_deletes_concurrently_and_reports_partial_failures(tmp_path: Path) -> None:
+    bin_dir = tmp_path / "bin"
+    bin_dir.mkdir()
+    calls = tmp_path / "calls.log"
+    fake_cli = bin_dir / "supabase"
+    fake_cli.write_text(
+        f"""#!/usr/bin/env bash
+workdir=""
+while [ $# -gt 0 ]; do
+  if [ "$1" = "--workdir" ]; then workdir="$2"; fi
+  args="$args $1"
+  shift
+done
+echo "$workdir $args" >> "{calls}"
+case "$args" in
+  *"branches list"*)
+    echo '[{{"id":"old-a","name":"preview-a","updated_at":"2026-01-01T00:00:00Z"}},'\
+'{{"id":"bad-id","name":"preview-b","updated_at":"2026-01-01T00:00:00Z"}},'\
+'{{"id":"old-c","name":"preview-c","updated_at":"2026-01-01T00:00:00Z"}}]' ;;
+  *"delete bad-id"*) sleep 0.2; echo "branch is busy" >&2; exit 1 ;;
+  *) sleep 0.2; echo '{{}}' ;;
+esac
+""",
+        encoding="utf-8",
+    )
+    fake_cli.chmod(0o755)
+    env = os.environ.copy()
+    env["PATH"] = f"{bin_dir}:{env['PATH']}"
+    env["TRR_SUPABASE_ACCESS_TOKEN"] = "secret-token-value"
+
+    result = subprocess.run(
+        [
+            "python3",
+            "scripts/supabase-preview-branch-cleanup.py",
+            "--delete",
+            "--json",
+            "--concurrency",
+            "3",
+            "--max-rate",
+            "0",
+        ],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    assert result.returncode == 1
+    payload = json.loads(result.stdout)
+    assert payload["deleted_branch_ids"] == ["old-a", "old-c"]
+    assert payload["failed_branch_ids"] == ["bad-id"]
+    failure = next(item for item in payload["deletions"] if item["id"] == "bad-id")
+    assert failure["ok"] is False
+    assert failure["error"] == "branch is busy"
+    assert result.stderr.count("[supabase-preview-branch-cleanup] [") == 3
+    assert "FAILED preview-b id=bad-id" in result.stderr
+    workdirs = {line.split(" ", 1)[0] for line in calls.read_text(encoding="utf-8").splitlines()}
+    assert len(workdirs) == 1
+    assert "secret-token-value" not in result.stdout + result.stderr
+
@@ -51,9 +51,15 @@ def test_deployment_target_tuple_is_exact_and_secret_free() -> None:
     assert "service_role" not in serialized
 
 
-def test_deployment_target_projection_check_passes() -> None:
+def test_deployment_target_projection_check_passes(tmp_path: Path) -> None:
     completed = subprocess.run(
-        [sys.executable, str(ROOT / "scripts" / "deployment_targets.py"), "check"],
+        [
+            sys.executable,
+            str(ROOT / "scripts" / "deployment_targets.py"),
+            "check",
+            "--cache-path",
+            str(tmp_path / "source-literals-cache.json"),
+        ],
         cwd=ROOT,
         capture_output=True,
         text=True,
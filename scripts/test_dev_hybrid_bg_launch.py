@@ -0,0 +1,105 @@
+from __future__ import annotations
+
+import gzip
+import importlib.util
+import os
+import sys
+import time
+from pathlib import Path
+
+
+SCRIPT_PATH = Path(__file__).resolve().parent / "dev-hybrid-bg-launch.py"
+
+
+def _load_module():
+    spec = importlib.util.spec_from_file_location("dev_hybrid_bg_launch_under_test", SCRIPT_PATH)
+    assert spec is not None
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _segment_text(segment_dir: Path) -> str:
+    return "".join(gzip.decompress(path.read_bytes()).decode("utf-8") for path in sorted(segment_dir.glob("*.gz")))
+
+
+def test_writer_rotates_by_size_and_age_and_bounds_total_size(tmp_path: Path) -> None:
+    launcher = _load_module()
+    log_file = tmp_path / "dev-hybrid-background.log"
+    log_file.write_text("previous session\n", encoding="utf-8")
+    now = [1_000.0]
+    writer = launcher.RotatingLogWriter(
+        log_file,
+        max_segment_bytes=64,
+        max_segment_age_seconds=60,
+        max_total_bytes=10_000,
+        compression="gzip",
+        clock=lambda: now[0],
+    )
+
+    for index in range(6):
+        writer.write(f"line {index:02d} {'x' * 20}\n".encode())
+    now[0] += 61
+    writer.write(b"after an idle minute\n")
+    writer.close()
+
+    segment_dir = tmp_path / "dev-hybrid-background-segments"
+    assert len(list(segment_dir.glob("*.gz"))) == 4
+    assert not list(segment_dir.glob("*.closed"))
+    assert _segment_text(segment_dir).startswith("previous session\nline 00")
+    assert log_file.read_text(encoding="utf-8") == "after an idle minute\n"
+
+    bounded = launcher.RotatingLogWriter(
+        log_file,
+        max_segment_bytes=64,
+        max_segment_age_seconds=60,
+        max_total_bytes=1,
+        compression="gzip",
+        clock=lambda: now[0],
+    )
+    bounded.close()
+    assert len(list(segment_dir.glob("*.gz"))) == 1
+    assert _segment_text(segment_dir) == "after an idle minute\n"
+
+
+def test_detached_launch_pipes_output_and_stops_processes_make_leaves_behind(tmp_path: Path) -> None:
+    launcher = _load_module()
+    log_file = tmp_path / "logs" / "dev-hybrid-background.log"
+    pid_file = tmp_path / "logs" / "dev-hybrid-background.pid"
+    script = (
+        "import subprocess, sys\n"
+        "leaked = subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(300)'], start_new_session=True)\n"
+        "for i in range(400):\n"
+        "    print(f'row {i:04d}', flush=True)\n"
+        "print(f'leaked {leaked.pid}', file=sys.stderr)\n"
+    )
+
+    pid = launcher.launch_detached(
+        log_file=log_file,
+        pid_file=pid_file,
+        cwd=tmp_path,
+        max_segment_bytes=1024,
+        compression="gzip",
+        stop_grace_seconds=2,
+        command=[sys.executable, "-c", script],
+    )
+
+    assert pid_file.read_text(encoding="utf-8").strip() == str(pid)
+    segment_dir = log_file.parent / "dev-hybrid-background-segments"
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
+        if "exited with status" in log_file.read_text(encoding="utf-8") and not list(segment_dir.glob("*.closed")):
+            break
+        time.sleep(0.05)
+    lines = (_segment_text(segment_dir) + log_file.read_text(encoding="utf-8")).splitlines()
+    assert lines[:400] == [f"row {i:04d}" for i in range(400)]
+    assert lines[-1] == "[workspace] make dev-hybrid exited with status 0; stopped 1 leftover process(es), 0 with SIGKILL"
+    leaked_pid = int(lines[400].removeprefix("leaked "))
+    try:
+        os.kill(leaked_pid, 0)
+    except ProcessLookupError:
+        pass
+    else:
+        raise AssertionError(f"leaked process {leaked_pid} is still running")
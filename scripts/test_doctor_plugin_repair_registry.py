@@ -7,6 +7,8 @@ import tempfile
 import time
 from pathlib import Path
 
+from scripts import preflight_scheduler
+
 
 ROOT = Path(__file__).resolve().parents[1]
 DOCTOR = ROOT / "scripts" / "doctor.sh"
@@ -110,7 +112,8 @@ def test_browser_doctor_status_check_is_time_bounded() -> None:
     assert "status check timed out after ${DOCTOR_PLUGIN_COMMAND_TIMEOUT_SECONDS}s" in text
     assert "make chrome-repair" in text
     assert "WORKSPACE_PREFLIGHT_DOCTOR_TIMEOUT_SECONDS" in preflight_text
-    assert "scripts/run-with-timeout.py" in preflight_text
+    doctor_phase = next(phase for phase in preflight_scheduler.build_phases(ROOT, {}) if phase.name == "doctor")
+    assert doctor_phase.command[:4] == ("python3", str(ROOT / "scripts" / "run-with-timeout.py"), "--timeout-seconds", "60")
 
 
 def test_preflight_reaps_abandoned_mcp_helpers_before_doctor() -> None:
@@ -121,8 +124,15 @@ def test_preflight_reaps_abandoned_mcp_helpers_before_doctor() -> None:
     assert reap_call in preflight_text
     assert preflight_text.index(reap_call) < preflight_text.index(doctor_call)
     assert 'WORKSPACE_PREFLIGHT_MCP_REAP:-1' in preflight_text
-    assert 'MCP_REAPER_UNTRACKED_MIN_AGE_SEC="${WORKSPACE_PREFLIGHT_MCP_STALE_AGE_SEC:-3600}"' in preflight_text
-    assert 'codex-mcp-session-reaper.sh" reap' in preflight_text
+    phases = {phase.name: phase for phase in preflight_scheduler.build_phases(ROOT, {"WORKSPACE_PREFLIGHT_MCP_STALE_AGE_SEC": "90"})}
+    assert phases["mcp-orphan-reap"].command == (
+        "env",
+        "MCP_REAPER_UNTRACKED_MIN_AGE_SEC=90",
+        "bash",
+        str(ROOT / "scripts" / "codex-mcp-session-reaper.sh"),
+        "reap",
+    )
+    assert phases["doctor"].deps == ("mcp-orphan-reap", "context7-cache-repair")
 
 
 def test_preflight_repairs_context7_cache_without_reloading_connectors() -> None:
@@ -132,7 +142,10 @@ def test_preflight_repairs_context7_cache_without_reloading_connectors() -> None
     doctor_call = 'run_preflight_phase "doctor"'
     assert repair_call in preflight_text
     assert preflight_text.index(repair_call) < preflight_text.index(doctor_call)
-    assert 'node "$context7_repair_script"' in preflight_text
+    repair_phase = next(
+        phase for phase in preflight_scheduler.build_phases(ROOT, {"HOME": "/home/dev"}) if phase.name == "context7-cache-repair"
+    )
+    assert repair_phase.command == ("node", "/home/dev/.codex/plugins/context7/scripts/repair-context7-mcp.mjs")
     assert '--reload' not in preflight_text[preflight_text.index(repair_call):preflight_text.index(doctor_call)]
 
 
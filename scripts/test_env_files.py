@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+from scripts.lib import env_files
+
+
+ENV_ALL_PATH = Path(__file__).resolve().parent / "workspace" / "env_all.py"
+
+
+def _load_env_all():
+    spec = importlib.util.spec_from_file_location("env_all_under_test", ENV_ALL_PATH)
+    assert spec is not None
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_parser_rules_cover_every_tools_old_dialect() -> None:
+    parsed = env_files.parse_env_text(
+        "# comment\n"
+        "\n"
+        "TRR_DB_URL=postgres://u@h:6543/db # pooled lane\n"
+        "export WORKSPACE_DEV_MODE=hybrid\n"
+        "TRR_APP_NAME=\"quoted # not a comment\"\n"
+        "SINGLE='x'\n"
+        "HASH=abc#def\n"
+        "TRR_DB_URL=override\n"
+        "not a key=1\n"
+        "MISSING_SEPARATOR\n"
+    )
+
+    assert parsed.values == {
+        "TRR_DB_URL": "override",
+        "WORKSPACE_DEV_MODE": "hybrid",
+        "TRR_APP_NAME": "quoted # not a comment",
+        "SINGLE": "x",
+        "HASH": "abc#def",
+    }
+    assert parsed.entries[0].value == "postgres://u@h:6543/db"
+    assert [line for line, _ in parsed.invalid_lines] == [9, 10]
+
+
+def test_load_is_memoized_by_path_mtime_and_size(tmp_path: Path) -> None:
+    env_files.clear_cache()
+    profile = tmp_path / "profiles" / "default.env"
+    profile.parent.mkdir()
+    profile.write_text("A=1\n", encoding="utf-8")
+
+    first = env_files.load_env_file(profile)
+    assert env_files.load_env_file(tmp_path / "profiles" / ".." / "profiles" / "default.env") is first
+    assert (env_files.stats.misses, env_files.stats.hits) == (1, 1)
+
+    profile.write_text("A=2\nB=3\n", encoding="utf-8")
+    stat = profile.stat()
+    os.utime(profile, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    assert env_files.env_values(profile) == {"A": "2", "B": "3"}
+    assert env_files.stats.misses == 2
+    assert not env_files.load_env_file(tmp_path / "absent.env").exists
+
+
+def test_lenient_decode_is_opt_in_and_cached_separately(tmp_path: Path) -> None:
+    env_files.clear_cache()
+    profile = tmp_path / "default.env"
+    profile.write_bytes(b"NOTE=caf\xe9\nA=1\n")
+
+    with pytest.raises(UnicodeDecodeError):
+        env_files.load_env_file(profile)
+    assert env_files.env_keys(profile, errors="ignore") == {"NOTE", "A"}
+    with pytest.raises(UnicodeDecodeError):
+        env_files.env_keys(profile)
+
+
+def test_env_all_runs_every_step_in_one_interpreter_and_reports_failures(tmp_path: Path, capsys) -> None:
+    env_all = _load_env_all()
+    env_files.clear_cache()
+    shared = tmp_path / "shared.env"
+    shared.write_text("TRR_DB_URL=x\n", encoding="utf-8")
+    ok = tmp_path / "ok_step.py"
+    ok.write_text(
+        "from scripts.lib import env_files\n"
+        "def main(argv):\n"
+        "    return 0 if env_files.env_keys(__import__('pathlib').Path(argv[0])) == {'TRR_DB_URL'} else 2\n",
+        encoding="utf-8",
+    )
+    broken = tmp_path / "broken-step.py"
+    broken.write_text("def main(argv):\n    raise RuntimeError('boom')\n", encoding="utf-8")
+
+    results = env_all.run_steps(
+        [
+            env_all.Step("first", ok, (str(shared),)),
+            env_all.Step("broken", broken, ()),
+            env_all.Step("second", ok, (str(shared),)),
+        ]
+    )
+
+    assert [(result.name, result.returncode) for result in results] == [("first", 0), ("broken", 1), ("second", 0)]
+    assert (env_files.stats.misses, env_files.stats.hits) == (1, 1)
+    assert "RuntimeError: boom" in capsys.readouterr().err
+    assert [step.name for step in env_all.build_steps(check=True)] == [
+        "env-contract-report",
+        "env-hygiene",
+        "redacted-env-inventory",
+    ]
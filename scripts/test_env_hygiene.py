@@ -92,6 +92,19 @@ def test_deprecated_runtime_name_fails_in_authority_surface(tmp_path: Path, monk
     assert any(finding.severity == "error" and finding.key == "DATABASE_URL" for finding in findings)
 
 
+def test_non_utf8_bytes_do_not_hide_surface_keys(tmp_path: Path, monkeypatch) -> None:
+    module = _load_module()
+    monkeypatch.setattr(module, "ROOT", tmp_path)
+    profile = tmp_path / "profiles/default.env"
+    profile.parent.mkdir(parents=True)
+    profile.write_bytes(b"# caf\xe9 notes\nDATABASE_URL=postgresql://secret\n")
+    _write(tmp_path / "TRR-APP/apps/web/.env.example", "TRR_DB_URL=\n")
+
+    findings, _counts = module._collect_findings(_manifest())
+
+    assert any(finding.severity == "error" and finding.key == "DATABASE_URL" for finding in findings)
+
+
 def test_snapshot_env_values_are_not_authority_errors(tmp_path: Path, monkeypatch) -> None:
     module = _load_module()
     monkeypatch.setattr(module, "ROOT", tmp_path)
@@ -241,3 +254,31 @@ def test_cleanup_actions_cover_all_env_file_authority_classes(tmp_path: Path, mo
     assert ("local_secret_adapters", "TRR-APP/apps/web/.env.local", "LOCAL_ONLY_KEY", "keep", "surface-local key is not part of the shared TRR env contract") in actions
     assert ("retired_env_surfaces", "screenalytics/.env", "SCREENALYTICS_LOCAL_ONLY", "remove", "retired Screenalytics env surface; unclassified Screenalytics-prefixed key should not become current authority") in actions
     assert ("evidence_snapshots", ".logs/workspace/pids.env", "WORKSPACE_MANAGER_PID", "keep", "evidence snapshot; report only and do not edit generated/pulled env evidence") in actions
+
+
+def test_matrix_indexes_keys_owners_and_retirement_precedence(tmp_path: Path, monkeypatch) -> None:
+    module = _load_module()
+    monkeypatch.setattr(module, "ROOT", tmp_path)
+    _write(tmp_path / "TRR-APP/apps/web/.env.local", "SUPABASE_URL=a\nTRR_EXTRA=1\n")
+    _write(tmp_path / "TRR-Backend/.env", "SUPABASE_URL=b\n")
+    manifest = _manifest()
+    manifest["retired_screenalytics_env"]["retire"].append("TRR_DB_URL")
+
+    matrix = module.EnvMatrix(manifest)
+
+    local = matrix.key_surfaces[module.LOCAL_SECRET_KEY]
+    assert [module._surface_label(surface) for surface in local["SUPABASE_URL"]] == [
+        "TRR-APP/apps/web/.env.local",
+        "TRR-Backend/.env",
+    ]
+    assert matrix.owner("SUPABASE_URL") == "backend-shared-schema"
+    assert matrix.owner("TRR_EXTRA") == "workspace-ops"
+    assert matrix.owner("UNOWNED") is None
+    assert matrix.retired_classification("TRR_DB_URL") == ("retain", None)
+    assert matrix.retired_classification("SCREENALYTICS_OBJECT_STORAGE_BUCKET") == (
+        "rename",
+        "TRR_CAST_SCREENTIME_ARTIFACT_BUCKET",
+    )
+    surface = local["SUPABASE_URL"][0]
+    assert matrix.status(surface, "SUPABASE_URL") is matrix.status(surface, "SUPABASE_URL")
+    assert module._collect_cleanup_actions(manifest, matrix) == module._collect_cleanup_actions(manifest)
@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+import pytest
+
+from scripts.lib import http_client
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self) -> None:
+        super().__init__(("127.0.0.1", 0), StandInHandler)
+        # A ``None`` status drops the connection without answering.
+        self.script: list[tuple[int | None, dict[str, str], bytes]] = []
+        self.requests: list[tuple[str, str, tuple[str, int]]] = []
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server: StandInServer
+
+    def _answer(self) -> None:
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        self.server.requests.append((self.command, self.path, self.client_address))
+        status, headers, body = self.server.script.pop(0) if self.server.script else (200, {}, b'{"ok": true}')
+        if status is None:
+            self.close_connection = True
+            return
+        self.send_response(status)
+        for key, value in headers.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = _answer
+    do_POST = _answer
+
+    def log_message(self, format: str, *args: object) -> None:
+        return None
+
+
+@pytest.fixture
+def server() -> Iterator[StandInServer]:
+    stand_in = StandInServer()
+    thread = threading.Thread(target=stand_in.serve_forever, daemon=True)
+    thread.start()
+    yield stand_in
+    stand_in.shutdown()
+    stand_in.server_close()
+
+
+def test_pooled_transport_reuses_one_connection_per_host(server: StandInServer) -> None:
+    transport = http_client.PooledTransport()
+    client = http_client.HttpClient(transport=transport)
+
+    responses = [client.get(f"{server.url}/v1/item/{index}") for index in range(5)]
+    client.close()
+
+    assert [response.json() for response in responses] == [{"ok": True}] * 5
+    assert transport.connections_opened == 1
+    assert len({address for _, _, address in server.requests}) == 1
+    assert [path for _, path, _ in server.requests] == [f"/v1/item/{index}" for index in range(5)]
+
+
+def test_retries_429_and_5xx_with_backoff_and_records_metrics(server: StandInServer) -> None:
+    server.script = [
+        (503, {}, b"{}"),
+        (429, {"Retry-After": "2"}, b"{}"),
+        (200, {}, b'{"name": "trr"}'),
+    ]
+    sleeps: list[float] = []
+    client = http_client.HttpClient(retry=http_client.RetryPolicy(attempts=3, base_delay=0.5), sleep=sleeps.append)
+
+    response = client.get(f"{server.url}/v1/projects/ref")
+
+    assert response.status == 200
+    assert response.json() == {"name": "trr"}
+    assert response.attempts == 3
+    assert 0 <= sleeps[0] <= 0.5
+    assert sleeps[1] == 2.0
+    host = server.url.removeprefix("http://")
+    summary = client.metrics.summary()[host]
+    assert summary["requests"] == 3
+    assert summary["retries"] == 2
+    assert summary["errors"] == 2
+    assert summary["max_ms"] >= summary["p50_ms"] >= 0
+
+
+def test_post_is_not_resent_on_server_errors(server: StandInServer) -> None:
+    server.script = [(502, {}, b"{}"), (200, {}, b"{}")]
+    client = http_client.HttpClient(sleep=lambda _: None)
+
+    response = client.post(f"{server.url}/v1/services/srv/deploys", json_body={"commitId": "abc"})
+
+    assert response.status == 502
+    assert response.attempts == 1
+    assert len(server.requests) == 1
+
+
+def test_dropped_reused_connection_resends_only_idempotent_requests(server: StandInServer) -> None:
+    client = http_client.HttpClient(transport=http_client.PooledTransport(), sleep=lambda _: None)
+    client.get(f"{server.url}/v1/warm")
+    server.script = [(None, {}, b"")]
+
+    assert client.get(f"{server.url}/v1/item").json() == {"ok": True}
+
+    server.script = [(None, {}, b"")]
+    with pytest.raises(http_client.TransportError):
+        client.post(f"{server.url}/v1/services/srv/deploys", json_body={"commitId": "abc"})
+    client.close()
+
+    assert [(method, path) for method, path, _ in server.requests] == [
+        ("GET", "/v1/warm"),
+        ("GET", "/v1/item"),
+        ("GET", "/v1/item"),
+        ("POST", "/v1/services/srv/deploys"),
+    ]
+
+
+def test_network_errors_raise_transport_error_after_retries() -> None:
+    attempts: list[str] = []
+
+    class DownTransport:
+        def send(self, request: http_client.HttpRequest, timeout: float) -> http_client.TransportResponse:
+            attempts.append(request.url)
+            raise http_client.TransportError("connection refused")
+
+    client = http_client.HttpClient(transport=DownTransport(), sleep=lambda _: None)
+
+    with pytest.raises(http_client.TransportError, match="connection refused"):
+        client.get("https://api.example.test/v1/ping")
+    assert len(attempts) == 3
+    assert client.metrics.summary()["api.example.test"]["errors"] == 3
+
+
+def test_urlopen_transport_keeps_existing_opener_hooks_working() -> None:
+    seen: list[tuple[str, str | None]] = []
+
+    class FakeResponse:
+        status = 200
+        headers = {"Content-Type": "application/json"}
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *args):
+            return None
+
+        def read(self) -> bytes:
+            return json.dumps({"lints": []}).encode("utf-8")
+
+    def fake_opener(request, timeout):
+        seen.append((request.full_url, request.headers.get("User-agent")))
+        return FakeResponse()
+
+    client = http_client.HttpClient(transport=http_client.UrlopenTransport(fake_opener))
+    response = client.get("https://api.supabase.com/v1/x", headers={"User-Agent": "TRR test/1.0"})
+
+    assert response.json() == {"lints": []}
+    assert seen == [("https://api.supabase.com/v1/x", "TRR test/1.0")]
@@ -4,9 +4,17 @@ import subprocess
 import time
 from pathlib import Path
 
+import pytest
+
 from scripts import instagram_auth_freshness as cli
 
 
+@pytest.fixture(autouse=True)
+def _isolated_validation_cache(tmp_path: Path, monkeypatch) -> None:
+    monkeypatch.setattr(cli, "VALIDATION_CACHE_PATH", tmp_path / "cache" / "instagram-auth-validation.json")
+    monkeypatch.delenv("WORKSPACE_INSTAGRAM_AUTH_VALIDATION_CACHE_SECONDS", raising=False)
+
+
 def test_check_instagram_auth_freshness_reports_ok_without_side_effects(
     tmp_path: Path,
     monkeypatch,
@@ -125,3 +133,66 @@ def test_main_only_fails_strict_mode_for_advisory(monkeypatch, capsys) -> None:
 
     monkeypatch.setenv("WORKSPACE_PREFLIGHT_STRICT", "1")
     assert cli.main([]) == 1
+
+
+def test_successful_validation_is_reused_until_cookie_files_change(tmp_path: Path, monkeypatch, capsys) -> None:
+    cookie_file = tmp_path / "instagram_cookies.json"
+    cookie_file.write_text('{"sessionid": "a"}', encoding="utf-8")
+    monkeypatch.setattr(cli, "DEFAULT_COOKIE_FILES", (cookie_file,))
+    monkeypatch.setattr(cli, "BACKEND_ROOT", tmp_path)
+    monkeypatch.setattr(cli, "_python_command", lambda: "python")
+    monkeypatch.setattr(cli, "_max_age_seconds", lambda: 14 * 24 * 60 * 60)
+    for key in cli.ENV_COOKIE_FILE_KEYS:
+        monkeypatch.delenv(key, raising=False)
+    calls: list[int] = []
+
+    def fake_run(*_args, **_kwargs):
+        calls.append(1)
+        return subprocess.CompletedProcess(["python"], 0, stdout='{"ok": true}\n', stderr="")
+
+    monkeypatch.setattr(cli.subprocess, "run", fake_run)
+
+    first = cli.check_instagram_auth_freshness()
+    second = cli.check_instagram_auth_freshness()
+
+    assert len(calls) == 1
+    assert first["validation_cached"] is False
+    assert second["validation_cached"] is True
+    assert second["state"] == "ok"
+    assert "validated, cached" in cli.render_summary(second)
+
+    cookie_file.write_text('{"sessionid": "b"}', encoding="utf-8")
+    cli.check_instagram_auth_freshness()
+    assert len(calls) == 2
+
+    assert cli.main(["--no-cache"]) == 0
+    assert len(calls) == 3
+    assert "Instagram auth freshness OK (validated;" in capsys.readouterr().out
+
+
+def test_failed_or_expired_validation_is_not_reused(tmp_path: Path, monkeypatch) -> None:
+    cookie_file = tmp_path / "instagram_cookies.json"
+    cookie_file.write_text("{}", encoding="utf-8")
+    monkeypatch.setattr(cli, "DEFAULT_COOKIE_FILES", (cookie_file,))
+    monkeypatch.setattr(cli, "BACKEND_ROOT", tmp_path)
+    monkeypatch.setattr(cli, "_python_command", lambda: "python")
+    for key in cli.ENV_COOKIE_FILE_KEYS:
+        monkeypatch.delenv(key, raising=False)
+    outcomes = iter([(1, '{"ok": false, "failure_reason": "manual_checkpoint_required"}'), (0, '{"ok": true}'), (0, '{"ok": true}')])
+    calls: list[int] = []
+
+    def fake_run(*_args, **_kwargs):
+        calls.append(1)
+        returncode, stdout = next(outcomes)
+        return subprocess.CompletedProcess(["python"], returncode, stdout=stdout, stderr="")
+
+    monkeypatch.setattr(cli.subprocess, "run", fake_run)
+
+    assert cli.check_instagram_auth_freshness()["ok"] is False
+    assert cli.check_instagram_auth_freshness()["validation_cached"] is False
+    fingerprint = cli.validation_fingerprint()
+    assert cli._load_cached_validation(fingerprint) is not None
+    assert cli._load_cached_validation(fingerprint, now=time.time() + cli.DEFAULT_VALIDATION_CACHE_SECONDS + 1) is None
+    monkeypatch.setenv("WORKSPACE_INSTAGRAM_AUTH_VALIDATION_CACHE_SECONDS", "0")
+    cli.check_instagram_auth_freshness()
+    assert len(calls) == 3
@@ -0,0 +1,138 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import sys
+import threading
+import time
+from pathlib import Path
+
+
+SCRIPT_PATH = Path(__file__).resolve().parent / "workspace" / "log_index.py"
+
+
+def _load_module():
+    spec = importlib.util.spec_from_file_location("log_index_under_test", SCRIPT_PATH)
+    assert spec is not None
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _append(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("a", encoding="utf-8") as handle:
+        handle.write(text)
+
+
+def test_ingest_is_incremental_and_survives_archive_and_truncation(tmp_path: Path) -> None:
+    log_index = _load_module()
+    backend = tmp_path / "trr-backend.log"
+    _append(backend, "2026-10-19T10:00:01Z INFO startup complete\n2026-10-19T10:00:30Z ERROR EMAXCONNSESSION max clients\n")
+    _append(tmp_path / "backend-watchdog-events.jsonl", json.dumps({"ts": "2026-10-19T10:01:00Z", "event": "restart"}) + "\n")
+
+    first = {stats.source: stats for stats in log_index.ingest(tmp_path)}
+    again = {stats.source: stats for stats in log_index.ingest(tmp_path)}
+
+    assert (first["backend"].lines, first["backend"].events, first["watchdog"].events) == (2, 1, 1)
+    assert again["backend"].bytes_read == 0
+
+    # Lines written after the last ingest, then `make dev` archives the log.
+    _append(backend, "2026-10-19T10:02:00Z WARNING UPSTREAM_TIMEOUT upstream\n")
+    archived = tmp_path / "archive" / "20261019-100300" / "trr-backend.log"
+    archived.parent.mkdir(parents=True)
+    backend.rename(archived)
+    _append(backend, "2026-10-19T10:05:00Z INFO postgres_pool_queue_depth=3\nTraceback (most recent call last)\nno newline yet")
+
+    rotated = {stats.source: stats for stats in log_index.ingest(tmp_path)}
+    assert rotated["backend"].rotated
+    assert rotated["backend"].lines == 3
+
+    backend.write_text("2026-10-19T11:00:00Z ERROR DATABASE_SERVICE_UNAVAILABLE\n", encoding="utf-8")
+    truncated = {stats.source: stats for stats in log_index.ingest(tmp_path)}
+    assert truncated["backend"].rotated and truncated["backend"].lines == 1
+
+    connection = log_index.connect(tmp_path / log_index.INDEX_NAME)
+    try:
+        events = log_index.query_events(connection, sources=["backend"])
+        assert [event["signals"] for event in events] == [
+            ["EMAXCONNSESSION"],
+            ["UPSTREAM_TIMEOUT"],
+            ["postgres_pool_queue_depth"],
+            ["traceback"],
+            ["DATABASE_SERVICE_UNAVAILABLE"],
+        ]
+        assert events[3]["ts"] == "2026-10-19T10:05:00Z"
+        total = connection.execute("SELECT SUM(lines) FROM minute_counts WHERE source = 'backend'").fetchone()[0]
+        assert total == 6
+    finally:
+        connection.close()
+
+
+def test_back_to_back_ingests_from_the_same_offsets_insert_once(tmp_path: Path, monkeypatch) -> None:
+    log_index = _load_module()
+    backend = tmp_path / "trr-backend.log"
+    _append(backend, "2026-10-19T10:00:01Z INFO startup complete\n")
+    log_index.ingest(tmp_path)
+    _append(backend, "2026-10-19T10:00:30Z ERROR EMAXCONNSESSION max clients\n")
+
+    # The first ingest pauses after reading its offset; the second starts from
+    # the same stored offset and must wait for the first commit, not re-read it.
+    reading = threading.Event()
+    ingest_file = log_index._ingest_file
+
+    def slow_ingest_file(*args, **kwargs):
+        reading.set()
+        time.sleep(0.3)
+        return ingest_file(*args, **kwargs)
+
+    monkeypatch.setattr(log_index, "_ingest_file", slow_ingest_file)
+    first = threading.Thread(target=log_index.ingest, args=(tmp_path,))
+    first.start()
+    assert reading.wait(5)
+    second = {stats.source: stats for stats in log_index.ingest(tmp_path)}
+    first.join(5)
+
+    assert second["backend"].bytes_read == 0
+    connection = log_index.connect(tmp_path / log_index.INDEX_NAME)
+    try:
+        assert [event["signals"] for event in log_index.query_events(connection, sources=["backend"])] == [
+            ["EMAXCONNSESSION"]
+        ]
+        total = connection.execute("SELECT SUM(lines) FROM minute_counts WHERE source = 'backend'").fetchone()[0]
+        assert total == 2
+    finally:
+        connection.close()
+
+
+def test_queries_filter_by_time_signal_and_count_per_minute(tmp_path: Path) -> None:
+    log_index = _load_module()
+    lines = [
+        "2026-10-19T10:00:05Z ERROR UPSTREAM_TIMEOUT a",
+        "2026-10-19T10:00:40Z ERROR UPSTREAM_TIMEOUT b",
+        "2026-10-19T10:01:10Z INFO pool_capacity=0",
+        "2026-10-19T10:03:00Z INFO request ok",
+        "2026-10-19T10:03:30Z ERROR UPSTREAM_TIMEOUT EMAXCONNSESSION c",
+    ]
+    _append(tmp_path / "trr-app.log", "\n".join(lines) + "\n")
+    log_index.ingest(tmp_path)
+    since = log_index.parse_time_arg("2026-10-19T10:00:30Z")
+    until = log_index.parse_time_arg("2026-10-19T10:03:15Z")
+
+    connection = log_index.connect(tmp_path / log_index.INDEX_NAME)
+    try:
+        window = log_index.query_events(connection, since=since, until=until)
+        timeouts = log_index.minute_counts(connection, signals=["UPSTREAM_TIMEOUT"])
+        all_lines = log_index.minute_counts(connection, since=since)
+    finally:
+        connection.close()
+
+    assert [event["message"][-1] for event in window] == ["b", "0"]
+    assert timeouts == [
+        {"minute": "2026-10-19T10:00:00Z", "count": 2},
+        {"minute": "2026-10-19T10:03:00Z", "count": 1},
+    ]
+    assert [row["count"] for row in all_lines] == [2, 1, 2]
+    assert log_index.parse_time_arg("15m", now=10_000) == 10_000 - 900
@@ -0,0 +1,372 @@
+from __future__ import annotations
+
+import gzip
+import io
+import importlib.util
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+
+SCRIPT_PATH = Path(__file__).resolve().with_name("nyt-interactive-scraper.py")
+
+
+def load_scraper_module():
+    spec = importlib.util.spec_from_file_location("nyt_interactive_scraper_under_test", SCRIPT_PATH)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def monthly_sitemap(month: str, slugs: list[str]) -> bytes:
+    urls = "".join(
+        f"<url><loc>https://www.nytimes.com/{slug}</loc><lastmod>{month}-15</lastmod></url>"
+        for slug in slugs
+    )
+    xml = f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>'
+    return gzip.compress(xml.encode("utf-8"))
+
+
+class SitemapStandIn:
+    """Local HTTP/1.1 stand-in for the NYT sitemap host."""
+
+    def __init__(self) -> None:
+        self.routes: dict[str, bytes] = {}
+        self.failures: dict[str, list[int]] = {}
+        self.etags: dict[str, str] = {}
+        self.requests: list[str] = []
+        self.connections = 0
+        stand_in = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self) -> None:
+                super().setup()
+                stand_in.connections += 1
+
+            def do_GET(self) -> None:  # noqa: N802 - http.server API
+                stand_in.requests.append(self.path)
+                queued = stand_in.failures.get(self.path)
+                if queued:
+                    self.send_response(queued.pop(0))
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                body = stand_in.routes.get(self.path)
+                if body is None:
+                    self.send_response(404)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                etag = stand_in.etags.get(self.path)
+                if etag and self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                if etag:
+                    self.send_header("ETag", etag)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *_args) -> None:
+                return
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def add_archive(self, months: dict[str, list[str]]) -> None:
+        entries = "".join(
+            f"<sitemap><loc>{self.base_url}/sitemaps/sitemap-{month}.xml.gz</loc></sitemap>"
+            for month in months
+        )
+        index = f'<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{entries}</sitemapindex>'
+        self.routes["/sitemaps/sitemap.xml.gz"] = gzip.compress(index.encode("utf-8"))
+        for month, slugs in months.items():
+            self.routes[f"/sitemaps/sitemap-{month}.xml.gz"] = monthly_sitemap(month, slugs)
+        for path in self.routes:
+            self.etags[path] = f'"{hash(self.routes[path]) & 0xFFFFFFFF:x}"'
+
+
+@pytest.fixture
+def stand_in():
+    server = SitemapStandIn()
+    server.thread.start()
+    try:
+        yield server
+    finally:
+        server.server.shutdown()
+        server.server.server_close()
+
+
+@pytest.fixture
+def scraper(stand_in, monkeypatch):
+    module = load_scraper_module()
+    monkeypatch.setattr(module, "SITEMAP_INDEX_URL", f"{stand_in.base_url}/sitemaps/sitemap.xml.gz")
+    monkeypatch.setattr(module, "NEWS_SITEMAP_URL", f"{stand_in.base_url}/sitemaps/news.xml.gz")
+    return module
+
+
+def test_archive_fetches_months_concurrently_and_assembles_in_order(stand_in, scraper) -> None:
+    months = {
+        f"2025-{index:02d}": [f"interactive/2025/{index:02d}/chart.html", f"2025/{index:02d}/story.html"]
+        for index in range(1, 13)
+    }
+    stand_in.add_archive(months)
+
+    with scraper.SitemapFetcher(workers=4, retries=0) as fetcher:
+        results = scraper.scrape_archive("2025-03", "2025-10", fetcher=fetcher)
+
+    assert [row["sitemap_month"] for row in results] == [f"2025-{index:02d}" for index in range(3, 11)]
+    assert all("/interactive/" in row["url"] for row in results)
+    # Index on the caller thread, then 8 months over one keep-alive connection per worker.
+    assert len(stand_in.requests) == 9
+    assert stand_in.connections <= 5
+
+
+def test_fetcher_retries_transient_statuses_with_backoff(stand_in, scraper) -> None:
+    stand_in.add_archive({"2026-01": ["interactive/2026/01/map.html"]})
+    stand_in.failures["/sitemaps/sitemap-2026-01.xml.gz"] = [503, 429]
+
+    with scraper.SitemapFetcher(workers=2, retries=2, backoff=0) as fetcher:
+        results = scraper.scrape_archive("2026-01", "2026-01", fetcher=fetcher)
+
+    assert [row["url"] for row in results] == ["https://www.nytimes.com/interactive/2026/01/map.html"]
+    assert stand_in.requests.count("/sitemaps/sitemap-2026-01.xml.gz") == 3
+
+
+def test_failed_month_is_reported_without_dropping_other_months(stand_in, scraper, capsys) -> None:
+    stand_in.add_archive(
+        {
+            "2026-01": ["interactive/2026/01/map.html"],
+            "2026-02": ["interactive/2026/02/map.html"],
+        }
+    )
+    stand_in.failures["/sitemaps/sitemap-2026-01.xml.gz"] = [404]
+
+    with scraper.SitemapFetcher(workers=2, retries=3, backoff=0) as fetcher:
+        results = scraper.scrape_archive("2026-01", "2026-02", fetcher=fetcher)
+
+    assert [row["sitemap_month"] for row in results] == ["2026-02"]
+    assert stand_in.requests.count("/sitemaps/sitemap-2026-01.xml.gz") == 1
+    assert "2026-01 ... FAILED (HTTP 404" in capsys.readouterr().err
+
+
+class TrackingStream(io.BytesIO):
+    """BytesIO that records how far a reader has pulled."""
+
+    def __init__(self, data: bytes) -> None:
+        super().__init__(data)
+        self.high_water = 0
+
+    def readinto(self, buffer) -> int:
+        count = super().readinto(buffer)
+        self.high_water = max(self.high_water, self.tell())
+        return count
+
+    def read(self, size: int | None = -1) -> bytes:
+        chunk = super().read(size)
+        self.high_water = max(self.high_water, self.tell())
+        return chunk
+
+
+def test_iter_sitemap_elements_streams_gzip_and_clears_processed_entries() -> None:
+    module = load_scraper_module()
+    slugs = [f"interactive/2025/01/chart-{index}.html" for index in range(20_000)]
+    payload = monthly_sitemap("2025-01", slugs)
+    stream = TrackingStream(payload)
+
+    elements = module.iter_sitemap_elements(stream, "url")
+    first = next(elements)
+
+    assert first.findtext("sm:loc", "", module.NS).endswith("chart-0.html")
+    assert stream.high_water < len(payload)
+
+    count = 1
+    previous = first
+    for element in elements:
+        # The entry handed out before this one has already been cleared.
+        assert len(previous) == 0
+        previous = element
+        count += 1
+    assert count == len(slugs)
+
+
+def test_iter_recent_filters_entries_while_streaming(stand_in, scraper) -> None:
+    entries = [
+        ("interactive/2026/10/18/us/map.html", "Politics"),
+        ("2026/10/18/upshot/chart.html", "vis-design, Economy"),
+        ("2026/10/18/nyregion/story.html", "New York"),
+        ("interactive/2026/us/elections/results-ohio.html", "Elections"),
+    ]
+    urls = "".join(
+        "<url>"
+        f"<loc>https://www.nytimes.com/{slug}</loc>"
+        f"<news:news><news:title>{slug}</news:title><news:keywords>{keywords}</news:keywords></news:news>"
+        "</url>"
+        for slug, keywords in entries
+    )
+    xml = (
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+        'xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">'
+        f"{urls}</urlset>"
+    )
+    stand_in.routes["/sitemaps/news.xml.gz"] = gzip.compress(xml.encode("utf-8"))
+
+    with scraper.SitemapFetcher(workers=1, retries=0) as fetcher:
+        recent = list(scraper.iter_recent(fetcher=fetcher))
+        vis = scraper.scrape_vis_design(fetcher)
+
+    assert [row["url"].rsplit("/", 1)[-1] for row in recent] == ["map.html", "chart.html"]
+    assert [row["url"].rsplit("/", 1)[-1] for row in vis] == ["chart.html"]
+    assert stand_in.connections == 1
+
+
+def test_cache_revalidates_index_and_current_month_and_skips_closed_months(
+    stand_in, scraper, tmp_path, monkeypatch
+) -> None:
+    stand_in.add_archive(
+        {
+            "2026-08": ["interactive/2026/08/a.html"],
+            "2026-09": ["interactive/2026/09/b.html"],
+            "2026-10": ["interactive/2026/10/c.html"],
+        }
+    )
+    monkeypatch.setattr(scraper, "current_month", lambda: "2026-10")
+
+    def run(offline: bool = False) -> list[dict]:
+        cache = scraper.SitemapCache(tmp_path / "cache", offline=offline)
+        with scraper.SitemapFetcher(workers=2, retries=0, cache=cache) as fetcher:
+            return scraper.scrape_archive("2026-08", "2026-10", fetcher=fetcher)
+
+    first = run()
+    assert len(stand_in.requests) == 4
+
+    stand_in.requests.clear()
+    second = run()
+    assert second == first
+    # Index and the open month are revalidated (304); closed months cost nothing.
+    assert sorted(stand_in.requests) == ["/sitemaps/sitemap-2026-10.xml.gz", "/sitemaps/sitemap.xml.gz"]
+
+    stand_in.requests.clear()
+    assert run(offline=True) == first
+    assert stand_in.requests == []
+
+
+def test_cache_replaces_body_when_server_content_changes(stand_in, scraper, tmp_path) -> None:
+    stand_in.routes["/sitemaps/news.xml.gz"] = monthly_sitemap("2026-10", ["interactive/2026/10/a.html"])
+    stand_in.etags["/sitemaps/news.xml.gz"] = '"v1"'
+    cache = scraper.SitemapCache(tmp_path / "cache")
+
+    with scraper.SitemapFetcher(workers=1, retries=0, cache=cache) as fetcher:
+        first = [row["url"] for row in scraper.iter_recent(fetcher=fetcher)]
+        stand_in.routes["/sitemaps/news.xml.gz"] = monthly_sitemap("2026-10", ["interactive/2026/10/b.html"])
+        stand_in.etags["/sitemaps/news.xml.gz"] = '"v2"'
+        second = [row["url"] for row in scraper.iter_recent(fetcher=fetcher)]
+
+    assert first[0].endswith("/a.html")
+    assert second[0].endswith("/b.html")
+    assert cache.conditional_headers(f"{stand_in.base_url}/sitemaps/news.xml.gz") == {"If-None-Match": '"v2"'}
+
+
+def test_offline_mode_fails_months_that_were_never_cached(scraper, tmp_path) -> None:
+    cache = scraper.SitemapCache(tmp_path / "cache", offline=True)
+
+    with scraper.SitemapFetcher(cache=cache) as fetcher:
+        with pytest.raises(scraper.FetchError, match="offline and not cached"):
+            scraper.get_monthly_sitemap_urls(fetcher)
+
+
+def news_sitemap(entries: list[tuple[str, str, str]]) -> bytes:
+    urls = "".join(
+        "<url>"
+        f"<loc>https://www.nytimes.com/{slug}</loc>"
+        "<news:news>"
+        f"<news:title>{slug}</news:title>"
+        f"<news:keywords>{keywords}</news:keywords>"
+        f"<news:publication_date>{published}</news:publication_date>"
+        "</news:news>"
+        "</url>"
+        for slug, keywords, published in entries
+    )
+    xml = (
+        '<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9" '
+        'xmlns:news="http://www.google.com/schemas/sitemap-news/0.9">'
+        f"{urls}</urlset>"
+    )
+    return gzip.compress(xml.encode("utf-8"))
+
+
+def test_store_since_last_run_emits_only_new_news_entries(stand_in, scraper, tmp_path) -> None:
+    first_window = [
+        ("interactive/2026/10/17/us/a.html", "Politics", "2026-10-17T09:00:00-04:00"),
+        ("2026/10/18/upshot/b.html", "vis-design, Economy", "2026-10-18T08:00:00-04:00"),
+    ]
+    stand_in.routes["/sitemaps/news.xml.gz"] = news_sitemap(first_window)
+
+    with scraper.ResultsStore(tmp_path / "store.sqlite3") as store:
+        with scraper.SitemapFetcher(workers=1, retries=0) as fetcher:
+            first = list(store.record_news(scraper.iter_recent(fetcher=fetcher), "news:recent", since_last_run=True))
+            stand_in.routes["/sitemaps/news.xml.gz"] = news_sitemap(
+                first_window + [("interactive/2026/10/18/world/c.html", "World", "2026-10-18T14:30:00Z")]
+            )
+            second = list(store.record_news(scraper.iter_recent(fetcher=fetcher), "news:recent", since_last_run=True))
+            third = list(store.record_news(scraper.iter_recent(fetcher=fetcher), "news:recent", since_last_run=True))
+
+        assert [row["url"].rsplit("/", 1)[-1] for row in first] == ["a.html", "b.html"]
+        assert [row["url"].rsplit("/", 1)[-1] for row in second] == ["c.html"]
+        assert third == []
+        assert store.get_mark("news:recent") == "2026-10-18T14:30:00+00:00"
+        assert [row["url"].rsplit("/", 1)[-1] for row in store.query(tag="VIS-DESIGN")] == ["b.html"]
+        assert len(store.query(month="2026-10")) == 3
+
+
+def test_store_upsert_keeps_news_metadata_when_archive_sees_same_url(scraper, tmp_path) -> None:
+    url = "https://www.nytimes.com/interactive/2026/03/01/climate/map.html"
+    with scraper.ResultsStore(tmp_path / "store.sqlite3") as store:
+        store.upsert({"url": url, "title": "Heat Map", "keywords": "vis-design", "published": "2026-03-01", "vis_design": True})
+        store.upsert({"url": url, "lastmod": "2026-03-04T10:00:00Z", "sitemap_month": "2026-03"})
+
+        [row] = store.query(month="2026-03")
+
+    assert row["title"] == "Heat Map"
+    assert row["vis_design"] is True
+    assert row["lastmod"] == "2026-03-04T10:00:00Z"
+
+
+def test_since_last_run_tracks_fetched_months_not_a_high_water_mark(stand_in, scraper, tmp_path) -> None:
+    months = ("2026-01", "2026-02", "2026-03", "2026-04")
+    stand_in.add_archive({month: [f"interactive/{month}/x.html"] for month in months})
+    stand_in.failures["/sitemaps/sitemap-2026-03.xml.gz"] = [404]
+
+    def run(store, start: str) -> list[str]:
+        with scraper.SitemapFetcher(workers=2, retries=0) as fetcher:
+            rows = store.record_archive(
+                scraper.iter_archive(
+                    start,
+                    "2026-04",
+                    fetcher=fetcher,
+                    on_month=store.archive_month_done,
+                    skip_months=store.fetched_archive_months(),
+                )
+            )
+            return [row["sitemap_month"] for row in rows]
+
+    with scraper.ResultsStore(tmp_path / "store.sqlite3") as store:
+        assert run(store, "2026-02") == ["2026-02", "2026-04"]
+        assert store.fetched_archive_months() == {"2026-02", "2026-04"}
+        # An earlier start fetches the never-fetched January; the failed
+        # March is retried even though April after it succeeded.
+        assert run(store, "2026-01") == ["2026-01", "2026-03"]
+        assert run(store, "2026-01") == []
+        assert store.fetched_archive_months(include_all=True) == set()
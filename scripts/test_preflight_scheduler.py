@@ -0,0 +1,221 @@
+from __future__ import annotations
+
+import dataclasses
+import re
+import subprocess
+import threading
+import time
+from pathlib import Path
+
+from scripts import preflight_scheduler as scheduler
+
+
+ROOT = Path(__file__).resolve().parents[1]
+PREFLIGHT_PATH = ROOT / "scripts" / "preflight.sh"
+LIB_PATH = ROOT / "scripts" / "lib" / "preflight-scheduler.sh"
+DIAGNOSTICS_PATH = ROOT / "scripts" / "lib" / "preflight-diagnostics.sh"
+
+
+def _shell_phase(name: str, script: str, **kwargs) -> scheduler.Phase:
+    return scheduler.Phase(name, ("bash", "-c", script), **kwargs)
+
+
+def test_declared_phases_match_preflight_order_and_dependencies() -> None:
+    phases = scheduler.build_phases(ROOT, {"HOME": "/nonexistent"})
+    source = PREFLIGHT_PATH.read_text(encoding="utf-8")
+    preflight_order = re.findall(r'run_preflight_phase(?:_capture \w+)? "([\w-]+)"', source)
+
+    assert scheduler.validate_phases(phases) == []
+    assert [phase.name for phase in phases] == preflight_order
+    for phase in phases:
+        # Every call runs the declared argv rather than its own copy.
+        call = re.search(rf'run_preflight_phase(?:_capture \w+)? "{phase.name}" "[^"]*" (.*)$', source, re.MULTILINE)
+        assert call is not None
+        assert call.group(1).startswith(f'"${{{scheduler.shell_variable(phase.name)}[@]}}"')
+
+
+def test_bash_loads_exact_phase_argv_from_declarations(tmp_path: Path) -> None:
+    env = {
+        "HOME": str(tmp_path / "home with space"),
+        "PATH": "/usr/bin:/bin",
+        "WORKSPACE_DEV_MODE": "hybrid",
+        "WORKSPACE_PREFLIGHT_STRICT": "1",
+        "WORKSPACE_PREFLIGHT_DOCTOR_TIMEOUT_SECONDS": "75",
+        "WORKSPACE_PREFLIGHT_MCP_STALE_AGE_SEC": "90",
+    }
+    phases = scheduler.build_phases(ROOT, env)
+    dump = "".join(
+        f'printf "%s\\0" "${{{scheduler.shell_variable(phase.name)}[@]}}" >"{tmp_path}/{phase.name}.argv"\n'
+        for phase in phases
+    )
+
+    result = subprocess.run(
+        ["/bin/bash", "-c", f'set -euo pipefail\nsource "{LIB_PATH}"\npreflight_load_phase_commands "{ROOT}"\n{dump}'],
+        capture_output=True,
+        text=True,
+        env=env,
+        check=False,
+    )
+
+    assert result.returncode == 0, result.stderr
+    for phase in phases:
+        loaded = (tmp_path / f"{phase.name}.argv").read_text(encoding="utf-8").split("\0")[:-1]
+        assert tuple(loaded) == phase.command
+
+
+def test_only_read_only_phases_are_scheduled_ahead() -> None:
+    phases = {phase.name: phase for phase in scheduler.build_phases(ROOT, {"HOME": "/nonexistent"})}
+
+    assert phases["env-contract"].read_only
+    assert not phases["runtime-reconcile"].read_only
+    assert phases["runtime-reconcile"].deps == ("modal-billing-guardrail", "mcp-orphan-reap", "doctor")
+    assert not phases["handoff-sync"].read_only
+    assert not phases["doctor"].read_only
+    assert phases["check-policy"].deps == ("handoff-sync", "codex-bootstrap")
+    assert not phases["context7-cache-repair"].enabled
+
+
+def test_scheduler_runs_independent_phases_with_bounded_parallelism(tmp_path: Path) -> None:
+    phases = [_shell_phase(name, f"sleep 0.3; echo {name}-out; echo {name}-err >&2") for name in ("a", "b", "c", "d")]
+    ledger = scheduler.Ledger(tmp_path)
+
+    started = time.monotonic()
+    rc = scheduler.Scheduler(phases, ledger, jobs=2, cwd=tmp_path).run()
+    elapsed = time.monotonic() - started
+
+    assert rc == 0
+    assert 0.55 < elapsed < 1.1
+    for name in ("a", "b", "c", "d"):
+        assert ledger.rc(name) == 0
+        assert ledger.output_path(name).read_text(encoding="utf-8") == f"{name}-out\n{name}-err\n"
+
+
+def test_scheduler_waits_for_inline_dependencies_and_skips_blocked_phases(tmp_path: Path) -> None:
+    phases = [
+        _shell_phase("writer", "exit 0", side_effects=("handoffs",)),
+        _shell_phase("failing-writer", "exit 0", side_effects=("codex-config",)),
+        _shell_phase("after-writer", "echo ran", deps=("writer",)),
+        _shell_phase("after-failure", "echo ran", deps=("failing-writer",)),
+    ]
+    ledger = scheduler.Ledger(tmp_path)
+
+    def inline_side() -> None:
+        time.sleep(0.2)
+        # preflight.sh runs side-effect phases itself and records their exit codes.
+        assert ledger.claim("writer") and ledger.claim("failing-writer")
+        ledger.write_rc("failing-writer", 3)
+        ledger.write_rc("writer", 0)
+
+    thread = threading.Thread(target=inline_side)
+    thread.start()
+    rc = scheduler.Scheduler(phases, ledger, jobs=4, cwd=tmp_path).run()
+    thread.join()
+
+    assert rc == 0
+    assert ledger.rc("after-writer") == 0
+    assert ledger.rc("after-failure") is None
+    assert ledger.claim("after-failure"), "blocked phases stay unclaimed for preflight.sh"
+
+
+def test_failing_gate_phase_keeps_runtime_reconcile_from_starting(tmp_path: Path) -> None:
+    marker = tmp_path / "reconciled"
+    stubs = {
+        "modal-billing-guardrail": "exit 1",
+        "runtime-reconcile": f"touch {marker}",
+    }
+    phases = [
+        dataclasses.replace(phase, command=("bash", "-c", stubs.get(phase.name, "exit 0")))
+        for phase in scheduler.build_phases(ROOT, {"HOME": "/nonexistent"})
+    ]
+    ledger = scheduler.Ledger(tmp_path / "ledger")
+
+    def inline_side() -> None:
+        # preflight.sh runs the other side-effect phases itself; reconcile is
+        # never reached because the guardrail failure stops the script.
+        for name in ("mcp-orphan-reap", "doctor", "handoff-sync", "codex-bootstrap"):
+            assert ledger.claim(name)
+            ledger.write_rc(name, 0)
+
+    thread = threading.Thread(target=inline_side)
+    thread.start()
+    run = scheduler.Scheduler(phases, ledger, jobs=4, cwd=tmp_path)
+    assert run.run() == 0
+    thread.join()
+
+    assert ledger.rc("modal-billing-guardrail") == 1
+    assert run._dep_state(run.phases["runtime-reconcile"]) == "blocked"
+    assert ledger.rc("runtime-reconcile") is None
+    assert not marker.exists()
+
+
+def test_scheduler_leaves_phases_already_claimed_by_preflight(tmp_path: Path) -> None:
+    ledger = scheduler.Ledger(tmp_path)
+    assert ledger.claim("claimed")
+
+    scheduler.Scheduler([_shell_phase("claimed", "echo should-not-run")], ledger, cwd=tmp_path).run()
+
+    assert not ledger.output_path("claimed").exists()
+    assert ledger.rc("claimed") is None
+
+
+def test_scheduler_records_shell_style_exit_codes(tmp_path: Path) -> None:
+    ledger = scheduler.Ledger(tmp_path)
+    phases = [_shell_phase("fails", "exit 7"), _shell_phase("killed", "kill -TERM $$")]
+
+    scheduler.Scheduler(phases, ledger, cwd=tmp_path).run()
+
+    assert ledger.rc("fails") == 7
+    assert ledger.rc("killed") == 143
+
+
+def test_bash_replays_buffered_result_and_claims_inline_phases(tmp_path: Path) -> None:
+    ledger = scheduler.Ledger(tmp_path / "ledger")
+    assert ledger.claim("prefetched")
+    ledger.output_path("prefetched").write_text("line one\nline two\n", encoding="utf-8")
+    ledger.write_rc("prefetched", 4)
+
+    result = subprocess.run(
+        [
+            "/bin/bash",
+            "-c",
+            f"""
+            set -euo pipefail
+            source "{DIAGNOSTICS_PATH}"
+            source "{LIB_PATH}"
+            PREFLIGHT_PREFETCH_DIR="{ledger.path}"
+            if preflight_prefetch_claim prefetched; then echo "unexpected claim"; fi
+            rc=0
+            preflight_prefetch_wait prefetched output || rc="$?"
+            printf 'rc=%s\\n%s\\n' "$rc" "$output"
+            preflight_prefetch_claim inline && echo "inline claimed"
+            preflight_prefetch_mark_done inline 0
+            """,
+        ],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout == "rc=4\nline one\nline two\ninline claimed\n"
+    assert ledger.rc("inline") == 0
+
+
+def test_prefetch_is_disabled_in_diagnostics_mode(tmp_path: Path) -> None:
+    result = subprocess.run(
+        [
+            "/bin/bash",
+            "-c",
+            f"""
+            source "{DIAGNOSTICS_PATH}"
+            source "{LIB_PATH}"
+            WORKSPACE_PREFLIGHT_DIAGNOSTICS=1 preflight_prefetch_start "{ROOT}"
+            preflight_prefetch_is_active && echo active || echo inactive
+            """,
+        ],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    assert result.stdout.strip() == "inactive"
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from scripts import preflight_scheduler as scheduler
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT_PATH = ROOT / "scripts" / "preflight-timings.py"
+LIB_PATH = ROOT / "scripts" / "lib" / "phase-timings.sh"
+
+
+def _load_module():
+    spec = importlib.util.spec_from_file_location("preflight_timings", SCRIPT_PATH)
+    assert spec and spec.loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+timings = _load_module()
+
+
+def _write_runs(path: Path, runs: list[dict[str, int]], *, source: str = "preflight") -> None:
+    now_ms = int(time.time() * 1000)
+    lines = []
+    for index, phases in enumerate(runs):
+        end_ms = now_ms - (len(runs) - index) * 60_000
+        for phase, elapsed in phases.items():
+            lines.append(
+                json.dumps(
+                    {
+                        "ts": "",
+                        "run_id": f"{source}-{index}",
+                        "source": source,
+                        "phase": phase,
+                        "start_ms": end_ms - elapsed,
+                        "end_ms": end_ms,
+                        "elapsed_ms": elapsed,
+                        "rc": 0,
+                        "output_bytes": 10,
+                        "prefetched": False,
+                    }
+                )
+            )
+    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+
+
+def test_bash_recorder_appends_parseable_events(tmp_path: Path) -> None:
+    ledger = tmp_path / "logs" / "phase-timings.jsonl"
+    result = subprocess.run(
+        [
+            "/bin/bash",
+            "-c",
+            f"""
+            set -euo pipefail
+            source "{LIB_PATH}"
+            WORKSPACE_PHASE_TIMINGS_FILE="{ledger}"
+            workspace_timings_init "{tmp_path}" preflight
+            start_ms="$(workspace_timings_now_ms)"
+            sleep 0.1
+            workspace_timings_record doctor "$start_ms" "$(workspace_timings_now_ms)" 3 "$(workspace_timings_byte_count "héllo")"
+            workspace_timings_record status-probe 100 150 0 null
+            """,
+        ],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    assert result.returncode == 0, result.stderr
+    events = timings.load_events(ledger)
+    assert [event["phase"] for event in events] == ["status-probe", "doctor"]
+    doctor = events[1]
+    assert doctor["rc"] == 3
+    assert doctor["output_bytes"] == 6
+    assert 90 <= doctor["elapsed_ms"] < 2000
+    assert doctor["run_id"].startswith("preflight-")
+    assert events[0]["output_bytes"] is None
+
+
+def test_recorder_is_silent_when_disabled(tmp_path: Path) -> None:
+    result = subprocess.run(
+        [
+            "/bin/bash",
+            "-c",
+            f"""
+            source "{LIB_PATH}"
+            WORKSPACE_PHASE_TIMINGS=0
+            workspace_timings_init "{tmp_path}" status
+            workspace_timings_record probe 1 2 0 0
+            """,
+        ],
+        capture_output=True,
+        text=True,
+        check=False,
+    )
+
+    assert result.returncode == 0, result.stderr
+    assert not (tmp_path / ".logs").exists()
+
+
+def test_scheduler_records_prefetched_phases(tmp_path: Path) -> None:
+    ledger_file = tmp_path / "phase-timings.jsonl"
+    log = scheduler.TimingLog(ledger_file, "preflight-run")
+    phases = [scheduler.Phase("quick", ("bash", "-c", "sleep 0.1; printf abc"))]
+
+    scheduler.Scheduler(phases, scheduler.Ledger(tmp_path / "ledger"), cwd=tmp_path, timings=log).run()
+
+    (event,) = timings.load_events(ledger_file)
+    assert event["phase"] == "quick"
+    assert event["prefetched"] is True
+    assert event["output_bytes"] == 3
+    assert event["rc"] == 0
+    assert event["elapsed_ms"] >= 90
+
+
+def test_report_summarizes_percentiles_and_daily_trend(tmp_path: Path) -> None:
+    ledger = tmp_path / "phase-timings.jsonl"
+    _write_runs(ledger, [{"doctor": elapsed, "env-contract": 20} for elapsed in (100, 200, 300, 400, 1000)])
+
+    rows = {row["phase"]: row for row in timings.summarize(timings.load_events(ledger))}
+
+    assert rows["doctor"]["p50_ms"] == 300
+    assert rows["doctor"]["p95_ms"] == 880
+    assert rows["doctor"]["count"] == 5
+    trend = timings.daily_trend(timings.load_events(ledger))
+    assert sum(point["count"] for point in trend["preflight/doctor"].values()) == 5
+
+
+def test_check_flags_regressions_beyond_ratio(tmp_path: Path, capsys) -> None:
+    ledger = tmp_path / "phase-timings.jsonl"
+    history = [{"doctor": 1000, "env-contract": 20} for _ in range(6)]
+    recent = [{"doctor": 2600, "env-contract": 60} for _ in range(3)]
+    _write_runs(ledger, history + recent)
+
+    regressions = timings.find_regressions(timings.load_events(ledger), max_ratio=1.5)
+
+    # env-contract tripled, but 40ms is under the noise floor.
+    assert [(item["phase"], item["ratio"]) for item in regressions] == [("doctor", 2.6)]
+    assert timings.main(["--ledger", str(ledger), "check", "--max-ratio", "1.5"]) == 1
+    assert "preflight/doctor" in capsys.readouterr().err
+    assert timings.main(["--ledger", str(ledger), "check", "--max-ratio", "3"]) == 0
+
+
+def test_check_needs_enough_history(tmp_path: Path) -> None:
+    ledger = tmp_path / "phase-timings.jsonl"
+    _write_runs(ledger, [{"doctor": 1000}, {"doctor": 9000}])
+
+    assert timings.find_regressions(timings.load_events(ledger), recent_runs=1) == []
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+import time
+
+from scripts.lib import process_supervisor
+from scripts.lib.process_supervisor import ProcessInfo, ProcessTreeSupervisor
+
+
+def _info(pid: int, ppid: int, comm: str = "node", start: int | None = 100) -> ProcessInfo:
+    return ProcessInfo(pid=pid, ppid=ppid, pgid=pid, state="S", comm=comm, cpu_seconds=1.5, rss_bytes=4096, start=start)
+
+
+def test_process_table_parsers_handle_awkward_command_names() -> None:
+    stat = "4242 (next-server (v1) x) S 4000 4000 4000 0 -1 0 0 0 0 0 250 50 0 0 20 0 1 0 9999 0 300 0"
+    info = process_supervisor.parse_proc_stat(stat)
+    assert (info.pid, info.ppid, info.comm, info.start) == (4242, 4000, "next-server (v1) x", 9999)
+    assert info.rss_bytes == 300 * process_supervisor._PAGE_SIZE
+
+    table = process_supervisor.parse_ps_table(
+        "  101     1   101  2048   1-02:03:04 Ss   uvicorn main:app\n  102   101   101   512     00:01.50 Z    node\n"
+    )
+    assert table[101].cpu_seconds == 86400 + 2 * 3600 + 3 * 60 + 4
+    assert table[101].comm == "uvicorn main:app"
+    assert table[102].cpu_seconds == 1.5 and not table[102].alive
+
+
+def test_reparented_descendants_stay_tracked_until_they_exit_or_the_pid_is_reused() -> None:
+    supervisor = ProcessTreeSupervisor(10, table=dict)
+    tree = {10: _info(10, 1, "bash"), 11: _info(11, 10), 12: _info(12, 11, "next-server")}
+    assert set(supervisor.tracked(tree)) == {10, 11, 12}
+
+    # The middle process exits and its child is reparented to init.
+    assert set(supervisor.tracked({10: tree[10], 12: _info(12, 1, "next-server")})) == {10, 12}
+    assert set(supervisor.tracked({10: tree[10], 12: _info(12, 1, "other", start=555)})) == {10}
+
+
+def test_terminate_escalates_to_sigkill_for_processes_that_ignore_sigterm() -> None:
+    script = (
+        "import signal, subprocess, sys, time\n"
+        "subprocess.Popen([sys.executable, '-c', 'import time; time.sleep(60)'])\n"
+        "signal.signal(signal.SIGTERM, signal.SIG_IGN)\n"
+        "print('ready', flush=True)\n"
+        "time.sleep(60)\n"
+    )
+    root = subprocess.Popen([sys.executable, "-c", script], stdout=subprocess.PIPE, text=True)
+    try:
+        assert root.stdout is not None and root.stdout.readline().strip() == "ready"
+        supervisor = ProcessTreeSupervisor(root.pid)
+        children = set(supervisor.tracked())
+        assert root.pid in children and len(children) == 2
+        started = time.monotonic()
+
+        result = supervisor.terminate(0.5, exclude_reap=[root.pid])
+
+        assert time.monotonic() - started < 5
+        assert result.killed == (root.pid,)
+        assert set(result.terminated) == children - {root.pid}
+        assert result.survivors == ()
+        assert root.wait(timeout=5) == -9
+    finally:
+        root.kill()
+        root.wait()
@@ -7,6 +7,7 @@ from pathlib import Path
 import pytest
 
 from scripts import render_trr
+from scripts.lib import http_client
 
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -231,6 +232,130 @@ def test_rollback_rejects_unsuccessful_deployment_without_posting() -> None:
     assert all(method == "GET" for method, _path, _body in client.calls)
 
 
+class SequencedDeployClient(FakeClient):
+    def __init__(self, statuses: list[str | Exception]) -> None:
+        super().__init__()
+        self.statuses = statuses
+
+    def get(self, path: str):
+        if path != f"/v1/services/{SERVICE_ID}/deploys/dpl_candidate":
+            return super().get(path)
+        self.calls.append(("GET", path, None))
+        step = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        if isinstance(step, Exception):
+            raise step
+        return {"id": "dpl_candidate", "status": step, "commit": {"id": CANDIDATE_COMMIT}}
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+        self.sleeps: list[float] = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _wait(client: FakeClient, clock: FakeClock, events: list[dict], **kwargs):
+    return render_trr.wait(
+        client=client,
+        target=render_trr.load_target(),
+        service_id=SERVICE_ID,
+        deploy_id="dpl_candidate",
+        commit=CANDIDATE_COMMIT,
+        emit=events.append,
+        clock=clock,
+        sleep=clock.sleep,
+        git_verify=_git_verify,
+        **kwargs,
+    )
+
+
+def test_wait_streams_transitions_and_backs_off_during_build() -> None:
+    statuses: list[str | Exception] = ["created"] * 2 + ["build_in_progress"] * 30
+    statuses += [render_trr.RenderGuardError("Render API GET failed: timed out")]
+    statuses += ["update_in_progress", "update_in_progress", "live"]
+    client = SequencedDeployClient(statuses)
+    clock = FakeClock()
+    events: list[dict] = []
+
+    result = _wait(client, clock, events)
+
+    transitions = [(event["from"], event["status"]) for event in events if event["event"] == "transition"]
+    assert transitions == [
+        (None, "created"),
+        ("created", "build_in_progress"),
+        ("build_in_progress", "update_in_progress"),
+        ("update_in_progress", "live"),
+    ]
+    assert [event["event"] for event in events].count("poll_error") == 1
+    assert events[-1] == result
+    assert result["ok"] is True
+    assert result["timed_out"] is False
+    assert result["polls"] == 35
+    assert all(method == "GET" for method, _path, _body in client.calls)
+    assert clock.sleeps[0] == render_trr.FAST_POLL_SECONDS
+    assert max(clock.sleeps) == 30.0
+
+
+def test_wait_reports_failed_deploys_and_timeouts() -> None:
+    events: list[dict] = []
+    failed = _wait(SequencedDeployClient(["queued", "build_failed"]), FakeClock(), events)
+    assert failed["ok"] is False
+    assert failed["status"] == "build_failed"
+    assert failed["timed_out"] is False
+
+    clock = FakeClock()
+    stuck = _wait(SequencedDeployClient(["build_in_progress"]), clock, [], timeout_seconds=120)
+    assert stuck["timed_out"] is True
+    assert stuck["status"] == "build_in_progress"
+    assert clock.now == 120
+
+
+def test_wait_rejects_commit_mismatch_while_polling() -> None:
+    client = SequencedDeployClient(["created"])
+    with pytest.raises(render_trr.RenderGuardError, match="commit mismatch"):
+        render_trr.wait(
+            client=client,
+            target=render_trr.load_target(),
+            service_id=SERVICE_ID,
+            deploy_id="dpl_candidate",
+            commit=PREVIOUS_COMMIT,
+            clock=FakeClock(),
+            sleep=lambda _: None,
+            git_verify=_git_verify,
+        )
+
+
+def test_api_client_maps_http_failures_and_retries_only_safe_requests() -> None:
+    sent: list[tuple[str, str, bytes | None]] = []
+    answers = [503, 200, 500]
+
+    class ScriptedTransport:
+        def send(self, request, timeout):
+            sent.append((request.method, request.url, request.body))
+            assert request.headers["Authorization"] == "Bearer rnd_test"
+            return http_client.TransportResponse(answers.pop(0), {}, b'{"id": "x"}')
+
+    client = render_trr.RenderApiClient(
+        "rnd_test",
+        http=http_client.HttpClient(transport=ScriptedTransport(), sleep=lambda _: None),
+        base_url="http://render.stand-in",
+    )
+
+    assert client.get(f"/v1/services/{SERVICE_ID}") == {"id": "x"}
+    with pytest.raises(render_trr.RenderGuardError, match="HTTP 500"):
+        client.post(f"/v1/services/{SERVICE_ID}/deploys", {"commitId": CANDIDATE_COMMIT})
+
+    assert [method for method, _url, _body in sent] == ["GET", "GET", "POST"]
+    assert sent[-1][1] == f"http://render.stand-in/v1/services/{SERVICE_ID}/deploys"
+    assert client.metrics.summary()["render.stand-in"]["retries"] == 1
+
+
 def test_shell_wrapper_exposes_only_guarded_commands() -> None:
     completed = subprocess.run(
         ["bash", str(ROOT / "scripts" / "render-trr.sh"), "--help"],
@@ -242,5 +367,5 @@ def test_shell_wrapper_exposes_only_guarded_commands() -> None:
     )
 
     assert completed.returncode == 0
-    for command in ("preflight", "deploy", "status", "rollback"):
+    for command in ("preflight", "deploy", "status", "wait", "rollback"):
         assert command in completed.stdout
@@ -0,0 +1,86 @@
+from __future__ import annotations
+
+import json
+import re
+import subprocess
+import sys
+from pathlib import Path
+
+
+SCRIPT_PATH = Path(__file__).resolve().parent / "run-with-timeout.py"
+
+
+def _run(*args: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(
+        [sys.executable, str(SCRIPT_PATH), *args],
+        capture_output=True,
+        text=True,
+        check=False,
+        timeout=30,
+    )
+
+
+def test_passthrough_output_exit_code_and_resource_report(tmp_path: Path) -> None:
+    report = tmp_path / "report.json"
+    script = (
+        "import sys\n"
+        "block = bytearray(64 * 1024 * 1024)\n"
+        "sum(range(2_000_000))\n"
+        "print('doctor ok')\n"
+        "sys.stdout.write('no trailing newline')\n"
+        "raise SystemExit(3)\n"
+    )
+
+    result = _run("--timeout-seconds", "20", "--report-json", str(report), "--", sys.executable, "-c", script)
+
+    assert result.returncode == 3
+    assert result.stdout == "doctor ok\nno trailing newline"
+    payload = json.loads(report.read_text(encoding="utf-8"))
+    assert payload["returncode"] == 3
+    assert payload["timed_out"] is False
+    assert payload["output_bytes"] == len(result.stdout)
+    assert payload["output_lines"] == 2
+    assert payload["max_rss_bytes"] >= 64 * 1024 * 1024
+    assert payload["cpu_user_seconds"] + payload["cpu_system_seconds"] > 0
+    assert payload["tail"] == ["doctor ok", "no trailing newline"]
+
+
+def test_stream_mode_timestamps_lines_and_reports_the_tail_on_timeout(tmp_path: Path) -> None:
+    report = tmp_path / "report.json"
+    script = "import time\nfor i in range(5):\n    print(f'step {i}', flush=True)\ntime.sleep(30)\n"
+
+    result = _run(
+        "--timeout-seconds",
+        "1",
+        "--label",
+        "slow doctor",
+        "--stream",
+        "--tail-lines",
+        "2",
+        "--report-json",
+        str(report),
+        "--",
+        sys.executable,
+        "-c",
+        script,
+    )
+
+    assert result.returncode == 124
+    lines = result.stdout.splitlines()
+    assert [re.sub(r"^\[\+\d+\.\d{3}s\] ", "", line) for line in lines] == [f"step {i}" for i in range(5)]
+    assert all(re.match(r"^\[\+\d+\.\d{3}s\] ", line) for line in lines)
+    assert "slow doctor timed out after 1s" in result.stderr
+    assert "  step 3\n  step 4\n" in result.stderr
+    payload = json.loads(report.read_text(encoding="utf-8"))
+    assert payload["timed_out"] is True
+    assert payload["label"] == "slow doctor"
+    assert payload["tail"] == ["step 3", "step 4"]
+    assert 1 <= payload["wall_seconds"] < 10
+
+
+def test_timeout_applies_after_the_command_closes_its_output() -> None:
+    result = _run("--timeout-seconds", "1", "--", "bash", "-c", "echo hi; exec >/dev/null 2>&1; sleep 30")
+
+    assert result.returncode == 124
+    assert result.stdout == "hi\n"
+    assert "timed out after 1s" in result.stderr
@@ -49,12 +49,13 @@ def test_capacity_manifest_keeps_dispatch_concurrency_and_stage_caps_distinct()
     assert hosted["stage_caps"]["instagram_posts_comments_platform"] == 4
 
 
-def test_social_dispatch_fallback_matches_local_capacity_authority() -> None:
+def test_social_dispatch_fallback_matches_local_capacity_authority(tmp_path: Path) -> None:
     payload = json.loads(MANIFEST.read_text(encoding="utf-8"))
 
     runtime_capacity.validate_social_dispatch_fallback(
         payload,
         implementation_path=SOCIAL_IMPLEMENTATION,
+        cache_path=tmp_path / "ast-cache.json",
     )
 
 
@@ -86,6 +87,7 @@ def test_social_dispatch_fallback_rejects_context_drift(tmp_path: Path) -> None:
         runtime_capacity.validate_social_dispatch_fallback(
             payload,
             implementation_path=implementation,
+            cache_path=tmp_path / "ast-cache.json",
         )
 
 
@@ -120,6 +122,7 @@ def test_social_dispatch_fallback_must_feed_the_returned_resolver(
         runtime_capacity.validate_social_dispatch_fallback(
             payload,
             implementation_path=implementation,
+            cache_path=tmp_path / "ast-cache.json",
         )
 
 
@@ -155,6 +158,7 @@ def test_social_dispatch_fallback_ignores_nested_resolver_returns(
         runtime_capacity.validate_social_dispatch_fallback(
             payload,
             implementation_path=implementation,
+            cache_path=tmp_path / "ast-cache.json",
         )
 
 
@@ -215,9 +219,15 @@ def test_hybrid_and_hosted_enabled_lane_values_are_preserved() -> None:
     )
 
 
-def test_runtime_capacity_projection_check_passes() -> None:
+def test_runtime_capacity_projection_check_passes(tmp_path: Path) -> None:
     completed = subprocess.run(
-        [sys.executable, str(ROOT / "scripts" / "runtime_capacity.py"), "check"],
+        [
+            sys.executable,
+            str(ROOT / "scripts" / "runtime_capacity.py"),
+            "--cache-path",
+            str(tmp_path / "ast-cache.json"),
+            "check",
+        ],
         cwd=ROOT,
         capture_output=True,
         text=True,
@@ -248,3 +258,97 @@ def test_missing_profile_override_uses_capacity_contract_error(tmp_path: Path) -
         match=r"unable to read profile .*missing\.env",
     ):
         runtime_capacity.validate_projections(payload, root=tmp_path)
+
+
+def test_social_dispatch_fallback_is_cached_by_file_hash(
+    tmp_path: Path, monkeypatch
+) -> None:
+    implementation = tmp_path / "social_impl.py"
+    cache_path = tmp_path / "ast-cache.json"
+    source = "\n".join(
+        (
+            "SOCIAL_MODAL_DISPATCH_LIMIT_DEFAULT = 4",
+            "",
+            "def _modal_dispatch_limit():",
+            "    return _resolve_int_env_with_bounds(",
+            "        'SOCIAL_MODAL_DISPATCH_LIMIT',",
+            "        SOCIAL_MODAL_DISPATCH_LIMIT_DEFAULT,",
+            "    )",
+            "",
+        )
+    )
+    implementation.write_text(source, encoding="utf-8")
+    assert (
+        runtime_capacity.social_dispatch_fallback(implementation, cache_path=cache_path)
+        == 4
+    )
+
+    def fail(*_args: object) -> int:
+        raise AssertionError("unchanged implementation was parsed again")
+
+    monkeypatch.setattr(runtime_capacity, "_inspect_social_dispatch_fallback", fail)
+    assert (
+        runtime_capacity.social_dispatch_fallback(implementation, cache_path=cache_path)
+        == 4
+    )
+
+    monkeypatch.undo()
+    implementation.write_text(source.replace("= 4", "= 6"), encoding="utf-8")
+    assert (
+        runtime_capacity.social_dispatch_fallback(implementation, cache_path=cache_path)
+        == 6
+    )
+
+
+def test_projection_engine_parses_each_profile_once(tmp_path: Path, monkeypatch) -> None:
+    payload = json.loads(MANIFEST.read_text(encoding="utf-8"))
+    parsed: list[str] = []
+    parse_profile = runtime_capacity._parse_profile
+
+    def counting_parse(path: Path) -> dict[str, str]:
+        parsed.append(path.name)
+        return parse_profile(path)
+
+    monkeypatch.setattr(runtime_capacity, "_parse_profile", counting_parse)
+    engine = runtime_capacity.ProjectionEngine(payload, ROOT, cache_path=tmp_path / "ast-cache.json")
+
+    assert engine.projection("workspace_hybrid") == runtime_capacity.shell_projection(
+        payload, "workspace_hybrid"
+    )
+    assert engine.projection("workspace_hybrid") is engine.projection("workspace_hybrid")
+    for _ in range(2):
+        engine.profile("local-lite")
+    assert parsed == ["local-lite.env"]
+    with pytest.raises(
+        runtime_capacity.CapacityContractError,
+        match="unknown runtime capacity context: nope",
+    ):
+        engine.projection("nope")
+
+
+def test_projection_engine_names_an_incomplete_context(tmp_path: Path) -> None:
+    payload = json.loads(MANIFEST.read_text(encoding="utf-8"))
+    payload["contexts"]["scratch"] = {"dispatch_batch_size": 1}
+    engine = runtime_capacity.ProjectionEngine(payload, ROOT, cache_path=tmp_path / "ast-cache.json")
+
+    assert engine.projection("workspace_hybrid")["WORKSPACE_RUNTIME_CAPACITY_CONTEXT"] == "workspace_hybrid"
+    with pytest.raises(
+        runtime_capacity.CapacityContractError,
+        match="runtime capacity context scratch is incomplete: missing 'stage_caps'",
+    ):
+        engine.projection("scratch")
+
+
+def test_source_literal_cache_follows_the_checked_root(tmp_path: Path) -> None:
+    modal_jobs = tmp_path / runtime_capacity.MODAL_JOBS
+    modal_jobs.parent.mkdir(parents=True)
+    modal_jobs.write_text(
+        "_CANONICAL_MODAL_RUNTIME_DEFAULTS = {'SOCIAL_MODAL_DISPATCH_LIMIT': 12}\n",
+        encoding="utf-8",
+    )
+
+    assert runtime_capacity._modal_defaults(tmp_path) == {"SOCIAL_MODAL_DISPATCH_LIMIT": "12"}
+    assert (tmp_path / ".logs" / "workspace" / "source-literals-cache.json").is_file()
+    assert runtime_capacity.ProjectionEngine(
+        json.loads(MANIFEST.read_text(encoding="utf-8")), tmp_path
+    ).cache_path == tmp_path / ".logs" / "workspace" / "source-literals-cache.json"
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+
+import pytest
+
+from scripts import runtime_capacity_simulator as simulator
+from scripts.runtime_capacity import CapacityContractError
+
+
+ROOT = Path(__file__).resolve().parents[1]
+MANIFEST = ROOT / "docs" / "workspace" / "runtime-capacity.json"
+
+
+def _context(name: str) -> dict:
+    return json.loads(MANIFEST.read_text(encoding="utf-8"))["contexts"][name]
+
+
+def _jobs(stage: str, count: int, duration: float = 10.0) -> list[simulator.Job]:
+    return [simulator.Job(index, stage, 0.0, duration) for index in range(count)]
+
+
+def test_dispatch_batch_and_container_family_limits_bound_running_jobs() -> None:
+    config = simulator.config_from_context(
+        "hosted_modal",
+        simulator.apply_overrides(_context("hosted_modal"), ["stage_caps.comments=8"]),
+        dispatch_interval_seconds=5.0,
+    )
+
+    report = simulator.simulate(config, _jobs("comments", 12))
+
+    # The comments family (4) and the Instagram platform cap (4) bound the
+    # run, not the stage cap of 8 or the dispatch batch of 12.
+    assert config.family("comments") == "comments"
+    assert report.completed == 12
+    assert report.peak_containers_by_family["comments"] == 4
+    assert report.stages["comments"].peak_in_flight == 4
+    assert report.peak_db_sessions == 4
+    assert report.makespan_seconds == 30.0
+    assert report.peak_queue_depth == 12
+    assert [sample["queued"] for sample in report.samples[:3]] == [8, 8, 4]
+
+
+def test_session_budget_overrun_and_zero_caps_are_reported() -> None:
+    config = simulator.config_from_context(
+        "workspace_hybrid",
+        _context("workspace_hybrid"),
+        session_pool_size=8,
+        session_headroom=5,
+        baseline_sessions=1,
+    )
+    jobs = _jobs("comments", 4, duration=20.0) + [simulator.Job(4, "posts", 0.0, 5.0)]
+    blocked = simulator.simulate(
+        simulator.config_from_context(
+            "workspace_hybrid",
+            simulator.apply_overrides(_context("workspace_hybrid"), ["stage_caps.posts=0"]),
+        ),
+        [simulator.Job(0, "posts", 0.0, 5.0)],
+    )
+
+    report = simulator.simulate(config, jobs)
+
+    assert report.session_budget == 3
+    assert report.peak_db_sessions == 6
+    assert report.over_budget
+    assert report.seconds_over_session_budget == 20.0
+    assert (blocked.completed, blocked.blocked, blocked.stages["posts"].blocked) == (0, 1, 1)
+
+
+def test_recorded_job_mix_and_overrides_are_validated(tmp_path: Path) -> None:
+    recorded = tmp_path / "jobs.jsonl"
+    recorded.write_text(
+        '{"stage": "media_mirror", "arrival_seconds": 3, "duration_seconds": 12, "db_sessions": 2}\n'
+        "\n"
+        '{"stage": "posts", "arrival_seconds": 1, "duration_seconds": 4, "platform": "tiktok"}\n',
+        encoding="utf-8",
+    )
+
+    jobs = simulator.load_jobs(recorded)
+
+    assert [(job.stage, job.db_sessions, job.platform) for job in jobs] == [
+        ("posts", 1, "tiktok"),
+        ("media_mirror", 2, "instagram"),
+    ]
+    recorded.write_text('{"stage": "stories", "arrival_seconds": 0, "duration_seconds": 1}\n', encoding="utf-8")
+    with pytest.raises(CapacityContractError, match="jobs.jsonl:1"):
+        simulator.load_jobs(recorded)
+    with pytest.raises(CapacityContractError, match="not an object"):
+        simulator.apply_overrides(_context("hosted_modal"), ["dispatch_batch_size.x=1"])
+    assert simulator.synthetic_jobs({"posts": 3}, arrival_window_seconds=60, seed=7) == simulator.synthetic_jobs(
+        {"posts": 3}, arrival_window_seconds=60, seed=7
+    )
+
+
+def test_cli_fails_over_budget_only_when_asked(capsys) -> None:
+    argv = ["--context", "workspace_hybrid", "--jobs", "comments=16", "--session-pool-size", "6"]
+
+    assert simulator.main(argv) == 0
+    assert "OVER BUDGET" in capsys.readouterr().out
+    assert simulator.main([*argv, "--fail-over-budget", "--json"]) == 1
+    assert json.loads(capsys.readouterr().out)[0]["over_budget"] is True
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+import ast
+import json
+from pathlib import Path
+
+import pytest
+
+from scripts.lib import source_literals
+
+
+def test_extract_literals_reads_module_constants_in_one_pass() -> None:
+    values = source_literals.extract_literals(
+        "import os\n"
+        "DEFAULT_PROJECT_REF = 'abc'\n"
+        "DEFAULT_TEAM: str = 'team'\n"
+        "PAIR = (1, 'two')\n"
+        "COMPUTED = os.getenv('X')\n"
+        "DEFAULTS: dict[str, str] = {'A': '1', 'B': 2, 'C': os.sep, **{}}\n"
+        "DEFAULT_PROJECT_REF = 'override'\n"
+        "def inner():\n"
+        "    HIDDEN = 1\n"
+    )
+
+    assert values == {
+        "DEFAULT_PROJECT_REF": "override",
+        "DEFAULT_TEAM": "team",
+        "PAIR": (1, "two"),
+        "DEFAULTS": {"A": "1", "B": 2},
+    }
+
+
+def test_literal_constants_are_served_from_disk_cache_until_the_file_changes(
+    tmp_path: Path, monkeypatch
+) -> None:
+    guard = tmp_path / "guard.py"
+    cache_path = tmp_path / "cache.json"
+    guard.write_text("NAME = 'one'\nIDS = {'a', 'b'}\n", encoding="utf-8")
+    source_literals.clear_cache()
+
+    assert source_literals.literal_constants(guard, ["NAME", "MISSING"], cache_path=cache_path) == {"NAME": "one"}
+    assert source_literals.stats.misses == 1
+
+    # A fresh process: nothing in memory, and parsing is not allowed.
+    source_literals.clear_cache()
+    real_parse = ast.parse
+
+    def no_full_parse(source, *args, **kwargs):
+        if kwargs.get("mode") != "eval":
+            raise AssertionError("cached file was parsed again")
+        return real_parse(source, *args, **kwargs)
+
+    monkeypatch.setattr(source_literals.ast, "parse", no_full_parse)
+    assert source_literals.literal_constants(guard, cache_path=cache_path) == {"NAME": "one", "IDS": {"a", "b"}}
+    assert (source_literals.stats.hits, source_literals.stats.misses) == (1, 0)
+    monkeypatch.undo()
+
+    guard.write_text("NAME = 'two'\n", encoding="utf-8")
+    assert source_literals.literal_constants(guard, ["NAME"], cache_path=cache_path) == {"NAME": "two"}
+    assert source_literals.stats.misses == 1
+
+
+def test_cached_analysis_does_not_cache_failures(tmp_path: Path) -> None:
+    target = tmp_path / "impl.py"
+    target.write_text("X = 1\n", encoding="utf-8")
+    source_literals.clear_cache()
+    calls: list[int] = []
+
+    def failing(_source: bytes) -> int:
+        calls.append(1)
+        raise ValueError("structure check failed")
+
+    for _ in range(2):
+        with pytest.raises(ValueError, match="structure check failed"):
+            source_literals.cached_analysis(
+                target, "check", failing, version="1", cache_path=tmp_path / "cache.json"
+            )
+    assert len(calls) == 2
+    with pytest.raises(OSError):
+        source_literals.literal_constants(tmp_path / "missing.py", cache_path=tmp_path / "cache.json")
+
+
+def test_cached_analysis_is_recomputed_when_its_version_changes(tmp_path: Path) -> None:
+    target = tmp_path / "impl.py"
+    cache_path = tmp_path / "cache.json"
+    target.write_text("X = 1\n", encoding="utf-8")
+    source_literals.clear_cache()
+
+    assert source_literals.cached_analysis(target, "check", lambda _: "old", version="1", cache_path=cache_path) == "old"
+    assert source_literals.cached_analysis(target, "check", lambda _: "new", version="1", cache_path=cache_path) == "old"
+
+    # Same file, new analysis logic: neither the memory nor the disk entry applies.
+    source_literals.clear_cache()
+    assert source_literals.cached_analysis(target, "check", lambda _: "new", version="2", cache_path=cache_path) == "new"
+    assert source_literals.stats.misses == 1
+    stored = json.loads(cache_path.read_text(encoding="utf-8"))["entries"][str(target.resolve())]["results"]
+    assert stored == {"check@2": "'new'"}
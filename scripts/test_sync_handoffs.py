@@ -425,6 +425,48 @@ class SyncHandoffsTests(unittest.TestCase):
         finally:
             MODULE.ROOT = original_root
 
+    def test_run_write_skips_unchanged_handoffs(self) -> None:
+        path = self.write_file("docs/ai/HANDOFF.md", "# Session Handoff")
+        before = path.stat().st_mtime_ns
+
+        written = MODULE.run_write({path: path.read_text(encoding="utf-8")})
+
+        self.assertEqual(written, [])
+        self.assertEqual(path.stat().st_mtime_ns, before)
+        other = self.root / "TRR-APP/docs/ai/HANDOFF.md"
+        self.assertEqual(MODULE.run_write({other: "new\n"}), [other])
+        self.assertEqual(other.read_text(encoding="utf-8"), "new\n")
+
+    def test_compare_and_swap_skips_paths_changed_by_another_writer(self) -> None:
+        stale = self.write_file("docs/ai/HANDOFF.md", "old")
+        raced = self.write_file("TRR-APP/docs/ai/HANDOFF.md", "old")
+        observed = {stale: MODULE.read_handoff_hash(stale), raced: MODULE.read_handoff_hash(raced)}
+        raced.write_text("written by another session\n", encoding="utf-8")
+
+        conflicts = MODULE.compare_and_swap({stale: "fresh\n", raced: "fresh\n"}, observed)
+
+        self.assertEqual(conflicts, [raced])
+        self.assertEqual(stale.read_text(encoding="utf-8"), "fresh\n")
+        self.assertEqual(raced.read_text(encoding="utf-8"), "written by another session\n")
+        self.assertEqual(sorted(p.name for p in stale.parent.iterdir()), ["HANDOFF.md"])
+
+    def test_optimistic_write_renders_and_swaps_selected_scopes(self) -> None:
+        original_root = MODULE.ROOT
+        MODULE.ROOT = self.root
+        try:
+            scopes = [MODULE.build_scopes(self.root)["app"]]
+            today = MODULE.dt.date(2026, 3, 31)
+
+            MODULE.run_optimistic_write(scopes, today, 1.0)
+            handoff = scopes[0].handoff_path
+            self.assertEqual(handoff.read_text(encoding="utf-8"), MODULE.render_scope(scopes[0], today))
+
+            before = handoff.stat().st_mtime_ns
+            MODULE.run_optimistic_write(scopes, today, 1.0)
+            self.assertEqual(handoff.stat().st_mtime_ns, before)
+        finally:
+            MODULE.ROOT = original_root
+
 
 if __name__ == "__main__":
     unittest.main()
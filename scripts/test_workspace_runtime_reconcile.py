@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import json
+import time
 
 from scripts import workspace_runtime_reconcile as cli
 
@@ -146,3 +147,110 @@ def test_main_writes_artifact_and_returns_nonzero_for_blocked(tmp_path, monkeypa
     saved = json.loads(artifact_path.read_text(encoding="utf-8"))
     assert saved["overall_state"] == "blocked"
     assert saved["summary"] == "remote_only_history"
+
+
+def test_runtime_reconcile_runs_helpers_concurrently(monkeypatch) -> None:
+    def slow_run(script_relpath: str):
+        time.sleep(0.3)
+        return 0, {"state": "ok"}
+
+    monkeypatch.setenv("WORKSPACE_DEV_MODE", "hybrid")
+    monkeypatch.setattr(cli, "_run_backend_script", slow_run)
+
+    started = time.monotonic()
+    artifact = cli.run_runtime_reconcile()
+
+    assert time.monotonic() - started < 0.75
+    assert artifact["overall_state"] == "ok"
+
+
+def test_backend_helper_timeout_blocks_db_and_marks_external_advisory(tmp_path, monkeypatch) -> None:
+    for relpath in (cli.DB_SCRIPT, cli.EXTERNAL_SCRIPT):
+        script = tmp_path / relpath
+        script.parent.mkdir(parents=True, exist_ok=True)
+        script.write_text("import time\ntime.sleep(30)\n", encoding="utf-8")
+
+    monkeypatch.setenv("WORKSPACE_DEV_MODE", "local")
+    monkeypatch.setenv("WORKSPACE_RUNTIME_DB_TIMEOUT_SECONDS", "1")
+    monkeypatch.setenv("WORKSPACE_RUNTIME_EXTERNAL_TIMEOUT_SECONDS", "1")
+    monkeypatch.setattr(cli, "BACKEND_ROOT", tmp_path)
+
+    started = time.monotonic()
+    artifact = cli.run_runtime_reconcile()
+
+    assert time.monotonic() - started < 5
+    assert artifact["overall_state"] == "blocked"
+    assert artifact["db"]["reason"] == "runtime_reconcile_timeout"
+    assert "WORKSPACE_RUNTIME_DB_TIMEOUT_SECONDS" in artifact["db"]["remediation"]
+    assert artifact["render"]["state"] == "advisory"
+    assert artifact["decodo"]["reason"] == "external_verify_timeout"
+
+
+def _counting_reconcile(calls: list[int]):
+    def run():
+        calls.append(1)
+        return cli.compute_overall_state(cli.default_artifact())
+
+    return run
+
+
+def test_main_reuses_fresh_artifact_until_fingerprints_change(tmp_path, monkeypatch, capsys) -> None:
+    calls: list[int] = []
+    backend = tmp_path / "TRR-Backend"
+    (backend / "supabase" / "migrations").mkdir(parents=True)
+    monkeypatch.setattr(cli, "BACKEND_ROOT", backend)
+    monkeypatch.setattr(cli, "ARTIFACT_PATH", tmp_path / "runtime-reconcile.json")
+    monkeypatch.setattr(cli, "run_runtime_reconcile", _counting_reconcile(calls))
+    monkeypatch.setenv("WORKSPACE_DEV_MODE", "hybrid")
+
+    assert cli.main([]) == 0
+    assert cli.main([]) == 0
+    assert len(calls) == 1
+    assert "[cached 0s ago; --force re-probes]" in capsys.readouterr().out
+
+    (backend / "supabase" / "migrations" / "20261019000000_new.sql").write_text("select 1;\n", encoding="utf-8")
+    cli.main([])
+    monkeypatch.setenv("WORKSPACE_DEV_MODE", "cloud")
+    cli.main([])
+    cli.main(["--force"])
+
+    assert len(calls) == 4
+
+
+def test_fingerprints_track_migration_contents_and_modal_source_tree(tmp_path, monkeypatch) -> None:
+    backend = tmp_path / "TRR-Backend"
+    migration = backend / "supabase" / "migrations" / "20261019000000_new.sql"
+    helper = backend / "trr_backend" / "socials" / "dispatch.py"
+    migration.parent.mkdir(parents=True)
+    helper.parent.mkdir(parents=True)
+    migration.write_text("select 1;\n", encoding="utf-8")
+    helper.write_text("LIMIT = 1\n", encoding="utf-8")
+    monkeypatch.setattr(cli, "BACKEND_ROOT", backend)
+    env = {"WORKSPACE_DEV_MODE": "local"}
+
+    before = cli.runtime_fingerprints(env)
+    assert cli.runtime_fingerprints(env) == before
+
+    migration.write_text("select 2;\n", encoding="utf-8")
+    after_migration = cli.runtime_fingerprints(env)
+    assert after_migration["migrations"] != before["migrations"]
+    assert after_migration["modal_app"] == before["modal_app"]
+
+    helper.write_text("LIMIT = 2\n", encoding="utf-8")
+    assert cli.runtime_fingerprints(env)["modal_app"] != after_migration["modal_app"]
+
+
+def test_cached_artifact_expires_and_never_reuses_blocked(tmp_path) -> None:
+    path = tmp_path / "runtime-reconcile.json"
+    fingerprints = {"workspace_mode": "local"}
+    artifact = cli.compute_overall_state(cli.default_artifact())
+    artifact["cache"] = {"generated_at": 1000.0, "fingerprints": fingerprints}
+    path.write_text(json.dumps(artifact), encoding="utf-8")
+
+    assert cli.load_cached_artifact(path, fingerprints, ttl_seconds=60, now=1030.0) is not None
+    assert cli.load_cached_artifact(path, fingerprints, ttl_seconds=60, now=1061.0) is None
+    assert cli.load_cached_artifact(path, fingerprints, ttl_seconds=0, now=1030.0) is None
+
+    artifact["overall_state"] = "blocked"
+    path.write_text(json.dumps(artifact), encoding="utf-8")
+    assert cli.load_cached_artifact(path, fingerprints, ttl_seconds=60, now=1030.0) is None
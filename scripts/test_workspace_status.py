@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import json
+import os
+import socket
+import sys
+import time
+from pathlib import Path
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPT_PATH = ROOT / "scripts" / "workspace" / "status.py"
+STATUS_SHELL = ROOT / "scripts" / "status-workspace.sh"
+
+PROC_NET_TCP = """\
+  sl  local_address rem_address   st tx_queue rx_queue tr tm->when retrnsmt   uid  timeout inode
+   0: 0100007F:1F40 00000000:0000 0A 00000000:00000000 00:00000000 00000000  1000        0 555 1 0000000000000000 100 0 0 10 0
+   1: 0100007F:0BB8 00000000:0000 0A 00000000:00000000 00:00000000 00000000  1000        0 777 1 0000000000000000 100 0 0 10 0
+   2: 0100007F:1F40 0100007F:D431 01 00000000:00000000 00:00000000 00000000  1000        0 999 1 0000000000000000 20 4 30 10 -1
+"""
+
+
+def _load_module():
+    spec = importlib.util.spec_from_file_location("workspace_status_under_test", SCRIPT_PATH)
+    assert spec is not None
+    module = importlib.util.module_from_spec(spec)
+    assert spec.loader is not None
+    sys.modules[spec.name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def _fake_proc(tmp_path: Path) -> Path:
+    proc = tmp_path / "proc"
+    (proc / "net").mkdir(parents=True)
+    (proc / "net" / "tcp").write_text(PROC_NET_TCP, encoding="utf-8")
+    for pid, comm, inode in (("4242", "uvicorn-backend", 555), ("4343", "node", 777), ("4444", "bash", 0)):
+        (proc / pid / "fd").mkdir(parents=True)
+        (proc / pid / "comm").write_text(f"{comm}\n", encoding="utf-8")
+        os.symlink(f"socket:[{inode}]" if inode else "/dev/null", proc / pid / "fd" / "3")
+    return proc
+
+
+def test_listeners_come_from_proc_net_tcp_in_lsof_format(tmp_path: Path) -> None:
+    status = _load_module()
+
+    assert status.parse_proc_net_tcp(PROC_NET_TCP) == {8000: {555}, 3000: {777}}
+    assert status.port_listeners([3000, 8000, 9000], _fake_proc(tmp_path)) == {
+        3000: "node:4343",
+        8000: "uvicorn-b:4242",
+        9000: "none",
+    }
+
+
+def test_hung_backend_is_reported_within_the_probe_timeout(tmp_path: Path, monkeypatch) -> None:
+    status = _load_module()
+    hung = socket.socket()
+    hung.bind(("127.0.0.1", 0))
+    hung.listen(8)
+    port = hung.getsockname()[1]
+    log_dir = tmp_path / ".logs" / "workspace"
+    log_dir.mkdir(parents=True)
+    (log_dir / "pids.env").write_text(
+        f"TRR_BACKEND_PORT={port}\nTRR_BACKEND_PID={os.getpid()}\nTRR_APP_PORT=1\nPROFILE=\"default\"\n",
+        encoding="utf-8",
+    )
+
+    async def fake_codex_runtime(env, timeout):
+        return {"app_servers": [], "context7": {"label": "ok"}, "plugin_registry": {"overall_status": "ok"}}
+
+    monkeypatch.setattr(status, "codex_runtime", fake_codex_runtime)
+    context = status.load_context(tmp_path, env={})
+    started = time.monotonic()
+    try:
+        probes = asyncio.run(status.collect_probes(context, probe_timeout=0.3, codex_timeout=5))
+    finally:
+        hung.close()
+    elapsed = time.monotonic() - started
+    document = status.build_document(context, probes, timestamp="2026-01-01T00:00:00Z")
+
+    assert elapsed < 1.0
+    assert document["health"]["trr_backend_readiness_status"] == "hung/unresponsive"
+    assert document["health"]["trr_backend_liveness_status"] == "starting/unhealthy"
+    assert document["health"]["trr_app_status"] == "down"
+    assert f":{os.getpid()}" in document["ports"]["trr_backend"]["listeners"]
+    assert document["modes"]["profile"] == "default"
+    assert "backend appears hung; watchdog is enabled" in status.render_text(context, document)
+
+
+def test_document_keeps_the_shell_collector_shape(tmp_path: Path) -> None:
+    status = _load_module()
+    context = status.load_context(tmp_path, env={})
+    probes = status.Probes(False, False, False, {}, status.codex_runtime_fallback("skipped"))
+
+    document = json.loads(json.dumps(status.build_document(context, probes)))
+
+    assert list(document) == [
+        "root",
+        "run_state",
+        "pidfile",
+        "modes",
+        "processes",
+        "ports",
+        "health",
+        "backend_watchdog",
+        "remote_execution",
+        "runtime_reconcile",
+        "codex_runtime",
+        "timestamp_utc",
+    ]
+    assert document["run_state"] == "inactive"
+    assert document["modes"]["workspace_dev_mode"] == "local"
+    assert set(document["modes"].values()) == {"local", "n/a"}
+    assert document["backend_watchdog"]["restart_count"] is None
+    assert document["health"]["trr_backend_status"] == "down"
+    assert document["runtime_reconcile"] is None
+    shell = STATUS_SHELL.read_text(encoding="utf-8")
+    for key in document["modes"]:
+        assert f'"{key}":' in shell
+    assert 'exec python3 "${ROOT}/scripts/workspace/status.py" "$@"' in shell
@@ -134,7 +134,7 @@ accepted_values() {
     WORKSPACE_TRR_REMOTE_SOCIAL_DISPATCH_LIMIT|WORKSPACE_TRR_MODAL_SOCIAL_JOB_CONCURRENCY_LIMIT|WORKSPACE_TRR_REMOTE_SOCIAL_POSTS|WORKSPACE_TRR_REMOTE_SOCIAL_COMMENTS|WORKSPACE_TRR_REMOTE_SOCIAL_MEDIA_MIRROR|WORKSPACE_TRR_REMOTE_SOCIAL_COMMENT_MEDIA_MIRROR)
       echo "integer"
       ;;
-    WORKSPACE_RUNTIME_DB_MAX_AUTO_APPLY)
+    WORKSPACE_RUNTIME_DB_MAX_AUTO_APPLY|WORKSPACE_RUNTIME_RECONCILE_TTL_SECONDS|WORKSPACE_RUNTIME_DB_TIMEOUT_SECONDS|WORKSPACE_RUNTIME_MODAL_TIMEOUT_SECONDS|WORKSPACE_RUNTIME_EXTERNAL_TIMEOUT_SECONDS)
       echo "integer"
       ;;
     ADMIN_ENFORCE_HOST|ADMIN_STRICT_HOST_ROUTING)
@@ -318,6 +318,18 @@ description_for() {
     WORKSPACE_RUNTIME_EXTERNAL_VERIFY_ENABLED)
       echo "Enable verify-only checks for external hosted contracts such as Render and Decodo."
       ;;
+    WORKSPACE_RUNTIME_RECONCILE_TTL_SECONDS)
+      echo "Reuse a clean runtime reconcile artifact this many seconds old when migrations, the Modal app, the profile, and the mode are unchanged; \`0\` always re-probes."
+      ;;
+    WORKSPACE_RUNTIME_DB_TIMEOUT_SECONDS)
+      echo "Wall-clock limit for the startup runtime DB reconcile helper; a timeout blocks startup like a failed reconcile."
+      ;;
+    WORKSPACE_RUNTIME_MODAL_TIMEOUT_SECONDS)
+      echo "Wall-clock limit for the startup Modal reconcile helper, including any auto-deploy it triggers."
+      ;;
+    WORKSPACE_RUNTIME_EXTERNAL_TIMEOUT_SECONDS)
+      echo "Wall-clock limit for the Render/Decodo verify-only helper; a timeout is reported as advisory."
+      ;;
     WORKSPACE_RUNTIME_RENDER_VERIFY_ONLY)
       echo "Keep Render checks advisory-only during startup."
       ;;
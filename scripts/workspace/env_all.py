@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""Run the env contract report, env hygiene check, and redacted env inventory together.
+
+All three tools run in this one interpreter and share the memoized parser in
+``scripts/lib/env_files.py``, so every env surface they have in common is read
+and parsed once. Each step runs even if an earlier one fails. The exit code is
+non-zero when any step fails.
+
+Default mode regenerates the reports (`make env-contract-report`,
+`make env-hygiene`, `make redacted-env-inventory`). ``--check`` runs the
+validating form of each step and writes nothing.
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import importlib.util
+import os
+import sys
+import time
+import traceback
+from dataclasses import dataclass
+from pathlib import Path
+from types import ModuleType
+
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.lib import env_files  # noqa: E402
+
+REDACTED_INVENTORY_OUTPUT = "docs/workspace/redacted-env-inventory.md"
+
+
+@dataclass(frozen=True)
+class Step:
+    name: str
+    script: Path
+    argv: tuple[str, ...]
+    env: tuple[tuple[str, str], ...] = ()
+
+
+@dataclass(frozen=True)
+class StepResult:
+    name: str
+    returncode: int
+    elapsed_seconds: float
+
+
+def build_steps(check: bool) -> list[Step]:
+    scripts = ROOT / "scripts"
+    redact_argv = ("--output", REDACTED_INVENTORY_OUTPUT, "--check") if check else ("--output", REDACTED_INVENTORY_OUTPUT)
+    return [
+        Step("env-contract-report", scripts / "env_contract_report.py", ("validate",) if check else ("write",)),
+        Step(
+            "env-hygiene",
+            scripts / "workspace" / "env_hygiene.py",
+            ("--check",),
+            env=(("WORKSPACE_ENV_HYGIENE_INCLUDE_ADJACENT", "1"),),
+        ),
+        Step("redacted-env-inventory", scripts / "redact-env-inventory.py", redact_argv),
+    ]
+
+
+def _load_script(path: Path) -> ModuleType:
+    name = f"env_all_{path.stem.replace('-', '_')}"
+    spec = importlib.util.spec_from_file_location(name, path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"cannot load {path}")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+@contextlib.contextmanager
+def _step_env(overrides: tuple[tuple[str, str], ...]):
+    saved = {key: os.environ.get(key) for key, _ in overrides}
+    for key, value in overrides:
+        os.environ.setdefault(key, value)
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def run_step(step: Step) -> StepResult:
+    started = time.monotonic()
+    try:
+        with _step_env(step.env):
+            returncode = int(_load_script(step.script).main(list(step.argv)) or 0)
+    except SystemExit as exc:
+        returncode = exc.code if isinstance(exc.code, int) else 1
+    except Exception:  # noqa: BLE001 - report the failure and keep running the other steps
+        traceback.print_exc()
+        returncode = 1
+    return StepResult(step.name, returncode, round(time.monotonic() - started, 3))
+
+
+def run_steps(steps: list[Step]) -> list[StepResult]:
+    results: list[StepResult] = []
+    for step in steps:
+        print(f"[env-all] {step.name}", flush=True)
+        result = run_step(step)
+        sys.stdout.flush()
+        results.append(result)
+    return results
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--check", action="store_true", help="validate only; do not rewrite generated docs")
+    args = parser.parse_args(argv)
+
+    results = run_steps(build_steps(args.check))
+    for result in results:
+        status = "ok" if result.returncode == 0 else f"FAILED (rc={result.returncode})"
+        print(f"[env-all] {result.name}: {status} in {result.elapsed_seconds:.2f}s")
+    stats = env_files.stats
+    print(f"[env-all] env files parsed: {stats.misses}, reused from cache: {stats.hits}")
+    return 0 if all(result.returncode == 0 for result in results) else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -11,6 +11,11 @@ from pathlib import Path
 
 
 ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.lib import env_files  # noqa: E402
+
 MANIFEST_PATH = ROOT / "docs/workspace/shared-env-manifest.json"
 
 AUTHORITY_KEYS = (
@@ -71,19 +76,10 @@ def _load_manifest(path: Path = MANIFEST_PATH) -> dict:
 
 
 def _parse_env_file(path: Path) -> set[str]:
-    keys: set[str] = set()
-    if not path.is_file():
-        return keys
-    for raw_line in path.read_text(encoding="utf-8", errors="ignore").splitlines():
-        line = raw_line.strip()
-        if not line or line.startswith("#") or "=" not in line:
-            continue
-        key = line.split("=", 1)[0].strip()
-        if key.startswith("export "):
-            key = key.removeprefix("export ").strip()
-        if key and key.replace("_", "").isalnum():
-            keys.add(key)
-    return keys
+    try:
+        return set(env_files.env_keys(path, errors="ignore"))
+    except OSError:
+        return set()
 
 
 def _include_adjacent_env_surfaces() -> bool:
@@ -119,37 +115,6 @@ def _is_shared_candidate(key: str) -> bool:
     return key.startswith(SHARED_KEY_PREFIXES) or key in DEPRECATED_RUNTIME_NAMES
 
 
-def _owner_for_key(key: str, manifest: dict) -> str | None:
-    exact = _manifest_exact_keys(manifest)
-    if key in exact:
-        owner = exact[key].get("owner")
-        return str(owner) if owner else None
-    for rule in manifest.get("shared_key_patterns", []):
-        pattern = rule.get("pattern")
-        owner = rule.get("owner")
-        if pattern and owner and fnmatch.fnmatchcase(key, pattern):
-            return str(owner)
-    return None
-
-
-def _retired_screenalytics_classification(manifest: dict, key: str) -> tuple[str, str | None] | None:
-    policy = manifest.get("retired_screenalytics_env", {})
-    if not isinstance(policy, dict):
-        return None
-
-    if key in set(policy.get("retain", [])):
-        return ("retain", None)
-    if key in set(policy.get("retire", [])):
-        return ("retire", None)
-    for item in policy.get("rename", []):
-        if not isinstance(item, dict):
-            continue
-        if item.get("key") == key:
-            replacement = item.get("replacement")
-            return ("rename", str(replacement) if replacement else None)
-    return None
-
-
 def _surface_label(surface: EnvSurface) -> str:
     return str(surface.path.relative_to(ROOT))
 
@@ -158,9 +123,85 @@ def _action(status: str, surface: EnvSurface, key: str, reason: str) -> CleanupA
     return CleanupAction(status, surface.authority, _surface_label(surface), key, reason)
 
 
-def _status_for_key(surface: EnvSurface, key: str, manifest: dict | None = None) -> CleanupAction:
+class EnvMatrix:
+    """Key/surface/owner index built once per run.
+
+    Every manifest surface is expanded and parsed once into surface -> keys and
+    authority -> key -> surfaces maps. Owners and Screenalytics retirement rules
+    are indexed by key, and cleanup statuses are memoized per (surface, key), so
+    findings and dry-run rows are lookups rather than rescans.
+    """
+
+    def __init__(self, manifest: dict) -> None:
+        self.manifest = manifest
+        self._path_keys: dict[Path, frozenset[str]] = {}
+        self.surfaces: dict[str, list[EnvSurface]] = {
+            authority_key: _expand_manifest_surfaces(manifest, authority_key) for authority_key in ENV_FILE_AUTHORITY_KEYS
+        }
+        self.surface_keys: dict[EnvSurface, frozenset[str]] = {}
+        self.key_surfaces: dict[str, dict[str, list[EnvSurface]]] = {}
+        for authority_key, surfaces in self.surfaces.items():
+            by_key = self.key_surfaces.setdefault(authority_key, {})
+            for surface in surfaces:
+                keys = self.surface_keys[surface] = self.keys(surface.path)
+                for key in keys:
+                    by_key.setdefault(key, []).append(surface)
+
+        self._exact_owners = {
+            key: str(metadata["owner"]) if metadata.get("owner") else None
+            for key, metadata in _manifest_exact_keys(manifest).items()
+        }
+        self._owner_patterns = [
+            (str(rule["pattern"]), str(rule["owner"]))
+            for rule in manifest.get("shared_key_patterns", [])
+            if isinstance(rule, dict) and rule.get("pattern") and rule.get("owner")
+        ]
+        self._owners: dict[str, str | None] = {}
+
+        policy = manifest.get("retired_screenalytics_env", {})
+        policy = policy if isinstance(policy, dict) else {}
+        self._retired: dict[str, tuple[str, str | None]] = {}
+        # Later writes win: retain beats retire beats rename, and the first
+        # rename entry for a key beats later ones.
+        for item in reversed(policy.get("rename", [])):
+            if isinstance(item, dict) and item.get("key"):
+                replacement = item.get("replacement")
+                self._retired[item["key"]] = ("rename", str(replacement) if replacement else None)
+        for key in policy.get("retire", []):
+            self._retired[key] = ("retire", None)
+        for key in policy.get("retain", []):
+            self._retired[key] = ("retain", None)
+        self._statuses: dict[tuple[EnvSurface, str], CleanupAction] = {}
+
+    def keys(self, path: Path) -> frozenset[str]:
+        keys = self._path_keys.get(path)
+        if keys is None:
+            keys = self._path_keys[path] = frozenset(_parse_env_file(path))
+        return keys
+
+    def owner(self, key: str) -> str | None:
+        if key not in self._owners:
+            if key in self._exact_owners:
+                self._owners[key] = self._exact_owners[key]
+            else:
+                self._owners[key] = next(
+                    (owner for pattern, owner in self._owner_patterns if fnmatch.fnmatchcase(key, pattern)),
+                    None,
+                )
+        return self._owners[key]
+
+    def retired_classification(self, key: str) -> tuple[str, str | None] | None:
+        return self._retired.get(key)
+
+    def status(self, surface: EnvSurface, key: str) -> CleanupAction:
+        action = self._statuses.get((surface, key))
+        if action is None:
+            action = self._statuses[(surface, key)] = _status_for_key(surface, key, self)
+        return action
+
+
+def _status_for_key(surface: EnvSurface, key: str, matrix: EnvMatrix) -> CleanupAction:
     surface_label = _surface_label(surface)
-    active_manifest = manifest or _load_manifest()
 
     if surface.authority == SNAPSHOT_KEY:
         return _action("keep", surface, key, "evidence snapshot; report only and do not edit generated/pulled env evidence")
@@ -178,11 +219,11 @@ def _status_for_key(surface: EnvSurface, key: str, manifest: dict | None = None)
         return _action("keep", surface, key, "env key in non-local surface; no cleanup rule matched")
 
     if is_retired_env_surface:
-        classification = _retired_screenalytics_classification(active_manifest, key)
+        classification = matrix.retired_classification(key)
         if classification:
             status, replacement = classification
             if status == "retain":
-                owner = _owner_for_key(key, active_manifest) or "supported workspace/backend owner"
+                owner = matrix.owner(key) or "supported workspace/backend owner"
                 return _action("keep", surface, key, f"retired Screenalytics env surface; retained key is owned by {owner}")
             if status == "rename":
                 suffix = f"; use {replacement} for new configuration" if replacement else ""
@@ -244,25 +285,28 @@ def _status_for_key(surface: EnvSurface, key: str, manifest: dict | None = None)
     return _action("keep", surface, key, "shared key is present in local adapter; no specific cleanup rule matched")
 
 
-def _collect_cleanup_actions(manifest: dict) -> list[CleanupAction]:
-    actions: list[CleanupAction] = []
-    for authority_key in ENV_FILE_AUTHORITY_KEYS:
-        for surface in _expand_manifest_surfaces(manifest, authority_key):
-            for key in sorted(_parse_env_file(surface.path)):
-                actions.append(_status_for_key(surface, key, manifest))
-    return actions
+def _collect_cleanup_actions(manifest: dict, matrix: EnvMatrix | None = None) -> list[CleanupAction]:
+    matrix = matrix or EnvMatrix(manifest)
+    return [
+        matrix.status(surface, key)
+        for authority_key in ENV_FILE_AUTHORITY_KEYS
+        for surface in matrix.surfaces[authority_key]
+        for key in sorted(matrix.surface_keys[surface])
+    ]
 
 
-def _collect_local_cleanup_actions(manifest: dict) -> list[CleanupAction]:
-    actions: list[CleanupAction] = []
-    for authority_key in (LOCAL_SECRET_KEY, RETIRED_ENV_KEY):
-        for surface in _expand_manifest_surfaces(manifest, authority_key):
-            for key in sorted(_parse_env_file(surface.path)):
-                actions.append(_status_for_key(surface, key, manifest))
-    return actions
+def _collect_local_cleanup_actions(manifest: dict, matrix: EnvMatrix | None = None) -> list[CleanupAction]:
+    matrix = matrix or EnvMatrix(manifest)
+    return [
+        matrix.status(surface, key)
+        for authority_key in (LOCAL_SECRET_KEY, RETIRED_ENV_KEY)
+        for surface in matrix.surfaces[authority_key]
+        for key in sorted(matrix.surface_keys[surface])
+    ]
 
 
-def _collect_findings(manifest: dict) -> tuple[list[Finding], dict[str, int]]:
+def _collect_findings(manifest: dict, matrix: EnvMatrix | None = None) -> tuple[list[Finding], dict[str, int]]:
+    matrix = matrix or EnvMatrix(manifest)
     findings: list[Finding] = []
     counts = {
         "authority_surfaces": 0,
@@ -272,24 +316,17 @@ def _collect_findings(manifest: dict) -> tuple[list[Finding], dict[str, int]]:
         "shared_authority_keys": 0,
     }
 
-    authority_surfaces: list[EnvSurface] = []
-    for authority_key in AUTHORITY_KEYS:
-        authority_surfaces.extend(_expand_manifest_surfaces(manifest, authority_key))
-    local_surfaces = _expand_manifest_surfaces(manifest, LOCAL_SECRET_KEY)
-    retired_surfaces = _expand_manifest_surfaces(manifest, RETIRED_ENV_KEY)
-    snapshot_surfaces = _expand_manifest_surfaces(manifest, SNAPSHOT_KEY)
-
+    authority_surfaces = [surface for authority_key in AUTHORITY_KEYS for surface in matrix.surfaces[authority_key]]
     counts["authority_surfaces"] = sum(1 for surface in authority_surfaces if surface.path.is_file())
-    counts["local_secret_adapters"] = sum(1 for surface in local_surfaces if surface.path.is_file())
-    counts["retired_env_surfaces"] = sum(1 for surface in retired_surfaces if surface.path.is_file())
-    counts["evidence_snapshots"] = sum(1 for surface in snapshot_surfaces if surface.path.is_file())
+    counts["local_secret_adapters"] = sum(1 for surface in matrix.surfaces[LOCAL_SECRET_KEY] if surface.path.is_file())
+    counts["retired_env_surfaces"] = sum(1 for surface in matrix.surfaces[RETIRED_ENV_KEY] if surface.path.is_file())
+    counts["evidence_snapshots"] = sum(1 for surface in matrix.surfaces[SNAPSHOT_KEY] if surface.path.is_file())
 
     for surface in authority_surfaces:
-        keys = _parse_env_file(surface.path)
-        if not keys:
-            continue
-        for key in sorted(keys):
-            if _is_shared_candidate(key):
+        is_app_example = surface.path.match("TRR-APP/apps/web/.env.example")
+        for key in sorted(matrix.surface_keys[surface]):
+            shared = _is_shared_candidate(key)
+            if shared:
                 counts["shared_authority_keys"] += 1
             if key in DEPRECATED_RUNTIME_NAMES:
                 findings.append(
@@ -300,7 +337,7 @@ def _collect_findings(manifest: dict) -> tuple[list[Finding], dict[str, int]]:
                         "deprecated runtime name is not allowed in profile or example adapters",
                     )
                 )
-            if surface.path.match("TRR-APP/apps/web/.env.example") and key in APP_LOCAL_DEPRECATED_NAMES:
+            if is_app_example and key in APP_LOCAL_DEPRECATED_NAMES:
                 findings.append(
                     Finding(
                         "error",
@@ -309,7 +346,7 @@ def _collect_findings(manifest: dict) -> tuple[list[Finding], dict[str, int]]:
                         "TRR-APP must use TRR_CORE_SUPABASE_SERVICE_ROLE_KEY instead",
                     )
                 )
-            if _is_shared_candidate(key) and _owner_for_key(key, manifest) is None:
+            if shared and matrix.owner(key) is None:
                 findings.append(
                     Finding(
                         "error",
@@ -319,13 +356,14 @@ def _collect_findings(manifest: dict) -> tuple[list[Finding], dict[str, int]]:
                     )
                 )
 
+    setup_adapter_paths = [ROOT / p for p in manifest.get("authority_surfaces", {}).get("surface_setup_adapters", [])]
     for repo_name, policy in manifest.get("repo_validation", {}).items():
         if not isinstance(policy, dict):
             continue
         env_example = policy.get("env_example")
         if env_example:
             path = ROOT / str(env_example)
-            keys = _parse_env_file(path)
+            keys = matrix.keys(path)
             for required in policy.get("required_env_example_keys", []):
                 if required not in keys:
                     findings.append(
@@ -337,10 +375,10 @@ def _collect_findings(manifest: dict) -> tuple[list[Finding], dict[str, int]]:
                         )
                     )
 
+        matching = [path for path in setup_adapter_paths if path.parts and repo_name in path.parts]
+        setup_keys = frozenset().union(*(matrix.keys(path) for path in matching))
         for required in policy.get("auth_required", []):
-            example_paths = [ROOT / p for p in manifest.get("authority_surfaces", {}).get("surface_setup_adapters", [])]
-            matching = [p for p in example_paths if p.parts and repo_name in p.parts]
-            if matching and not any(required in _parse_env_file(path) for path in matching):
+            if matching and required not in setup_keys:
                 findings.append(
                     Finding(
                         "error",
@@ -350,17 +388,11 @@ def _collect_findings(manifest: dict) -> tuple[list[Finding], dict[str, int]]:
                     )
                 )
 
-    local_key_owners: dict[str, list[EnvSurface]] = {}
-    for surface in local_surfaces:
-        for key in _parse_env_file(surface.path):
-            if _is_shared_candidate(key):
-                local_key_owners.setdefault(key, []).append(surface)
-    for key, surfaces in sorted(local_key_owners.items()):
+    for key, surfaces in sorted(matrix.key_surfaces[LOCAL_SECRET_KEY].items()):
+        if not _is_shared_candidate(key):
+            continue
         if len(surfaces) > 1 and key not in {"TRR_DB_DIRECT_URL", "TRR_DB_SESSION_URL", "TRR_DB_URL", "TRR_INTERNAL_ADMIN_SHARED_SECRET"}:
-            status_notes = []
-            for surface in surfaces:
-                action = _status_for_key(surface, key, manifest)
-                status_notes.append(f"{_surface_label(surface)}={action.status}")
+            status_notes = [f"{_surface_label(surface)}={matrix.status(surface, key).status}" for surface in surfaces]
             findings.append(
                 Finding(
                     "warn",
@@ -480,8 +512,9 @@ def parse_args(argv: list[str]) -> argparse.Namespace:
 def main(argv: list[str] | None = None) -> int:
     args = parse_args(argv or sys.argv[1:])
     manifest = _load_manifest()
-    findings, counts = _collect_findings(manifest)
-    actions = _collect_cleanup_actions(manifest)
+    matrix = EnvMatrix(manifest)
+    findings, counts = _collect_findings(manifest, matrix)
+    actions = _collect_cleanup_actions(manifest, matrix)
     error_count = sum(1 for finding in findings if finding.severity == "error")
 
     if args.output:
@@ -0,0 +1,465 @@
+#!/usr/bin/env python3
+"""Incremental index over the workspace logs in .logs/workspace.
+
+Each run reads only the bytes appended since the previous run (tracked per log
+by device, inode and byte offset) and stores:
+
+- per-minute line counts by source and level, for every line;
+- one event row for every line that carries a signal tag (pool exhaustion,
+  upstream timeouts, tracebacks, watchdog events) or a WARNING+ level.
+
+When dev-workspace.sh archives a log on startup, the unread tail of the old
+file is finished from ``archive/<run>/`` before the new file is read from the
+start. Queries and per-minute counts are answered from the SQLite index, so
+they never rescan the raw logs.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import sqlite3
+import sys
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, Iterator
+
+
+ROOT = Path(__file__).resolve().parents[2]
+LOG_DIR = ROOT / ".logs" / "workspace"
+INDEX_NAME = "log-index.sqlite3"
+SCHEMA_VERSION = 1
+
+LOG_SOURCES = {
+    "app": "trr-app.log",
+    "backend": "trr-backend.log",
+    "social-worker": "social-worker.log",
+    "remote-workers": "remote-workers.log",
+    "watchdog": "backend-watchdog-events.jsonl",
+}
+JSONL_SOURCES = frozenset({"watchdog"})
+
+# Literal marker -> signal tag. Kept in sync with db-pressure-rehearsal.sh.
+SIGNAL_MARKERS = {
+    "EMAXCONNSESSION": "EMAXCONNSESSION",
+    "MaxClientsInSessionMode": "MaxClientsInSessionMode",
+    "UPSTREAM_TIMEOUT": "UPSTREAM_TIMEOUT",
+    "DATABASE_SERVICE_UNAVAILABLE": "DATABASE_SERVICE_UNAVAILABLE",
+    "postgres_pool_queue_depth": "postgres_pool_queue_depth",
+    "pool_capacity": "pool_capacity",
+    "connection pool exhausted": "connection_pool_exhausted",
+    "Traceback (most recent call last)": "traceback",
+}
+SIGNAL_PATTERN = re.compile("|".join(re.escape(marker) for marker in SIGNAL_MARKERS))
+LEVEL_PATTERN = re.compile(r"\b(DEBUG|INFO|WARN(?:ING)?|ERROR|CRITICAL|FATAL)\b")
+LEVEL_ALIASES = {"WARN": "WARNING", "FATAL": "CRITICAL"}
+EVENT_LEVELS = frozenset({"WARNING", "ERROR", "CRITICAL"})
+TIMESTAMP_PATTERN = re.compile(
+    r"(\d{4}-\d{2}-\d{2})[T ](\d{2}:\d{2}:\d{2})(?:[.,]\d+)?(Z|[+-]\d{2}:?\d{2})?"
+)
+TIMESTAMP_SEARCH_CHARS = 64
+RELATIVE_TIME_PATTERN = re.compile(r"(\d+)([smhd])")
+RELATIVE_TIME_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+READ_CHUNK_BYTES = 1 << 20
+MESSAGE_MAX_CHARS = 500
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+CREATE TABLE IF NOT EXISTS files (
+    source TEXT PRIMARY KEY,
+    device INTEGER NOT NULL,
+    inode INTEGER NOT NULL,
+    offset INTEGER NOT NULL,
+    last_ts INTEGER
+);
+CREATE TABLE IF NOT EXISTS minute_counts (
+    minute INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    level TEXT NOT NULL,
+    lines INTEGER NOT NULL,
+    PRIMARY KEY (minute, source, level)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    ts INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    level TEXT NOT NULL,
+    signals TEXT NOT NULL,
+    message TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS events_ts ON events (ts);
+CREATE TABLE IF NOT EXISTS event_signals (
+    signal TEXT NOT NULL,
+    ts INTEGER NOT NULL,
+    event_id INTEGER NOT NULL,
+    PRIMARY KEY (signal, ts, event_id)
+) WITHOUT ROWID;
+"""
+
+
+class LogIndexError(RuntimeError):
+    pass
+
+
+@dataclass(frozen=True)
+class ParsedLine:
+    ts: int
+    level: str
+    signals: tuple[str, ...]
+    message: str
+
+    @property
+    def is_event(self) -> bool:
+        return bool(self.signals) or self.level in EVENT_LEVELS
+
+
+@dataclass
+class IngestStats:
+    source: str
+    bytes_read: int = 0
+    lines: int = 0
+    events: int = 0
+    rotated: bool = False
+
+
+def parse_timestamp(text: str) -> int | None:
+    match = TIMESTAMP_PATTERN.search(text[:TIMESTAMP_SEARCH_CHARS])
+    if not match:
+        return None
+    date_part, time_part, zone = match.groups()
+    try:
+        parsed = datetime.fromisoformat(f"{date_part}T{time_part}")
+    except ValueError:
+        return None
+    if zone == "Z":
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    elif zone:
+        parsed = datetime.fromisoformat(f"{date_part}T{time_part}{zone[:3]}:{zone[-2:]}")
+    else:
+        # Naive timestamps are written in the workspace's local time.
+        parsed = parsed.astimezone()
+    return int(parsed.timestamp())
+
+
+def parse_line(source: str, line: str, fallback_ts: int) -> ParsedLine:
+    """Extract timestamp, level and signal tags; untimestamped lines inherit ``fallback_ts``."""
+    if source in JSONL_SOURCES:
+        try:
+            payload = json.loads(line)
+        except ValueError:
+            payload = None
+        if isinstance(payload, dict):
+            event = str(payload.get("event") or "unknown")
+            ts = parse_timestamp(str(payload.get("ts") or "")) or fallback_ts
+            level = "WARNING" if event == "restart" else "INFO"
+            return ParsedLine(ts, level, (f"watchdog_{event}",), line[:MESSAGE_MAX_CHARS])
+
+    ts = parse_timestamp(line) or fallback_ts
+    level_match = LEVEL_PATTERN.search(line)
+    level = LEVEL_ALIASES.get(level_match.group(1), level_match.group(1)) if level_match else ""
+    signals = tuple(dict.fromkeys(SIGNAL_MARKERS[match.group(0)] for match in SIGNAL_PATTERN.finditer(line)))
+    return ParsedLine(ts, level, signals, line[:MESSAGE_MAX_CHARS])
+
+
+def connect(index_path: Path) -> sqlite3.Connection:
+    index_path.parent.mkdir(parents=True, exist_ok=True)
+    connection = sqlite3.connect(index_path, timeout=30)
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.executescript(SCHEMA)
+    row = connection.execute("SELECT value FROM meta WHERE key = 'schema'").fetchone()
+    if row is None:
+        connection.execute("INSERT INTO meta (key, value) VALUES ('schema', ?)", (str(SCHEMA_VERSION),))
+        connection.commit()
+    elif row[0] != str(SCHEMA_VERSION):
+        raise LogIndexError(f"{index_path} uses index schema {row[0]}; delete it to rebuild with schema {SCHEMA_VERSION}.")
+    return connection
+
+
+def _read_lines(path: Path, offset: int) -> Iterator[tuple[str, int]]:
+    """Yield (line, offset after line) for complete lines past ``offset``."""
+    with path.open("rb") as handle:
+        handle.seek(offset)
+        pending = b""
+        position = offset
+        while True:
+            chunk = handle.read(READ_CHUNK_BYTES)
+            if not chunk:
+                return
+            pending += chunk
+            lines = pending.split(b"\n")
+            pending = lines.pop()
+            for raw in lines:
+                position += len(raw) + 1
+                yield raw.decode("utf-8", errors="replace").rstrip("\r"), position
+
+
+def _find_rotated(log_dir: Path, name: str, device: int, inode: int) -> Path | None:
+    for candidate in sorted((log_dir / "archive").glob(f"*/{name}"), reverse=True):
+        try:
+            stat = candidate.stat()
+        except OSError:
+            continue
+        if stat.st_dev == device and stat.st_ino == inode:
+            return candidate
+    return None
+
+
+def _ingest_file(
+    connection: sqlite3.Connection,
+    source: str,
+    path: Path,
+    offset: int,
+    last_ts: int | None,
+    stats: IngestStats,
+) -> tuple[int, int | None]:
+    fallback_ts = last_ts if last_ts is not None else int(path.stat().st_mtime)
+    minutes: dict[tuple[int, str], int] = {}
+    events: list[ParsedLine] = []
+    end = offset
+    line_count = 0
+    for line, end in _read_lines(path, offset):
+        parsed = parse_line(source, line, fallback_ts)
+        fallback_ts = parsed.ts
+        key = (parsed.ts - parsed.ts % 60, parsed.level)
+        minutes[key] = minutes.get(key, 0) + 1
+        if parsed.is_event:
+            events.append(parsed)
+        line_count += 1
+    stats.lines += line_count
+    stats.bytes_read += end - offset
+    stats.events += len(events)
+
+    connection.executemany(
+        "INSERT INTO minute_counts (minute, source, level, lines) VALUES (?, ?, ?, ?) "
+        "ON CONFLICT (minute, source, level) DO UPDATE SET lines = lines + excluded.lines",
+        [(minute, source, level, count) for (minute, level), count in minutes.items()],
+    )
+    for event in events:
+        cursor = connection.execute(
+            "INSERT INTO events (ts, source, level, signals, message) VALUES (?, ?, ?, ?, ?)",
+            (event.ts, source, event.level, ",".join(event.signals), event.message),
+        )
+        connection.executemany(
+            "INSERT OR IGNORE INTO event_signals (signal, ts, event_id) VALUES (?, ?, ?)",
+            [(signal, event.ts, cursor.lastrowid) for signal in event.signals],
+        )
+    return end, fallback_ts if line_count else last_ts
+
+
+def ingest(log_dir: Path = LOG_DIR, index_path: Path | None = None) -> list[IngestStats]:
+    """Bring the index up to date with every workspace log; returns per-source stats."""
+    connection = connect(index_path or log_dir / INDEX_NAME)
+    results: list[IngestStats] = []
+    try:
+        for source, name in LOG_SOURCES.items():
+            stats = IngestStats(source)
+            results.append(stats)
+            path = log_dir / name
+            try:
+                current = path.stat()
+            except OSError:
+                continue
+            # Hold the write lock from reading this source's offset through its
+            # commit, so a concurrent ingest waits and then sees the new offset.
+            connection.execute("BEGIN IMMEDIATE")
+            try:
+                row = connection.execute(
+                    "SELECT device, inode, offset, last_ts FROM files WHERE source = ?", (source,)
+                ).fetchone()
+                offset, last_ts = 0, None
+                if row is not None:
+                    device, inode, offset, last_ts = row
+                    if (device, inode) != (current.st_dev, current.st_ino):
+                        stats.rotated = True
+                        rotated = _find_rotated(log_dir, name, device, inode)
+                        if rotated is not None:
+                            _, last_ts = _ingest_file(connection, source, rotated, offset, last_ts, stats)
+                        offset = 0
+                    elif current.st_size < offset:
+                        stats.rotated = True
+                        offset = 0
+                offset, last_ts = _ingest_file(connection, source, path, offset, last_ts, stats)
+                connection.execute(
+                    "INSERT INTO files (source, device, inode, offset, last_ts) VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (source) DO UPDATE SET device = excluded.device, inode = excluded.inode, "
+                    "offset = excluded.offset, last_ts = excluded.last_ts",
+                    (source, current.st_dev, current.st_ino, offset, last_ts),
+                )
+                connection.commit()
+            except BaseException:
+                connection.rollback()
+                raise
+    finally:
+        connection.close()
+    return results
+
+
+def parse_time_arg(value: str, *, now: float | None = None) -> int:
+    """Accept a relative age (``90s``, ``15m``, ``2h``, ``1d``) or an ISO-8601 timestamp."""
+    now = time.time() if now is None else now
+    relative = RELATIVE_TIME_PATTERN.fullmatch(value.strip())
+    if relative:
+        return int(now) - int(relative.group(1)) * RELATIVE_TIME_UNITS[relative.group(2)]
+    parsed = parse_timestamp(value.strip())
+    if parsed is None:
+        raise argparse.ArgumentTypeError(f"expected 15m/2h/1d or an ISO timestamp, got {value!r}")
+    return parsed
+
+
+def _filters(
+    ts_column: str,
+    *,
+    since: int | None,
+    until: int | None,
+    sources: Iterable[str] = (),
+    levels: Iterable[str] = (),
+) -> tuple[list[str], list[object]]:
+    clauses: list[str] = []
+    params: list[object] = []
+    if since is not None:
+        clauses.append(f"{ts_column} >= ?")
+        params.append(since)
+    if until is not None:
+        clauses.append(f"{ts_column} < ?")
+        params.append(until)
+    for column, values in (("source", list(sources)), ("level", list(levels))):
+        if values:
+            clauses.append(f"{column} IN ({', '.join('?' for _ in values)})")
+            params.extend(values)
+    return clauses, params
+
+
+def query_events(
+    connection: sqlite3.Connection,
+    *,
+    since: int | None = None,
+    until: int | None = None,
+    signals: Iterable[str] = (),
+    sources: Iterable[str] = (),
+    levels: Iterable[str] = (),
+    limit: int = 200,
+) -> list[dict[str, object]]:
+    clauses, params = _filters("events.ts", since=since, until=until, sources=sources, levels=levels)
+    signals = list(signals)
+    if signals:
+        signal_clauses, signal_params = _filters("ts", since=since, until=until)
+        clauses.append(
+            "events.id IN (SELECT event_id FROM event_signals WHERE "
+            + " AND ".join([f"signal IN ({', '.join('?' for _ in signals)})", *signal_clauses])
+            + ")"
+        )
+        params.extend([*signals, *signal_params])
+    where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+    rows = connection.execute(
+        f"SELECT ts, source, level, signals, message FROM events {where} ORDER BY ts DESC, id DESC LIMIT ?",
+        [*params, limit],
+    ).fetchall()
+    return [
+        {"ts": _iso(ts), "source": source, "level": level, "signals": [s for s in tags.split(",") if s], "message": message}
+        for ts, source, level, tags, message in reversed(rows)
+    ]
+
+
+def minute_counts(
+    connection: sqlite3.Connection,
+    *,
+    since: int | None = None,
+    until: int | None = None,
+    signals: Iterable[str] = (),
+    sources: Iterable[str] = (),
+    levels: Iterable[str] = (),
+) -> list[dict[str, object]]:
+    """Lines per minute; with ``signals`` set, counts signal-tagged events instead."""
+    signals = list(signals)
+    if signals:
+        clauses, params = _filters("events.ts", since=since, until=until, sources=sources, levels=levels)
+        clauses.append(f"event_signals.signal IN ({', '.join('?' for _ in signals)})")
+        params.extend(signals)
+        rows = connection.execute(
+            "SELECT events.ts - events.ts % 60 AS minute, COUNT(DISTINCT events.id) FROM events "
+            "JOIN event_signals ON event_signals.event_id = events.id "
+            f"WHERE {' AND '.join(clauses)} GROUP BY minute ORDER BY minute",
+            params,
+        ).fetchall()
+    else:
+        floor = None if since is None else since - since % 60
+        clauses, params = _filters("minute", since=floor, until=until, sources=sources, levels=levels)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        rows = connection.execute(
+            f"SELECT minute, SUM(lines) FROM minute_counts {where} GROUP BY minute ORDER BY minute",
+            params,
+        ).fetchall()
+    return [{"minute": _iso(minute), "count": count} for minute, count in rows]
+
+
+def _iso(ts: int) -> str:
+    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Index and query .logs/workspace without rescanning the raw logs.")
+    parser.add_argument("--log-dir", type=Path, default=LOG_DIR, help="Workspace log directory (default: .logs/workspace).")
+    parser.add_argument("--index", type=Path, help=f"Index path (default: <log-dir>/{INDEX_NAME}).")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("ingest", help="Index bytes appended since the previous run.")
+    for name, help_text in (
+        ("query", "List indexed events (signal-tagged or WARNING+ lines)."),
+        ("counts", "Print line counts per minute (signal-tagged events with --signal)."),
+    ):
+        command = subparsers.add_parser(name, help=help_text)
+        command.add_argument("--since", type=parse_time_arg, help="Start of the window: 15m, 2h, 1d or an ISO timestamp.")
+        command.add_argument("--until", type=parse_time_arg, help="End of the window (exclusive).")
+        command.add_argument("--signal", action="append", default=[], help="Signal tag; repeatable.")
+        command.add_argument("--source", action="append", default=[], choices=sorted(LOG_SOURCES), help="Log source; repeatable.")
+        command.add_argument("--level", action="append", default=[], type=str.upper, help="Log level; repeatable.")
+        command.add_argument("--no-ingest", action="store_true", help="Query the index as-is without catching up first.")
+        command.add_argument("--json", action="store_true", help="Emit JSON.")
+        if name == "query":
+            command.add_argument("--limit", type=int, default=200, help="Most recent events to print (default: 200).")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = parse_args(sys.argv[1:] if argv is None else argv)
+    log_dir = args.log_dir if args.log_dir.is_absolute() else ROOT / args.log_dir
+    index_path = args.index or log_dir / INDEX_NAME
+
+    try:
+        if args.command == "ingest" or not args.no_ingest:
+            results = ingest(log_dir, index_path)
+            if args.command == "ingest":
+                for stats in results:
+                    rotated = " (rotated)" if stats.rotated else ""
+                    print(f"[log-index] {stats.source}: {stats.lines} lines, {stats.events} events, {stats.bytes_read} bytes{rotated}")
+                return 0
+        connection = connect(index_path)
+    except (LogIndexError, sqlite3.Error, OSError) as exc:
+        print(f"[log-index] ERROR: {exc}", file=sys.stderr)
+        return 1
+
+    filters = {"since": args.since, "until": args.until, "signals": args.signal, "sources": args.source, "levels": args.level}
+    try:
+        if args.command == "query":
+            rows = query_events(connection, limit=args.limit, **filters)
+            if args.json:
+                print(json.dumps(rows, indent=2))
+            for row in [] if args.json else rows:
+                tags = f" [{','.join(row['signals'])}]" if row["signals"] else ""
+                level = f" {row['level']}" if row["level"] else ""
+                print(f"{row['ts']} {row['source']}{level}{tags}: {row['message']}")
+        else:
+            rows = minute_counts(connection, **filters)
+            if args.json:
+                print(json.dumps(rows, indent=2))
+            for row in [] if args.json else rows:
+                print(f"{row['minute']}  {row['count']}")
+    finally:
+        connection.close()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,858 @@
+#!/usr/bin/env python3
+"""Workspace status snapshot (``make status`` / ``make status-json``).
+
+Collects the same document as the shell collector in status-workspace.sh, but
+probes health endpoints and port listeners concurrently with a bounded
+per-probe timeout, reads listeners from /proc/net/tcp on Linux, and parses the
+pidfile, watchdog state and runtime-reconcile artifacts in-process. The Codex
+runtime section (Context7 + doctor plugin registry) still comes from the shell
+libraries; it is fetched with one ``status-workspace.sh --codex-runtime-json``
+callback that runs alongside the probes.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import re
+import signal
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Awaitable, Callable, Mapping, TypeVar
+from urllib.parse import urlsplit
+
+
+ROOT = Path(__file__).resolve().parents[2]
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from scripts.lib import env_files  # noqa: E402
+from scripts.preflight_scheduler import TimingLog  # noqa: E402
+
+
+STATUS_SCRIPT = ROOT / "scripts" / "status-workspace.sh"
+DEFAULT_PROBE_TIMEOUT_SECONDS = 0.75
+CODEX_RUNTIME_TIMEOUT_SECONDS = 30.0
+RELOAD_LOG_TAIL_LINES = 800
+RELOAD_LOG_TAIL_BYTES = 512 * 1024
+RELOAD_MARKERS = re.compile(r"WatchFiles detected changes|Started reloader process|StatReload")
+# lsof prints at most nine characters of the command name by default.
+LSOF_COMMAND_WIDTH = 9
+TCP_LISTEN_STATE = "0A"
+
+# Defaults applied before the pidfile is loaded; mirrors status-workspace.sh.
+RUNTIME_DEFAULTS: dict[str, str] = {
+    "TRR_BACKEND_PORT": "8000",
+    "TRR_APP_PORT": "3000",
+    "TRR_APP_HOST": "127.0.0.1",
+    "WORKSPACE_HEALTH_CURL_MAX_TIME": "8",
+    "WORKSPACE_BACKEND_AUTO_RESTART": "1",
+    "WORKSPACE_BACKEND_HEALTH_INTERVAL_SECONDS": "5",
+    "WORKSPACE_BACKEND_HEALTH_FAILURE_THRESHOLD": "6",
+    "WORKSPACE_BACKEND_HEALTH_CURL_MAX_TIME": "30",
+    "WORKSPACE_STATUS_BACKEND_HEALTH_CURL_MAX_TIME": "5",
+    "WORKSPACE_SOCIAL_WORKER_ENABLED": "1",
+    "WORKSPACE_SOCIAL_WORKER_POSTS": "6",
+    "WORKSPACE_SOCIAL_WORKER_COMMENTS": "6",
+    "WORKSPACE_SOCIAL_WORKER_MEDIA_MIRROR": "6",
+    "WORKSPACE_SOCIAL_WORKER_COMMENT_MEDIA_MIRROR": "6",
+    "WORKSPACE_SOCIAL_WORKER_INTERVAL_SEC": "2",
+    "WORKSPACE_TRR_JOB_PLANE_MODE": "local",
+    "WORKSPACE_TRR_LONG_JOB_ENFORCE_REMOTE": "0",
+    "WORKSPACE_TRR_REMOTE_EXECUTOR": "modal",
+    "WORKSPACE_TRR_MODAL_ENABLED": "0",
+    "WORKSPACE_TRR_REMOTE_WORKERS_ENABLED": "0",
+    "WORKSPACE_TRR_REMOTE_ADMIN_WORKERS": "1",
+    "WORKSPACE_TRR_REMOTE_REDDIT_WORKERS": "1",
+    "WORKSPACE_TRR_REMOTE_GOOGLE_NEWS_WORKERS": "1",
+    "WORKSPACE_TRR_REMOTE_SOCIAL_WORKERS": "0",
+    "WORKSPACE_RUNTIME_CAPACITY_PROFILE": "local_workspace",
+    "WORKSPACE_TRR_REMOTE_SOCIAL_DISPATCH_LIMIT": "4",
+    "WORKSPACE_TRR_MODAL_SOCIAL_JOB_CONCURRENCY_LIMIT": "4",
+    "WORKSPACE_SUPAVISOR_SESSION_POOL_SIZE": "15",
+    "WORKSPACE_ENFORCE_DB_HOLDER_BUDGET": "0",
+    "WORKSPACE_TRR_REMOTE_SOCIAL_POSTS": "1",
+    "WORKSPACE_TRR_REMOTE_SOCIAL_COMMENTS": "1",
+    "WORKSPACE_TRR_REMOTE_SOCIAL_MEDIA_MIRROR": "1",
+    "WORKSPACE_TRR_REMOTE_SOCIAL_COMMENT_MEDIA_MIRROR": "1",
+    "WORKSPACE_TRR_REMOTE_WORKER_POLL_SECONDS": "2",
+    "WORKSPACE_TRR_REMOTE_GOOGLE_NEWS_LEASE_SECONDS": "300",
+    "TRR_BACKEND_RELOAD": "0",
+    "TRR_ADMIN_ROUTE_CACHE_DISABLED": "0",
+    "WORKSPACE_DEV_MODE": "local",
+    "WORKSPACE_BACKEND_RESTART_COUNT": "0",
+    "WORKSPACE_OPEN_BROWSER": "0",
+    "WORKSPACE_OPEN_ADMIN_BROWSER": "1",
+    "WORKSPACE_BROWSER_TAB_SYNC_MODE": "reuse_no_reload",
+    "WORKSPACE_BROWSER_TRANSPORT_REPAIR_STATE": "not_checked",
+    "WORKSPACE_BROWSER_TRANSPORT_REPAIR_REASON": "not_checked",
+    "WORKSPACE_BROWSER_TRANSPORT_REPAIR_CLEANED": "0",
+    "WORKSPACE_BROWSER_TRANSPORT_REPAIR_BROKEN_LIVE_SESSIONS": "0",
+    "WORKSPACE_IN_APP_BROWSER_REPAIR_STATE": "not_checked",
+    "WORKSPACE_IN_APP_BROWSER_REPAIR_REASON": "not_checked",
+    "WORKSPACE_IN_APP_BROWSER_REPAIR_CLEANED": "0",
+    "WORKSPACE_IN_APP_BROWSER_REPAIR_RETAINED_LIVE": "0",
+    "WORKSPACE_IN_APP_BROWSER_REPAIR_RETIRED_PROJECT_OWNED": "0",
+}
+
+# Runtime knobs reported under "modes" (after workspace_dev_mode), in order.
+MODE_KEYS = (
+    "WORKSPACE_OPEN_BROWSER",
+    "WORKSPACE_OPEN_ADMIN_BROWSER",
+    "WORKSPACE_BROWSER_TAB_SYNC_MODE",
+    "WORKSPACE_BROWSER_TRANSPORT_REPAIR_STATE",
+    "WORKSPACE_BROWSER_TRANSPORT_REPAIR_REASON",
+    "WORKSPACE_BROWSER_TRANSPORT_REPAIR_CLEANED",
+    "WORKSPACE_BROWSER_TRANSPORT_REPAIR_BROKEN_LIVE_SESSIONS",
+    "WORKSPACE_IN_APP_BROWSER_REPAIR_STATE",
+    "WORKSPACE_IN_APP_BROWSER_REPAIR_REASON",
+    "WORKSPACE_IN_APP_BROWSER_REPAIR_CLEANED",
+    "WORKSPACE_IN_APP_BROWSER_REPAIR_RETAINED_LIVE",
+    "WORKSPACE_IN_APP_BROWSER_REPAIR_RETIRED_PROJECT_OWNED",
+    "WORKSPACE_STRICT",
+    "WORKSPACE_BACKEND_AUTO_RESTART",
+    "WORKSPACE_BACKEND_HEALTH_INTERVAL_SECONDS",
+    "WORKSPACE_BACKEND_HEALTH_FAILURE_THRESHOLD",
+    "WORKSPACE_BACKEND_HEALTH_CURL_MAX_TIME",
+    "WORKSPACE_STATUS_BACKEND_HEALTH_CURL_MAX_TIME",
+    "WORKSPACE_SOCIAL_WORKER_ENABLED",
+    "WORKSPACE_SOCIAL_WORKER_POSTS",
+    "WORKSPACE_SOCIAL_WORKER_COMMENTS",
+    "WORKSPACE_SOCIAL_WORKER_MEDIA_MIRROR",
+    "WORKSPACE_SOCIAL_WORKER_COMMENT_MEDIA_MIRROR",
+    "WORKSPACE_SOCIAL_WORKER_INTERVAL_SEC",
+    "WORKSPACE_TRR_JOB_PLANE_MODE",
+    "WORKSPACE_TRR_LONG_JOB_ENFORCE_REMOTE",
+    "TRR_ALLOW_LOCAL_ADMIN_OPERATION_OVERRIDE",
+    "WORKSPACE_TRR_REMOTE_EXECUTOR",
+    "WORKSPACE_TRR_MODAL_ENABLED",
+    "WORKSPACE_TRR_REMOTE_WORKERS_ENABLED",
+    "WORKSPACE_TRR_REMOTE_ADMIN_WORKERS",
+    "WORKSPACE_TRR_REMOTE_REDDIT_WORKERS",
+    "WORKSPACE_TRR_REMOTE_GOOGLE_NEWS_WORKERS",
+    "WORKSPACE_TRR_REMOTE_SOCIAL_WORKERS",
+    "WORKSPACE_RUNTIME_CAPACITY_PROFILE",
+    "WORKSPACE_RUNTIME_CAPACITY_CONTEXT",
+    "WORKSPACE_TRR_REMOTE_SOCIAL_DISPATCH_LIMIT",
+    "WORKSPACE_TRR_MODAL_SOCIAL_JOB_CONCURRENCY_LIMIT",
+    "WORKSPACE_TRR_REMOTE_SOCIAL_POSTS",
+    "WORKSPACE_TRR_REMOTE_SOCIAL_COMMENTS",
+    "WORKSPACE_TRR_REMOTE_SOCIAL_MEDIA_MIRROR",
+    "WORKSPACE_TRR_REMOTE_SOCIAL_COMMENT_MEDIA_MIRROR",
+    "WORKSPACE_TRR_REMOTE_WORKER_POLL_SECONDS",
+    "WORKSPACE_TRR_REMOTE_GOOGLE_NEWS_LEASE_SECONDS",
+    "TRR_BACKEND_RELOAD",
+    "TRR_ADMIN_ROUTE_CACHE_DISABLED",
+    "PROFILE",
+)
+PROCESS_KEYS = (
+    ("trr_app", "TRR_APP_PID"),
+    ("trr_social_worker", "TRR_SOCIAL_WORKER_PID"),
+    ("trr_remote_workers", "TRR_REMOTE_WORKERS_PID"),
+    ("trr_backend", "TRR_BACKEND_PID"),
+)
+RECONCILE_COMPONENTS = ("db", "modal", "render", "decodo")
+CODEX_OWNER_LABELS = {
+    "desktop": "Desktop Codex app-server",
+    "vscode": "VS Code Codex app-server",
+}
+
+T = TypeVar("T")
+
+
+def parse_env_file(path: Path) -> dict[str, str]:
+    """Read the KEY=value lines the workspace writes to pids.env-style files."""
+    try:
+        return env_files.env_values(path)
+    except (OSError, UnicodeError):
+        return {}
+
+
+@dataclass
+class StatusContext:
+    root: Path
+    values: dict[str, str]
+    have_pidfile: bool
+    have_watchdog_state: bool
+
+    @property
+    def log_dir(self) -> Path:
+        return self.root / ".logs" / "workspace"
+
+    @property
+    def pidfile(self) -> Path:
+        return self.log_dir / "pids.env"
+
+    def get(self, key: str, default: str = "") -> str:
+        return self.values.get(key) or default
+
+    def runtime_value(self, key: str) -> str:
+        if not self.have_pidfile:
+            return "n/a"
+        return self.get(key) or "n/a"
+
+    def watchdog_value(self, key: str) -> str:
+        if not self.have_pidfile and not self.have_watchdog_state:
+            return "n/a"
+        return self.get(key) or "n/a"
+
+    def restart_count(self) -> int | None:
+        if not self.have_pidfile and not self.have_watchdog_state:
+            return None
+        return int(self.get("BACKEND_RESTART_COUNT", "0"))
+
+    def dev_mode(self) -> str:
+        return self.get("WORKSPACE_DEV_MODE", "local")
+
+    def modal_remote_active(self) -> bool:
+        return (
+            self.have_pidfile
+            and self.get("WORKSPACE_TRR_REMOTE_WORKERS_ENABLED", "0") == "1"
+            and self.get("WORKSPACE_TRR_REMOTE_EXECUTOR") == "modal"
+            and self.get("WORKSPACE_TRR_MODAL_ENABLED") == "1"
+        )
+
+
+def load_context(root: Path = ROOT, env: Mapping[str, str] | None = None) -> StatusContext:
+    env = os.environ if env is None else env
+    values = dict(env)
+    for key, default in RUNTIME_DEFAULTS.items():
+        values[key] = values.get(key) or default
+    values["PROFILE"] = values.get("PROFILE") or ""
+    values["WORKSPACE_RUNTIME_CAPACITY_CONTEXT"] = (
+        values.get("WORKSPACE_RUNTIME_CAPACITY_CONTEXT") or values["WORKSPACE_RUNTIME_CAPACITY_PROFILE"]
+    )
+    if not re.fullmatch(r"[1-9][0-9]*", values["WORKSPACE_STATUS_BACKEND_HEALTH_CURL_MAX_TIME"]):
+        values["WORKSPACE_STATUS_BACKEND_HEALTH_CURL_MAX_TIME"] = "5"
+
+    log_dir = root / ".logs" / "workspace"
+    pidfile = log_dir / "pids.env"
+    watchdog_state = log_dir / "backend-watchdog.env"
+    have_pidfile = pidfile.is_file()
+    if have_pidfile:
+        values.update(parse_env_file(pidfile))
+    have_watchdog_state = watchdog_state.is_file()
+    if have_watchdog_state:
+        values.update(parse_env_file(watchdog_state))
+    if not re.fullmatch(r"[0-9]+", values.get("BACKEND_RESTART_COUNT") or "0"):
+        values["BACKEND_RESTART_COUNT"] = "0"
+    return StatusContext(root=root, values=values, have_pidfile=have_pidfile, have_watchdog_state=have_watchdog_state)
+
+
+def pid_is_running(pid: str) -> bool:
+    """Same answer as ``kill -0``: processes we may not signal count as not running."""
+    try:
+        os.kill(int(pid), 0)
+    except (ValueError, OverflowError, OSError):
+        return False
+    return True
+
+
+def pid_state(pid: str) -> str:
+    if not pid:
+        return "not recorded"
+    if pid_is_running(pid):
+        return f"running (pid={pid})"
+    return f"not running (pid={pid})"
+
+
+# --- Port listeners -----------------------------------------------------------
+
+
+def parse_proc_net_tcp(text: str) -> dict[int, set[int]]:
+    """Map local port -> socket inodes for LISTEN rows of /proc/net/tcp{,6}."""
+    listening: dict[int, set[int]] = {}
+    for line in text.splitlines()[1:]:
+        fields = line.split()
+        if len(fields) < 10 or fields[3] != TCP_LISTEN_STATE:
+            continue
+        try:
+            port = int(fields[1].rsplit(":", 1)[1], 16)
+            inode = int(fields[9])
+        except (IndexError, ValueError):
+            continue
+        listening.setdefault(port, set()).add(inode)
+    return listening
+
+
+def socket_owners(inodes: set[int], proc: Path = Path("/proc")) -> dict[int, set[tuple[str, int]]]:
+    """Resolve socket inodes to (command, pid) by walking /proc/<pid>/fd."""
+    owners: dict[int, set[tuple[str, int]]] = {}
+    if not inodes:
+        return owners
+    targets = {f"socket:[{inode}]": inode for inode in inodes}
+    try:
+        entries = list(os.scandir(proc))
+    except OSError:
+        return owners
+    for entry in entries:
+        if not entry.name.isdigit():
+            continue
+        matched: set[int] = set()
+        try:
+            for fd in os.scandir(os.path.join(entry.path, "fd")):
+                try:
+                    inode = targets.get(os.readlink(fd.path))
+                except OSError:
+                    continue
+                if inode is not None:
+                    matched.add(inode)
+        except OSError:
+            continue
+        if not matched:
+            continue
+        try:
+            command = Path(entry.path, "comm").read_text(encoding="utf-8").strip()
+        except OSError:
+            command = "?"
+        for inode in matched:
+            owners.setdefault(inode, set()).add((command[:LSOF_COMMAND_WIDTH], int(entry.name)))
+    return owners
+
+
+def proc_port_listeners(ports: list[int], proc: Path = Path("/proc")) -> dict[int, str]:
+    listening: dict[int, set[int]] = {}
+    for table in ("tcp", "tcp6"):
+        try:
+            text = (proc / "net" / table).read_text(encoding="utf-8")
+        except OSError:
+            continue
+        for port, inodes in parse_proc_net_tcp(text).items():
+            listening.setdefault(port, set()).update(inodes)
+    wanted = set().union(*(listening.get(port, set()) for port in ports)) if ports else set()
+    owners = socket_owners(wanted, proc)
+    result: dict[int, str] = {}
+    for port in ports:
+        inodes = listening.get(port, set())
+        if not inodes:
+            result[port] = "none"
+            continue
+        labels = sorted({f"{command}:{pid}" for inode in inodes for command, pid in owners.get(inode, ())})
+        result[port] = ",".join(labels) if labels else "listening (owner not visible to this user)"
+    return result
+
+
+def lsof_port_listeners(ports: list[int]) -> dict[int, str]:
+    result: dict[int, str] = {}
+    for port in ports:
+        try:
+            completed = subprocess.run(
+                ["lsof", "-nP", f"-iTCP:{port}", "-sTCP:LISTEN"],
+                capture_output=True,
+                text=True,
+                timeout=5,
+                check=False,
+            )
+        except FileNotFoundError:
+            result[port] = "unknown (no lsof or /proc/net/tcp)"
+            continue
+        except subprocess.TimeoutExpired:
+            result[port] = "unknown (lsof timed out)"
+            continue
+        labels = sorted(
+            {f"{fields[0]}:{fields[1]}" for fields in (line.split() for line in completed.stdout.splitlines()[1:]) if len(fields) > 1}
+        )
+        result[port] = ",".join(labels) if labels else "none"
+    return result
+
+
+def port_listeners(ports: list[int], proc: Path = Path("/proc")) -> dict[int, str]:
+    if (proc / "net" / "tcp").is_file():
+        return proc_port_listeners(ports, proc)
+    return lsof_port_listeners(ports)
+
+
+# --- Health probes ------------------------------------------------------------
+
+
+async def http_probe(url: str, timeout: float) -> bool:
+    """True when ``url`` answers with a non-error status within ``timeout`` (curl -f semantics)."""
+    parts = urlsplit(url)
+    host = parts.hostname or "127.0.0.1"
+    port = parts.port or (443 if parts.scheme == "https" else 80)
+    path = parts.path or "/"
+    if parts.query:
+        path = f"{path}?{parts.query}"
+
+    async def exchange() -> bool:
+        reader, writer = await asyncio.open_connection(host, port, ssl=parts.scheme == "https" or None)
+        try:
+            writer.write(
+                f"GET {path} HTTP/1.1\r\nHost: {parts.netloc}\r\nUser-Agent: trr-workspace-status\r\n"
+                "Accept: */*\r\nConnection: close\r\n\r\n".encode("ascii")
+            )
+            await writer.drain()
+            status_line = await reader.readline()
+        finally:
+            writer.close()
+        fields = status_line.split()
+        return len(fields) >= 2 and fields[1].isdigit() and int(fields[1]) < 400
+
+    try:
+        return await asyncio.wait_for(exchange(), timeout)
+    except (OSError, asyncio.TimeoutError, ValueError):
+        return False
+
+
+def health_label(ok: bool, pid: str) -> str:
+    if ok:
+        return "ok"
+    return "starting/unhealthy" if pid_is_running(pid) else "down"
+
+
+def backend_readiness_label(readiness_ok: bool, liveness_ok: bool, pid: str) -> str:
+    """One-sample version of backend_health_status + workspace_backend_readiness_label."""
+    if readiness_ok:
+        return "ok"
+    if not pid_is_running(pid):
+        return "down"
+    return "degraded/slow" if liveness_ok else "hung/unresponsive"
+
+
+# --- Codex runtime callback -----------------------------------------------------
+
+
+def codex_runtime_fallback(reason: str) -> dict[str, object]:
+    return {
+        "app_servers": [],
+        "context7": {"status": "unknown", "label": "unknown", "repair_command": "make context7-repair"},
+        "plugin_registry": {"overall_status": "unknown", "results": []},
+        "error": reason,
+    }
+
+
+async def codex_runtime(env: Mapping[str, str], timeout: float) -> dict[str, object]:
+    process = await asyncio.create_subprocess_exec(
+        "bash",
+        str(STATUS_SCRIPT),
+        "--codex-runtime-json",
+        stdin=asyncio.subprocess.DEVNULL,
+        stdout=asyncio.subprocess.PIPE,
+        stderr=asyncio.subprocess.DEVNULL,
+        env=dict(env),
+        start_new_session=True,
+    )
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout)
+    except asyncio.TimeoutError:
+        try:
+            os.killpg(process.pid, signal.SIGKILL)
+        except OSError:
+            pass
+        await process.wait()
+        return codex_runtime_fallback(f"codex runtime check timed out after {timeout:g}s")
+    try:
+        payload = json.loads(stdout.decode("utf-8", errors="replace"))
+    except json.JSONDecodeError:
+        return codex_runtime_fallback(f"codex runtime check failed (rc={process.returncode})")
+    return payload if isinstance(payload, dict) else codex_runtime_fallback("codex runtime check returned no object")
+
+
+# --- Artifacts -------------------------------------------------------------------
+
+
+def load_json_artifact(path: Path) -> tuple[bool, object]:
+    """(exists, payload); payload is None when the file is missing or unreadable."""
+    if not path.is_file():
+        return False, None
+    try:
+        return True, json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return True, None
+
+
+def count_backend_reload_events(log_path: Path) -> int:
+    try:
+        with log_path.open("rb") as handle:
+            handle.seek(0, os.SEEK_END)
+            handle.seek(max(0, handle.tell() - RELOAD_LOG_TAIL_BYTES))
+            tail = handle.read().decode("utf-8", errors="replace")
+    except OSError:
+        return 0
+    lines = tail.splitlines()[-RELOAD_LOG_TAIL_LINES:]
+    return sum(1 for line in lines if RELOAD_MARKERS.search(line))
+
+
+# --- Collection ----------------------------------------------------------------
+
+
+@dataclass
+class Probes:
+    backend_readiness_ok: bool
+    backend_liveness_ok: bool
+    app_ok: bool
+    listeners: dict[int, str]
+    codex_runtime: dict[str, object]
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+async def _timed(timings: TimingLog | None, phase: str, awaitable: Awaitable[T], render: Callable[[T], str] = str) -> T:
+    start_ms = _now_ms()
+    result = await awaitable
+    if timings is not None:
+        timings.record(phase, start_ms, _now_ms(), 0, len(render(result).encode("utf-8")))
+    return result
+
+
+async def collect_probes(
+    context: StatusContext,
+    *,
+    probe_timeout: float,
+    codex_timeout: float,
+    timings: TimingLog | None = None,
+    proc: Path = Path("/proc"),
+) -> Probes:
+    backend_port = context.get("TRR_BACKEND_PORT")
+    app_port = context.get("TRR_APP_PORT")
+    ports = [int(port) for port in dict.fromkeys((app_port, backend_port)) if port.isdigit()]
+    env = dict(os.environ, WORKSPACE_STATUS_ENGINE="bash")
+    if timings is not None:
+        env.update(
+            WORKSPACE_PHASE_TIMINGS_FILE=str(timings.path),
+            WORKSPACE_PHASE_TIMINGS_RUN_ID=timings.run_id,
+            WORKSPACE_PHASE_TIMINGS_SOURCE=timings.source,
+        )
+
+    readiness, liveness, app, listeners, codex = await asyncio.gather(
+        _timed(timings, "backend-readiness", http_probe(readiness_url(context), probe_timeout)),
+        _timed(timings, "backend-liveness", http_probe(liveness_url(context), probe_timeout)),
+        _timed(timings, "app-health", http_probe(app_url(context), probe_timeout)),
+        _timed(timings, "port-listeners", asyncio.to_thread(port_listeners, ports, proc), json.dumps),
+        _timed(timings, "codex-runtime", codex_runtime(env, codex_timeout), json.dumps),
+    )
+    return Probes(
+        backend_readiness_ok=readiness,
+        backend_liveness_ok=liveness,
+        app_ok=app,
+        listeners=listeners,
+        codex_runtime=codex,
+    )
+
+
+def readiness_url(context: StatusContext) -> str:
+    return f"http://127.0.0.1:{context.get('TRR_BACKEND_PORT')}/health"
+
+
+def liveness_url(context: StatusContext) -> str:
+    return f"http://127.0.0.1:{context.get('TRR_BACKEND_PORT')}/health/live"
+
+
+def app_url(context: StatusContext) -> str:
+    return f"http://{context.get('TRR_APP_HOST')}:{context.get('TRR_APP_PORT')}/"
+
+
+def _listeners_for(probes: Probes, port: str) -> str:
+    return probes.listeners.get(int(port), "none") if port.isdigit() else "none"
+
+
+def watchdog_state_label(context: StatusContext) -> str:
+    if context.have_pidfile:
+        return "active"
+    return "last_run_telemetry" if context.have_watchdog_state else "inactive"
+
+
+def modal_social_lane(context: StatusContext) -> str:
+    if not context.have_pidfile:
+        return "n/a"
+    if context.modal_remote_active() and context.get("WORKSPACE_TRR_REMOTE_SOCIAL_WORKERS", "0") == "1":
+        return "enabled"
+    return "disabled"
+
+
+def modal_social_stage_caps(context: StatusContext) -> str:
+    if not context.have_pidfile:
+        return "n/a"
+    return ", ".join(
+        f"{label}={context.get(key, 'n/a')}"
+        for label, key in (
+            ("posts", "WORKSPACE_TRR_REMOTE_SOCIAL_POSTS"),
+            ("comments", "WORKSPACE_TRR_REMOTE_SOCIAL_COMMENTS"),
+            ("media_mirror", "WORKSPACE_TRR_REMOTE_SOCIAL_MEDIA_MIRROR"),
+            ("comment_media_mirror", "WORKSPACE_TRR_REMOTE_SOCIAL_COMMENT_MEDIA_MIRROR"),
+        )
+    )
+
+
+def modal_social_runtime_summary(context: StatusContext) -> str:
+    if not context.modal_remote_active():
+        return "n/a"
+    return (
+        f"social_lane={modal_social_lane(context)}, "
+        f"dispatch_limit={context.get('WORKSPACE_TRR_REMOTE_SOCIAL_DISPATCH_LIMIT', 'n/a')}, "
+        f"max_concurrency={context.get('WORKSPACE_TRR_MODAL_SOCIAL_JOB_CONCURRENCY_LIMIT', 'n/a')}, "
+        f"stage_caps={modal_social_stage_caps(context)}"
+    )
+
+
+def remote_execution_summary(context: StatusContext) -> str:
+    if not context.have_pidfile:
+        return "n/a"
+    if context.get("WORKSPACE_TRR_REMOTE_WORKERS_ENABLED", "0") != "1":
+        return "disabled"
+    if context.modal_remote_active():
+        return f"modal_dispatch_active ({modal_social_runtime_summary(context)}; local claim loops skipped)"
+    return "local_claim_loops"
+
+
+def build_document(context: StatusContext, probes: Probes, *, timestamp: str | None = None) -> dict[str, object]:
+    backend_pid = context.get("TRR_BACKEND_PID")
+    readiness_status = backend_readiness_label(probes.backend_readiness_ok, probes.backend_liveness_ok, backend_pid)
+    _, reconcile = load_json_artifact(context.log_dir / "runtime-reconcile.json")
+    modes: dict[str, str] = {"workspace_dev_mode": context.dev_mode()}
+    modes.update((key.lower(), context.runtime_value(key)) for key in MODE_KEYS)
+    remote_pid = context.get("TRR_REMOTE_WORKERS_PID")
+    return {
+        "root": str(context.root),
+        "run_state": "active" if context.have_pidfile else "inactive",
+        "pidfile": {
+            "path": str(context.pidfile),
+            "loaded": context.have_pidfile,
+            "active": context.have_pidfile,
+        },
+        "modes": modes,
+        "processes": {
+            name: {"pid": context.get(key), "running": pid_is_running(context.get(key))} for name, key in PROCESS_KEYS
+        },
+        "ports": {
+            "trr_app": {"port": context.get("TRR_APP_PORT"), "listeners": _listeners_for(probes, context.get("TRR_APP_PORT"))},
+            "trr_backend": {
+                "port": context.get("TRR_BACKEND_PORT"),
+                "listeners": _listeners_for(probes, context.get("TRR_BACKEND_PORT")),
+            },
+        },
+        "health": {
+            "trr_backend_url": readiness_url(context),
+            "trr_backend_status": readiness_status,
+            "trr_backend_readiness_url": readiness_url(context),
+            "trr_backend_readiness_status": readiness_status,
+            "trr_backend_liveness_url": liveness_url(context),
+            "trr_backend_liveness_status": health_label(probes.backend_liveness_ok, backend_pid),
+            "trr_app_url": app_url(context),
+            "trr_app_status": health_label(probes.app_ok, context.get("TRR_APP_PID")),
+        },
+        "backend_watchdog": {
+            "state": watchdog_state_label(context),
+            "restart_count": context.restart_count(),
+            "last_restart_reason": context.watchdog_value("BACKEND_LAST_RESTART_REASON"),
+            "last_restart_at": context.watchdog_value("BACKEND_LAST_RESTART_AT"),
+            "last_restart_probe_rc": context.watchdog_value("BACKEND_LAST_RESTART_PROBE_RC"),
+        },
+        "remote_execution": {
+            "summary": remote_execution_summary(context),
+            "local_claim_loop_pid": remote_pid,
+            "local_claim_loops_running": pid_is_running(remote_pid),
+            "modal_social_lane": modal_social_lane(context),
+            "modal_social_dispatch_limit": context.runtime_value("WORKSPACE_TRR_REMOTE_SOCIAL_DISPATCH_LIMIT"),
+            "modal_social_max_concurrency": context.runtime_value("WORKSPACE_TRR_MODAL_SOCIAL_JOB_CONCURRENCY_LIMIT"),
+            "modal_social_stage_caps": modal_social_stage_caps(context),
+        },
+        "runtime_reconcile": reconcile,
+        "codex_runtime": probes.codex_runtime,
+        "timestamp_utc": timestamp or time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+    }
+
+
+# --- Text rendering ----------------------------------------------------------------
+
+
+def _reconcile_lines(context: StatusContext) -> list[str]:
+    exists, payload = load_json_artifact(context.log_dir / "runtime-reconcile.json")
+    lines = ["[status] Runtime reconcile:"]
+    if not exists:
+        return lines + ["  overall_state: n/a"]
+    if not isinstance(payload, dict):
+        return lines + ["  overall_state: unavailable"]
+    lines.append(f"  overall_state: {payload.get('overall_state') or 'unknown'}")
+    lines.append(f"  summary: {payload.get('summary') or 'n/a'}")
+    for name in RECONCILE_COMPONENTS:
+        component = payload.get(name) or {}
+        lines.append(f"  {name}: {component.get('state') or 'n/a'}")
+        if component.get("reason"):
+            lines.append(f"    reason: {component['reason']}")
+        if component.get("remediation"):
+            lines.append(f"    remediation: {component['remediation']}")
+        if name != "modal":
+            continue
+        readiness = component.get("readiness") or {}
+        if not isinstance(readiness, dict) or not readiness:
+            continue
+        if readiness.get("core_ok") is not None:
+            lines.append(f"    core_ready: {bool(readiness.get('core_ok'))}")
+        probe = readiness.get("getty_remote_probe") or {}
+        if isinstance(probe, dict) and probe:
+            probe_reason = probe.get("reason")
+            probe_state = "healthy" if probe.get("ready") is True else "blocked"
+            if probe_reason == "proxy_unconfigured":
+                probe_state = "disabled"
+            lines.append(f"    getty_remote_probe: {probe_state}")
+            if probe_reason:
+                lines.append(f"      reason: {probe_reason}")
+            if probe.get("transport_mode"):
+                lines.append(f"      transport_mode: {probe['transport_mode']}")
+            if probe.get("proxy_fingerprint"):
+                lines.append(f"      proxy_fingerprint: {probe['proxy_fingerprint']}")
+    return lines
+
+
+def render_text(context: StatusContext, document: dict[str, object]) -> str:
+    processes = document["processes"]
+    ports = document["ports"]
+    health = document["health"]
+    watchdog = document["backend_watchdog"]
+    codex = document["codex_runtime"]
+    pidfile = context.pidfile
+    app_port = context.get("TRR_APP_PORT")
+    backend_port = context.get("TRR_BACKEND_PORT")
+
+    lines = ["[status] Workspace status snapshot", f"[status] Root: {context.root}"]
+    if context.have_pidfile:
+        lines += [f"[status] Pidfile: {pidfile} (loaded)", "[status] Workspace run: active"]
+    else:
+        lines += [f"[status] Pidfile: {pidfile} (not found)", "[status] Workspace run: inactive"]
+    lines += ["", "[status] Workspace modes:", f"  WORKSPACE_DEV_MODE: {context.dev_mode()}"]
+    for key in MODE_KEYS:
+        value = context.runtime_value(key)
+        if key == "TRR_BACKEND_RELOAD":
+            reload_mode = "n/a" if not context.have_pidfile else ("reload" if context.get(key, "1") == "1" else "non-reload")
+            value = f"{value} ({reload_mode})"
+        lines.append(f"  {key}: {value}")
+
+    app_pid = context.get("TRR_APP_PID")
+    app_listeners = ports["trr_app"]["listeners"]
+    if pid_is_running(app_pid):
+        app_state = f"running (pid={app_pid})"
+    elif app_listeners != "none":
+        app_state = f"running (listener={app_listeners}; tracked pid={app_pid or 'n/a'} exited)"
+    else:
+        app_state = pid_state(app_pid)
+    if not context.have_pidfile:
+        remote_state = "n/a"
+    elif context.get("WORKSPACE_TRR_REMOTE_WORKERS_ENABLED", "0") != "1":
+        remote_state = "disabled"
+    elif context.get("WORKSPACE_TRR_REMOTE_EXECUTOR") == "modal" and context.get("WORKSPACE_TRR_MODAL_ENABLED") == "1":
+        remote_state = "not started locally (Modal dispatch active)"
+    else:
+        remote_state = pid_state(processes["trr_remote_workers"]["pid"])
+    lines += [
+        "",
+        "[status] Process states:",
+        f"  TRR_APP: {app_state}",
+        f"  TRR_SOCIAL_WORKER: {pid_state(processes['trr_social_worker']['pid'])}",
+        f"  TRR_REMOTE_WORKERS: {remote_state}",
+        f"  TRR_BACKEND: {pid_state(processes['trr_backend']['pid'])}",
+        "",
+        "[status] Port listeners:",
+        f"  TRR-APP (:{app_port}): {app_listeners}",
+        f"  TRR-Backend (:{backend_port}): {ports['trr_backend']['listeners']}",
+        "",
+        "[status] Health checks (best effort):",
+        f"  TRR-Backend readiness ({health['trr_backend_readiness_url']}): {health['trr_backend_readiness_status']}",
+        f"  TRR-Backend liveness ({health['trr_backend_liveness_url']}): {health['trr_backend_liveness_status']}",
+        f"  TRR-APP ({health['trr_app_url']}): {health['trr_app_status']}",
+        "",
+        "[status] Backend watchdog:",
+        f"  state: {watchdog['state']}",
+        f"  restart_count: {'n/a' if watchdog['restart_count'] is None else watchdog['restart_count']}",
+        f"  last_restart_reason: {watchdog['last_restart_reason']}",
+        f"  last_restart_at: {watchdog['last_restart_at']}",
+        f"  last_restart_probe_rc: {watchdog['last_restart_probe_rc']}",
+        "",
+        "[status] Remote execution:",
+        f"  summary: {document['remote_execution']['summary']}",
+    ]
+    if context.modal_remote_active():
+        lines.append(f"  modal_social: {modal_social_runtime_summary(context)}")
+    lines.append("")
+    lines += _reconcile_lines(context)
+
+    context7 = codex.get("context7") or {}
+    registry = codex.get("plugin_registry") or {}
+    app_servers = [server for server in codex.get("app_servers") or [] if server.get("pid")]
+    lines += [
+        "",
+        "[status] Codex shared-state runtime:",
+        f"  Context7: {context7.get('label', 'unknown')}",
+        f"    cache_parity: {context7.get('cache_parity', 'unknown')}; stale_cache_copies: {context7.get('stale_cache_copies', 'unknown')}",
+        f"  plugin_registry: {registry.get('overall_status', 'unknown')}",
+    ]
+    if codex.get("error"):
+        lines.append(f"  error: {codex['error']}")
+    if not app_servers:
+        lines.append("  app_servers: none detected")
+    for server in app_servers:
+        label = server.get("label") or CODEX_OWNER_LABELS.get(server.get("owner", ""), "Unknown Codex app-server")
+        lines.append(f"  {label}: pid={server['pid']} ppid={server.get('ppid', '')} mcp_children={server.get('mcp_children', 'none')}")
+
+    log_dir = context.log_dir
+    if health["trr_backend_readiness_status"] == "hung/unresponsive":
+        lines.append("")
+        if context.get("WORKSPACE_BACKEND_AUTO_RESTART", "1") == "1":
+            lines.append(
+                f"[status] Recommendation: backend appears hung; watchdog is enabled. Check '{log_dir}/trr-backend.log' and '{log_dir}/backend-watchdog-events.jsonl'."
+            )
+        else:
+            lines.append(
+                "[status] Recommendation: backend appears hung; run 'make stop && make dev' or set WORKSPACE_BACKEND_AUTO_RESTART=1."
+            )
+    if context.get("TRR_BACKEND_RELOAD", "1") == "1":
+        reload_events = count_backend_reload_events(log_dir / "trr-backend.log")
+        if reload_events > 3:
+            lines.append(
+                f"[status] Warning: recent backend reload churn detected ({reload_events} reload markers). Consider TRR_BACKEND_RELOAD=0 for stream stability."
+            )
+    if len(app_servers) > 1:
+        lines.append(
+            "[status] Warning: multiple Codex app-server owners are sharing the same runtime. Prefer one active Desktop/VS Code owner at a time."
+        )
+    return "\n".join(lines) + "\n"
+
+
+def _timing_log(root: Path) -> TimingLog | None:
+    if (os.environ.get("WORKSPACE_PHASE_TIMINGS") or "1") != "1":
+        return None
+    path = Path(os.environ.get("WORKSPACE_PHASE_TIMINGS_FILE") or root / ".logs" / "workspace" / "phase-timings.jsonl")
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+    except OSError:
+        return None
+    run_id = f"status-{time.strftime('%Y%m%dT%H%M%SZ', time.gmtime())}-{os.getpid()}"
+    return TimingLog(path, run_id, "status")
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Workspace status snapshot (PIDs, ports, health).")
+    parser.add_argument("--json", action="store_true", help="Emit the status document as JSON.")
+    parser.add_argument(
+        "--probe-timeout",
+        type=float,
+        default=DEFAULT_PROBE_TIMEOUT_SECONDS,
+        help=f"Per-probe HTTP timeout in seconds (default: {DEFAULT_PROBE_TIMEOUT_SECONDS}).",
+    )
+    args = parser.parse_args(argv)
+
+    context = load_context(ROOT)
+    probes = asyncio.run(
+        collect_probes(
+            context,
+            probe_timeout=args.probe_timeout,
+            codex_timeout=CODEX_RUNTIME_TIMEOUT_SECONDS,
+            timings=_timing_log(ROOT),
+        )
+    )
+    document = build_document(context, probes)
+    if args.json:
+        print(json.dumps(document, indent=2))
+    else:
+        sys.stdout.write(render_text(context, document))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,15 +1,35 @@
 from __future__ import annotations
 
+import hashlib
 import json
 import os
+import signal
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
+from scripts import backend_helper_worker
+
 ROOT = Path(__file__).resolve().parent.parent
 BACKEND_ROOT = ROOT / "TRR-Backend"
 ARTIFACT_PATH = ROOT / ".logs" / "workspace" / "runtime-reconcile.json"
+DB_SCRIPT = "scripts/dev/reconcile_runtime_db.py"
+MODAL_SCRIPT = "scripts/modal/reconcile_modal_runtime.py"
+EXTERNAL_SCRIPT = "scripts/dev/verify_external_runtime_contracts.py"
+# Per-helper wall-clock budgets: (env override, default seconds).
+SCRIPT_TIMEOUTS: dict[str, tuple[str, int]] = {
+    DB_SCRIPT: ("WORKSPACE_RUNTIME_DB_TIMEOUT_SECONDS", 120),
+    MODAL_SCRIPT: ("WORKSPACE_RUNTIME_MODAL_TIMEOUT_SECONDS", 300),
+    EXTERNAL_SCRIPT: ("WORKSPACE_RUNTIME_EXTERNAL_TIMEOUT_SECONDS", 60),
+}
+TIMEOUT_EXIT_CODE = 124
+CACHE_TTL_ENV = "WORKSPACE_RUNTIME_RECONCILE_TTL_SECONDS"
+DEFAULT_CACHE_TTL_SECONDS = 900
+# Only clean results are reused; blocked/fixed runs always re-probe next time.
+CACHEABLE_STATES = frozenset({"ok", "advisory"})
 
 
 def default_component(
@@ -66,23 +86,66 @@ def load_json_file(path: Path) -> dict[str, Any]:
     return merged
 
 
+def _script_timeout_seconds(script_relpath: str) -> int | None:
+    env_name, default = SCRIPT_TIMEOUTS.get(script_relpath, ("", 0))
+    if not env_name:
+        return None
+    raw = (os.getenv(env_name) or "").strip()
+    try:
+        value = int(raw) if raw else default
+    except ValueError:
+        value = default
+    return value if value > 0 else default
+
+
+def _timeout_payload(script_relpath: str, timeout_seconds: int | None) -> dict[str, Any]:
+    return {
+        "state": "blocked",
+        "reason": "runtime_reconcile_timeout",
+        "remediation": (
+            f"{script_relpath} did not finish within {timeout_seconds}s; "
+            f"rerun it from TRR-Backend or raise {SCRIPT_TIMEOUTS[script_relpath][0]}."
+        ),
+        "timed_out": True,
+    }
+
+
 def _run_backend_script(script_relpath: str) -> tuple[int, dict[str, Any]]:
-    command = [_python_command(BACKEND_ROOT), script_relpath, "--json"]
-    completed = subprocess.run(
-        command,
-        cwd=BACKEND_ROOT,
-        capture_output=True,
-        text=True,
-        check=False,
-    )
+    timeout_seconds = _script_timeout_seconds(script_relpath)
+    try:
+        completed = backend_helper_worker.try_run_script(BACKEND_ROOT, script_relpath, ["--json"], timeout=timeout_seconds)
+    except subprocess.TimeoutExpired:
+        return TIMEOUT_EXIT_CODE, _timeout_payload(script_relpath, timeout_seconds)
+    if completed is not None:
+        returncode, stdout, stderr = completed.returncode, completed.stdout, completed.stderr
+    else:
+        command = [_python_command(BACKEND_ROOT), script_relpath, "--json"]
+        process = subprocess.Popen(
+            command,
+            cwd=BACKEND_ROOT,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE,
+            text=True,
+            start_new_session=True,
+        )
+        try:
+            stdout, stderr = process.communicate(timeout=timeout_seconds)
+        except subprocess.TimeoutExpired:
+            try:
+                os.killpg(process.pid, signal.SIGKILL)
+            except OSError:
+                process.kill()
+            process.communicate()
+            return TIMEOUT_EXIT_CODE, _timeout_payload(script_relpath, timeout_seconds)
+        returncode = process.returncode
     payload: dict[str, Any]
     try:
-        payload = json.loads((completed.stdout or "").strip() or "{}")
+        payload = json.loads((stdout or "").strip() or "{}")
     except json.JSONDecodeError:
         payload = {
             "state": "blocked",
             "reason": "script_output_invalid",
-            "remediation": (completed.stderr or completed.stdout or "Runtime reconcile helper failed").strip() or None,
+            "remediation": (stderr or stdout or "Runtime reconcile helper failed").strip() or None,
         }
     if not isinstance(payload, dict):
         payload = {
@@ -90,7 +153,7 @@ def _run_backend_script(script_relpath: str) -> tuple[int, dict[str, Any]]:
             "reason": "script_output_invalid",
             "remediation": "Runtime reconcile helper returned a non-object payload.",
         }
-    return completed.returncode, payload
+    return returncode, payload
 
 
 def _component_detail(name: str, component: dict[str, Any]) -> str | None:
@@ -185,13 +248,27 @@ def run_runtime_reconcile() -> dict[str, Any]:
     artifact = default_artifact()
     workspace_mode = (os.getenv("WORKSPACE_DEV_MODE") or "local").strip() or "local"
 
-    db_rc, db_payload = _run_backend_script("scripts/dev/reconcile_runtime_db.py")
+    # The helpers touch independent systems, so run them side by side; the phase
+    # then takes as long as the slowest helper (each bounded by its own timeout).
+    scripts = [DB_SCRIPT, EXTERNAL_SCRIPT] if workspace_mode == "local" else [DB_SCRIPT, MODAL_SCRIPT, EXTERNAL_SCRIPT]
+    with ThreadPoolExecutor(max_workers=len(scripts)) as pool:
+        results = dict(zip(scripts, pool.map(_run_backend_script, scripts)))
+
+    db_rc, db_payload = results[DB_SCRIPT]
     if workspace_mode == "local":
         modal_rc = 0
         modal_payload = default_component(skipped=True, reason="disabled_local_mode", deployed=False, fingerprint_changed=False)
     else:
-        modal_rc, modal_payload = _run_backend_script("scripts/modal/reconcile_modal_runtime.py")
-    _, external_payload = _run_backend_script("scripts/dev/verify_external_runtime_contracts.py")
+        modal_rc, modal_payload = results[MODAL_SCRIPT]
+    _, external_payload = results[EXTERNAL_SCRIPT]
+    if external_payload.get("timed_out"):
+        # Render/Decodo checks are verify-only, so a hung probe is advisory.
+        for name in ("render", "decodo"):
+            external_payload[name] = {
+                "state": "advisory",
+                "reason": "external_verify_timeout",
+                "remediation": external_payload.get("remediation"),
+            }
 
     artifact["db"].update(db_payload)
     artifact["modal"].update(modal_payload)
@@ -211,15 +288,105 @@ def run_runtime_reconcile() -> dict[str, Any]:
     return compute_overall_state(artifact)
 
 
+def _sha256(*chunks: bytes) -> str:
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(chunk)
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+def _read_bytes(path: Path) -> bytes:
+    try:
+        return path.read_bytes()
+    except OSError:
+        return b""
+
+
+def _tree_sha256(root: Path, pattern: str) -> str:
+    """Digest every file under ``root`` matching ``pattern`` by relative path and contents."""
+    chunks: list[bytes] = []
+    if root.is_dir():
+        for path in sorted(root.rglob(pattern)):
+            if path.is_file():
+                chunks.append(path.relative_to(root).as_posix().encode("utf-8"))
+                chunks.append(_read_bytes(path))
+    return _sha256(*chunks)
+
+
+def runtime_fingerprints(env: dict[str, str] | None = None) -> dict[str, str]:
+    """Inputs that can change a reconcile result without the TTL expiring.
+
+    The Modal app is deployed from the whole ``trr_backend`` package, so any
+    source change there can change what the reconcile helper sees as drift;
+    migrations are hashed by contents so an edited migration also re-probes.
+    """
+    env = dict(os.environ) if env is None else env
+    profile = ROOT / "profiles" / f"{(env.get('PROFILE') or 'default').strip()}.env"
+    runtime_env = "\n".join(
+        f"{key}={value}" for key, value in sorted(env.items()) if key.startswith("WORKSPACE_RUNTIME_") and key != CACHE_TTL_ENV
+    )
+    return {
+        "migrations": _tree_sha256(BACKEND_ROOT / "supabase" / "migrations", "*.sql"),
+        "modal_app": _tree_sha256(BACKEND_ROOT / "trr_backend", "*.py"),
+        "profile_env": _sha256(_read_bytes(profile), runtime_env.encode("utf-8")),
+        "workspace_mode": (env.get("WORKSPACE_DEV_MODE") or "local").strip() or "local",
+    }
+
+
+def _cache_ttl_seconds() -> int:
+    raw = (os.getenv(CACHE_TTL_ENV) or "").strip()
+    try:
+        return max(0, int(raw)) if raw else DEFAULT_CACHE_TTL_SECONDS
+    except ValueError:
+        return DEFAULT_CACHE_TTL_SECONDS
+
+
+def load_cached_artifact(
+    path: Path,
+    fingerprints: dict[str, str],
+    *,
+    ttl_seconds: int,
+    now: float | None = None,
+) -> dict[str, Any] | None:
+    """Return the previous artifact when it is fresh and its inputs are unchanged."""
+    if ttl_seconds <= 0 or not path.is_file():
+        return None
+    try:
+        loaded = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+    cache = loaded.get("cache") if isinstance(loaded, dict) else None
+    if not isinstance(cache, dict) or not isinstance(cache.get("generated_at"), (int, float)):
+        return None
+    age = (time.time() if now is None else now) - cache["generated_at"]
+    if age < 0 or age > ttl_seconds:
+        return None
+    if cache.get("fingerprints") != fingerprints or loaded.get("overall_state") not in CACHEABLE_STATES:
+        return None
+    return loaded
+
+
 def main(argv: list[str] | None = None) -> int:
     args = argv or sys.argv[1:]
     emit_json = "--json" in args
-    artifact = run_runtime_reconcile()
-    ARTIFACT_PATH.parent.mkdir(parents=True, exist_ok=True)
-    ARTIFACT_PATH.write_text(json.dumps(artifact, indent=2, sort_keys=True) + "\n", encoding="utf-8")
+    fingerprints = runtime_fingerprints()
+    cached = None
+    if "--force" not in args:
+        cached = load_cached_artifact(ARTIFACT_PATH, fingerprints, ttl_seconds=_cache_ttl_seconds())
+    if cached is not None:
+        artifact = cached
+    else:
+        artifact = run_runtime_reconcile()
+        artifact["cache"] = {"generated_at": time.time(), "fingerprints": fingerprints}
+        ARTIFACT_PATH.parent.mkdir(parents=True, exist_ok=True)
+        ARTIFACT_PATH.write_text(json.dumps(artifact, indent=2, sort_keys=True) + "\n", encoding="utf-8")
 
     if emit_json:
         print(json.dumps(artifact, indent=2, sort_keys=True))
+    elif cached is not None:
+        age = int(time.time() - cached["cache"]["generated_at"])
+        print(f"{render_preflight_summary(artifact)} [cached {age}s ago; --force re-probes]")
     else:
         print(render_preflight_summary(artifact))
     return 1 if artifact.get("overall_state") == "blocked" else 0